@@ -0,0 +1,270 @@
+"""
+Content-addressed, compressed store for the large text columns.
+
+documents.content_html, case_issues.data_json, proceedings.asmt10_snapshot and
+proceeding_drafts.snapshot_json hold a reference ("blob:sha256:<hex>") instead
+of the text itself once the text is at least BLOB_MIN_CHARS long. The text
+lives once in content_blobs, zlib-compressed, keyed by the sha256 of its
+content - re-exporting an identical document or re-saving an unchanged draft
+adds nothing.
+
+Large base64 images embedded in the text (the letterhead above all) are
+split out into their own asset blobs, stored decoded, so every document
+carrying the same letterhead shares one copy.
+
+Readers call get_text(), which passes legacy inline values through and
+decompresses a reference only when the row is actually opened.
+
+Run as a script to migrate an existing database and print the space report:
+    python -m src.database.blob_store [path/to/adjudication.db]
+"""
+import base64
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import sys
+import threading
+import zlib
+
+REF_PREFIX = "blob:sha256:"
+
+# Shorter values stay inline: not worth a lookup
+BLOB_MIN_CHARS = 1024
+# Embedded images at least this long become shared asset blobs
+ASSET_MIN_CHARS = 4096
+
+# (table, text column, primary key) of every column stored through here
+BLOB_COLUMNS = [
+    ("documents", "content_html", "id"),
+    ("case_issues", "data_json", "id"),
+    ("proceedings", "asmt10_snapshot", "id"),
+    ("proceeding_drafts", "snapshot_json", "draft_id"),
+]
+
+_DATA_URI_RE = re.compile(r"(data:image/[a-z+]+;base64,)([A-Za-z0-9+/=]{%d,})" % ASSET_MIN_CHARS)
+_ASSET_TOKEN_RE = re.compile(r"blob-asset:([0-9a-f]{64})")
+
+# Decoded assets are few (letterheads) and read constantly
+_asset_cache = {}
+_asset_lock = threading.Lock()
+
+
+def is_ref(value):
+    return isinstance(value, str) and value.startswith(REF_PREFIX)
+
+
+def _digest(text):
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _ensure_table(cursor):
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS content_blobs (
+            hash TEXT PRIMARY KEY,
+            codec TEXT NOT NULL,
+            raw_size INTEGER NOT NULL,
+            stored_size INTEGER NOT NULL,
+            data BLOB NOT NULL,
+            assets TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+
+
+def _put_asset(cursor, payload):
+    digest = _digest(payload)
+    data = base64.b64decode(payload)
+    cursor.execute("""
+        INSERT OR IGNORE INTO content_blobs (hash, codec, raw_size, stored_size, data)
+        VALUES (?, 'b64', ?, ?, ?)
+    """, (digest, len(payload), len(data), sqlite3.Binary(data)))
+    return digest
+
+
+def put_text(cursor, text):
+    """
+    Stores text and returns its reference. None, short text and values that
+    are already references are returned unchanged.
+    """
+    if not isinstance(text, str) or len(text) < BLOB_MIN_CHARS or is_ref(text):
+        return text
+
+    digest = _digest(text)
+    cursor.execute("SELECT 1 FROM content_blobs WHERE hash = ?", (digest,))
+    if cursor.fetchone():
+        return REF_PREFIX + digest
+
+    assets = []
+
+    def externalise(match):
+        asset = _put_asset(cursor, match.group(2))
+        assets.append(asset)
+        return match.group(1) + "blob-asset:" + asset
+
+    body = _DATA_URI_RE.sub(externalise, text)
+    data = zlib.compress(body.encode("utf-8"), 6)
+    cursor.execute("""
+        INSERT OR IGNORE INTO content_blobs (hash, codec, raw_size, stored_size, data, assets)
+        VALUES (?, 'zlib', ?, ?, ?, ?)
+    """, (digest, len(text), len(data), sqlite3.Binary(data), json.dumps(sorted(set(assets))) if assets else None))
+    return REF_PREFIX + digest
+
+
+def _get_asset(cursor, digest):
+    with _asset_lock:
+        if digest in _asset_cache:
+            return _asset_cache[digest]
+    cursor.execute("SELECT data FROM content_blobs WHERE hash = ? AND codec = 'b64'", (digest,))
+    row = cursor.fetchone()
+    if row is None:
+        raise KeyError(f"Missing asset blob {digest}")
+    payload = base64.b64encode(row[0]).decode("ascii")
+    with _asset_lock:
+        _asset_cache[digest] = payload
+    return payload
+
+
+def get_text(cursor, value):
+    """Text for a stored value: references are decompressed, anything else is returned as is."""
+    if not is_ref(value):
+        return value
+    digest = value[len(REF_PREFIX):]
+    cursor.execute("SELECT codec, data FROM content_blobs WHERE hash = ?", (digest,))
+    row = cursor.fetchone()
+    if row is None:
+        raise KeyError(f"Missing content blob {digest}")
+    codec, data = row
+    if codec == "b64":
+        return base64.b64encode(data).decode("ascii")
+    text = zlib.decompress(data).decode("utf-8")
+    return _ASSET_TOKEN_RE.sub(lambda m: _get_asset(cursor, m.group(1)), text)
+
+
+def collect_garbage(cursor):
+    """Deletes blobs no column (or referenced blob) points at. Returns (blobs, bytes) removed."""
+    live = set()
+    for table, column, _ in BLOB_COLUMNS:
+        try:
+            cursor.execute(f"SELECT {column} FROM {table} WHERE {column} LIKE ?", (REF_PREFIX + "%",))
+        except sqlite3.OperationalError:
+            continue  # Table / column not present in this database
+        live.update(row[0][len(REF_PREFIX):] for row in cursor.fetchall())
+
+    cursor.execute("SELECT hash, assets, stored_size FROM content_blobs")
+    rows = cursor.fetchall()
+    for digest, assets, _ in rows:
+        if digest in live and assets:
+            live.update(json.loads(assets))
+
+    dead = [(digest, size) for digest, _, size in rows if digest not in live]
+    for digest, _ in dead:
+        cursor.execute("DELETE FROM content_blobs WHERE hash = ?", (digest,))
+    return len(dead), sum(size for _, size in dead)
+
+
+def _store_stats(cursor):
+    cursor.execute("SELECT COUNT(*), COALESCE(SUM(stored_size), 0), COALESCE(SUM(raw_size), 0) FROM content_blobs")
+    count, stored, raw = cursor.fetchone()
+    return {"blobs": count, "stored_bytes": stored, "raw_bytes": raw}
+
+
+def migrate(conn, commit=True):
+    """
+    Moves inline values of BLOB_COLUMNS into the store. Idempotent: rows that
+    already hold a reference (or are short) are left alone. With
+    commit=False the caller's transaction is left open (schema migrations).
+
+    Each value is verified to round-trip before its row is rewritten. Triggers
+    on the migrated tables (e.g. the issued DRC-01A immutability guard) are
+    suspended for the rewrite, since the content itself does not change, and
+    restored in the same transaction. Returns a report dict.
+    """
+    cursor = conn.cursor()
+    _ensure_table(cursor)
+    stored_before = _store_stats(cursor)["stored_bytes"]
+    report = {"columns": [], "inline_bytes": 0, "reference_bytes": 0}
+
+    for table, column, pk in BLOB_COLUMNS:
+        try:
+            cursor.execute(f"""
+                SELECT {pk}, {column} FROM {table}
+                WHERE {column} IS NOT NULL AND length({column}) >= ? AND {column} NOT LIKE ?
+            """, (BLOB_MIN_CHARS, REF_PREFIX + "%"))
+        except sqlite3.OperationalError:
+            continue
+        rows = cursor.fetchall()
+        if not rows:
+            continue
+
+        cursor.execute("SELECT name, sql FROM sqlite_master WHERE type = 'trigger' AND tbl_name = ?", (table,))
+        triggers = cursor.fetchall()
+        for name, _ in triggers:
+            cursor.execute(f"DROP TRIGGER IF EXISTS {name}")
+
+        inline_bytes = reference_bytes = 0
+        for key, text in rows:
+            ref = put_text(cursor, text)
+            if get_text(cursor, ref) != text:
+                raise RuntimeError(f"Blob round-trip mismatch for {table}.{column} row {key}")
+            cursor.execute(f"UPDATE {table} SET {column} = ? WHERE {pk} = ?", (ref, key))
+            inline_bytes += len(text.encode("utf-8"))
+            reference_bytes += len(ref)
+
+        for _, sql in triggers:
+            cursor.execute(sql)
+
+        report["columns"].append({"column": f"{table}.{column}", "rows": len(rows), "inline_bytes": inline_bytes})
+        report["inline_bytes"] += inline_bytes
+        report["reference_bytes"] += reference_bytes
+
+    report["garbage_blobs"], report["garbage_bytes"] = collect_garbage(cursor)
+    report.update(_store_stats(cursor))
+    report["saved_bytes"] = report["inline_bytes"] - report["reference_bytes"] - (report["stored_bytes"] - stored_before)
+    if commit:
+        conn.commit()
+    return report
+
+
+def format_report(report):
+    mb = lambda n: f"{n / (1024 * 1024):.2f} MB"
+    lines = ["Content blob store migration"]
+    for col in report["columns"]:
+        lines.append(f"  {col['column']}: {col['rows']} rows moved ({mb(col['inline_bytes'])} inline)")
+    if not report["columns"]:
+        lines.append("  No inline values left to move.")
+    lines.append(f"  Store: {report['blobs']} blobs, {mb(report['stored_bytes'])} stored "
+                 f"for {mb(report['raw_bytes'])} of content")
+    if report["garbage_blobs"]:
+        lines.append(f"  Removed {report['garbage_blobs']} unreferenced blobs ({mb(report['garbage_bytes'])})")
+    if report["inline_bytes"] or report["garbage_bytes"]:
+        lines.append(f"  Space saved by this run: {mb(report['saved_bytes'])}")
+    if "file_bytes_before" in report:
+        lines.append(f"  Database file: {mb(report['file_bytes_before'])} -> {mb(report['file_bytes_after'])}")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    from src.database.schema import DB_FILE
+    args = sys.argv[1:] if argv is None else argv
+    db_file = args[0] if args else DB_FILE
+    if not os.path.exists(db_file):
+        print(f"Database not found: {db_file}")
+        return 1
+
+    before = os.path.getsize(db_file)
+    conn = sqlite3.connect(db_file)
+    try:
+        report = migrate(conn)
+        # Give the freed pages back to the file system
+        conn.execute("VACUUM")
+    finally:
+        conn.close()
+    report["file_bytes_before"], report["file_bytes_after"] = before, os.path.getsize(db_file)
+    print(format_report(report))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,180 @@
+"""
+Case File Register (DRC-01A / SCN / OIO tracking) stored in SQLite.
+
+The register used to live in case_files.csv, which every getter re-read and
+every update rewrote. case_file_register is now the authoritative copy:
+demand columns are REAL, OC/SCN/OIO dates are ISO 'YYYY-MM-DD' (so they
+sort and range-filter as text) and status and the register dates are
+indexed. Callers still exchange dicts with the CSV's header names
+('CaseID', 'SCN_Date', ...); keys outside FIELDS (e.g. 'SCN_HTML_Path')
+are kept in the JSON 'extra' column.
+
+case_files.csv is imported once, by import_csv(), and not written again.
+"""
+import csv
+import json
+import uuid
+from datetime import datetime
+
+# (CSV header / dict key, column, kind)
+FIELDS = [
+    ("CaseID", "case_id", "text"),
+    ("GSTIN", "gstin", "text"),
+    ("Legal Name", "legal_name", "text"),
+    ("Trade Name", "trade_name", "text"),
+    ("Section", "section", "text"),
+    ("Status", "status", "text"),
+    ("DRC01A_Path", "drc01a_path", "text"),
+    ("DRC01_Path", "drc01_path", "text"),
+    ("DRC07_Path", "drc07_path", "text"),
+    ("Created_At", "created_at", "text"),
+    ("Updated_At", "updated_at", "text"),
+    ("OC_Number", "oc_number", "text"),
+    ("OC_Content", "oc_content", "text"),
+    ("OC_Date", "oc_date", "date"),
+    ("OC_To", "oc_to", "text"),
+    ("OC_Copy_To", "oc_copy_to", "text"),
+    ("SCN_Number", "scn_number", "text"),
+    ("SCN_Date", "scn_date", "date"),
+    ("OIO_Number", "oio_number", "text"),
+    ("OIO_Date", "oio_date", "date"),
+    ("CGST_Demand", "cgst_demand", "amount"),
+    ("SGST_Demand", "sgst_demand", "amount"),
+    ("IGST_Demand", "igst_demand", "amount"),
+    ("Cess_Demand", "cess_demand", "amount"),
+    ("Total_Demand", "total_demand", "amount"),
+    ("Financial_Year", "financial_year", "text"),
+    ("Issue_Description", "issue_description", "text"),
+    ("Remarks", "remarks", "text"),
+]
+COLUMNS = {key: column for key, column, _ in FIELDS}
+_KINDS = {key: kind for key, _, kind in FIELDS}
+
+_SQL_TYPES = {"text": "TEXT", "date": "TEXT", "amount": "REAL"}
+_DATE_FORMATS = ("%Y-%m-%d", "%d/%m/%Y", "%d-%m-%Y", "%d.%m.%Y", "%Y-%m-%d %H:%M:%S", "%Y/%m/%d")
+
+
+def create_table(cursor):
+    columns = ",\n".join(
+        f"{column} {'TEXT PRIMARY KEY' if column == 'case_id' else _SQL_TYPES[kind]}"
+        for _, column, kind in FIELDS
+    )
+    cursor.execute(f"CREATE TABLE IF NOT EXISTS case_file_register (\n{columns},\nextra TEXT\n)")
+    for name, cols in (("status", "status"), ("oc_date", "oc_date"), ("scn_date", "scn_date"),
+                       ("oio_date", "oio_date"), ("gstin", "gstin, section, updated_at")):
+        cursor.execute(f"CREATE INDEX IF NOT EXISTS idx_case_file_register_{name} ON case_file_register({cols})")
+
+
+def to_date(value):
+    """ISO date for the formats the register has been written in; unknown text is kept as-is."""
+    text = "" if value is None else str(value).strip()
+    if not text or text.lower() == "nan":
+        return None
+    for fmt in _DATE_FORMATS:
+        try:
+            return datetime.strptime(text, fmt).date().isoformat()
+        except ValueError:
+            continue
+    return text
+
+
+def to_amount(value):
+    """'1,23,456.00' / 123456 -> 123456.0; blanks and non-numbers -> None."""
+    if value is None:
+        return None
+    if isinstance(value, (int, float)):
+        return None if value != value else float(value)  # NaN from pandas
+    text = str(value).replace(",", "").replace("₹", "").strip()
+    try:
+        return float(text) if text else None
+    except ValueError:
+        return None
+
+
+def _text(value):
+    if value is None:
+        return None
+    text = str(value)
+    return None if text.lower() == "nan" else text
+
+
+def _convert(key, value):
+    kind = _KINDS[key]
+    if kind == "date":
+        return to_date(value)
+    if kind == "amount":
+        return to_amount(value)
+    return _text(value)
+
+
+def _split(data):
+    """(column -> value, extra keys) for a dict keyed by CSV headers."""
+    values, extra = {}, {}
+    for key, value in data.items():
+        if key in COLUMNS:
+            values[COLUMNS[key]] = _convert(key, value)
+        elif value not in (None, ""):
+            extra[key] = value if isinstance(value, (int, float, bool)) else str(value)
+    return values, extra
+
+
+def _now():
+    return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+
+def insert(cursor, data, case_id=None):
+    """Adds one case file; returns its CaseID (a new UUID unless given)."""
+    values, extra = _split(data)
+    values["case_id"] = case_id or values.get("case_id") or str(uuid.uuid4())
+    values["created_at"] = values.get("created_at") or _now()
+    values["updated_at"] = values.get("updated_at") or values["created_at"]
+    values["extra"] = json.dumps(extra) if extra else None
+    cols = list(values)
+    cursor.execute(
+        f"INSERT INTO case_file_register ({', '.join(cols)}) VALUES ({', '.join('?' * len(cols))})",
+        [values[c] for c in cols]
+    )
+    return values["case_id"]
+
+
+def update(cursor, case_id, updates):
+    """Applies updates (CSV header keys) to one case file; False if it does not exist."""
+    row = cursor.execute("SELECT extra FROM case_file_register WHERE case_id = ?", (case_id,)).fetchone()
+    if row is None:
+        return False
+    values, extra = _split({k: v for k, v in updates.items() if k != "CaseID"})
+    if extra:
+        merged = json.loads(row[0]) if row[0] else {}
+        merged.update(extra)
+        values["extra"] = json.dumps(merged)
+    values["updated_at"] = _now()
+    assignments = ", ".join(f"{c} = ?" for c in values)
+    cursor.execute(f"UPDATE case_file_register SET {assignments} WHERE case_id = ?",
+                   list(values.values()) + [case_id])
+    return True
+
+
+def to_record(row):
+    """sqlite3.Row -> dict keyed like a case_files.csv row (blanks as '')."""
+    record = {key: ("" if row[column] is None else row[column]) for key, column, _ in FIELDS}
+    if row["extra"]:
+        for key, value in json.loads(row["extra"]).items():
+            record.setdefault(key, value)
+    return record
+
+
+def import_csv(cursor, csv_path):
+    """
+    Copies case_files.csv into the table. Rows whose CaseID is already
+    present are left alone, so re-running is harmless. Returns rows added.
+    """
+    added = 0
+    with open(csv_path, newline='', encoding='utf-8-sig', errors='replace') as f:
+        for record in csv.DictReader(f):
+            record = {(k or "").strip(): (v or "").strip() for k, v in record.items() if k}
+            case_id = record.get("CaseID") or str(uuid.uuid4())
+            if cursor.execute("SELECT 1 FROM case_file_register WHERE case_id = ?", (case_id,)).fetchone():
+                continue
+            insert(cursor, {k: v for k, v in record.items() if v != ""}, case_id=case_id)
+            added += 1
+    return added
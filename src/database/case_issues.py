@@ -0,0 +1,197 @@
+"""
+Structured demand columns of case_issues.
+
+Every issue row keeps its full card state in data_json, but the figures the
+demand text, registers and totals need are also stored as plain columns,
+written next to the JSON whenever an issue is saved:
+
+    igst_tax, cgst_tax, sgst_tax, cess_tax   tax per head (tax_breakdown)
+    interest, penalty                        summed across the heads
+    is_included                              0 if the card was dropped
+
+so totals for a proceeding, or for the whole office, are one aggregate
+query over (proceeding_id, stage) and never decode JSON. Readers get
+IssueRecord dicts whose 'data_json' and 'data' are loaded on first access.
+"""
+import json
+
+from src.utils.number_utils import safe_int
+
+# tax_breakdown act -> column
+TAX_COLUMNS = {"IGST": "igst_tax", "CGST": "cgst_tax", "SGST": "sgst_tax", "CESS": "cess_tax"}
+DEMAND_COLUMNS = list(TAX_COLUMNS.values()) + ["interest", "penalty"]
+COLUMNS = DEMAND_COLUMNS + ["is_included"]
+
+
+def demand_values(data):
+    """Column values for one issue's data dict (zeros when it has no tax_breakdown)."""
+    values = dict.fromkeys(DEMAND_COLUMNS, 0)
+    breakdown = (data or {}).get("tax_breakdown") or {}
+    if isinstance(breakdown, dict):
+        for act, heads in breakdown.items():
+            if not isinstance(heads, dict):
+                continue
+            column = TAX_COLUMNS.get(str(act).upper())
+            if column:
+                values[column] += safe_int(heads.get("tax", 0))
+            values["interest"] += safe_int(heads.get("interest", 0))
+            values["penalty"] += safe_int(heads.get("penalty", 0))
+    values["is_included"] = 0 if (data or {}).get("is_included") is False else 1
+    return values
+
+
+def insert(cursor, data, data_json=None, **columns):
+    """
+    INSERTs one case_issues row: columns (proceeding_id, issue_id, stage,
+    origin, ...) plus data_json (through the blob store) and the demand
+    columns derived from data.
+    """
+    from src.database import blob_store
+
+    if data_json is None:
+        data_json = json.dumps(data)
+    columns["data_json"] = blob_store.put_text(cursor, data_json)
+    columns.update(demand_values(data))
+    names = list(columns)
+    cursor.execute(
+        f"INSERT INTO case_issues ({', '.join(names)}) VALUES ({', '.join('?' * len(names))})",
+        [columns[n] for n in names]
+    )
+
+
+def tax_breakdown(row):
+    """{act: {'tax': ...}} from a row's tax columns, for the demand text."""
+    return {act.title() if act == "CESS" else act: {"tax": row[column] or 0}
+            for act, column in TAX_COLUMNS.items()}
+
+
+def backfill(cursor):
+    """Fills the demand columns of existing rows from their data_json."""
+    from src.database import blob_store
+
+    rows = cursor.execute("SELECT id, data_json FROM case_issues").fetchall()
+    assignments = ", ".join(f"{c} = ?" for c in COLUMNS)
+    for row_id, data_json in rows:
+        try:
+            data = json.loads(blob_store.get_text(cursor, data_json) or "{}")
+        except (TypeError, ValueError):
+            data = {}
+        values = demand_values(data if isinstance(data, dict) else {})
+        cursor.execute(f"UPDATE case_issues SET {assignments} WHERE id = ?",
+                       [values[c] for c in COLUMNS] + [row_id])
+
+
+def totals(cursor, proceeding_id=None, stage=None, included_only=True):
+    """
+    Summed demand columns (plus 'issues' and 'total') over case_issues,
+    optionally limited to one proceeding and/or stage.
+    """
+    clauses, params = [], []
+    if proceeding_id is not None:
+        clauses.append("proceeding_id = ?")
+        params.append(str(proceeding_id))
+    if stage is not None:
+        clauses.append("stage = ?")
+        params.append(stage)
+    if included_only:
+        clauses.append("is_included = 1")
+    where = (" WHERE " + " AND ".join(clauses)) if clauses else ""
+    sums = ", ".join(f"COALESCE(SUM({c}), 0)" for c in DEMAND_COLUMNS)
+    row = cursor.execute(f"SELECT COUNT(*), {sums} FROM case_issues{where}", params).fetchone()
+    result = {"issues": row[0]}
+    result.update(zip(DEMAND_COLUMNS, row[1:]))
+    result["total"] = sum(result[c] for c in DEMAND_COLUMNS)
+    return result
+
+
+class IssueRecord(dict):
+    """
+    A case_issues row as a dict. 'data_json' (the text, read from the blob
+    store when stored there) and 'data' (that text parsed) are only loaded
+    when first read - listing issues or totalling them never pays for the
+    JSON of cards that are not opened. Anything that copies or serialises
+    the record (dict(r), r.copy(), {**r}, json.dumps(r), pickling) loads
+    them first, and pickles as a plain dict.
+    """
+
+    def __init__(self, row, data_json, resolve=None):
+        super().__init__(row)
+        dict.pop(self, 'data_json', None)
+        self._stored = data_json
+        self._resolve = resolve
+
+    def _text(self):
+        if not dict.__contains__(self, 'data_json'):
+            text = self._stored
+            if self._resolve is not None:
+                try:
+                    text = self._resolve(text)
+                except Exception as e:
+                    print(f"Error loading issue data: {e}")
+                    text = None
+            dict.__setitem__(self, 'data_json', text)
+        return dict.__getitem__(self, 'data_json')
+
+    def _decode(self):
+        if not dict.__contains__(self, 'data'):
+            text = self._text()
+            try:
+                data = json.loads(text) if text else {}
+            except (TypeError, ValueError):
+                data = {}
+            dict.__setitem__(self, 'data', data)
+        return dict.__getitem__(self, 'data')
+
+    def __missing__(self, key):
+        if key == 'data':
+            return self._decode()
+        if key == 'data_json':
+            return self._text()
+        raise KeyError(key)
+
+    def get(self, key, default=None):
+        if key in ('data', 'data_json'):
+            return self[key]
+        return super().get(key, default)
+
+    def __contains__(self, key):
+        return key in ('data', 'data_json') or super().__contains__(key)
+
+    # Whole-record views see the lazy keys too
+    def __iter__(self):
+        self._decode()
+        return super().__iter__()
+
+    def __len__(self):
+        self._decode()
+        return super().__len__()
+
+    def keys(self):
+        self._decode()
+        return super().keys()
+
+    def values(self):
+        self._decode()
+        return super().values()
+
+    def items(self):
+        self._decode()
+        return super().items()
+
+    def copy(self):
+        return dict(self.items())
+
+    def __eq__(self, other):
+        self._decode()
+        return super().__eq__(other)
+
+    def __ne__(self, other):
+        self._decode()
+        return super().__ne__(other)
+
+    def __repr__(self):
+        self._decode()
+        return super().__repr__()
+
+    def __reduce_ex__(self, protocol):
+        return dict, (self.copy(),)
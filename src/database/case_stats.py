@@ -0,0 +1,230 @@
+"""
+Materialised case and demand statistics.
+
+case_stats holds one row per (source, status, form_type, financial_year,
+workflow_stage) with the number of cases in it. demand_stats holds the
+number of demand lines and their total per (source, stage, financial_year).
+Triggers on the underlying tables keep both current, whichever code path
+writes, so the dashboard and reports read a few dozen summary rows instead
+of scanning proceedings, case_issues and the case file register.
+
+Sources:
+    SCRUTINY      proceedings
+    ADJUDICATION  adjudication_cases (form_type = adjudication section)
+    CASE_FILE     case_file_register (form_type = section; its demand is
+                  total_demand)
+    ISSUES        case_issues demand lines (stage = DRC-01A / SCN / ASMT-10):
+                  tax, interest and penalty from the demand columns of the
+                  included lines, or the legacy amount for lines saved
+                  without a tax breakdown (scrutiny shortfalls)
+
+rebuild() recomputes everything from the base tables; install() is
+idempotent and drops and recreates the triggers.
+"""
+
+_CASE_SOURCES = {
+    # source: (table, status, form_type, financial_year, workflow_stage)
+    "SCRUTINY": ("proceedings", "status", "form_type", "financial_year", "workflow_stage"),
+    "ADJUDICATION": ("adjudication_cases", "status", "adjudication_section", "financial_year", "workflow_stage"),
+    "CASE_FILE": ("case_file_register", "status", "section", "financial_year", None),
+}
+
+_CASE_KEY = "source, status, form_type, financial_year, workflow_stage"
+_DEMAND_KEY = "source, stage, financial_year"
+
+# Owning case's financial year for a case_issues row
+_ISSUE_FY = ("COALESCE((SELECT financial_year FROM proceedings WHERE id = {row}.proceeding_id), "
+             "(SELECT financial_year FROM adjudication_cases WHERE id = {row}.proceeding_id), '')")
+
+_CASE_FILE_DEMAND = "COALESCE({row}.total_demand, 0)"
+
+
+def _issue_exprs(cursor):
+    """
+    (items, demand) SQL templates for one case_issues row. Databases from
+    before the demand columns (schema V6) only have amount.
+    """
+    from src.database import case_issues
+    present = {row[1] for row in cursor.execute("PRAGMA table_info(case_issues)").fetchall()}
+    if not set(case_issues.COLUMNS) <= present:
+        return "1", "COALESCE(CAST({row}.amount AS REAL), 0)"
+    heads = " + ".join(f"COALESCE({{row}}.{c}, 0)" for c in case_issues.DEMAND_COLUMNS)
+    included = "COALESCE({row}.is_included, 1) != 0"
+    return (f"({included})",
+            f"CASE WHEN {included} THEN COALESCE(NULLIF({heads}, 0), CAST({{row}}.amount AS REAL), 0) ELSE 0 END")
+
+
+def _case_values(source, row):
+    _, status, form_type, fy, stage = _CASE_SOURCES[source]
+    stage_expr = f"COALESCE({row}.{stage}, 0)" if stage else "0"
+    return (f"'{source}', COALESCE({row}.{status}, ''), COALESCE({row}.{form_type}, ''), "
+            f"COALESCE({row}.{fy}, ''), {stage_expr}")
+
+
+def _case_add(source, row):
+    return (f"INSERT INTO case_stats ({_CASE_KEY}, cases) VALUES ({_case_values(source, row)}, 1) "
+            f"ON CONFLICT({_CASE_KEY}) DO UPDATE SET cases = cases + 1;")
+
+
+def _case_remove(source, row):
+    return (f"UPDATE case_stats SET cases = cases - 1 "
+            f"WHERE ({_CASE_KEY}) = ({_case_values(source, row)});")
+
+
+def _demand_change(source, stage, fy, amount, sign, items="1"):
+    """Adds (sign '+') or removes (sign '-') one demand line."""
+    return (f"INSERT INTO demand_stats ({_DEMAND_KEY}, items, demand) "
+            f"VALUES ('{source}', {stage}, {fy}, {sign}{items}, {sign}({amount})) "
+            f"ON CONFLICT({_DEMAND_KEY}) DO UPDATE SET items = items + excluded.items, "
+            f"demand = demand + excluded.demand;")
+
+
+def _issue_change(exprs, row, sign):
+    items, demand = exprs
+    return _demand_change("ISSUES", f"COALESCE({row}.stage, '')", _ISSUE_FY.format(row=row),
+                          demand.format(row=row), sign, items.format(row=row))
+
+
+def _case_file_change(row, sign):
+    return _demand_change("CASE_FILE", "''", f"COALESCE({row}.financial_year, '')",
+                          _CASE_FILE_DEMAND.format(row=row), sign)
+
+
+def _move_issue_demand(exprs, case_id, old_fy, new_fy):
+    """Re-files a case's demand lines from old_fy to new_fy (financial year edited, case deleted)."""
+    items, demand = (e.format(row="case_issues") for e in exprs)
+    lines = (f"SELECT COALESCE(stage, '') AS stage, SUM({items}) AS items, "
+             f"COALESCE(SUM({demand}), 0) AS demand "
+             f"FROM case_issues WHERE proceeding_id = {case_id} GROUP BY COALESCE(stage, '')")
+    return f"""
+        INSERT INTO demand_stats ({_DEMAND_KEY}, items, demand)
+        SELECT 'ISSUES', stage, {old_fy}, -items, -demand FROM ({lines}) WHERE items > 0
+        ON CONFLICT({_DEMAND_KEY}) DO UPDATE SET items = items + excluded.items, demand = demand + excluded.demand;
+        INSERT INTO demand_stats ({_DEMAND_KEY}, items, demand)
+        SELECT 'ISSUES', stage, {new_fy}, items, demand FROM ({lines}) WHERE items > 0
+        ON CONFLICT({_DEMAND_KEY}) DO UPDATE SET items = items + excluded.items, demand = demand + excluded.demand;
+    """
+
+
+def _triggers(exprs):
+    """(name, table, event, when, body) for every trigger that maintains the statistics."""
+    triggers = []
+    for source, (table, status, form_type, fy, stage) in _CASE_SOURCES.items():
+        key = source.lower()
+        watched = ", ".join(c for c in (status, form_type, fy, stage) if c)
+        insert, delete = _case_add(source, "NEW"), _case_remove(source, "OLD")
+        update = _case_remove(source, "OLD") + "\n" + _case_add(source, "NEW")
+        if source == "CASE_FILE":
+            insert += "\n" + _case_file_change("NEW", "+")
+            delete += "\n" + _case_file_change("OLD", "-")
+            update += "\n" + _case_file_change("OLD", "-") + "\n" + _case_file_change("NEW", "+")
+            watched += ", total_demand"
+        else:
+            # The case's demand lines are filed under its financial year
+            delete += _move_issue_demand(exprs, "OLD.id", f"COALESCE(OLD.{fy}, '')", "''")
+            triggers.append((f"trg_stats_{key}_year", table, f"AFTER UPDATE OF {fy}",
+                             f"OLD.{fy} IS NOT NEW.{fy}",
+                             _move_issue_demand(exprs, "NEW.id", f"COALESCE(OLD.{fy}, '')", f"COALESCE(NEW.{fy}, '')")))
+        triggers += [
+            (f"trg_stats_{key}_insert", table, "AFTER INSERT", None, insert),
+            (f"trg_stats_{key}_delete", table, "AFTER DELETE", None, delete),
+            (f"trg_stats_{key}_update", table, f"AFTER UPDATE OF {watched}", None, update),
+        ]
+    from src.database import case_issues
+    watched = "proceeding_id, stage, amount"
+    if exprs[0] != "1":
+        watched += ", " + ", ".join(case_issues.COLUMNS)
+    triggers += [
+        ("trg_stats_issues_insert", "case_issues", "AFTER INSERT", None, _issue_change(exprs, "NEW", "+")),
+        ("trg_stats_issues_delete", "case_issues", "AFTER DELETE", None, _issue_change(exprs, "OLD", "-")),
+        ("trg_stats_issues_update", "case_issues", f"AFTER UPDATE OF {watched}", None,
+         _issue_change(exprs, "OLD", "-") + "\n" + _issue_change(exprs, "NEW", "+")),
+    ]
+    return triggers
+
+
+def install(cursor):
+    """Creates the statistics tables and (re)creates their triggers."""
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS case_stats (
+            source TEXT NOT NULL,
+            status TEXT NOT NULL,
+            form_type TEXT NOT NULL,
+            financial_year TEXT NOT NULL,
+            workflow_stage INTEGER NOT NULL,
+            cases INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (source, status, form_type, financial_year, workflow_stage)
+        ) WITHOUT ROWID
+    """)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS demand_stats (
+            source TEXT NOT NULL,
+            stage TEXT NOT NULL,
+            financial_year TEXT NOT NULL,
+            items INTEGER NOT NULL DEFAULT 0,
+            demand REAL NOT NULL DEFAULT 0,
+            PRIMARY KEY (source, stage, financial_year)
+        ) WITHOUT ROWID
+    """)
+    # Per-case demand lookups in the financial-year triggers
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_case_issues_proceeding ON case_issues(proceeding_id, stage)")
+    for name, table, event, when, body in _triggers(_issue_exprs(cursor)):
+        cursor.execute(f"DROP TRIGGER IF EXISTS {name}")
+        when = f" WHEN {when}" if when else ""
+        cursor.execute(f"CREATE TRIGGER {name} {event} ON {table} FOR EACH ROW{when} BEGIN\n{body}\nEND")
+
+
+def rebuild(cursor):
+    """Recomputes both tables from the base tables."""
+    cursor.execute("DELETE FROM case_stats")
+    cursor.execute("DELETE FROM demand_stats")
+    for source, (table, *_) in _CASE_SOURCES.items():
+        values = _case_values(source, table)
+        cursor.execute(f"""
+            INSERT INTO case_stats ({_CASE_KEY}, cases)
+            SELECT {values}, COUNT(*) FROM {table} GROUP BY 2, 3, 4, 5
+        """)
+    items, demand = (e.format(row="case_issues") for e in _issue_exprs(cursor))
+    cursor.execute(f"""
+        INSERT INTO demand_stats ({_DEMAND_KEY}, items, demand)
+        SELECT 'ISSUES', COALESCE(stage, ''), {_ISSUE_FY.format(row='case_issues')}, SUM({items}),
+               COALESCE(SUM({demand}), 0)
+        FROM case_issues GROUP BY 2, 3
+    """)
+    cursor.execute(f"""
+        INSERT INTO demand_stats ({_DEMAND_KEY}, items, demand)
+        SELECT 'CASE_FILE', '', COALESCE(financial_year, ''), COUNT(*),
+               SUM({_CASE_FILE_DEMAND.format(row='case_file_register')})
+        FROM case_file_register GROUP BY 3
+    """)
+
+
+def summary(cursor):
+    """
+    The statistics as nested dicts:
+        cases[source]                 -> count
+        by_stage/by_status/by_form_type/by_year[source][value] -> count
+        demand[source][stage]         -> total, demand_by_year[source][fy] -> total
+        demand_items[source][stage]   -> number of demand lines
+    """
+    result = {key: {} for key in ("cases", "by_stage", "by_status", "by_form_type", "by_year",
+                                  "demand", "demand_by_year", "demand_items")}
+
+    def add(table, source, key, amount):
+        bucket = result[table].setdefault(source, {})
+        bucket[key] = bucket.get(key, 0) + amount
+
+    cursor.execute(f"SELECT {_CASE_KEY}, cases FROM case_stats WHERE cases != 0")
+    for source, status, form_type, fy, stage, cases in cursor.fetchall():
+        result["cases"][source] = result["cases"].get(source, 0) + cases
+        add("by_stage", source, stage, cases)
+        add("by_status", source, status, cases)
+        add("by_form_type", source, form_type, cases)
+        add("by_year", source, fy, cases)
+
+    cursor.execute(f"SELECT {_DEMAND_KEY}, items, demand FROM demand_stats WHERE items != 0")
+    for source, stage, fy, items, demand in cursor.fetchall():
+        add("demand", source, stage, demand)
+        add("demand_by_year", source, fy, demand)
+        add("demand_items", source, stage, items)
+    return result
@@ -5,6 +5,7 @@ import json
 import uuid
 from datetime import datetime
 from src.utils.constants import TAXPAYERS_FILE, CASES_FILE, CASE_FILES_FILE, WorkflowStage
+from src.database import blob_store, case_files, case_issues, case_stats, oc_sequence
 
 class DatabaseError(Exception): pass
 class ConcurrencyError(DatabaseError): pass
@@ -12,6 +13,15 @@ class ConcurrencyError(DatabaseError): pass
 class DatabaseManager:
     _initialized = False
 
+    def __new__(cls, *args, **kwargs):
+        # Service mode (see src/database/db_service.py): talk to the shared server instead
+        if cls is DatabaseManager:
+            from src.database import db_service
+            service = db_service.configured_service()
+            if service:
+                return db_service.DatabaseClient(*service)
+        return super().__new__(cls)
+
     def __init__(self, db_path=None):
         self.db_path = db_path
         self.ensure_files_exist()
@@ -218,7 +228,7 @@ class DatabaseManager:
             return []
 
     def delete_csv_case(self, case_id):
-        """Delete a legacy case from CSV files (both cases.csv and case_files.csv)"""
+        """Delete a legacy case from cases.csv and the case file register"""
         success = False
         try:
             # 1. Delete from CASES_FILE
@@ -229,13 +239,13 @@ class DatabaseManager:
                     df.to_csv(CASES_FILE, index=False)
                     success = True
 
-            # 2. Delete from CASE_FILES_FILE (This is likely where the UUID case is)
-            if os.path.exists(CASE_FILES_FILE):
-                df2 = pd.read_csv(CASE_FILES_FILE)
-                if case_id in df2['CaseID'].astype(str).values:
-                    df2 = df2[df2['CaseID'].astype(str) != str(case_id)]
-                    df2.to_csv(CASE_FILES_FILE, index=False)
-                    success = True
+            # 2. Delete from the case file register (This is likely where the UUID case is)
+            conn = self._get_conn()
+            cursor = conn.execute("DELETE FROM case_file_register WHERE case_id = ?", (str(case_id),))
+            if cursor.rowcount:
+                success = True
+            conn.commit()
+            conn.close()
             
             return success
         except Exception as e:
@@ -243,71 +253,49 @@ class DatabaseManager:
             return False
 
     # ---------------- Case File Register Methods ----------------
+    # Stored in case_file_register (see src/database/case_files.py); dicts use
+    # the old case_files.csv headers as keys.
+
+    def import_case_files_csv(self, csv_path=CASE_FILES_FILE):
+        """
+        One-time copy of case_files.csv into case_file_register. Recorded in
+        csv_mirror_state, so later calls (and later edits of the file) are
+        ignored. Returns the number of rows added.
+        """
+        from src.database.register_queries import csv_signature
+
+        try:
+            conn = self._get_conn()
+            cursor = conn.cursor()
+            cursor.execute("BEGIN IMMEDIATE")
+            if cursor.execute("SELECT 1 FROM csv_mirror_state WHERE source = 'case_files'").fetchone():
+                conn.rollback()
+                conn.close()
+                return 0
+            added = case_files.import_csv(cursor, csv_path) if os.path.exists(csv_path) else 0
+            signature = csv_signature(csv_path)
+            cursor.execute(
+                "INSERT INTO csv_mirror_state (source, mtime, size) VALUES ('case_files', ?, ?)",
+                (signature[0] if signature else None, signature[1] if signature else None)
+            )
+            conn.commit()
+            conn.close()
+            return added
+        except Exception as e:
+            print(f"Error importing case files CSV: {e}")
+            return 0
 
     def _legacy_create_case_file_csv(self, data):
         """
-        [LEGACY] Creates a new entry in the Case File Register (CSV).
+        [LEGACY] Creates a new entry in the Case File Register.
         renamed to prevent accidental usage in modern flows.
         """
         try:
-            import uuid
-            from datetime import datetime
-            
-            case_id = str(uuid.uuid4())
+            conn = self._get_conn()
+            case_id = case_files.insert(conn.cursor(), {k: v for k, v in data.items() if k != 'CaseID'})
+            conn.commit()
+            conn.close()
             data['CaseID'] = case_id
-            data['Created_At'] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            data['Updated_At'] = data['Created_At']
-            
-            # Ensure all columns exist
-            required_cols = [
-                "CaseID", "GSTIN", "Legal Name", "Trade Name", "Section", "Status", 
-                "DRC01A_Path", "DRC01_Path", "DRC07_Path", "Created_At", "Updated_At",
-                "OC_Number", "OC_Content", "OC_Date", "OC_To", "OC_Copy_To",
-                "SCN_Number", "SCN_Date", "OIO_Number", "OIO_Date",
-                "CGST_Demand", "SGST_Demand", "IGST_Demand", "Total_Demand",
-                "Financial_Year", "Issue_Description", "Remarks"
-            ]
-            
-            # Check if file exists and read existing header
-            file_exists = os.path.isfile(CASE_FILES_FILE)
-            existing_header = []
-            if file_exists and os.stat(CASE_FILES_FILE).st_size > 0:
-                with open(CASE_FILES_FILE, 'r', newline='', encoding='utf-8') as f:
-                    reader = csv.reader(f)
-                    existing_header = next(reader, [])
-            
-            # If new columns are needed, we might need to rewrite the file or append columns
-            # For simplicity, let's use pandas to handle schema evolution if file exists
-            if file_exists and existing_header:
-                df = pd.read_csv(CASE_FILES_FILE)
-                # Add missing columns
-                for col in required_cols:
-                    if col not in df.columns:
-                        df[col] = ""
-                
-                # Add new row
-                new_row = {k: data.get(k, "") for k in required_cols}
-                new_row['CaseID'] = case_id
-                new_row['Created_At'] = data['Created_At']
-                new_row['Updated_At'] = data['Updated_At']
-                
-                # Append using concat
-                new_df = pd.DataFrame([new_row])
-                df = pd.concat([df, new_df], ignore_index=True)
-                df.to_csv(CASE_FILES_FILE, index=False)
-                
-            else:
-                # Create new file with all columns
-                row_data = {k: data.get(k, "") for k in required_cols}
-                row_data['CaseID'] = case_id
-                row_data['Created_At'] = data['Created_At']
-                row_data['Updated_At'] = data['Updated_At']
-                
-                with open(CASE_FILES_FILE, 'w', newline='', encoding='utf-8') as f:
-                    writer = csv.DictWriter(f, fieldnames=required_cols)
-                    writer.writeheader()
-                    writer.writerow(row_data)
-                
             return case_id
         except Exception as e:
             print(f"Error creating case file: {e}")
@@ -322,40 +310,32 @@ class DatabaseManager:
         updates: dict containing fields to update
         """
         try:
-            from datetime import datetime
-            
-            df = pd.read_csv(CASE_FILES_FILE)
-            
-            # Check if case exists
-            if case_id not in df['CaseID'].values:
+            conn = self._get_conn()
+            found = case_files.update(conn.cursor(), case_id, updates)
+            conn.commit()
+            conn.close()
+            if not found:
                 return False, "Case ID not found"
-            # Update fields
-            idx = df[df['CaseID'] == case_id].index[0]
-            
-            for key, value in updates.items():
-                # If column doesn't exist, create it
-                if key not in df.columns:
-                    df[key] = ""
-                
-                df.at[idx, key] = value
-            
-            df.at[idx, 'Updated_At'] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            
-            df.to_csv(CASE_FILES_FILE, index=False)
             return True, "Case updated successfully"
             
         except Exception as e:
             print(f"Error updating case file: {e}")
             return False, str(e)
 
+    def _case_file_rows(self, where="", params=(), order=""):
+        conn = self._get_conn()
+        conn.row_factory = sqlite3.Row
+        try:
+            rows = conn.execute(f"SELECT * FROM case_file_register{where}{order}", params).fetchall()
+            return [case_files.to_record(row) for row in rows]
+        finally:
+            conn.close()
+
     def get_case_file(self, case_id):
         """Retrieve a single case file by ID"""
         try:
-            df = pd.read_csv(CASE_FILES_FILE)
-            case = df[df['CaseID'] == case_id]
-            if not case.empty:
-                return case.iloc[0].to_dict()
-            return None
+            rows = self._case_file_rows(" WHERE case_id = ?", (case_id,))
+            return rows[0] if rows else None
         except Exception as e:
             print(f"Error getting case file: {e}")
             return None
@@ -363,12 +343,7 @@ class DatabaseManager:
     def get_all_case_files(self):
         """Retrieve all case files"""
         try:
-            if not os.path.exists(CASE_FILES_FILE):
-                return []
-            df = pd.read_csv(CASE_FILES_FILE)
-            # Replace NaN with empty string
-            df = df.fillna("")
-            return df.to_dict('records')
+            return self._case_file_rows(order=" ORDER BY rowid")
         except Exception as e:
             print(f"Error getting all case files: {e}")
             return []
@@ -379,18 +354,9 @@ class DatabaseManager:
         Useful for linking Order to existing proceedings.
         """
         try:
-            df = pd.read_csv(CASE_FILES_FILE)
-            
-            # Filter by GSTIN and Section (loose match for section if needed, but exact is better for now)
-            # We might need to handle section string variations, but let's assume consistency for now
-            mask = (df['GSTIN'] == gstin) & (df['Section'] == section)
-            results = df[mask]
-            
-            if not results.empty:
-                # Sort by Updated_At descending to get the latest
-                results = results.sort_values(by='Updated_At', ascending=False)
-                return results.iloc[0].to_dict()
-            return None
+            rows = self._case_file_rows(" WHERE gstin = ? AND section = ?", (gstin, section),
+                                        " ORDER BY updated_at DESC LIMIT 1")
+            return rows[0] if rows else None
         except Exception as e:
             print(f"Error finding active case: {e}")
             return None
@@ -398,20 +364,7 @@ class DatabaseManager:
     def get_cases_by_gstin(self, gstin):
         """Retrieve all cases for a specific GSTIN"""
         try:
-            if not os.path.exists(CASE_FILES_FILE):
-                return []
-            df = pd.read_csv(CASE_FILES_FILE)
-            df = df.fillna("")
-            
-            # Filter by GSTIN
-            cases = df[df['GSTIN'] == gstin]
-            
-            if not cases.empty:
-                # Sort by Updated_At descending
-                if 'Updated_At' in cases.columns:
-                    cases = cases.sort_values(by='Updated_At', ascending=False)
-                return cases.to_dict('records')
-            return []
+            return self._case_file_rows(" WHERE gstin = ?", (gstin,), " ORDER BY updated_at DESC")
         except Exception as e:
             print(f"Error getting cases by GSTIN: {e}")
             return []
@@ -420,38 +373,50 @@ class DatabaseManager:
         """
         Get the next available OC number for a given year suffix (e.g., '2025' or '25').
         Expected DB Format: 'SEQUENCE/YEAR' (e.g. '123/2025')
-        Returns: Integer (next sequence number)
+        Returns: Integer (next sequence number). Only a suggestion - use
+        allocate_oc_numbers (or leave OC_Number blank on issuance) to reserve it.
         """
         try:
             conn = self._get_conn()
-            cursor = conn.cursor()
-            
-            # Filter entries ending with /year_suffix
-            # Use LIKE '%/2025'
-            query = f"%/{year_suffix}"
-            cursor.execute("SELECT oc_number FROM oc_register WHERE oc_number LIKE ?", (query,))
-            rows = cursor.fetchall()
+            next_seq = oc_sequence.peek(conn.cursor(), str(year_suffix))
             conn.close()
-            
-            max_seq = 0
-            for row in rows:
-                oc_str = str(row[0]).strip()
-                if '/' in oc_str:
-                    try:
-                        # Split '123/2025' -> takes '123'
-                        seq_part = oc_str.split('/')[0]
-                        seq = int(seq_part)
-                        if seq > max_seq:
-                            max_seq = seq
-                    except ValueError:
-                        pass
-            
-            return max_seq + 1
-            
+            return next_seq
         except Exception as e:
             print(f"Error getting next OC number: {e}")
             return 1
-    
+
+    def allocate_oc_numbers(self, year_suffix=None, n=1):
+        """
+        Reserve n consecutive OC numbers (e.g. for a mail-merge batch) in one
+        transaction. Returns the formatted numbers, [] on failure.
+        """
+        try:
+            conn = self._get_conn()
+            cursor = conn.cursor()
+            # Take the write lock up front so concurrent issuers queue instead of failing
+            cursor.execute("BEGIN IMMEDIATE")
+            numbers = oc_sequence.allocate(cursor, str(year_suffix or oc_sequence.current_year()), n)
+            conn.commit()
+            conn.close()
+            return numbers
+        except Exception as e:
+            print(f"Error allocating OC numbers: {e}")
+            return []
+
+    def get_oc_entry_for_case(self, case_id):
+        """First OC register row recorded against a case, as a dict; None if none"""
+        try:
+            conn = self._get_conn()
+            conn.row_factory = sqlite3.Row
+            cursor = conn.cursor()
+            cursor.execute("SELECT * FROM oc_register WHERE case_id = ?", (case_id,))
+            row = cursor.fetchone()
+            conn.close()
+            return dict(row) if row else None
+        except Exception as e:
+            print(f"Error getting OC entry for case {case_id}: {e}")
+            return None
+
     def get_oc_register_entries(self):
         """Get all OC register entries from SQLite"""
         try:
@@ -481,30 +446,9 @@ class DatabaseManager:
             return []
     
     def get_scn_register_cases(self):
-        """Get all SCN register cases"""
+        """Get all SCN register cases (newest SCN first)"""
         try:
-            if not os.path.exists(CASE_FILES_FILE):
-                return []
-            df = pd.read_csv(CASE_FILES_FILE)
-            
-            # Ensure all columns exist
-            expected_cols = [
-                "GSTIN", "Legal Name", "Issue_Description", "Financial_Year", "Section", 
-                "SCN_Number", "SCN_Date", "CGST_Demand", "SGST_Demand", "IGST_Demand", 
-                "Total_Demand", "Remarks"
-            ]
-            for col in expected_cols:
-                if col not in df.columns:
-                    df[col] = ""
-            
-            df = df.fillna("")
-            
-            # Filter for cases with SCN
-            mask = (df['Status'].str.contains('SCN', case=False, na=False)) | (df['SCN_Number'].astype(str) != "")
-            results = df[mask]
-            if 'SCN_Date' in results.columns:
-                results = results.sort_values(by='SCN_Date', ascending=False)
-            return results.to_dict('records')
+            return list(self.iter_register_rows('scn'))
         except Exception as e:
             print(f"Error getting SCN register cases: {e}")
             return []
@@ -512,28 +456,7 @@ class DatabaseManager:
     def get_oio_register_cases(self):
         """Get all OIO register cases (DRC-07)"""
         try:
-            if not os.path.exists(CASE_FILES_FILE):
-                return []
-            df = pd.read_csv(CASE_FILES_FILE)
-            
-            # Ensure all columns exist
-            expected_cols = [
-                "GSTIN", "Legal Name", "Issue_Description", "Financial_Year", "Section", 
-                "SCN_Number", "SCN_Date", "OIO_Number", "OIO_Date",
-                "CGST_Demand", "SGST_Demand", "IGST_Demand", "Cess_Demand", "Total_Demand", "Remarks"
-            ]
-            for col in expected_cols:
-                if col not in df.columns:
-                    df[col] = ""
-            
-            df = df.fillna("")
-            
-            # Filter for cases with OIO/DRC-07
-            mask = (df['Status'].str.contains('ORDER', case=False, na=False)) | (df['OIO_Number'].astype(str) != "")
-            results = df[mask]
-            if 'OIO_Date' in results.columns:
-                results = results.sort_values(by='OIO_Date', ascending=False)
-            return results.to_dict('records')
+            return list(self.iter_register_rows('oio'))
         except Exception as e:
             print(f"Error getting OIO register cases: {e}")
             return []
@@ -541,35 +464,145 @@ class DatabaseManager:
     def get_drc01a_register_cases(self):
         """Get all DRC-01A register cases"""
         try:
-            if not os.path.exists(CASE_FILES_FILE):
-                return []
-            df = pd.read_csv(CASE_FILES_FILE)
-            
-            # Ensure all columns exist
-            expected_cols = [
-                "GSTIN", "Legal Name", "Issue_Description", "Financial_Year", "Section", 
-                "OC_Date", "CGST_Demand", "SGST_Demand", "IGST_Demand", "Cess_Demand", "Total_Demand", "Remarks"
-            ]
-            for col in expected_cols:
-                if col not in df.columns:
-                    df[col] = ""
-            
-            df = df.fillna("")
-            
-            # Filter for cases with DRC-01A
-            # Either status contains DRC-01A or DRC01A_Path is not empty
-            mask = (df['Status'].str.contains('DRC-01A', case=False, na=False)) | (df['DRC01A_Path'].astype(str) != "")
-            results = df[mask]
-            if 'OC_Date' in results.columns:
-                results = results.sort_values(by='OC_Date', ascending=False)
-            return results.to_dict('records')
+            return list(self.iter_register_rows('drc01a'))
         except Exception as e:
             print(f"Error getting DRC-01A register cases: {e}")
             return []
 
+    # ---------------- Paged Register Queries ----------------
+
+    # (db_file, source) -> CSV signature the mirror was last built from
+    _mirror_signatures = {}
+
+    def sync_csv_mirror(self, source, conn=None):
+        """
+        Re-copies a CSV register into its SQLite mirror if the file changed
+        (mtime/size) since the last sync. Cheap no-op otherwise.
+        """
+        from src.database.register_queries import CSV_MIRRORS, csv_signature
+
+        mirror = CSV_MIRRORS[source]
+        signature = csv_signature(mirror.csv_path)
+        cache_key = (self.db_file, source)
+        if cache_key in DatabaseManager._mirror_signatures and DatabaseManager._mirror_signatures[cache_key] == signature:
+            return False
+
+        own_conn = conn is None
+        if own_conn:
+            conn = self._get_conn()
+        try:
+            cursor = conn.cursor()
+            row = cursor.execute("SELECT mtime, size FROM csv_mirror_state WHERE source = ?", (source,)).fetchone()
+            stored = (row[0], row[1]) if row and row[0] is not None else None
+            if row is not None and stored == signature:
+                DatabaseManager._mirror_signatures[cache_key] = signature
+                return False
+
+            cursor.execute(f"DELETE FROM {mirror.table}")
+            if signature is not None:
+                cols = list(mirror.columns.values())
+                verb = "INSERT OR REPLACE" if mirror.replace else "INSERT"
+                cursor.executemany(
+                    f"{verb} INTO {mirror.table} ({', '.join(cols)}) VALUES ({', '.join('?' * len(cols))})",
+                    mirror.rows()
+                )
+            cursor.execute(
+                "INSERT OR REPLACE INTO csv_mirror_state (source, mtime, size) VALUES (?, ?, ?)",
+                (source, signature[0] if signature else None, signature[1] if signature else None)
+            )
+            conn.commit()
+            DatabaseManager._mirror_signatures[cache_key] = signature
+            return True
+        except Exception as e:
+            print(f"Error syncing {source} mirror: {e}")
+            conn.rollback()
+            return False
+        finally:
+            if own_conn:
+                conn.close()
+
+    def _register_query(self, register, conn):
+        from src.database.register_queries import REGISTERS
+        spec = REGISTERS[register]
+        if spec.mirror:
+            self.sync_csv_mirror(spec.mirror, conn)
+        return spec
+
+    def count_register_rows(self, register, search=None, filters=None):
+        """Number of rows a register view would show for the given search/filters."""
+        try:
+            conn = self._get_conn()
+            spec = self._register_query(register, conn)
+            where, params = spec.where_clause(search, filters)
+            count = conn.execute(f"SELECT COUNT(*) FROM {spec.table}{where}", params).fetchone()[0]
+            conn.close()
+            return count
+        except Exception as e:
+            print(f"Error counting {register} register: {e}")
+            return 0
+
+    def fetch_register_page(self, register, offset=0, limit=200, order_by=None, descending=False,
+                            search=None, filters=None):
+        """
+        One page of a register as dicts keyed like the legacy getters
+        (e.g. 'GSTIN', 'SCN_Number'). Sorting and filtering run in SQL.
+        """
+        try:
+            conn = self._get_conn()
+            conn.row_factory = sqlite3.Row
+            spec = self._register_query(register, conn)
+            where, params = spec.where_clause(search, filters)
+            sql = (f"SELECT {spec.select_list()} FROM {spec.table}{where}"
+                   f"{spec.order_clause(order_by, descending)} LIMIT ? OFFSET ?")
+            rows = conn.execute(sql, params + [limit, offset]).fetchall()
+            conn.close()
+            return [dict(row) for row in rows]
+        except Exception as e:
+            print(f"Error fetching {register} register page: {e}")
+            return []
+
+    def iter_register_rows(self, register, search=None, filters=None, order_by=None, descending=False,
+                           batch_size=500):
+        """
+        Yields every row of a register in batches of batch_size without building
+        the full list. Batches are keyset-paged on the sort order plus rowid, so
+        no read lock is held between them (writers are not blocked for the
+        length of an export) and rows are neither repeated nor skipped when
+        others are written meanwhile.
+        """
+        from src.database.register_queries import keyset_clause
+
+        conn = self._get_conn()
+        conn.row_factory = sqlite3.Row
+        try:
+            spec = self._register_query(register, conn)
+            conn.commit()  # Whatever the mirror sync left open
+            where, params = spec.where_clause(search, filters)
+            terms = spec.sort_terms(order_by, descending)
+            keys = [(f"_sort{i}", desc) for i, (_, desc) in enumerate(terms)]
+            inner = (f"SELECT {spec.select_list()}, "
+                     + ", ".join(f"{expr} AS {key}" for (expr, _), (key, _) in zip(terms, keys))
+                     + f" FROM {spec.table}{where}")
+            order = ", ".join(f"{key} {'DESC' if desc else 'ASC'}" for key, desc in keys)
+            last = None
+            while True:
+                after, after_params = keyset_clause(keys, last) if last else ("1", [])
+                rows = conn.execute(f"SELECT * FROM ({inner}) WHERE {after} ORDER BY {order} LIMIT ?",
+                                    params + after_params + [batch_size]).fetchall()
+                for row in rows:
+                    yield {k: row[k] for k in row.keys() if not k.startswith("_sort")}
+                if len(rows) < batch_size:
+                    break
+                last = [rows[-1][key] for key, _ in keys]
+        finally:
+            conn.close()
+
     def _insert_oc_entry(self, cursor, case_id, oc_data, is_issuance=False):
         """
         Internal: Write to OC Register using an existing cursor.
+        A blank OC_Number is allocated from the sequence in the cursor's
+        transaction; an explicit one already in the register is rejected.
+        Returns the OC number written.
         """
         # 1. Enforce Issuance Flag
         if not is_issuance:
@@ -577,7 +610,13 @@ class DatabaseManager:
              raise ValueError("Illegal OC Register Write: Called without is_issuance=True")
 
         # 2. Validate OC Number Format (Anti-Ghost)
-        oc_number = str(oc_data.get('OC_Number', '')).strip()
+        oc_number = str(oc_data.get('OC_Number') or '').strip()
+        if not oc_number:
+            # No number given: reserve the next free one within this transaction
+            year = oc_sequence.current_year()
+            oc_number = oc_sequence.allocate(cursor, year)[0]
+            while cursor.execute("SELECT 1 FROM oc_register WHERE oc_number = ?", (oc_number,)).fetchone():
+                oc_number = oc_sequence.allocate(cursor, year)[0]
         
         # Valid: "1/2026", "123/2025" - MUST have '/'
         if oc_number.upper().startswith("OC-") or len(oc_number) > 20: 
@@ -585,52 +624,42 @@ class DatabaseManager:
              if "OC-" in oc_number.upper(): 
                  raise ValueError(f"Invalid OC Number Format: {oc_number}.")
         
-        # Check if OC Number already exists
-        cursor.execute("SELECT id FROM oc_register WHERE oc_number = ?", (oc_number,))
-        existing = cursor.fetchone()
-        
-        if existing:
-            # Update existing entry
-            cursor.execute("""
-                UPDATE oc_register 
-                SET oc_content = ?, oc_date = ?, oc_to = ?
-                WHERE id = ?
-            """, (
-                oc_data.get('OC_Content'),
-                oc_data.get('OC_Date'),
-                oc_data.get('OC_To'),
-                existing[0]
-            ))
-        else:
-            # Insert new entry
-            cursor.execute("""
-                INSERT INTO oc_register (case_id, oc_number, oc_content, oc_date, oc_to)
-                VALUES (?, ?, ?, ?, ?)
-            """, (
-                case_id,
-                oc_number,
-                oc_data.get('OC_Content'),
-                oc_data.get('OC_Date'),
-                oc_data.get('OC_To')
-            ))
+        # An issued number is never reused: refuse instead of overwriting the earlier entry
+        cursor.execute("SELECT 1 FROM oc_register WHERE oc_number = ?", (oc_number,))
+        if cursor.fetchone():
+            raise ValueError(f"OC Number already issued: {oc_number}.")
+
+        oc_sequence.record(cursor, oc_number)
+        cursor.execute("""
+            INSERT INTO oc_register (case_id, oc_number, oc_content, oc_date, oc_to)
+            VALUES (?, ?, ?, ?, ?)
+        """, (
+            case_id,
+            oc_number,
+            oc_data.get('OC_Content'),
+            oc_data.get('OC_Date'),
+            oc_data.get('OC_To')
+        ))
         return oc_number
 
     def add_oc_entry(self, case_id, oc_data, is_issuance=False):
         """
         Add an entry to the OC Register (SQLite).
+        Leave OC_Number blank to have the next number allocated in the same
+        transaction. Returns the OC number written, False on failure.
         """
         try:
             conn = self._get_conn()
             cursor = conn.cursor()
             
-            self._insert_oc_entry(cursor, case_id, oc_data, is_issuance)
+            oc_number = self._insert_oc_entry(cursor, case_id, oc_data, is_issuance)
             
             conn.commit()
             conn.close()
-            return True
+            return oc_number
         except Exception as e:
             print(f"Error adding OC entry: {e}")
-            if "Illegal OC Register Write" in str(e) or "Invalid OC Number" in str(e):
+            if "Illegal OC Register Write" in str(e) or "Invalid OC Number" in str(e) or "OC Number already issued" in str(e):
                 raise e # Propagate crucial validation errors
             return False
         except Exception as e:
@@ -678,10 +707,8 @@ class DatabaseManager:
                 description = data.get('issue') or data.get('description')
                 amount = data.get('amount') or data.get('total_shortfall', 0)
                 
-                cursor.execute("""
-                    INSERT INTO case_issues (proceeding_id, issue_id, stage, data_json, category, description, amount)
-                    VALUES (?, ?, ?, ?, ?, ?, ?)
-                """, (proceeding_id, issue_id, stage, data_json, category, description, amount))
+                case_issues.insert(cursor, data, data_json, proceeding_id=proceeding_id, issue_id=issue_id, stage=stage,
+                                   category=category, description=description, amount=amount)
                 
                 # [TRACE Checkpoint B] Dump raw data_json of the DRC-01A record immediately after write
                 if stage == 'DRC-01A':
@@ -725,7 +752,7 @@ class DatabaseManager:
             
             for row in rows:
                 try:
-                    data = json.loads(row[1])
+                    data = json.loads(blob_store.get_text(cursor, row[1]))
                 except:
                     data = {}
                     
@@ -763,6 +790,7 @@ class DatabaseManager:
                 d = dict(row)
                 # Fix for 'None' string literal if present (legacy artifact)
                 if d.get('asmt10_snapshot') == 'None': d['asmt10_snapshot'] = None
+                d['asmt10_snapshot'] = self._resolve_blob(d.get('asmt10_snapshot'))
                 return d
             return None
         except Exception as e:
@@ -807,7 +835,18 @@ class DatabaseManager:
             
             set_clauses = []
             values = []
-            for col, val in updates.items():
+            for col, val in list(updates.items()):
+                if col == 'data_json':
+                    # Keep the demand columns in step with the new payload
+                    try:
+                        data = json.loads(val) if val else {}
+                    except (TypeError, ValueError):
+                        data = {}
+                    for demand_col, amount in case_issues.demand_values(data if isinstance(data, dict) else {}).items():
+                        if demand_col not in updates:
+                            set_clauses.append(f"{demand_col} = ?")
+                            values.append(amount)
+                    val = blob_store.put_text(cursor, val)
                 set_clauses.append(f"{col} = ?")
                 values.append(val)
             
@@ -871,7 +910,7 @@ class DatabaseManager:
             for row in source_issues:
                 # [Governance] Verify Frozen Artifact Presence & Normalize Schema
                 try:
-                    data = json.loads(row[1])
+                    data = json.loads(blob_store.get_text(cursor, row[1]))
                     
                     # Schema Normalization: Promote summary_table to grid_data if needed
                     # Scrutiny artifacts often store the baked table in 'summary_table'.
@@ -906,10 +945,8 @@ class DatabaseManager:
                     print(f"Normalization Error for {row[0]}: {e}")
                     continue
 
-                cursor.execute("""
-                    INSERT INTO case_issues (proceeding_id, issue_id, stage, data_json)
-                    VALUES (?, ?, 'SCN', ?)
-                """, (proceeding_id, row[0], final_json)) # Normalized Copy
+                # Normalized Copy
+                case_issues.insert(cursor, data, final_json, proceeding_id=proceeding_id, issue_id=row[0], stage='SCN')
                 count += 1
                 
             conn.commit()
@@ -1017,15 +1054,21 @@ class DatabaseManager:
         Returns a formatted string with 3 clauses per issue.
         """
         try:
-            issues = self.get_case_issues(proceeding_id)
-            if not issues:
+            # Tax heads come from the structured columns; no issue JSON is decoded
+            conn = self._get_conn()
+            conn.row_factory = sqlite3.Row
+            rows = conn.execute(f"""
+                SELECT {', '.join(case_issues.TAX_COLUMNS.values())}
+                FROM case_issues WHERE proceeding_id = ? AND stage = 'SCN' ORDER BY id
+            """, (proceeding_id,)).fetchall()
+            conn.close()
+            if not rows:
                 return "No issues found to generate demand text."
             
             text_blocks = []
-            for i, issue in enumerate(issues, 1):
-                data = issue.get('data', {})
+            for i, row in enumerate(rows, 1):
                 # Use helper
-                issue_block = self.generate_single_issue_demand_text(data, i)
+                issue_block = self.generate_single_issue_demand_text({'tax_breakdown': case_issues.tax_breakdown(row)}, i)
                 text_blocks.append(issue_block)
                 
             return "\n\n".join(text_blocks)
@@ -1044,112 +1087,45 @@ class DatabaseManager:
         self.db_file = self.db_path if self.db_path else DB_FILE
         
         if not DatabaseManager._initialized:
-            init_db(self.db_file)
-            
-            # [MIGRATION] Schema Update for Scrutiny Dashboard (Strategic Refactor)
-            # Ensure 'description' column exists in issues_master
+            # A current schema costs one PRAGMA user_version read here
             try:
-                conn = sqlite3.connect(self.db_file)
-                cursor = conn.cursor()
-                cursor.execute("PRAGMA table_info(issues_master)")
-                columns = [info[1] for info in cursor.fetchall()]
-                
-                if "description" not in columns:
-                    print("[MIGRATION] Adding 'description' column to issues_master...")
-                    cursor.execute("ALTER TABLE issues_master ADD COLUMN description TEXT NOT NULL DEFAULT ''")
-                    conn.commit()
-                    print("[MIGRATION] Success. 'description' column added.")
-                    
-                # --- OFFICER REGISTRY MIGRATION (V2) ---
-                # 1. Provide strict single-row schema_meta definition
-                cursor.execute('''
-                    CREATE TABLE IF NOT EXISTS schema_meta (
-                        id INTEGER PRIMARY KEY CHECK (id = 1),
-                        version INTEGER NOT NULL
-                    )
-                ''')
-
-                # 2. Check current version, initialize if empty
-                cursor.execute("SELECT version FROM schema_meta WHERE id = 1")
-                row = cursor.fetchone()
-
-                if not row:
-                    # Initialize fresh DB or pre-V2 legacy DB to V1
-                    cursor.execute("INSERT INTO schema_meta (id, version) VALUES (1, 1)")
-                    current_version = 1
-                else:
-                    current_version = row[0]
-
-                # 3. Apply V2 Migration (Officer Registry) safely
-                if current_version < 2:
-                    print("[MIGRATION] Running Database Schema V2 Update (Officer Registry)...")
-                    
-                    # Create officers table
-                    cursor.execute('''
-                        CREATE TABLE IF NOT EXISTS officers (
-                            id INTEGER PRIMARY KEY AUTOINCREMENT,
-                            name TEXT NOT NULL,
-                            designation TEXT NOT NULL,
-                            jurisdiction TEXT NOT NULL,
-                            office_address TEXT,
-                            is_active BOOLEAN DEFAULT 1,
-                            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                        )
-                    ''')
-                    
-                    # Create indexing
-                    cursor.execute("CREATE INDEX IF NOT EXISTS idx_officer_active ON officers(is_active)")
-                    
-                    # Safely add columns to proceedings
-                    cursor.execute("PRAGMA table_info(proceedings)")
-                    proc_cols = [info[1] for info in cursor.fetchall()]
-                    
-                    if "issuing_officer_id" not in proc_cols:
-                        print("[MIGRATION] Adding 'issuing_officer_id' to proceedings...")
-                        cursor.execute("ALTER TABLE proceedings ADD COLUMN issuing_officer_id INTEGER REFERENCES officers(id)")
-                        
-                    if "issuing_officer_snapshot" not in proc_cols:
-                        print("[MIGRATION] Adding 'issuing_officer_snapshot' to proceedings...")
-                        cursor.execute("ALTER TABLE proceedings ADD COLUMN issuing_officer_snapshot TEXT")
-                    
-                    cursor.execute("UPDATE schema_meta SET version = 2 WHERE id = 1")
-                    print("[MIGRATION] V2 Update Complete.")
-                
-                # Commit all schema changes
-                conn.commit()
-                conn.close()
+                applied = init_db(self.db_file)
             except Exception as e:
                 print(f"[CRITICAL] Schema Migration Failed: {e}")
                 # We enforce a hard crash if schema is invalid to prevent silent data corruption
                 raise RuntimeError(f"Database Schema Migration Failed: {e}")
 
-            # --- Diagnostic Logging ---
-            try:
-                conn_diag = sqlite3.connect(self.db_file)
-                cursor_diag = conn_diag.cursor()
-                cursor_diag.execute("SELECT COUNT(*) FROM issues_master")
-                count = cursor_diag.fetchone()[0]
-                
-                # Check for corrupted sop_point
-                cursor_diag.execute("SELECT issue_id FROM issues_master WHERE sop_point IS NULL")
-                corrupt_issues = cursor_diag.fetchall()
-                if corrupt_issues:
-                    print("\n[!] CRITICAL WARNING: Database Integrity Failure [!]")
-                    print(f"[!] Found {len(corrupt_issues)} issues with missing sop_point:")
-                    for issue in corrupt_issues:
-                        print(f"    - {issue[0]}")
-                    print("[!] These issues will cause FATAL INVARIANT FAILURES in the analysis pipeline.\n")
-                    
-                print(f"=== DATABASE DIAGNOSTICS ===")
-                print(f"DB Path: {os.path.abspath(self.db_file)}")
-                print(f"issues_master row count: {count}")
-                print(f"============================")
-                conn_diag.close()
-            except Exception as e:
-                print(f"Diagnostics failed: {e}")
-
+            if applied:
+                self._print_diagnostics()
+            self.import_case_files_csv()
             DatabaseManager._initialized = True
 
+    def _print_diagnostics(self):
+        """Post-migration integrity report (issues_master row count, missing sop_point)."""
+        try:
+            conn_diag = sqlite3.connect(self.db_file)
+            cursor_diag = conn_diag.cursor()
+            cursor_diag.execute("SELECT COUNT(*) FROM issues_master")
+            count = cursor_diag.fetchone()[0]
+            
+            # Check for corrupted sop_point
+            cursor_diag.execute("SELECT issue_id FROM issues_master WHERE sop_point IS NULL")
+            corrupt_issues = cursor_diag.fetchall()
+            if corrupt_issues:
+                print("\n[!] CRITICAL WARNING: Database Integrity Failure [!]")
+                print(f"[!] Found {len(corrupt_issues)} issues with missing sop_point:")
+                for issue in corrupt_issues:
+                    print(f"    - {issue[0]}")
+                print("[!] These issues will cause FATAL INVARIANT FAILURES in the analysis pipeline.\n")
+                
+            print(f"=== DATABASE DIAGNOSTICS ===")
+            print(f"DB Path: {os.path.abspath(self.db_file)}")
+            print(f"issues_master row count: {count}")
+            print(f"============================")
+            conn_diag.close()
+        except Exception as e:
+            print(f"Diagnostics failed: {e}")
+
     def _get_conn(self):
         """Returns a configured SQLite connection instance using the active db_file."""
         if not hasattr(self, 'db_file') or not self.db_file:
@@ -1282,7 +1258,7 @@ class DatabaseManager:
             cursor.execute("""
                 INSERT INTO proceeding_drafts (proceeding_id, snapshot_json, hash)
                 VALUES (?, ?, ?)
-            """, (proceeding_id, snapshot_json, snapshot_hash))
+            """, (proceeding_id, blob_store.put_text(cursor, snapshot_json), snapshot_hash))
             
             conn.commit()
             return True
@@ -1491,6 +1467,7 @@ class DatabaseManager:
     def _parse_proceeding_json_fields(self, d):
         """Helper to parse JSON fields in proceeding dict"""
         import json
+        d['asmt10_snapshot'] = self._resolve_blob(d.get('asmt10_snapshot'))
         for field in ['demand_details', 'selected_issues', 'taxpayer_details', 'additional_details', 'asmt10_snapshot']:
             val = d.get(field)
             if val and isinstance(val, str):
@@ -1712,7 +1689,7 @@ class DatabaseManager:
                     doc_id,
                     data.get('proceeding_id'),
                     data.get('doc_type'),
-                    data.get('content_html'),
+                    blob_store.put_text(cursor, data.get('content_html')),
                     data.get('template_id'),
                     data.get('template_version'),
                     data.get('version_no', 1),
@@ -1728,7 +1705,7 @@ class DatabaseManager:
                         snapshot_path = ?
                     WHERE id = ?
                 """, (
-                    data.get('content_html'),
+                    blob_store.put_text(cursor, data.get('content_html')),
                     data.get('is_final', 0),
                     data.get('snapshot_path'),
                     doc_id
@@ -1741,21 +1718,56 @@ class DatabaseManager:
             print(f"Error saving document: {e}")
             return None
 
-    def get_documents(self, proceeding_id):
-        """Get all documents for a proceeding"""
+    def get_documents(self, proceeding_id, with_content=False):
+        """
+        Get all documents for a proceeding.
+        content_html is left out unless with_content is set - listing documents
+        should not decompress every stored body; open one via get_document_content.
+        """
         try:
             conn = self._get_conn()
             conn.row_factory = sqlite3.Row
             cursor = conn.cursor()
             
-            cursor.execute("SELECT * FROM documents WHERE proceeding_id = ? ORDER BY created_at DESC", (proceeding_id,))
-            rows = cursor.fetchall()
+            columns = "*" if with_content else (
+                "id, proceeding_id, doc_type, template_id, template_version, version_no, "
+                "is_final, snapshot_path, created_at, updated_at"
+            )
+            cursor.execute(f"SELECT {columns} FROM documents WHERE proceeding_id = ? ORDER BY created_at DESC", (proceeding_id,))
+            rows = [dict(row) for row in cursor.fetchall()]
+            if with_content:
+                for row in rows:
+                    row['content_html'] = blob_store.get_text(cursor, row['content_html'])
             conn.close()
-            return [dict(row) for row in rows]
+            return rows
         except Exception as e:
             print(f"Error getting documents: {e}")
             return []
 
+    def get_document_content(self, doc_id):
+        """HTML body of a single document (decompressed from the blob store), None if missing"""
+        try:
+            conn = self._get_conn()
+            cursor = conn.cursor()
+            cursor.execute("SELECT content_html FROM documents WHERE id = ?", (doc_id,))
+            row = cursor.fetchone()
+            content = blob_store.get_text(cursor, row[0]) if row else None
+            conn.close()
+            return content
+        except Exception as e:
+            print(f"Error getting document content: {e}")
+            return None
+
+    def _resolve_blob(self, value):
+        """Text for a blob-store reference read outside a cursor; other values pass through"""
+        if not blob_store.is_ref(value):
+            return value
+        conn = self._get_conn()
+        try:
+            return blob_store.get_text(conn.cursor(), value)
+        finally:
+            conn.close()
+
     def log_event(self, proceeding_id, event_type, description, conn=None):
         """Log an event to the timeline"""
         import uuid
@@ -1807,6 +1819,58 @@ class DatabaseManager:
             print(f"Error getting all proceedings: {e}")
             return []
 
+    def get_document_case_ids(self, doc_type):
+        """
+        Cases that have a document of doc_type ('ASMT-10', 'DRC-01A' or 'SCN'):
+        finalised scrutiny cases for ASMT-10, otherwise cases with issues
+        drafted at that stage.
+        """
+        try:
+            conn = self._get_conn()
+            cursor = conn.cursor()
+            if doc_type == 'ASMT-10':
+                cursor.execute("SELECT id FROM proceedings WHERE asmt10_finalised_on IS NOT NULL ORDER BY id")
+            else:
+                cursor.execute("SELECT DISTINCT proceeding_id FROM case_issues WHERE stage = ? ORDER BY proceeding_id",
+                               (doc_type,))
+            ids = [row[0] for row in cursor.fetchall()]
+            conn.close()
+            return ids
+        except Exception as e:
+            print(f"Error listing {doc_type} cases: {e}")
+            return []
+
+    def get_case_statistics(self):
+        """
+        Case counts and demand totals for the dashboard and reports, read
+        from the trigger-maintained summary tables (see case_stats.summary).
+        """
+        try:
+            conn = self._get_conn()
+            try:
+                return case_stats.summary(conn.cursor())
+            finally:
+                conn.close()
+        except Exception as e:
+            print(f"Error reading case statistics: {e}")
+            return None
+
+    def get_issue_demand_totals(self, proceeding_id=None, stage=None):
+        """
+        Tax per head, interest, penalty and total over the included issues
+        of one proceeding (and stage), or of every case when proceeding_id
+        is None. One aggregate query; see case_issues.totals.
+        """
+        try:
+            conn = self._get_conn()
+            try:
+                return case_issues.totals(conn.cursor(), proceeding_id, stage)
+            finally:
+                conn.close()
+        except Exception as e:
+            print(f"Error totalling issue demand: {e}")
+            return None
+
     def get_all_templates(self):
         """Get all templates from the database"""
         try:
@@ -1821,6 +1885,20 @@ class DatabaseManager:
             print(f"Error fetching templates: {e}")
             return []
 
+    def get_template_content(self, template_type):
+        """Content of the first template matching a communication type (by type or name), None if none"""
+        try:
+            conn = self._get_conn()
+            cursor = conn.cursor()
+            cursor.execute("SELECT content FROM templates WHERE type = ? OR name LIKE ? LIMIT 1",
+                           (template_type, f"%{template_type}%"))
+            row = cursor.fetchone()
+            conn.close()
+            return row[0] if row else None
+        except Exception as e:
+            print(f"Error fetching template for {template_type}: {e}")
+            return None
+
     def get_template(self, template_id):
         """Get a specific template by ID"""
         try:
@@ -2277,20 +2355,14 @@ class DatabaseManager:
                  WHERE ci.proceeding_id = ? AND ci.stage = ?
              """, (proceeding_id, stage))
              rows = cursor.fetchall()
-             conn.close()
              
              results = []
-             import json
              for row in rows:
                  r = dict(row)
 
-                 # Parse data_json if it exists
-                 if 'data_json' in r and isinstance(r['data_json'], str):
-                     try:
-                         r['data'] = json.loads(r['data_json'])
-                     except:
-                         r['data'] = {}
-                 results.append(r)
+                 # data_json is fetched and parsed into 'data' only when a caller reads it
+                 results.append(case_issues.IssueRecord(r, r.get('data_json'), resolve=self._resolve_blob))
+             conn.close()
              return results
              
         except Exception as e:
@@ -2330,10 +2402,8 @@ class DatabaseManager:
                  
                  print(f"[DB DIAG] Inserting {issue_id} | PID: {pid_str} | SrcPID: {source_pid}")
 
-                 cursor.execute("""
-                     INSERT INTO case_issues (proceeding_id, issue_id, stage, data_json, origin, added_by, source_proceeding_id)
-                     VALUES (?, ?, ?, ?, ?, ?, ?)
-                 """, (pid_str, issue_id, 'SCN', data_json, origin, added_by, source_pid))
+                 case_issues.insert(cursor, data, data_json, proceeding_id=pid_str, issue_id=issue_id, stage='SCN',
+                                    origin=origin, added_by=added_by, source_proceeding_id=source_pid)
              
              conn.commit()
              # Verify immediately
@@ -2475,7 +2545,7 @@ class DatabaseManager:
             """, (
                 user_id, 
                 adj_id, 
-                snapshot_json, 
+                blob_store.put_text(cursor, snapshot_json), 
                 WorkflowStage.ASMT10_ISSUED.value, # Explicit Stage Set
                 pid
             ))
@@ -2486,6 +2556,8 @@ class DatabaseManager:
             # 3. OC Register
             # Use shared logic with STRICT issuance
             valid_oc_num = self._insert_oc_entry(cursor, asmt_data.get('case_id'), oc_data, is_issuance=True)
+            # The number may have been allocated just now
+            cursor.execute("UPDATE proceedings SET oc_number = ? WHERE id = ?", (valid_oc_num, pid))
             
             # 4. ASMT-10 Register
             cursor.execute("""
@@ -2546,7 +2618,7 @@ class DatabaseManager:
                 conn.close()
                 return False, "Snapshot already exists. ASMT-10 is immutable."
 
-            cursor.execute("UPDATE proceedings SET asmt10_snapshot = ? WHERE id = ?", (json.dumps(snapshot_data), pid))
+            cursor.execute("UPDATE proceedings SET asmt10_snapshot = ? WHERE id = ?", (blob_store.put_text(cursor, json.dumps(snapshot_data)), pid))
             conn.commit()
             conn.close()
             return True, "Saved"
@@ -2605,6 +2677,7 @@ class DatabaseManager:
             
             # 1. Clear Registers
             cursor.execute("DELETE FROM oc_register")
+            cursor.execute("DELETE FROM oc_sequences")
             cursor.execute("DELETE FROM asmt10_register")
             
             # 2. Clear Adjudication Cases
@@ -2775,37 +2848,213 @@ class DatabaseManager:
             print(f"Error getting Act chapters: {e}")
             return []
     
-    def search_handbook(self, query, act_id=None):
-        """Search across all acts and sections"""
+    def get_handbook_outline(self):
+        """
+        Acts with their chapters in one query (no per-act / per-chapter round trips).
+        Returns [{act_id, title, chapters: [{chapter_id, chapter_name, section_count}], loose_sections}]
+        """
         try:
             conn = self._get_conn()
             conn.row_factory = sqlite3.Row
             cursor = conn.cursor()
-            
-            search_pattern = f"%{query}%"
-            
-            if act_id:
+            cursor.execute("""
+                SELECT a.act_id, a.title, s.chapter_id, MAX(s.chapter_name) AS chapter_name,
+                       COUNT(s.id) AS section_count, MIN(s.id) AS first_id
+                FROM gst_acts a
+                LEFT JOIN gst_sections s ON s.act_id = a.act_id
+                GROUP BY a.act_id, s.chapter_id
+                ORDER BY a.title, first_id
+            """)
+            rows = cursor.fetchall()
+            conn.close()
+
+            outline = []
+            by_act = {}
+            for row in rows:
+                act = by_act.get(row['act_id'])
+                if act is None:
+                    act = {'act_id': row['act_id'], 'title': row['title'], 'chapters': [], 'loose_sections': 0}
+                    by_act[row['act_id']] = act
+                    outline.append(act)
+                if row['chapter_id']:
+                    act['chapters'].append({
+                        'chapter_id': row['chapter_id'],
+                        'chapter_name': row['chapter_name'],
+                        'section_count': row['section_count']
+                    })
+                else:
+                    act['loose_sections'] += row['section_count']
+            return outline
+        except Exception as e:
+            print(f"Error getting handbook outline: {e}")
+            return []
+
+    def get_section_headers(self, act_id, chapter_id=None):
+        """Section number/title only (content is fetched when a section is opened)."""
+        try:
+            conn = self._get_conn()
+            conn.row_factory = sqlite3.Row
+            cursor = conn.cursor()
+            if chapter_id:
                 cursor.execute("""
-                    SELECT s.*, a.title as act_title 
-                    FROM gst_sections s
-                    JOIN gst_acts a ON s.act_id = a.act_id
-                    WHERE s.act_id = ? AND (s.title LIKE ? OR s.content LIKE ?)
-                    ORDER BY s.id
-                    LIMIT 50
-                """, (act_id, search_pattern, search_pattern))
+                    SELECT id, act_id, section_number, title, chapter_id, chapter_name
+                    FROM gst_sections WHERE act_id = ? AND chapter_id = ? ORDER BY id
+                """, (act_id, chapter_id))
             else:
                 cursor.execute("""
-                    SELECT s.*, a.title as act_title 
-                    FROM gst_sections s
-                    JOIN gst_acts a ON s.act_id = a.act_id
-                    WHERE s.title LIKE ? OR s.content LIKE ?
-                    ORDER BY s.id
-                    LIMIT 50
-                """, (search_pattern, search_pattern))
-            
+                    SELECT id, act_id, section_number, title, chapter_id, chapter_name
+                    FROM gst_sections WHERE act_id = ? AND chapter_id IS NULL ORDER BY id
+                """, (act_id,))
             rows = cursor.fetchall()
             conn.close()
             return [dict(row) for row in rows]
+        except Exception as e:
+            print(f"Error getting section headers: {e}")
+            return []
+
+    def get_section(self, section_id):
+        """Single section with full content."""
+        try:
+            conn = self._get_conn()
+            conn.row_factory = sqlite3.Row
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT s.*, a.title AS act_title
+                FROM gst_sections s
+                JOIN gst_acts a ON s.act_id = a.act_id
+                WHERE s.id = ?
+            """, (section_id,))
+            row = cursor.fetchone()
+            conn.close()
+            return dict(row) if row else None
+        except Exception as e:
+            print(f"Error getting section: {e}")
+            return None
+
+    def rebuild_handbook_index(self, conn=None):
+        """
+        Repopulates the FTS5 handbook index from gst_sections, splitting
+        amendment footnotes into their own column.
+        """
+        from src.utils.legal_text import split_footnotes, format_chapter_label
+
+        own_conn = conn is None
+        if own_conn:
+            conn = self._get_conn()
+        try:
+            cursor = conn.cursor()
+            cursor.execute("DELETE FROM gst_handbook_fts")
+
+            def _rows():
+                src = conn.cursor()
+                src.execute("SELECT id, act_id, section_number, title, content, chapter_id, chapter_name FROM gst_sections")
+                for sid, act_id, sec_no, title, content, chapter_id, chapter_name in src:
+                    body, footnotes = split_footnotes(content or "")
+                    chapter = format_chapter_label(chapter_id, chapter_name) if chapter_id else ""
+                    yield (sid, sec_no or "", title or "", chapter, body, footnotes, act_id)
+
+            cursor.executemany("""
+                INSERT INTO gst_handbook_fts (rowid, section_number, title, chapter, body, footnotes, act_id)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            """, _rows())
+            cursor.execute("INSERT INTO gst_handbook_fts (gst_handbook_fts) VALUES ('optimize')")
+            cursor.execute("UPDATE gst_handbook_fts_state SET dirty = 0 WHERE id = 1")
+            conn.commit()
+            return True
+        except Exception as e:
+            print(f"Error rebuilding handbook index: {e}")
+            conn.rollback()
+            return False
+        finally:
+            if own_conn:
+                conn.close()
+
+    def _ensure_handbook_index(self, conn):
+        """Rebuilds the FTS index if gst_sections changed since the last build."""
+        row = conn.execute("SELECT dirty FROM gst_handbook_fts_state WHERE id = 1").fetchone()
+        if row is None or row[0]:
+            return self.rebuild_handbook_index(conn)
+        return True
+
+    @staticmethod
+    def _build_fts_query(query):
+        """
+        Turns free text into a safe FTS5 expression: every word is quoted
+        (so '16(4)' or 'AND' cannot break the syntax) and the last word is a
+        prefix match for search-as-you-type.
+        """
+        import re
+        terms = re.findall(r"\w+", query or "")
+        if not terms:
+            return None
+        parts = [f'"{t}"' for t in terms[:-1]]
+        parts.append(f'"{terms[-1]}"*')
+        return " ".join(parts)
+
+    def search_handbook(self, query, act_id=None, limit=50):
+        """
+        Ranked search across all acts and sections.
+        Uses the FTS5 index (bm25, section number and title weighted highest) and
+        returns a highlighted HTML snippet per hit instead of the full content.
+        Falls back to a LIKE scan if FTS5 is unavailable.
+        """
+        import html
+        fts_query = self._build_fts_query(query)
+        if not fts_query:
+            return []
+
+        try:
+            conn = self._get_conn()
+            conn.row_factory = sqlite3.Row
+            cursor = conn.cursor()
+
+            try:
+                self._ensure_handbook_index(conn)
+                sql = """
+                    SELECT s.id, s.act_id, s.section_number, s.title, s.chapter_id, s.chapter_name,
+                           a.title AS act_title,
+                           snippet(gst_handbook_fts, -1, char(2), char(3), '…', 24) AS snippet,
+                           bm25(gst_handbook_fts, 10.0, 5.0, 2.0, 1.0, 0.5) AS rank
+                    FROM gst_handbook_fts f
+                    JOIN gst_sections s ON s.id = f.rowid
+                    JOIN gst_acts a ON s.act_id = a.act_id
+                    WHERE gst_handbook_fts MATCH ?
+                """
+                params = [fts_query]
+                if act_id:
+                    sql += " AND f.act_id = ?"
+                    params.append(act_id)
+                sql += " ORDER BY rank LIMIT ?"
+                params.append(limit)
+                cursor.execute(sql, params)
+                rows = [dict(row) for row in cursor.fetchall()]
+                for row in rows:
+                    # Escape the section text, then turn the FTS markers into highlights
+                    snip = html.escape(row.get('snippet') or "")
+                    row['snippet'] = snip.replace("\x02", "<b style='background:#fff59d;'>").replace("\x03", "</b>")
+            except sqlite3.OperationalError as e:
+                print(f"Handbook FTS unavailable ({e}), falling back to LIKE search")
+                search_pattern = f"%{query}%"
+                sql = """
+                    SELECT s.id, s.act_id, s.section_number, s.title, s.chapter_id, s.chapter_name,
+                           a.title AS act_title, substr(s.content, 1, 200) AS snippet
+                    FROM gst_sections s
+                    JOIN gst_acts a ON s.act_id = a.act_id
+                    WHERE (s.title LIKE ? OR s.content LIKE ?)
+                """
+                params = [search_pattern, search_pattern]
+                if act_id:
+                    sql += " AND s.act_id = ?"
+                    params.append(act_id)
+                sql += " ORDER BY s.id LIMIT ?"
+                params.append(limit)
+                cursor.execute(sql, params)
+                rows = [dict(row) for row in cursor.fetchall()]
+                for row in rows:
+                    row['snippet'] = html.escape(row.get('snippet') or "")
+
+            conn.close()
+            return rows
         except Exception as e:
             print(f"Error searching handbook: {e}")
             return []
@@ -2841,6 +3090,30 @@ class DatabaseManager:
             print(f"Error fetching CGST sections: {e}")
             return []
 
+    def get_cgst_section_catalogue(self):
+        """
+        The CGST Act sections as a SectionCatalogue (subsections split and
+        words indexed). Built once per process and reused until gst_sections
+        is written to again.
+        """
+        from src.utils import section_catalogue
+
+        try:
+            conn = self._get_conn()
+            try:
+                row = conn.execute("SELECT revision FROM gst_sections_state WHERE id = 1").fetchone()
+            finally:
+                conn.close()
+            revision = row[0] if row else None
+        except Exception as e:
+            print(f"Error reading section revision: {e}")
+            revision = None
+        if revision is None:
+            # No revision counter to trust: index this load only
+            return section_catalogue.SectionCatalogue(self.get_cgst_sections())
+        key = (os.path.abspath(self.db_file), revision)
+        return section_catalogue.get_catalogue(key, self.get_cgst_sections)
+
     def get_scrutiny_cases(self):
         """Get all ASMT-10 cases from proceedings table"""
         try:
@@ -2863,6 +3136,57 @@ class DatabaseManager:
             print(f"Error getting scrutiny cases: {e}")
             return []
 
+    def get_analysis_results(self, proceeding_id):
+        """Stored SOP step results for a case: {step: {'fingerprint', 'issues', 'analyzed'}}."""
+        try:
+            conn = self._get_conn()
+            cursor = conn.cursor()
+            cursor.execute("SELECT step, fingerprint, result_json FROM analysis_results WHERE proceeding_id = ?",
+                           (proceeding_id,))
+            rows = cursor.fetchall()
+            conn.close()
+
+            results = {}
+            for step, fingerprint, result_json in rows:
+                try:
+                    entry = json.loads(result_json)
+                except (TypeError, ValueError):
+                    continue
+                entry['fingerprint'] = fingerprint
+                results[step] = entry
+            return results
+        except Exception as e:
+            print(f"Error getting analysis results: {e}")
+            return {}
+
+    def save_analysis_results(self, proceeding_id, results):
+        """
+        Replaces the stored step results of a case with those of the latest run.
+        Steps missing from results (e.g. not cacheable this run) are dropped so
+        they are recomputed next time.
+        """
+        try:
+            conn = self._get_conn()
+            cursor = conn.cursor()
+            cursor.execute("DELETE FROM analysis_results WHERE proceeding_id = ?", (proceeding_id,))
+            cursor.executemany("""
+                INSERT INTO analysis_results (proceeding_id, step, fingerprint, result_json)
+                VALUES (?, ?, ?, ?)
+            """, [
+                (proceeding_id, step, entry['fingerprint'],
+                 json.dumps({'issues': entry.get('issues', []), 'analyzed': entry.get('analyzed', 0)}, default=str))
+                for step, entry in results.items()
+            ])
+            conn.commit()
+            conn.close()
+            return True
+        except Exception as e:
+            print(f"Error saving analysis results: {e}")
+            if 'conn' in locals():
+                conn.rollback()
+                conn.close()
+            return False
+
     # ---------------- Officer Registry Methods ----------------
 
     def get_active_officers(self):
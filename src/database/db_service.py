@@ -0,0 +1,394 @@
+"""
+Optional service mode for offices sharing one database between desktops.
+
+One machine runs the server, which owns adjudication.db and the CSV data
+files and exposes the DatabaseManager API over an authenticated socket:
+
+    python -m src.database.db_service --host 0.0.0.0 --port 47321 --key <shared key>
+
+Every other desktop points at it, either through the environment
+(GST_DB_SERVICE=host:port, GST_DB_SERVICE_KEY=<key>) or through
+"db_service" / "db_service_key" in config/settings.json. DatabaseManager()
+then returns a DatabaseClient, which forwards each public method call to the
+server.
+
+On the server, reads run in parallel on a pool of SQLite connections, while
+writes are serialised behind a single writer lock. Only the methods listed
+in READ_ONLY_METHODS count as reads; everything else - including getters
+that refresh a CSV mirror or the handbook index first - takes the writer
+lock. Methods that return a generator (iter_register_rows) are streamed to
+the client in chunks of STREAM_CHUNK items over a connection of their own.
+Transactions that must not
+interleave, such as OC number allocation and ASMT-10 / DRC-01A
+finalisation, therefore run entirely server-side. DatabaseClient.batch()
+sends several writes in one round trip, and the server applies them under
+a single hold of the writer lock.
+
+The transport is multiprocessing.connection. Its HMAC handshake with the
+shared key rejects unauthenticated peers before any payload is unpickled.
+"""
+import argparse
+import inspect
+import os
+import queue
+import sqlite3
+import sys
+import threading
+from contextlib import contextmanager
+from itertools import islice
+from multiprocessing import AuthenticationError
+from multiprocessing.connection import Client, Listener
+
+DEFAULT_PORT = 47321
+STREAM_CHUNK = 500
+
+# DatabaseManager methods that never write, so they may run concurrently.
+# Anything not listed runs under the writer lock. Not listed on purpose:
+# count_register_rows / fetch_register_page / iter_register_rows and the
+# get_*_register_cases built on them (they sync CSV mirrors), and
+# search_handbook (it may rebuild the FTS index).
+READ_ONLY_METHODS = frozenset({
+    "find_active_case", "get_active_issues", "get_active_officers", "get_act_chapters",
+    "get_act_sections", "get_all_case_files", "get_all_cases", "get_all_gstins",
+    "get_all_issues_metadata", "get_all_officers", "get_all_proceedings", "get_all_taxpayers",
+    "get_all_templates", "get_analysis_results", "get_asmt10_register_entries",
+    "get_case_file", "get_case_issues", "get_case_statistics", "get_cases_by_gstin",
+    "get_cgst_section_catalogue", "get_cgst_sections", "get_dashboard_catalog",
+    "get_document_case_ids", "get_document_content", "get_documents", "get_gst_acts",
+    "get_handbook_outline", "get_issue", "get_issue_by_name", "get_issue_demand_totals",
+    "get_issue_templates", "get_next_oc_number", "get_oc_entry_for_case",
+    "get_oc_register_entries", "get_officer_by_id", "get_pending_cases", "get_proceeding",
+    "get_scrutiny_case_data", "get_scrutiny_cases", "get_section", "get_section_headers",
+    "get_taxpayer", "get_template", "get_template_content", "get_timeline",
+    "get_valid_adjudication_cases", "search_taxpayers",
+})
+
+
+def is_read(method_name):
+    return method_name in READ_ONLY_METHODS
+
+
+def is_stream(method_name):
+    """True for DatabaseManager methods that return a generator."""
+    from src.database.db_manager import DatabaseManager
+    return inspect.isgeneratorfunction(getattr(DatabaseManager, method_name, None))
+
+
+def configured_service():
+    """(address, authkey) of the configured database service, or None for local mode."""
+    address = os.environ.get("GST_DB_SERVICE")
+    key = os.environ.get("GST_DB_SERVICE_KEY")
+    if address is None:
+        try:
+            from src.utils.config_manager import ConfigManager
+            settings = ConfigManager().settings
+        except Exception:
+            return None
+        address = settings.get("db_service")
+        key = key or settings.get("db_service_key")
+    if not address:
+        return None
+    host, _, port = str(address).rpartition(":")
+    return (host or "127.0.0.1", int(port or DEFAULT_PORT)), (key or "").encode("utf-8")
+
+
+# ---- Server ----
+
+class PooledConnection(sqlite3.Connection):
+    """Connection whose close() hands it back to its pool."""
+    pool = None
+
+    def close(self):
+        if self.pool is None:
+            super().close()
+        else:
+            self.pool.release(self)
+
+    def discard(self):
+        super().close()
+
+
+class ConnectionPool:
+    """Keeps up to size idle connections to db_file; more are opened on demand."""
+
+    def __init__(self, db_file, size=4):
+        self.db_file = db_file
+        self.size = size
+        self._idle = queue.LifoQueue()
+
+    def acquire(self):
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            conn = sqlite3.connect(self.db_file, timeout=30, factory=PooledConnection, check_same_thread=False)
+            conn.execute("PRAGMA foreign_keys = ON;")
+            conn.pool = self
+            return conn
+
+    def release(self, conn):
+        # Whatever the caller left behind must not leak into the next borrower
+        if conn.in_transaction:
+            conn.rollback()
+        conn.row_factory = None
+        if self._idle.qsize() < self.size:
+            self._idle.put(conn)
+        else:
+            conn.discard()
+
+    def close_all(self):
+        while True:
+            try:
+                self._idle.get_nowait().discard()
+            except queue.Empty:
+                return
+
+
+def _pooled_manager(db_file, pool):
+    from src.database.db_manager import DatabaseManager
+
+    class PooledDatabaseManager(DatabaseManager):
+        def _get_conn(self):
+            return pool.acquire()
+
+    return PooledDatabaseManager(db_file)
+
+
+class _Stream:
+    """A generator result on its way to a client, one ('chunk', items) message at a time."""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.first = list(islice(rows, STREAM_CHUNK))
+
+    def send_to(self, conn):
+        """Sends the chunks and a closing ('ok', None); ('error', e) if the generator fails."""
+        chunk = self.first
+        try:
+            while chunk:
+                conn.send(("chunk", chunk))
+                chunk = list(islice(self.rows, STREAM_CHUNK))
+        except (EOFError, OSError):
+            raise
+        except Exception as e:
+            conn.send(("error", e))
+            return
+        finally:
+            close = getattr(self.rows, "close", None)
+            if close:
+                close()  # Releases the generator's pooled connection
+        conn.send(("ok", None))
+
+
+class DatabaseService:
+    """
+    Serves one DatabaseManager to DatabaseClients. address=(host, 0) picks a
+    free port; the bound address is in self.address once constructed.
+    """
+
+    def __init__(self, db_file=None, address=("127.0.0.1", DEFAULT_PORT), authkey=b"", pool_size=4):
+        if not authkey:
+            raise ValueError("A shared key is required to run the database service.")
+        from src.database.schema import DB_FILE
+        self.pool = ConnectionPool(db_file or DB_FILE, pool_size)
+        self.manager = _pooled_manager(self.pool.db_file, self.pool)
+        self._write_lock = threading.Lock()
+        self._listener = Listener(address, authkey=authkey)
+        self.address = self._listener.address
+        self._closed = threading.Event()
+
+    def serve_forever(self):
+        while not self._closed.is_set():
+            try:
+                conn = self._listener.accept()
+            except (OSError, EOFError, AuthenticationError):
+                if self._closed.is_set():
+                    break
+                continue  # Failed handshake (wrong key) - keep serving
+            threading.Thread(target=self._handle, args=(conn,), daemon=True).start()
+
+    def start(self):
+        """Serves on a background thread; returns the thread."""
+        thread = threading.Thread(target=self.serve_forever, name="db-service", daemon=True)
+        thread.start()
+        return thread
+
+    def close(self):
+        self._closed.set()
+        self._listener.close()
+        self.pool.close_all()
+
+    def _call(self, name, args, kwargs, stream=False):
+        if name.startswith("_") or not callable(getattr(self.manager, name, None)):
+            raise AttributeError(f"DatabaseManager has no method '{name}'")
+        result = getattr(self.manager, name)(*args, **kwargs)
+        if hasattr(result, "__next__"):
+            # Generators cannot cross the socket. A streamed call keeps it and
+            # reads the first chunk now, under the caller's lock, since that is
+            # where the generator does any syncing before it starts reading.
+            return _Stream(result) if stream else list(result)
+        return result
+
+    def _dispatch(self, request):
+        op = request[0]
+        if op in ("call", "stream"):
+            _, name, args, kwargs = request
+            stream = op == "stream"
+            if is_read(name):
+                return self._call(name, args, kwargs, stream)
+            with self._write_lock:
+                return self._call(name, args, kwargs, stream)
+        if op == "batch":
+            with self._write_lock:
+                return [self._call(name, args, kwargs) for name, args, kwargs in request[1]]
+        raise ValueError(f"Unknown request: {op}")
+
+
+    def _handle(self, conn):
+        try:
+            while True:
+                try:
+                    request = conn.recv()
+                except (EOFError, OSError):
+                    return
+                try:
+                    result = self._dispatch(request)
+                except Exception as e:
+                    response = ("error", e)
+                else:
+                    if isinstance(result, _Stream):
+                        try:
+                            result.send_to(conn)
+                        except (EOFError, OSError):
+                            return  # The client stopped reading
+                        continue
+                    response = ("ok", result)
+                try:
+                    conn.send(response)
+                except Exception as e:
+                    # Result or exception that cannot be pickled
+                    conn.send(("error", RuntimeError(f"Unserialisable response: {e}")))
+        finally:
+            conn.close()
+
+
+# ---- Client ----
+
+class DatabaseClient:
+    """
+    Stand-in for DatabaseManager in service mode: every public DatabaseManager
+    method is forwarded to the server. Calls are safe to share between
+    threads (batch() is not); a dropped connection is reopened once.
+    """
+
+    def __init__(self, address, authkey):
+        self.address = address
+        self._authkey = authkey
+        self._conn = None
+        self._lock = threading.Lock()
+        self._batch = None
+
+    def _request(self, request):
+        with self._lock:
+            for attempt in (1, 2):
+                sent = False
+                try:
+                    if self._conn is None:
+                        self._conn = Client(self.address, authkey=self._authkey)
+                    self._conn.send(request)
+                    sent = True
+                    status, payload = self._conn.recv()
+                    break
+                except (EOFError, ConnectionError, OSError):
+                    self._conn = None
+                    # Only a request that never reached the server is safe to resend
+                    if sent or attempt == 2:
+                        raise
+        if status == "error":
+            raise payload
+        return payload
+
+    def __getattr__(self, name):
+        from src.database.db_manager import DatabaseManager
+        if name.startswith("_") or not callable(getattr(DatabaseManager, name, None)):
+            raise AttributeError(name)
+
+        if is_stream(name):
+            def remote(*args, **kwargs):
+                return self._stream(("stream", name, args, kwargs))
+            remote.__name__ = name
+            return remote
+
+        def remote(*args, **kwargs):
+            if self._batch is not None and not is_read(name):
+                self._batch.append((name, args, kwargs))
+                return None
+            return self._request(("call", name, args, kwargs))
+        remote.__name__ = name
+        return remote
+
+    def _stream(self, request):
+        """
+        Yields the items of a streamed call as its chunks arrive. Each stream
+        has a connection of its own, so other calls are not held up while it
+        is consumed; abandoning it closes that connection.
+        """
+        conn = Client(self.address, authkey=self._authkey)
+        try:
+            conn.send(request)
+            while True:
+                status, payload = conn.recv()
+                if status == "error":
+                    raise payload
+                if status == "ok":
+                    return
+                yield from payload
+        finally:
+            conn.close()
+
+    @contextmanager
+    def batch(self):
+        """
+        Queues write calls made inside the block and sends them together on
+        exit. Their return values are in the yielded list afterwards.
+        """
+        self._batch, results = [], []
+        try:
+            yield results
+            calls, self._batch = self._batch, None
+            if calls:
+                results.extend(self._request(("batch", calls)))
+        finally:
+            self._batch = None
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Shared database service for multi-officer offices")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--db", help="Database file (default: data/adjudication.db)")
+    parser.add_argument("--key", default=os.environ.get("GST_DB_SERVICE_KEY"), help="Shared key clients must present")
+    parser.add_argument("--pool-size", type=int, default=4)
+    args = parser.parse_args(argv)
+    if not args.key:
+        print("A shared key is required (--key or GST_DB_SERVICE_KEY).")
+        return 1
+
+    service = DatabaseService(args.db, (args.host, args.port), args.key.encode("utf-8"), args.pool_size)
+    print(f"Database service listening on {service.address[0]}:{service.address[1]}")
+    try:
+        service.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        service.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
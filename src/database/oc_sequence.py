@@ -0,0 +1,90 @@
+"""
+Per-year OC number sequence.
+
+oc_sequences holds the highest sequence issued for each year suffix (the
+part after '/' in 'SEQUENCE/YEAR'), so the next number is a primary-key
+lookup instead of a scan of the register. A year is seeded from the existing
+oc_register rows the first time it is used.
+
+allocate() reserves numbers inside the caller's transaction: its first
+statement is a write, so SQLite serialises concurrent issuers on the
+database write lock and two transactions can never be handed the same
+number. Numbers typed in by the officer are recorded with record() so the
+sequence never falls behind the register.
+"""
+import datetime
+
+_SEED_SQL = """
+    INSERT OR IGNORE INTO oc_sequences (year, last_seq)
+    SELECT ?, COALESCE(MAX(CAST(substr(oc_number, 1, instr(oc_number, '/') - 1) AS INTEGER)), 0)
+    FROM oc_register WHERE oc_number LIKE ?
+"""
+
+
+def _ensure_table(cursor):
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS oc_sequences (
+            year TEXT PRIMARY KEY,
+            last_seq INTEGER NOT NULL DEFAULT 0
+        )
+    """)
+
+
+def current_year():
+    return str(datetime.date.today().year)
+
+
+def split(oc_number):
+    """'12/2025' -> (12, '2025'); None if the number is not in SEQUENCE/YEAR form."""
+    parts = str(oc_number or "").strip().split("/")
+    if len(parts) < 2:
+        return None
+    try:
+        return int(parts[0]), parts[-1].strip()
+    except ValueError:
+        return None
+
+
+def _seed(cursor, year):
+    cursor.execute(_SEED_SQL, (year, f"%/{year}"))
+
+
+def peek(cursor, year):
+    """Next sequence number for year, without reserving it."""
+    _ensure_table(cursor)
+    cursor.execute("SELECT last_seq FROM oc_sequences WHERE year = ?", (year,))
+    row = cursor.fetchone()
+    if row is None:
+        # Not seeded yet: same answer the seed would give
+        cursor.execute(
+            "SELECT COALESCE(MAX(CAST(substr(oc_number, 1, instr(oc_number, '/') - 1) AS INTEGER)), 0) "
+            "FROM oc_register WHERE oc_number LIKE ?", (f"%/{year}",))
+        row = cursor.fetchone()
+    return row[0] + 1
+
+
+def allocate(cursor, year, n=1):
+    """
+    Reserves n consecutive numbers for year in the cursor's transaction and
+    returns them formatted ('13/2025', '14/2025', ...). The reservation is
+    released only if the transaction rolls back.
+    """
+    if n < 1:
+        return []
+    _ensure_table(cursor)
+    _seed(cursor, year)
+    cursor.execute("UPDATE oc_sequences SET last_seq = last_seq + ? WHERE year = ?", (n, year))
+    cursor.execute("SELECT last_seq FROM oc_sequences WHERE year = ?", (year,))
+    last = cursor.fetchone()[0]
+    return [f"{seq}/{year}" for seq in range(last - n + 1, last + 1)]
+
+
+def record(cursor, oc_number):
+    """Advances the sequence past a manually entered number (no-op for other formats)."""
+    parsed = split(oc_number)
+    if parsed is None:
+        return
+    seq, year = parsed
+    _ensure_table(cursor)
+    _seed(cursor, year)
+    cursor.execute("UPDATE oc_sequences SET last_seq = MAX(last_seq, ?) WHERE year = ?", (seq, year))
@@ -0,0 +1,257 @@
+"""
+Paged register queries.
+
+Each register shown in a list view (taxpayers, case registers, reports) is
+described once here: the table it reads, the UI keys it exposes (same keys
+the old dict-returning getters used), which columns are searchable, which
+named filters it accepts and its default order. DatabaseManager turns a
+spec into COUNT / LIMIT-OFFSET queries so views only ever hold the rows
+that have been scrolled into view, and full exports into keyset-paged
+queries (sort_terms / keyset_clause).
+
+Registers that still live in CSV files are read through indexed SQLite
+mirrors which are re-synced whenever the CSV's mtime or size changes.
+"""
+import csv
+import os
+
+from src.utils.constants import TAXPAYERS_FILE, CASES_FILE
+
+
+class CsvMirror:
+    """A CSV file copied into a SQLite table (header name -> column name)."""
+
+    def __init__(self, source, csv_path, table, columns, replace=False):
+        self.source = source
+        self.csv_path = csv_path
+        self.table = table
+        self.columns = columns
+        # INSERT OR REPLACE for mirrors keyed on a natural key (GSTIN)
+        self.replace = replace
+
+    def rows(self):
+        with open(self.csv_path, newline='', encoding='utf-8-sig', errors='replace') as f:
+            reader = csv.reader(f)
+            header = next(reader, None)
+            if not header:
+                return
+            header = [h.strip() for h in header]
+            positions = [header.index(h) if h in header else None for h in self.columns]
+            for record in reader:
+                if not record:
+                    continue
+                yield tuple(
+                    (record[p].strip() if p is not None and p < len(record) else "")
+                    for p in positions
+                )
+
+
+CSV_MIRRORS = {
+    'taxpayers': CsvMirror('taxpayers', TAXPAYERS_FILE, 'taxpayers', {
+        "GSTIN": "gstin", "Legal Name": "legal_name", "Trade Name": "trade_name",
+        "Address": "address", "State": "state", "Email": "email", "Mobile": "mobile",
+        "Status": "status", "Constitution": "constitution",
+    }, replace=True),
+    'cases': CsvMirror('cases', CASES_FILE, 'legacy_cases', {
+        "CaseID": "case_id", "GSTIN": "gstin", "Legal Name": "legal_name",
+        "Proceeding Type": "proceeding_type", "Form Type": "form_type", "Date": "case_date",
+        "Status": "status", "FilePath": "file_path",
+    }),
+}
+
+
+class RegisterQuery:
+    """
+    columns: {ui_key: sql_expr}
+    search:  sql exprs matched with LIKE '%text%'
+    filters: {name: (sql_fragment_with_one_placeholder, value_format)}
+    sort:    {ui_key: sql_expr} overrides for ordering (e.g. numeric casts)
+    """
+
+    def __init__(self, table, columns, where=None, search=(), filters=None,
+                 order="rowid", sort=None, mirror=None):
+        self.table = table
+        self.columns = columns
+        self.where = where
+        self.search = search
+        self.filters = filters or {}
+        self.order = order
+        self.sort = sort or {}
+        self.mirror = mirror
+
+    def select_list(self):
+        return ", ".join(f'{expr} AS "{key}"' for key, expr in self.columns.items())
+
+    def where_clause(self, search=None, filters=None):
+        clauses = []
+        params = []
+        if self.where:
+            clauses.append(f"({self.where})")
+        if search and self.search:
+            clauses.append("(" + " OR ".join(f"{col} LIKE ?" for col in self.search) + ")")
+            params.extend([f"%{search}%"] * len(self.search))
+        for name, value in (filters or {}).items():
+            if value in (None, "") or name not in self.filters:
+                continue
+            fragment, fmt = self.filters[name]
+            clauses.append(fragment)
+            params.append(fmt.format(value) if fmt else value)
+        return (" WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+    def order_clause(self, order_by=None, descending=False):
+        # Only whitelisted keys reach the SQL
+        if order_by in self.columns:
+            expr = self.sort.get(order_by, f'"{order_by}"')
+            return f" ORDER BY {expr} {'DESC' if descending else 'ASC'}, rowid"
+        return f" ORDER BY {self.order}"
+
+    def sort_terms(self, order_by=None, descending=False):
+        """
+        The order of order_clause as [(sql_expr, descending)] over table
+        columns, always ending in rowid so that it is a total order.
+        """
+        if order_by in self.columns:
+            terms = [(self.sort.get(order_by, self.columns[order_by]), descending)]
+        else:
+            terms = []
+            for term in self.order.split(","):
+                expr, _, direction = term.strip().rpartition(" ")
+                if direction.upper() in ("ASC", "DESC"):
+                    terms.append((expr.strip(), direction.upper() == "DESC"))
+                else:
+                    terms.append((term.strip(), False))
+        if terms[-1][0].lower() != "rowid":
+            terms.append(("rowid", False))
+        return terms
+
+
+def keyset_clause(keys, last):
+    """
+    SQL condition (and params) for rows strictly after `last` - the values
+    of keys [(column, descending)] in the previous row - in that order.
+    SQLite puts NULLs first ascending and last descending.
+    """
+    alternatives, params = [], []
+    for i, (column, desc) in enumerate(keys):
+        equal = [f"{c} IS ?" for c, _ in keys[:i]]
+        value = last[i]
+        if value is None:
+            if desc:
+                continue  # Nothing sorts after NULL descending
+            after = f"{column} IS NOT NULL"
+            after_params = []
+        else:
+            after = f"({column} < ? OR {column} IS NULL)" if desc else f"{column} > ?"
+            after_params = [value]
+        alternatives.append("(" + " AND ".join(equal + [after]) + ")")
+        params += list(last[:i]) + after_params
+    return ("(" + " OR ".join(alternatives) + ")") if alternatives else "0", params
+
+
+_CASE_FILE_COMMON = {
+    "CaseID": "case_id",
+    "GSTIN": "gstin",
+    "Legal Name": "legal_name",
+    "Issue_Description": "issue_description",
+    "Financial_Year": "financial_year",
+    "Section": "section",
+    "Status": "status",
+}
+_CASE_FILE_SEARCH = ("gstin", "legal_name", "issue_description", "financial_year", "section", "remarks")
+_GSTIN_FILTER = ("gstin LIKE ?", "%{}%")
+
+REGISTERS = {
+    'taxpayers': RegisterQuery(
+        'taxpayers',
+        {
+            "GSTIN": "gstin", "Legal Name": "legal_name", "Trade Name": "trade_name",
+            "Address": "address", "State": "state", "Email": "email", "Mobile": "mobile",
+            "Status": "status", "Constitution": "constitution",
+        },
+        search=("gstin", "legal_name", "trade_name"),
+        filters={'status': ("status = ?", None), 'gstin': _GSTIN_FILTER},
+        mirror='taxpayers',
+    ),
+    'cases': RegisterQuery(
+        'legacy_cases',
+        {
+            "CaseID": "case_id", "GSTIN": "gstin", "Legal Name": "legal_name",
+            "Proceeding Type": "proceeding_type", "Form Type": "form_type", "Date": "case_date",
+            "Status": "status", "FilePath": "file_path",
+        },
+        search=("gstin", "legal_name", "form_type", "status"),
+        filters={
+            'date_from': ("case_date >= ?", None),
+            'date_to': ("case_date <= ?", None),
+            'gstin': _GSTIN_FILTER,
+        },
+        mirror='cases',
+    ),
+    'oc': RegisterQuery(
+        'oc_register',
+        {
+            "id": "id", "OC_Number": "oc_number", "OC_Content": "oc_content",
+            "OC_Date": "oc_date", "OC_To": "oc_to", "OC_Copy_To": "''",
+        },
+        search=("oc_number", "oc_content", "oc_to"),
+        filters={'date_from': ("oc_date >= ?", None), 'date_to': ("oc_date <= ?", None)},
+        order="oc_date DESC, created_at DESC",
+    ),
+    'drc01a': RegisterQuery(
+        'case_file_register',
+        dict(_CASE_FILE_COMMON, **{
+            "OC_Date": "oc_date", "CGST_Demand": "cgst_demand", "SGST_Demand": "sgst_demand",
+            "IGST_Demand": "igst_demand", "Cess_Demand": "cess_demand",
+            "Total_Demand": "total_demand", "Remarks": "remarks",
+        }),
+        where="status LIKE '%DRC-01A%' OR drc01a_path != ''",
+        search=_CASE_FILE_SEARCH,
+        filters={'date_from': ("oc_date >= ?", None), 'date_to': ("oc_date <= ?", None), 'gstin': _GSTIN_FILTER},
+        order="oc_date DESC",
+    ),
+    'scn': RegisterQuery(
+        'case_file_register',
+        dict(_CASE_FILE_COMMON, **{
+            "SCN_Number": "scn_number", "SCN_Date": "scn_date",
+            "CGST_Demand": "cgst_demand", "SGST_Demand": "sgst_demand", "IGST_Demand": "igst_demand",
+            "Total_Demand": "total_demand", "Remarks": "remarks",
+        }),
+        where="status LIKE '%SCN%' OR scn_number != ''",
+        search=_CASE_FILE_SEARCH + ("scn_number",),
+        filters={'date_from': ("scn_date >= ?", None), 'date_to': ("scn_date <= ?", None), 'gstin': _GSTIN_FILTER},
+        order="scn_date DESC",
+    ),
+    'oio': RegisterQuery(
+        'case_file_register',
+        dict(_CASE_FILE_COMMON, **{
+            "SCN_Number": "scn_number", "SCN_Date": "scn_date",
+            "OIO_Number": "oio_number", "OIO_Date": "oio_date",
+            "CGST_Demand": "cgst_demand", "SGST_Demand": "sgst_demand", "IGST_Demand": "igst_demand",
+            "Cess_Demand": "cess_demand", "Total_Demand": "total_demand", "Remarks": "remarks",
+        }),
+        where="status LIKE '%ORDER%' OR oio_number != ''",
+        search=_CASE_FILE_SEARCH + ("scn_number", "oio_number"),
+        filters={'date_from': ("oio_date >= ?", None), 'date_to': ("oio_date <= ?", None), 'gstin': _GSTIN_FILTER},
+        order="oio_date DESC",
+    ),
+    'asmt10': RegisterQuery(
+        'asmt10_register',
+        {
+            "id": "id", "gstin": "gstin", "financial_year": "financial_year",
+            "issue_date": "issue_date", "case_id": "case_id", "oc_number": "oc_number",
+            "created_at": "created_at",
+        },
+        search=("gstin", "financial_year", "oc_number", "case_id"),
+        filters={'date_from': ("issue_date >= ?", None), 'date_to': ("issue_date <= ?", None), 'gstin': _GSTIN_FILTER},
+        order="created_at DESC",
+    ),
+}
+
+
+def csv_signature(path):
+    """(mtime, size) of a CSV file, or None if it does not exist."""
+    try:
+        st = os.stat(path)
+        return (st.st_mtime, st.st_size)
+    except OSError:
+        return None
@@ -6,17 +6,72 @@ import json
 # Define DB Path relative to the project root
 DB_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "data", "adjudication.db")
 
+
 def init_db(db_file=None):
-    """Initialize the SQLite database with the required schema."""
+    """
+    Brings the database up to SCHEMA_VERSION.
+
+    The applied version is kept in PRAGMA user_version, so opening a current
+    database costs a single header read. Pending steps of MIGRATIONS run in
+    order inside one IMMEDIATE transaction; the version is bumped in the same
+    transaction, so a failed step leaves the file as it was. Returns the
+    names of the steps applied ([] if the schema was already current).
+    """
     target_db = db_file if db_file else DB_FILE
-    os.makedirs(os.path.dirname(target_db), exist_ok=True)
-    
+    os.makedirs(os.path.dirname(os.path.abspath(target_db)), exist_ok=True)
+
     conn = sqlite3.connect(target_db)
+    try:
+        if schema_version(conn) >= SCHEMA_VERSION:
+            return []
+
+        conn.execute("PRAGMA foreign_keys = ON;")
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            # Another process may have migrated while we waited for the lock
+            current = schema_version(conn)
+            applied = []
+            for version, name, step in MIGRATIONS:
+                if version > current:
+                    step(conn)
+                    applied.append(f"V{version} {name}")
+            if applied:
+                conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+    finally:
+        conn.close()
+
+    if applied:
+        print(f"Database at {target_db} migrated: {', '.join(applied)}")
+    return applied
+
+
+def schema_version(conn):
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def _add_columns(cursor, table, col_defs):
+    """ALTER TABLE ... ADD COLUMN for each definition the table lacks (no-op if the table is missing)."""
+    cursor.execute(f"PRAGMA table_info({table})")
+    existing = {info[1] for info in cursor.fetchall()}
+    if not existing:
+        return
+    for col_def in col_defs:
+        if col_def.split()[0] not in existing:
+            cursor.execute(f"ALTER TABLE {table} ADD COLUMN {col_def}")
+
+
+def _v1_baseline(conn):
+    """
+    The schema as it stood before versioning. Every statement is idempotent,
+    so this both creates a fresh database and completes a legacy one
+    (user_version 0) that may predate any of the columns below.
+    """
     cursor = conn.cursor()
     
-    # Enable Foreign Keys
-    cursor.execute("PRAGMA foreign_keys = ON;")
-    
     # 0. Case Registry (Canonical Anchor)
     cursor.execute("""
     CREATE TABLE IF NOT EXISTS case_registry (
@@ -57,7 +112,6 @@ def init_db(db_file=None):
     """)
     
     # Migration: Add new columns if not exist
-    # Note: These should be safe to run even if columns exist (using try/except)
     migration_cols = [
         "case_id TEXT",
         "form_type TEXT",
@@ -73,15 +127,10 @@ def init_db(db_file=None):
         "asmt10_snapshot TEXT"
     ]
     
-    for col_def in migration_cols:
-        try: cursor.execute(f"ALTER TABLE proceedings ADD COLUMN {col_def}")
-        except: pass
+    _add_columns(cursor, "proceedings", migration_cols)
     
     # Add chapter_name to gst_sections if not exists
-    try: 
-        cursor.execute("ALTER TABLE gst_sections ADD COLUMN chapter_name TEXT")
-    except: 
-        pass
+    _add_columns(cursor, "gst_sections", ["chapter_name TEXT"])
         
     try: cursor.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_case_id ON proceedings(case_id)")
     except: pass
@@ -218,36 +267,22 @@ def init_db(db_file=None):
     
     
     # Migration: Add stage column to case_issues if not exists
-    try: cursor.execute("ALTER TABLE case_issues ADD COLUMN stage TEXT DEFAULT 'DRC-01A'")
-    except: pass
+    # plus the structured columns for ASMT-10/Adjudication and SCN Manual Issue Insertion (Step 159)
+    _add_columns(cursor, "case_issues", [
+        "stage TEXT DEFAULT 'DRC-01A'",
+        "category TEXT",
+        "description TEXT",
+        "amount DECIMAL(15,2) DEFAULT 0",
+        "origin TEXT DEFAULT 'SCRUTINY'",
+        "source_proceeding_id TEXT",
+        "added_by TEXT",
+    ])
 
-    # Migration: Add structured columns for ASMT-10/Adjudication
-    try: cursor.execute("ALTER TABLE case_issues ADD COLUMN category TEXT")
-    except: pass
-    try: cursor.execute("ALTER TABLE case_issues ADD COLUMN description TEXT")
-    except: pass
-    try: cursor.execute("ALTER TABLE case_issues ADD COLUMN amount DECIMAL(15,2) DEFAULT 0")
-    except: pass
+    # Migration: Add liability columns if missing
+    _add_columns(cursor, "issues_master", ["liability_config TEXT", "tax_demand_mapping TEXT"])
 
-    # Migration: Add columns for SCN Manual Issue Insertion (Step 159)
-    try: cursor.execute("ALTER TABLE case_issues ADD COLUMN origin TEXT DEFAULT 'SCRUTINY'")
-    except: pass
-    try: cursor.execute("ALTER TABLE case_issues ADD COLUMN source_proceeding_id TEXT")
-    except: pass
-    try: cursor.execute("ALTER TABLE case_issues ADD COLUMN added_by TEXT")
-    except: pass
-
-    
-    # Migration: Add liability columns if missing [RETIRED for issues_data]
-    lib_cols = [
-        ("issues_master", "liability_config TEXT"),
-        ("issues_master", "tax_demand_mapping TEXT")
-        # ("issues_data", "liability_config TEXT"),
-        # ("issues_data", "tax_demand_mapping TEXT")
-    ]
-    for table, col_def in lib_cols:
-        try: cursor.execute(f"ALTER TABLE {table} ADD COLUMN {col_def}")
-        except: pass
+    # Scrutiny Dashboard catalogue text
+    _add_columns(cursor, "issues_master", ["description TEXT NOT NULL DEFAULT ''"])
 
     # 10. GST Acts Table
     cursor.execute("""
@@ -272,6 +307,38 @@ def init_db(db_file=None):
         FOREIGN KEY (act_id) REFERENCES gst_acts(act_id) ON DELETE CASCADE
     );
     """)
+    try: cursor.execute("CREATE INDEX IF NOT EXISTS idx_gst_sections_act_chapter ON gst_sections(act_id, chapter_id)")
+    except: pass
+
+    # 11B. Handbook Search Index (FTS5, rowid = gst_sections.id)
+    # Footnotes are split from the section text in Python, so writes to
+    # gst_sections only flag the index as stale; DatabaseManager rebuilds it
+    # before the next search.
+    try:
+        cursor.execute("""
+        CREATE VIRTUAL TABLE IF NOT EXISTS gst_handbook_fts USING fts5(
+            section_number, title, chapter, body, footnotes,
+            act_id UNINDEXED,
+            tokenize = 'unicode61 remove_diacritics 2'
+        );
+        """)
+        cursor.execute("""
+        CREATE TABLE IF NOT EXISTS gst_handbook_fts_state (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            dirty INTEGER NOT NULL DEFAULT 1
+        );
+        """)
+        cursor.execute("INSERT OR IGNORE INTO gst_handbook_fts_state (id, dirty) VALUES (1, 1)")
+        for op in ("INSERT", "UPDATE", "DELETE"):
+            cursor.execute(f"""
+                CREATE TRIGGER IF NOT EXISTS trg_gst_sections_fts_{op.lower()}
+                AFTER {op} ON gst_sections
+                BEGIN
+                    UPDATE gst_handbook_fts_state SET dirty = 1 WHERE id = 1;
+                END;
+            """)
+    except Exception as e:
+        print(f"Warning creating handbook search index: {e}")
 
     # 12. ASMT-10 Register (Finalized Notices)
     cursor.execute("""
@@ -287,6 +354,88 @@ def init_db(db_file=None):
     """)
     try: cursor.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_asmt10_case_id ON asmt10_register(case_id)")
     except: pass
+    try: cursor.execute("CREATE INDEX IF NOT EXISTS idx_asmt10_created_at ON asmt10_register(created_at)")
+    except: pass
+    try: cursor.execute("CREATE INDEX IF NOT EXISTS idx_oc_register_date ON oc_register(oc_date, created_at)")
+    except: pass
+
+    # 12B. Indexed mirrors of the CSV registers (taxpayers.csv, cases.csv, case_files.csv)
+    # The CSV files stay authoritative; DatabaseManager re-syncs a mirror when its
+    # file's mtime/size changes so list views can page, sort and filter in SQL.
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS csv_mirror_state (
+        source TEXT PRIMARY KEY,
+        mtime REAL,
+        size INTEGER
+    );
+    """)
+
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS taxpayers (
+        gstin TEXT PRIMARY KEY,
+        legal_name TEXT,
+        trade_name TEXT,
+        address TEXT,
+        state TEXT,
+        email TEXT,
+        mobile TEXT,
+        status TEXT,
+        constitution TEXT
+    );
+    """)
+    try:
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_taxpayers_legal_name ON taxpayers(legal_name COLLATE NOCASE)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_taxpayers_trade_name ON taxpayers(trade_name COLLATE NOCASE)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_taxpayers_status ON taxpayers(status)")
+    except: pass
+
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS legacy_cases (
+        case_id TEXT,
+        gstin TEXT,
+        legal_name TEXT,
+        proceeding_type TEXT,
+        form_type TEXT,
+        case_date TEXT,
+        status TEXT,
+        file_path TEXT
+    );
+    """)
+    try:
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_legacy_cases_date ON legacy_cases(case_date)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_legacy_cases_gstin ON legacy_cases(gstin)")
+    except: pass
+
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS case_file_register (
+        case_id TEXT,
+        gstin TEXT,
+        legal_name TEXT,
+        trade_name TEXT,
+        section TEXT,
+        status TEXT,
+        drc01a_path TEXT,
+        oc_number TEXT,
+        oc_date TEXT,
+        scn_number TEXT,
+        scn_date TEXT,
+        oio_number TEXT,
+        oio_date TEXT,
+        cgst_demand TEXT,
+        sgst_demand TEXT,
+        igst_demand TEXT,
+        cess_demand TEXT,
+        total_demand TEXT,
+        financial_year TEXT,
+        issue_description TEXT,
+        remarks TEXT
+    );
+    """)
+    try:
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_case_file_register_scn_date ON case_file_register(scn_date)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_case_file_register_oio_date ON case_file_register(oio_date)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_case_file_register_oc_date ON case_file_register(oc_date)")
+    except: pass
 
     # 13. Adjudication Cases (Downstream from Finalized Scrutiny)
     cursor.execute("""
@@ -320,13 +469,10 @@ def init_db(db_file=None):
         "version_no INTEGER DEFAULT 1",
         "is_active INTEGER DEFAULT 1"
     ]
-    for col_def in adj_cols:
-        try: cursor.execute(f"ALTER TABLE adjudication_cases ADD COLUMN {col_def}")
-        except: pass
+    _add_columns(cursor, "adjudication_cases", adj_cols)
 
     # Migration: Add version_no to proceedings if not exists
-    try: cursor.execute("ALTER TABLE proceedings ADD COLUMN version_no INTEGER DEFAULT 1")
-    except: pass
+    _add_columns(cursor, "proceedings", ["version_no INTEGER DEFAULT 1"])
 
     # Refactor Migration: Workflow Stage & Skip Logic
     _migrate_workflow_stages(cursor)
@@ -439,10 +585,147 @@ def init_db(db_file=None):
     except: pass
     try: cursor.execute("CREATE INDEX IF NOT EXISTS idx_draft_created_at ON proceeding_drafts(created_at)")
     except: pass
-    
-    conn.commit()
-    conn.close()
-    print(f"Database initialized at {DB_FILE}")
+
+    # 15. Scrutiny Analysis Results (one row per SOP step)
+    # fingerprint hashes the step's input files/configs/schemas; Re-Analyze
+    # reuses result_json while it still matches.
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS analysis_results (
+        proceeding_id TEXT NOT NULL,
+        step TEXT NOT NULL,
+        fingerprint TEXT NOT NULL,
+        result_json TEXT NOT NULL,
+        computed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        PRIMARY KEY (proceeding_id, step)
+    );
+    """)
+
+    # 16. Content Blob Store (see src/database/blob_store.py)
+    # Large text columns hold 'blob:sha256:<hash>' references into this table.
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS content_blobs (
+        hash TEXT PRIMARY KEY,
+        codec TEXT NOT NULL, -- zlib (text) or b64 (decoded embedded image)
+        raw_size INTEGER NOT NULL,
+        stored_size INTEGER NOT NULL,
+        data BLOB NOT NULL,
+        assets TEXT, -- JSON list of asset hashes the text refers to
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    );
+    """)
+
+    # 17. OC Number Sequences (see src/database/oc_sequence.py)
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS oc_sequences (
+        year TEXT PRIMARY KEY, -- Suffix after '/' in the OC number
+        last_seq INTEGER NOT NULL DEFAULT 0
+    );
+    """)
+
+
+def _v2_officer_registry(conn):
+    cursor = conn.cursor()
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS officers (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT NOT NULL,
+            designation TEXT NOT NULL,
+            jurisdiction TEXT NOT NULL,
+            office_address TEXT,
+            is_active BOOLEAN DEFAULT 1,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_officer_active ON officers(is_active)")
+    _add_columns(cursor, "proceedings", [
+        "issuing_officer_id INTEGER REFERENCES officers(id)",
+        "issuing_officer_snapshot TEXT",
+    ])
+
+
+def _v3_content_blob_store(conn):
+    from src.database import blob_store
+    report = blob_store.migrate(conn, commit=False)
+    print(blob_store.format_report(report))
+
+
+def _v4_case_stats(conn):
+    from src.database import case_stats
+    cursor = conn.cursor()
+    case_stats.install(cursor)
+    case_stats.rebuild(cursor)
+
+
+def _v5_case_file_register(conn):
+    """
+    case_file_register stops being a text mirror of case_files.csv and
+    becomes the register itself (typed demand/date columns). The mirror held
+    nothing the CSV doesn't, so it is dropped; DatabaseManager imports the
+    CSV once on next start (import_case_files_csv).
+    """
+    from src.database import case_files, case_stats
+    cursor = conn.cursor()
+    cursor.execute("DROP TABLE IF EXISTS case_file_register")
+    cursor.execute("DELETE FROM csv_mirror_state WHERE source = 'case_files'")
+    case_files.create_table(cursor)
+    case_stats.install(cursor)
+    case_stats.rebuild(cursor)
+
+
+def _v6_issue_demand_columns(conn):
+    from src.database import case_issues
+    cursor = conn.cursor()
+    _add_columns(cursor, "case_issues", [f"{col} REAL DEFAULT 0" for col in case_issues.DEMAND_COLUMNS]
+                 + ["is_included INTEGER DEFAULT 1"])
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_case_issues_proceeding ON case_issues(proceeding_id, stage)")
+    case_issues.backfill(cursor)
+
+
+def _v7_gst_sections_revision(conn):
+    """
+    A counter bumped by every write to gst_sections, so the section
+    catalogue (src/utils/section_catalogue.py) is only rebuilt when the
+    Acts / Rules text actually changed.
+    """
+    cursor = conn.cursor()
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS gst_sections_state (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            revision INTEGER NOT NULL DEFAULT 0
+        )
+    """)
+    cursor.execute("INSERT OR IGNORE INTO gst_sections_state (id, revision) VALUES (1, 0)")
+    for op in ("INSERT", "UPDATE", "DELETE"):
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS trg_gst_sections_revision_{op.lower()}
+            AFTER {op} ON gst_sections
+            BEGIN
+                UPDATE gst_sections_state SET revision = revision + 1 WHERE id = 1;
+            END
+        """)
+
+
+def _v8_issue_demand_stats(conn):
+    """Issue demand statistics move from case_issues.amount to the V6 demand columns."""
+    from src.database import case_stats
+    cursor = conn.cursor()
+    case_stats.install(cursor)
+    case_stats.rebuild(cursor)
+
+
+# (version, name, step). Append new steps here; never edit an applied one.
+# V1-V3 match the old schema_meta versions, which user_version supersedes.
+MIGRATIONS = [
+    (1, "baseline schema", _v1_baseline),
+    (2, "officer registry", _v2_officer_registry),
+    (3, "content blob store", _v3_content_blob_store),
+    (4, "materialised case statistics", _v4_case_stats),
+    (5, "case file register in SQLite", _v5_case_file_register),
+    (6, "structured issue demand columns", _v6_issue_demand_columns),
+    (7, "gst_sections revision counter", _v7_gst_sections_revision),
+    (8, "issue demand statistics from demand columns", _v8_issue_demand_stats),
+]
+SCHEMA_VERSION = MIGRATIONS[-1][0]
 
 def _migrate_workflow_stages(cursor):
     """
@@ -452,15 +735,8 @@ def _migrate_workflow_stages(cursor):
     from src.utils.constants import WorkflowStage
     
     # 1. Add Columns
-    try: cursor.execute("ALTER TABLE proceedings ADD COLUMN workflow_stage INTEGER")
-    except: pass
-    try: cursor.execute("ALTER TABLE proceedings ADD COLUMN drc01a_skipped BOOLEAN DEFAULT 0")
-    except: pass
-    
-    try: cursor.execute("ALTER TABLE adjudication_cases ADD COLUMN workflow_stage INTEGER")
-    except: pass
-    try: cursor.execute("ALTER TABLE adjudication_cases ADD COLUMN drc01a_skipped BOOLEAN DEFAULT 0")
-    except: pass
+    for table in ("proceedings", "adjudication_cases"):
+        _add_columns(cursor, table, ["workflow_stage INTEGER", "drc01a_skipped BOOLEAN DEFAULT 0"])
     
     # 2. Migration Logic (Idempotent: WHERE workflow_stage IS NULL)
     
@@ -0,0 +1,107 @@
+"""
+Input fingerprints for incremental scrutiny re-analysis.
+
+Every SOP step run by ScrutinyParser.parse_file declares which uploads,
+configs and issue schemas it reads. The step fingerprint is a hash over the
+content of those inputs; when it matches the fingerprint stored with the
+previous result for the case, the stored issues are reused instead of
+re-parsing the PDFs / Excel files behind them.
+"""
+import hashlib
+import json
+import os
+import threading
+
+# Bump whenever SOP logic changes in a way that invalidates stored results
+ANALYSIS_VERSION = 1
+
+# Issue key a step can set to keep its result out of the cache (e.g. the user
+# cancelled an ambiguity prompt, so the result says nothing about the inputs)
+TRANSIENT_KEY = "_transient"
+
+_digest_cache = {}
+_digest_lock = threading.Lock()
+
+
+def file_digest(path):
+    """
+    sha256 of a file's content, memoised per (path, mtime, size) so an
+    unchanged upload is hashed once per session. Returns None if unreadable.
+    """
+    try:
+        st = os.stat(path)
+    except (OSError, TypeError, ValueError):
+        return None
+    key = (os.path.abspath(path), st.st_mtime_ns, st.st_size)
+    with _digest_lock:
+        if key in _digest_cache:
+            return _digest_cache[key]
+
+    h = hashlib.sha256()
+    try:
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                h.update(chunk)
+    except OSError:
+        return None
+    digest = h.hexdigest()
+    with _digest_lock:
+        _digest_cache[key] = digest
+    return digest
+
+
+def step_fingerprint(files=None, configs=None, schemas=None, extra=None):
+    """
+    files: {role: [paths]} - hashed by content, so renaming or re-uploading an
+    identical file keeps the fingerprint. configs / schemas / extra must be
+    JSON-serialisable.
+    """
+    payload = {
+        "version": ANALYSIS_VERSION,
+        "files": {
+            role: sorted(file_digest(p) or f"missing:{os.path.basename(str(p))}" for p in paths if p)
+            for role, paths in (files or {}).items()
+        },
+        "configs": configs or {},
+        "schemas": schemas or {},
+        "extra": extra,
+    }
+    canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class AnalysisStepCache:
+    """
+    Step results of the previous run ({step: {'fingerprint', 'issues',
+    'analyzed'}}) and the ones produced by the current run.
+    """
+
+    def __init__(self, prior=None):
+        self.prior = prior or {}
+        self.results = {}
+        self.recomputed = []
+        self.reused = []
+
+    def lookup(self, step, fingerprint):
+        """Returns (issues, analyzed_count) if the stored result is still valid, else None."""
+        entry = self.prior.get(step)
+        if not entry or entry.get("fingerprint") != fingerprint:
+            return None
+        self.results[step] = entry
+        self.reused.append(step)
+        # Fresh copies: callers enrich issues in place
+        return json.loads(json.dumps(entry.get("issues", []))), entry.get("analyzed", 0)
+
+    def store(self, step, fingerprint, issues, analyzed):
+        self.recomputed.append(step)
+        transient = False
+        for issue in issues:
+            if isinstance(issue, dict) and issue.pop(TRANSIENT_KEY, False):
+                transient = True
+        if transient:
+            return
+        self.results[step] = {
+            "fingerprint": fingerprint,
+            "issues": json.loads(json.dumps(issues, default=str)),
+            "analyzed": analyzed,
+        }
@@ -1,6 +1,3 @@
-from PyQt6.QtGui import QTextDocument, QPageLayout, QPageSize
-from PyQt6.QtPrintSupport import QPrinter
-from PyQt6.QtCore import QSizeF, QMarginsF
 import os
 from src.utils.formatting import format_indian_number
 
@@ -362,7 +359,8 @@ class ASMT10Generator:
         return html
 
     @staticmethod
-    def generate_html(data, issues, for_preview=True, show_letterhead=True, style_mode="legacy", for_pdf=False):
+    def generate_html(data, issues, for_preview=True, show_letterhead=True, style_mode="legacy", for_pdf=False,
+                      inline_assets=True):
         """
         Generates the HTML content for ASMT-10 with specific layout and formatting.
         
@@ -373,11 +371,13 @@ class ASMT10Generator:
             show_letterhead (bool): Whether to include letterhead image
             style_mode (str): "legacy" (Scrutiny Tab default) or "professional" (Adjudication Tab)
             for_pdf (bool): If True, renders static content for WeasyPrint (No JS pagination)
+            inline_assets (bool): Inline an image letterhead as a data URI; False references
+                the file, for views loaded with render_assets.base_url()
         """
         from src.utils.config_manager import ConfigManager
+        from src.utils import render_assets
         import re
         import os
-        import base64
         from datetime import datetime
         
         config = ConfigManager()
@@ -407,7 +407,7 @@ class ASMT10Generator:
             </div>
             """
         
-        # 2. Fetch Letterhead
+        # 2. Fetch Letterhead (encoded once per file version by render_assets)
         lh_content = ""
         try:
             if show_letterhead:
@@ -415,31 +415,9 @@ class ASMT10Generator:
                 lh_path = os.path.join(config.letterheads_dir, lh_filename)
                 
                 if lh_path and os.path.exists(lh_path):
-                    ext = os.path.splitext(lh_path)[1][1:].lower()
-                    
                     # Fetch visual adjustments for this specific letterhead
                     adj = config.get_letterhead_adjustments(lh_filename)
-                    # [RENDER-TIME CAP] Prevent extreme width adjustments (e.g. 623%) from breaking layout
-                    width_val = adj.get('width', 100)
-                    if width_val > 100: width_val = 100
-                    
-                    lh_style = f"width: {width_val}%; padding-top: {adj.get('padding_top', 0)}px; margin-bottom: {adj.get('margin_bottom', 20)}px;"
-                    
-                    if ext == "html":
-                        # Case 1: HTML letterhead - read as text
-                        with open(lh_path, 'r', encoding='utf-8') as f:
-                            lh_full = f.read()
-                            # Extract body content if present, otherwise use full content
-                            import re
-                            match = re.search(r"<body[^>]*>(.*?)</body>", lh_full, re.DOTALL | re.IGNORECASE)
-                            inner_html = match.group(1) if match else lh_full
-                            lh_content = f'<div style="{lh_style} text-align: center;">{inner_html}</div>'
-                    else:
-                        # Case 2: Image letterhead - read as binary and base64 encode
-                        with open(lh_path, "rb") as image_file:
-                            encoded_string = base64.b64encode(image_file.read()).decode('utf-8')
-                        if ext == "jpg": ext = "jpeg"
-                        lh_content = f'<div style="{lh_style} text-align: center;"><img src="data:image/{ext};base64,{encoded_string}" alt="Letterhead" style="max-width: 100%; height: auto;"></div>'
+                    lh_content = render_assets.letterhead_block(lh_path, adj, inline=inline_assets)
                 else:
                     print(f"Letterhead file not found: {lh_path}")
         except Exception as e:
@@ -564,29 +542,11 @@ class ASMT10Generator:
                 'for_pdf': for_pdf
             }
             
-            # Load Template and CSS
-            import os
-            from jinja2 import Environment, FileSystemLoader
-            template_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "templates")
-            css_dir = os.path.join(template_dir, 'css')
-            
-            def read_css(filename):
-                path = os.path.join(css_dir, filename)
-                if os.path.exists(path):
-                    with open(path, 'r', encoding='utf-8') as f:
-                        return f.read()
-                return ""
-
-            base_css = read_css('doc_base.css')
-            renderer_css = "" if not for_preview else read_css('doc_qt.css')
-            
             # Workaround for formatter mangling: generate full style tag in Python
-            template_vars['full_styles_html'] = f"<style>\n{base_css}\n{renderer_css}\n</style>"
+            template_vars['full_styles_html'] = render_assets.document_styles_html(for_preview)
 
-            env = Environment(loader=FileSystemLoader(template_dir))
-            template = env.get_template('asmt10_prof.html')
-            
-            return template.render(**template_vars)
+            from src.utils.template_engine import TemplateEngine
+            return TemplateEngine.render_document('asmt10_prof.html', template_vars)
 
         else:
             # --- LEGACY STYLE (Original Scrutiny Tab) ---
@@ -721,6 +681,10 @@ class ASMT10Generator:
     @staticmethod
     def save_pdf(html_content, output_path):
         """Generates PDF using Qt's internal printer"""
+        # Qt is only needed here, so the HTML generation stays usable headless
+        from PyQt6.QtGui import QTextDocument, QPageLayout, QPageSize
+        from PyQt6.QtPrintSupport import QPrinter
+        from PyQt6.QtCore import QMarginsF
         try:
             doc = QTextDocument()
             doc.setHtml(html_content)
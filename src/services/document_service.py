@@ -0,0 +1,755 @@
+"""
+Headless generation of ASMT-10, DRC-01A and SCN documents.
+
+The notice models are built straight from the database (the proceeding,
+its case_issues and the issuing officer snapshot) rather than from the
+widgets of ProceedingsWorkspace, and rendered to HTML or PDF without Qt.
+The workspace uses the same renderers, so a document regenerated here
+matches the one an officer exports from the GUI.
+
+The command line regenerates documents for many cases in parallel, e.g.
+after a template fix or for a nightly refresh of the register PDFs:
+
+    python -m src.services.document_service scn 41 42 43 --out exports --workers 4
+    python -m src.services.document_service drc01a --all --format html
+
+Each case is rendered in a worker process; PDFs are written by WeasyPrint in
+that process, which gives the isolation the GUI gets from render_worker.
+"""
+import argparse
+import copy
+import datetime
+import json
+import os
+import re
+import sys
+import tempfile
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from src.utils import render_assets
+from src.utils.formatting import format_indian_number
+from src.utils.issue_renderer import IssueRenderer
+from src.utils.number_utils import safe_int
+
+ACT_PRIORITY = ["IGST", "CGST", "SGST", "UTGST", "Cess"]
+
+# CLI name -> document type (case_issues stage, file name prefix)
+DOC_TYPES = {"asmt10": "ASMT-10", "drc01a": "DRC-01A", "scn": "SCN"}
+
+
+def _as_dict(value):
+    if isinstance(value, dict):
+        return value
+    if isinstance(value, str) and value:
+        try:
+            parsed = json.loads(value)
+            return parsed if isinstance(parsed, dict) else {}
+        except ValueError:
+            return {}
+    return {}
+
+
+def _display_date(value):
+    """'yyyy-mm-dd' (as stored) -> 'dd/mm/yyyy'; anything else is returned as is."""
+    if not value:
+        return ""
+    try:
+        return datetime.datetime.strptime(str(value)[:10], "%Y-%m-%d").strftime("%d/%m/%Y")
+    except ValueError:
+        return str(value)
+
+
+def _html_lines(html):
+    """Non-empty text lines of a rich-text field (one per paragraph / line break)."""
+    if not html:
+        return []
+    text = re.sub(r"<head.*?</head>", "", str(html), flags=re.DOTALL | re.IGNORECASE)
+    text = re.sub(r"<br\s*/?>|</p>|</div>|</li>", "\n", text, flags=re.IGNORECASE)
+    text = re.sub(r"<[^>]+>", "", text).replace("&nbsp;", " ").replace("&amp;", "&")
+    return [line.strip() for line in text.split("\n") if line.strip()]
+
+
+def financial_year_of(date):
+    """'2025-26' for any date from April 2025 to March 2026."""
+    start = date.year if date.month >= 4 else date.year - 1
+    return f"{start}-{(start + 1) % 100:02d}"
+
+
+def format_indian_currency(value):
+    """Indian digit grouping; paise shown only when non-zero."""
+    if value is None: return "0"
+    try:
+        val = safe_int(value)
+    except (ValueError, TypeError):
+        return str(value)
+
+    is_negative = val < 0
+    integer_part, decimal_part = f"{abs(val):.2f}".split(".")
+    decimal_suffix = "" if decimal_part == "00" else "." + decimal_part
+
+    if len(integer_part) > 3:
+        last3 = integer_part[-3:]
+        rest = integer_part[:-3]
+        # split rest into chunks of 2 from right
+        parts = []
+        while len(rest) > 2:
+            parts.insert(0, rest[-2:])
+            rest = rest[:-2]
+        parts.insert(0, rest)
+        integer_part = ",".join(parts) + "," + last3
+
+    result = integer_part + decimal_suffix
+    return "-" + result if is_negative else result
+
+
+def resolve_officer(proceeding, doc_key, db, officer_id=None):
+    """
+    Issuing officer for one document: the snapshot taken when it was saved
+    (per document, or the old flat format), else the live officer record.
+    """
+    details = _as_dict(proceeding.get('additional_details'))
+    snapshot_json = proceeding.get('issuing_officer_snapshot') or details.get('issuing_officer_snapshot')
+    officer = {}
+    if snapshot_json:
+        snapshot = _as_dict(snapshot_json)
+        if doc_key in snapshot:
+            officer = snapshot[doc_key] or {}
+        elif 'name' in snapshot:
+            officer = snapshot  # Fallback for old flat format
+    if not officer:
+        officer_id = proceeding.get('issuing_officer_id') or details.get('issuing_officer_id') or officer_id
+        officer = (db.get_officer_by_id(officer_id) if officer_id else None) or {}
+    return officer
+
+
+def aggregate_tax_rows(breakdowns, period):
+    """
+    Act-wise demand table rows (in ACT_PRIORITY order) from per-issue
+    {act: {'tax', 'interest', 'penalty'}} breakdowns. Returns (rows, grand_total).
+    """
+    totals = {}
+    for breakdown in breakdowns:
+        for act, vals in (breakdown or {}).items():
+            bucket = totals.setdefault(act, {'tax': 0, 'interest': 0, 'penalty': 0, 'total': 0})
+            for key in ('tax', 'interest', 'penalty'):
+                v = safe_int(vals.get(key, 0))
+                bucket[key] += v
+                bucket['total'] += v
+
+    rows = []
+    for act in ACT_PRIORITY:
+        if act in totals:
+            rows.append(dict(act=act, period=period, **totals[act]))
+    return rows, sum(row['total'] for row in rows)
+
+
+def tax_table_html(tax_rows):
+    """
+    HTML table rows for the demand summary.
+    Accepts list of dicts: [{'act', 'period', 'tax', 'interest', 'penalty', 'total'}, ...]
+    """
+    rows_html = ""
+    if not tax_rows:
+        return "<tr><td colspan='7' style='text-align: center;'>No tax details found.</td></tr>"
+
+    total_tax = 0
+    total_int = 0
+    total_pen = 0
+    total_grand = 0
+
+    for row in tax_rows:
+        act = row.get('act', '')
+        period = row.get('period', '')
+        tax = row.get('tax', 0)
+        interest = row.get('interest', 0)
+        penalty = row.get('penalty', 0)
+        total = row.get('total', 0)
+
+        total_tax += tax
+        total_int += interest
+        total_pen += penalty
+        total_grand += total
+
+        # DRC-01A expects 6 columns: Act | Period | Tax | Interest | Penalty | Total
+        rows_html += f"""
+        <tr>
+            <td style="border: 1px solid black; padding: 5px; text-align: center;">{act}</td>
+            <td style="border: 1px solid black; padding: 5px; text-align: center;">{period}</td>
+            <td style="border: 1px solid black; padding: 5px; text-align: right;">{format_indian_number(tax)}</td>
+            <td style="border: 1px solid black; padding: 5px; text-align: right;">{format_indian_number(interest)}</td>
+            <td style="border: 1px solid black; padding: 5px; text-align: right;">{format_indian_number(penalty)}</td>
+            <td style="border: 1px solid black; padding: 5px; text-align: right;"><b>{format_indian_number(total)}</b></td>
+        </tr>
+        """
+
+    # Add a Grand Total row for the DRC-01A/SCN Table inject
+    rows_html += f"""
+    <tr style="background-color: #f2f2f2; font-weight: bold;">
+        <td colspan="2" style="border: 1px solid black; padding: 5px; text-align: right;">Total</td>
+        <td style="border: 1px solid black; padding: 5px; text-align: right;">{format_indian_number(total_tax)}</td>
+        <td style="border: 1px solid black; padding: 5px; text-align: right;">{format_indian_number(total_int)}</td>
+        <td style="border: 1px solid black; padding: 5px; text-align: right;">{format_indian_number(total_pen)}</td>
+        <td style="border: 1px solid black; padding: 5px; text-align: right;">{format_indian_number(total_grand)}</td>
+    </tr>
+    """
+    return rows_html
+
+
+def section_base(raw_section):
+    """'73' or '74' from an adjudication section; ValueError if neither."""
+    raw_sec = str(raw_section or "").strip()
+    if not raw_sec:
+        raise ValueError("DRC-01A: adjudication_section is blank. Cannot build model. Ensure section is set during case setup.")
+    sec_match = re.search(r'(73|74)', raw_sec)
+    if not sec_match:
+        raise ValueError(f"Invalid section_base for DRC-01A derived from: '{raw_sec}'. Must contain '73' or '74'.")
+    return sec_match.group(1)
+
+
+def drc01a_advice_paragraph(base, payment_date):
+    if base == "73":
+        return f"You are hereby advised to pay the amount of tax as ascertained above alongwith the amount of applicable interest in full by {payment_date}, failing which Show Cause Notice will be issued under section 73(1)."
+    return f"You are hereby advised to pay the amount of tax as ascertained above alongwith the amount of applicable interest and penalty under section 74(5) by {payment_date}, failing which Show Cause Notice will be issued under section 74(1)."
+
+
+def scn_paragraph_numbers(issue_count):
+    """Intro = para 1, jurisdiction = para 2, issues from para 3; the closing paras follow the issues."""
+    next_para = 3 + issue_count
+    names = ('para_demand', 'para_waiver', 'para_cancellation', 'para_hearing',
+             'para_exparte', 'para_prejudice', 'para_amendment', 'para_reliance')
+    return {name: next_para + i for i, name in enumerate(names)}
+
+
+def scn_intro_narrative(proceeding):
+    """Introductory grounds narrative, always citing the case's own ASMT-10 reference."""
+    try:
+        from src.utils.scn_generator import generate_intro_narrative
+        details = _as_dict(proceeding.get('additional_details'))
+        grounds_data = details.get('scn_grounds')
+        if not grounds_data:
+            return ""
+        # Deepcopy to prevent mutation of stored JSON, then overlay the authoritative identifiers
+        gen_view = copy.deepcopy(grounds_data)
+        if 'data' in gen_view:
+            ref = gen_view['data'].setdefault('asmt10_ref', {})
+            ref['oc_no'] = proceeding.get('oc_number', '')
+            ref['date'] = proceeding.get('notice_date', '')
+        return generate_intro_narrative(gen_view)
+    except Exception as e:
+        print(f"Narrative Gen Error: {e}")
+        return "<b>[ERROR GENERATING INTRODUCTORY NARRATIVE]</b>"
+
+
+def render_drc01a_html(model):
+    """
+    Map the DRC-01A model to the drc01a.html context and render.
+    Accepts dict: { 'gstin', 'legal_name', 'address', 'case_id', 'oc_no', 'oc_date', 'tax_rows', 'issues_html' }
+    """
+    if not model:
+        return "<h3>Data Validation Failed</h3>"
+
+    try:
+        from src.utils.template_engine import TemplateEngine
+
+        # Defense against None type aggregation
+        total = model.get('grand_total_liability', 0)
+        formatted_total = format_indian_number(total) if total is not None else "0"
+
+        advice_paragraph = re.sub(r'\s+', ' ', model.get('advice_paragraph', '')).strip()
+
+        # Structural cleanup of issues_html
+        sanitized_issues = re.sub(r'\s+', ' ', model.get('issues_html', '')).strip()
+        # Remove inline styles ONLY from <p> and <span> to preserve <table> borders and grid styling
+        sanitized_issues = re.sub(r'(<(?:p|span)[^>]*?)\s+style="[^"]*"', r'\1', sanitized_issues, flags=re.IGNORECASE)
+        # Remove empty paragraphs
+        sanitized_issues = re.sub(r'<p>\s*</p>', '', sanitized_issues)
+        # Collapse multiple <br>
+        sanitized_issues = re.sub(r'(<br\s*/?>\s*){2,}', '<br>', sanitized_issues).strip()
+
+        context = {
+            'gstin': model['gstin'],
+            'legal_name': model['legal_name'],
+            'trade_name': f"({model['trade_name']})" if model.get('trade_name') and model['trade_name'] != model['legal_name'] else "",
+            'address': model['address'],
+            'case_id': model['case_id'],
+            'oc_no': model['oc_no'],
+            'oc_date': model['oc_date'],
+            'financial_year': model['financial_year'],
+            'form_type': model['form_type'],
+            'section_base': model['section_base'],
+            'tax_table_html': model.get('tax_table_html', ''),
+            'issues_html': sanitized_issues,
+            'grand_total': formatted_total,
+            'advice_paragraph': advice_paragraph,
+            'last_date_reply': model['reply_date'],
+            'officer_name': model.get('officer_name', 'Proper Officer'),
+            'designation': model.get('designation', 'Superintendent'),
+            'jurisdiction': model.get('jurisdiction', 'Paravur Range')
+        }
+
+        # Strict contract validation
+        for key, value in context.items():
+            if value is None:
+                raise KeyError(f"CRITICAL: Missing required contract key for DRC-01A rendering: {key}")
+
+        return TemplateEngine.render_document("drc01a.html", context)
+
+    except Exception as e:
+        print(f"Error rendering DRC-01A: {e}\n{traceback.format_exc()}")
+        return f"<h3>Rendering Error: {str(e)}</h3>"
+
+
+def render_scn_html(model, is_preview=False, for_pdf=False):
+    """Render the SCN model through scn.html."""
+    if not model:
+        return "<h3>No Case Data Loaded</h3>"
+
+    model = dict(model)
+    model['is_preview'] = is_preview
+
+    try:
+        # 1. Format Issues HTML from the centralized model
+        issues_html = ""
+        for issue in model.get('issues', []):
+            current_para_num = issue['index'] + 2 # Paras 1&2 are fixed, Issues start at 3
+
+            # No wrapper for the whole issue to avoid pagination truncation of multi-block content
+            issues_html += f"""
+            <div class="issue-header">
+                <table class="para-table">
+                    <tr>
+                        <td class="para-num">{current_para_num}.</td>
+                        <td class="para-content"><h3>Issue No. {issue['index']}: {issue['title']}</h3></td>
+                    </tr>
+                </table>
+            </div>
+            """
+
+            # Sub Paragraphs
+            sub_para_count = 1
+            for p_content in issue['paras']:
+                issues_html += f"""
+                <table class="para-table">
+                    <tr>
+                        <td class="para-num">{current_para_num}.{sub_para_count}</td>
+                        <td class="para-content">
+                            <p class="legal-para">{p_content}</p>
+                        </td>
+                    </tr>
+                </table>
+                """
+                sub_para_count += 1
+
+            # Table as Sub-Para (Unwrapped for pagination splitting)
+            if issue['table_html'] and issue['table_html'].strip():
+                issues_html += f"""
+                <table class="para-table">
+                    <tr>
+                        <td class="para-num">{current_para_num}.{sub_para_count}</td>
+                        <td class="para-content">
+                            <p class="legal-para">The details of the discrepancies are as follows:</p>
+                        </td>
+                    </tr>
+                </table>
+                {issue['table_html']}
+                """
+
+        model['issues_content'] = issues_html
+        model['issues_templates'] = issues_html
+
+        # Letterhead (read / encoded once per file version by render_assets)
+        model['letter_head'] = ""
+        if model.get('show_letterhead'):
+            try:
+                from src.utils.config_manager import ConfigManager
+                config = ConfigManager()
+                lh_filename = config.get_pdf_letterhead()
+                lh_path = config.get_letterhead_path('pdf')
+
+                if lh_path and os.path.exists(lh_path):
+                    # Fetch visual adjustments for this specific letterhead
+                    adj = config.get_letterhead_adjustments(lh_filename)
+                    # Previews reference the image file instead of inlining megabytes of base64
+                    model['letter_head'] = render_assets.letterhead_block(lh_path, adj, inline=not is_preview)
+            except Exception as e:
+                print(f"Letterhead failed: {e}")
+                model['letter_head'] = ""
+
+        model['section'] = model.get('initiating_section', '')
+        model['for_pdf'] = for_pdf
+
+        # CSS for SCN injection (since TemplateEngine doesn't do this yet)
+        model['base_css'] = render_assets.read_css('doc_base.css')
+        model['renderer_css'] = render_assets.read_css('doc_qt.css') if is_preview else ""
+        model['full_styles_html'] = f"<style>\n{model['base_css']}\n{model['renderer_css']}\n</style>"
+
+        from src.utils.template_engine import TemplateEngine
+        return TemplateEngine.render_document("scn.html", model)
+
+    except Exception as e:
+        print(f"Error rendering SCN: {e}")
+        traceback.print_exc()
+        return f"<h3>Render Error: {str(e)}</h3>"
+
+
+def write_pdf(html_content, output_path):
+    """WeasyPrint in this process; the file appears only once it is complete."""
+    from src.services.render_worker import render_html_to_pdf
+
+    out_dir = os.path.dirname(os.path.abspath(output_path))
+    os.makedirs(out_dir, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(suffix=".pdf", dir=out_dir)
+    os.close(fd)
+    try:
+        success, msg = render_html_to_pdf(html_content, tmp_path)
+        if not success:
+            raise RuntimeError("MISSING_DEPENDENCY" if msg == "MISSING_GTK_DEPENDENCY" else msg)
+        os.replace(tmp_path, output_path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def write_text(text, output_path):
+    out_dir = os.path.dirname(os.path.abspath(output_path))
+    os.makedirs(out_dir, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(suffix=os.path.splitext(output_path)[1], dir=out_dir)
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        f.write(text)
+    os.replace(tmp_path, output_path)
+
+
+class DocumentService:
+    """Builds notice models from the database and renders them; no Qt involved."""
+
+    def __init__(self, db=None):
+        if db is None:
+            from src.database.db_manager import DatabaseManager
+            db = DatabaseManager()
+        self.db = db
+
+    # ---- Shared lookups ----
+
+    def _proceeding(self, pid):
+        proceeding = self.db.get_proceeding(pid)
+        if not proceeding:
+            raise ValueError(f"Case {pid} not found")
+        return proceeding
+
+    @staticmethod
+    def _taxpayer(proceeding):
+        tp = _as_dict(proceeding.get('taxpayer_details'))
+        return {
+            'gstin': proceeding.get('gstin', '') or tp.get('GSTIN', ''),
+            'legal_name': proceeding.get('legal_name', '') or tp.get('Legal Name', ''),
+            'trade_name': proceeding.get('trade_name', '') or tp.get('Trade Name', ''),
+            'address': proceeding.get('address', '') or tp.get('Address', ''),
+        }
+
+    def _issue_template(self, record):
+        """The template an issue was drafted with: its saved snapshot, else the master."""
+        data = record.get('data') or {}
+        template = data.get('template_snapshot') or self.db.get_issue(record['issue_id']) or {}
+        template = copy.deepcopy(template)
+        # Table data adopted at drafting time (as IssueCard.load_data does)
+        table_data = data.get('table_data')
+        if table_data and not (template.get('grid_data') or template.get('tables')):
+            if isinstance(table_data, list) or ('rows' in table_data and 'columns' in table_data):
+                template['grid_data'] = table_data
+            else:
+                template.setdefault('tables', {}).update(table_data)
+        return template
+
+    @staticmethod
+    def _issue_variables(data, template):
+        for key in ('values', 'facts', 'variables'):
+            if isinstance(data.get(key), dict):
+                return dict(data[key])
+        return dict(template.get('variables', {}))
+
+    def _issue_title(self, issue_id, template):
+        master = self.db.get_issue(issue_id)
+        if master:
+            return master.get('issue_name', 'Unknown Issue')
+        raw_name = template.get('issue_name', '')
+        return raw_name if raw_name and raw_name != 'Issue' else "Issue Concerning Tax Liability"
+
+    @staticmethod
+    def _is_included(data):
+        return data.get('is_included', True) and data.get('status', 'ACTIVE') != 'DROPPED'
+
+    # ---- DRC-01A ----
+
+    def drc01a_model(self, pid):
+        """The DRC-01A model (as ProceedingsWorkspace._get_drc01a_model) from the saved draft."""
+        proceeding = self._proceeding(pid)
+        details = _as_dict(proceeding.get('additional_details'))
+        meta = details.get('drc01a_metadata') or {}
+
+        model = self._taxpayer(proceeding)
+        financial_year = proceeding.get('financial_year', '') or ''
+        oc_date = _display_date(meta.get('oc_date'))
+        model.update({
+            'case_id': proceeding.get('case_id', '') or '',
+            'oc_no': meta.get('oc_number', '') or '',
+            'oc_date': oc_date,
+            'issue_date': oc_date,
+            'financial_year': financial_year,
+            'form_type': proceeding.get('form_type', '') or 'DRC-01A',
+            'reply_date': _display_date(meta.get('reply_date') or proceeding.get('last_date_to_reply')),
+            'payment_date': _display_date(meta.get('payment_date')),
+            # Resolved section: prefer adjudication_section over initiating_section
+            'initiating_section': proceeding.get('adjudication_section') or proceeding.get('initiating_section') or '',
+        })
+
+        base = section_base(model['initiating_section'])
+        model['section_base'] = base
+        model['section_title'] = f"section {base}(5)"
+        model['section_body'] = f"{base}(5)"
+        model['sections_violated_html'] = "<i>Not specified</i>"
+
+        issues_html = ""
+        breakdowns = []
+        for record in self.db.get_case_issues(pid, stage='DRC-01A'):
+            data = record.get('data') or {}
+            if not self._is_included(data):
+                continue
+            template = self._issue_template(record)
+            variables = self._issue_variables(data, template)
+            issues_html += IssueRenderer.extract_html_body(data.get('content', ''))
+            issues_html += IssueRenderer.generate_table_html(template, variables)
+            issues_html += "<br><hr style='border: 1px dashed #eee;'><br>"
+            breakdown = data.get('tax_breakdown')
+            if breakdown is None:
+                breakdown = IssueRenderer.tax_breakdown(template, variables)
+            breakdowns.append(breakdown)
+        model['issues_html'] = issues_html
+
+        tax_rows, grand_total = aggregate_tax_rows(breakdowns, financial_year)
+        model['tax_rows'] = tax_rows
+        model['grand_total_liability'] = grand_total
+        model['tax_table_html'] = tax_table_html(tax_rows)
+        model['tax_period_from'] = f"01/04/{financial_year[:4]}" if financial_year else ""
+        model['tax_period_to'] = f"31/03/{financial_year[5:]}" if len(financial_year) > 5 else ""
+        model['advice_paragraph'] = drc01a_advice_paragraph(base, model['payment_date'])
+
+        officer = resolve_officer(proceeding, 'DRC-01A', self.db)
+        model['officer_name'] = officer.get('name', 'Proper Officer')
+        model['designation'] = officer.get('designation', 'Superintendent')
+        model['jurisdiction'] = officer.get('jurisdiction', 'Paravur Range')
+        return model
+
+    # ---- SCN ----
+
+    def scn_model(self, pid, use_snapshot=True):
+        """
+        The SCN model (as ProceedingsWorkspace._get_scn_model). The snapshot
+        saved with the SCN draft is used when present, since it also carries
+        the officer's edits to the issue narratives; otherwise the model is
+        rebuilt from the SCN-stage case_issues.
+        """
+        proceeding = self._proceeding(pid)
+        details = _as_dict(proceeding.get('additional_details'))
+        meta = details.get('scn_metadata') or {}
+        if use_snapshot and isinstance(meta.get('scn_model_snapshot'), dict):
+            return copy.deepcopy(meta['scn_model_snapshot'])
+
+        model = copy.deepcopy(proceeding)
+        model['additional_details'] = {k: v for k, v in details.items() if k != 'scn_metadata'}
+
+        try:
+            scn_date = datetime.datetime.strptime(str(meta.get('scn_date'))[:10], "%Y-%m-%d").date()
+        except ValueError:
+            scn_date = datetime.date.today()
+        model['issue_date'] = scn_date.strftime("%d/%m/%Y")
+        model['year'] = scn_date.year
+        model['current_financial_year'] = financial_year_of(scn_date)
+
+        model['oc_no'] = meta.get('scn_oc_number') or "____"
+        model['scn_no'] = meta.get('scn_number') or "____"
+        model['initiating_section'] = model.get('adjudication_section') or model.get('initiating_section', '') or "____"
+        model['section'] = model['initiating_section']
+
+        tp = _as_dict(proceeding.get('taxpayer_details'))
+        model['legal_name'] = tp.get('Legal Name', '') or model.get('legal_name', '')
+        model['trade_name'] = tp.get('Trade Name', '') or model.get('trade_name', '')
+        model['address'] = tp.get('Address', '') or model.get('address', '')
+        model['gstin'] = model.get('gstin', '')
+        model['constitution_of_business'] = tp.get('Constitution of Business', 'Registered')
+
+        officer = resolve_officer(proceeding, 'SCN', self.db)
+        model['officer_name'] = officer.get('name', "________________")
+        model['officer_designation'] = model['designation'] = officer.get('designation', "________________")
+        model['jurisdiction'] = officer.get('jurisdiction', "________________")
+
+        records = [r for r in self.db.get_case_issues(pid, stage='SCN') if self._is_included(r.get('data') or {})]
+        # Internal issue ids in the narratives are replaced by their sequence numbers
+        id_to_index = {r['issue_id']: str(idx) for idx, r in enumerate(records, start=1)}
+
+        issues, breakdowns = [], []
+        for idx, record in enumerate(records, start=1):
+            data = record.get('data') or {}
+            template = self._issue_template(record)
+            variables = self._issue_variables(data, template)
+            narrative = data.get('scn_content') or IssueRenderer.render_narrative(
+                record['issue_id'], template, variables, "SCN", proceeding)
+            narrative = re.sub(r'<p>\s*(&nbsp;)?\s*</p>', '', IssueRenderer.extract_html_body(narrative))
+            paras = re.findall(r'<p.*?>(.*?)</p>', narrative, re.DOTALL) or ([narrative] if narrative.strip() else [])
+            clean_paras = []
+            for p_content in paras:
+                clean_content = re.sub(r'\s+', ' ', p_content).strip()
+                if not clean_content:
+                    continue
+                for internal_id, seq_num in id_to_index.items():
+                    clean_content = re.sub(r'\b' + re.escape(internal_id) + r'\b', f"issue {seq_num}", clean_content)
+                clean_paras.append(clean_content)
+
+            issues.append({
+                'index': idx,
+                'title': self._issue_title(record['issue_id'], template),
+                'issue_id': record['issue_id'],
+                'paras': clean_paras,
+                'table_html': IssueRenderer.generate_table_html(template, variables),
+            })
+            breakdowns.append(IssueRenderer.tax_breakdown(template, variables))
+
+        tax_rows, _ = aggregate_tax_rows(breakdowns, model.get('financial_year', ''))
+        act_tax = {row['act']: row['tax'] for row in tax_rows}
+        total_tax = sum(act_tax.values())
+
+        model['issues'] = issues
+        model['total_tax_val'] = total_tax
+        model['igst_total_val'] = act_tax.get('IGST', 0)
+        model['cgst_total_val'] = act_tax.get('CGST', 0)
+        model['sgst_total_val'] = act_tax.get('SGST', 0)
+        model['total_amount'] = format_indian_currency(total_tax)
+        model['igst_total'] = format_indian_currency(model['igst_total_val'])
+        model['cgst_total'] = format_indian_currency(model['cgst_total_val'])
+        model['sgst_total'] = format_indian_currency(model['sgst_total_val'])
+        model.update(scn_paragraph_numbers(len(issues)))
+
+        model['reliance_documents'] = _html_lines(meta.get('reliance_documents'))
+        model['copy_submitted_to'] = _html_lines(meta.get('copy_submitted_to'))
+        model['show_letterhead'] = False
+        model['intro_narrative'] = scn_intro_narrative(proceeding)
+        model['demand_text'] = meta.get('demand_text') or "<p>No demand details generated.</p>"
+        model['tax_table_html'] = tax_table_html(tax_rows)
+        return model
+
+    # ---- ASMT-10 ----
+
+    def asmt10_html(self, pid, for_pdf=True):
+        """ASMT-10 of a scrutiny case, or of the scrutiny case an adjudication came from."""
+        from src.services.asmt10_generator import ASMT10Generator
+
+        proceeding = self._proceeding(pid)
+        scrutiny_id = proceeding.get('source_scrutiny_id') or proceeding.get('scrutiny_id')
+        if not scrutiny_id and proceeding.get('source_type') == 'SCRUTINY':
+            scrutiny_id = pid
+        scrutiny_data = self.db.get_scrutiny_case_data(scrutiny_id) if scrutiny_id else None
+        if not scrutiny_data:
+            raise ValueError(f"No ASMT-10 linked to case {pid}")
+
+        issues = scrutiny_data.get('selected_issues', [])
+        if isinstance(issues, dict) and 'issues' in issues:
+            issues = issues['issues']
+        data = {
+            'case_id': scrutiny_data.get('case_id'),
+            'financial_year': scrutiny_data.get('financial_year'),
+            'section': scrutiny_data.get('section'),
+            'notice_date': scrutiny_data.get('asmt10_finalised_on', '-'),
+            'oc_number': scrutiny_data.get('oc_number', 'DRAFT'),
+            'last_date_to_reply': scrutiny_data.get('last_date_to_reply', 'N/A'),
+            'taxpayer_details': scrutiny_data.get('taxpayer_details', {}),
+            'gstin': scrutiny_data.get('gstin'),
+        }
+        return ASMT10Generator.generate_html(data, issues, for_pdf=for_pdf)
+
+    # ---- Output ----
+
+    def render_html(self, doc_type, pid, for_pdf=True):
+        """HTML of one document; doc_type is 'ASMT-10', 'DRC-01A' or 'SCN'."""
+        if doc_type == 'ASMT-10':
+            return self.asmt10_html(pid, for_pdf=for_pdf)
+        if doc_type == 'DRC-01A':
+            return render_drc01a_html(self.drc01a_model(pid))
+        if doc_type == 'SCN':
+            return render_scn_html(self.scn_model(pid), for_pdf=for_pdf)
+        raise ValueError(f"Unknown document type: {doc_type}")
+
+    def render_pdf(self, doc_type, pid, output_path):
+        write_pdf(self.render_html(doc_type, pid, for_pdf=True), output_path)
+        return output_path
+
+
+# ---- Command line ----
+
+_service = None
+
+
+def _init_worker(db_path):
+    global _service
+    db = None
+    if db_path:
+        from src.database.db_manager import DatabaseManager
+        db = DatabaseManager(db_path)
+    _service = DocumentService(db)
+
+
+def _generate(doc_type, pid, fmt, out_dir):
+    """One document in a worker process -> (pid, path, error)."""
+    from src.services.export_jobs import describe_error
+
+    path = os.path.join(out_dir, f"{doc_type}_{re.sub(r'[^A-Za-z0-9_-]', '_', str(pid))}.{fmt}")
+    try:
+        if fmt == "pdf":
+            _service.render_pdf(doc_type, pid, path)
+        else:
+            write_text(_service.render_html(doc_type, pid, for_pdf=False), path)
+        return pid, path, None
+    except Exception as e:
+        return pid, None, describe_error(e)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Regenerate ASMT-10 / DRC-01A / SCN documents without the GUI")
+    parser.add_argument("doc", choices=sorted(DOC_TYPES), help="Document to generate")
+    parser.add_argument("ids", nargs="*", help="Case ids")
+    parser.add_argument("--all", action="store_true", help="Every case that has this document")
+    parser.add_argument("--format", choices=["pdf", "html"], default="pdf")
+    parser.add_argument("--out", default="exports", help="Output directory")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 2)
+    parser.add_argument("--db", help="Database file (default: data/adjudication.db)")
+    args = parser.parse_args(argv)
+
+    doc_type = DOC_TYPES[args.doc]
+    ids = list(args.ids)
+    if args.all:
+        _init_worker(args.db)
+        ids += [pid for pid in _service.db.get_document_case_ids(doc_type) if pid not in ids]
+    if not ids:
+        if args.all:
+            # Nothing to regenerate is not a failure
+            print(f"No cases have a {doc_type} document.")
+            return 0
+        print("No cases given (pass case ids or --all).")
+        return 1
+
+    failures = 0
+    with ProcessPoolExecutor(max_workers=max(1, min(args.workers, len(ids))),
+                             initializer=_init_worker, initargs=(args.db,)) as pool:
+        futures = [pool.submit(_generate, doc_type, pid, args.format, args.out) for pid in ids]
+        for future in as_completed(futures):
+            pid, path, error = future.result()
+            if error:
+                failures += 1
+                print(f"[FAILED] {doc_type} {pid}: {error}")
+            else:
+                print(f"[OK] {doc_type} {pid}: {path}")
+    print(f"{len(ids) - failures} of {len(ids)} documents generated.")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,252 @@
+"""
+Streaming reader for E-Way Bill portal exports (SOP Point 6).
+
+A year of e-way bills runs to hundreds of thousands of rows, so the export is
+never loaded whole. CSV files are read with pandas in chunks, and XLSX
+sheets are read row by row through openpyxl's read-only mode and batched
+into chunks. Each chunk is reduced to per-month and per-counterparty sums
+and then discarded. Memory therefore depends on the number of months and
+counterparties, not on the number of bills.
+
+Only outward, non-cancelled bills are counted, where the export carries
+those columns, and only those dated in the case's financial year when one
+is given. Column headers are matched loosely because the portal
+reports differ ("Taxable Value" / "Assessable Value", "To GSTIN" /
+"Other Party GSTIN", ...).
+"""
+import csv
+import os
+from collections import defaultdict
+
+import pandas as pd
+
+from src.utils.date_utils import fy_months
+
+CHUNK_ROWS = 50000
+HEADER_SCAN_ROWS = 25
+
+AMOUNT_FIELDS = ("taxable", "cgst", "sgst", "igst", "cess")
+
+
+def _find(headers, *keyword_sets, exclude=()):
+    """Index of the first header containing every keyword of the earliest matching set."""
+    for keywords in keyword_sets:
+        for i, h in enumerate(headers):
+            if all(k in h for k in keywords) and not any(x in h for x in exclude):
+                return i
+    return None
+
+
+def map_columns(raw_headers):
+    """
+    Role -> column index for an export's header row. Returns None if the row
+    does not look like an e-way bill header (no date or no value column).
+    """
+    headers = [str(h or "").strip().lower() for h in raw_headers]
+    cols = {
+        "date": _find(headers, ("doc", "date"), ("document", "date"), ("invoice", "date"), ("ewb", "date"),
+                      ("eway", "date"), ("e-way", "date"), ("date",), exclude=("valid", "upto", "cancel")),
+        "gstin": _find(headers, ("to", "gstin"), ("other", "party", "gstin"), ("recipient", "gstin"),
+                       ("buyer", "gstin"), ("gstin",), exclude=("from", "supplier", "generat", "transporter")),
+        "taxable": _find(headers, ("taxable",), ("assessable",)),
+        "cgst": _find(headers, ("cgst",)),
+        "sgst": _find(headers, ("sgst",), ("utgst",)),
+        "igst": _find(headers, ("igst",)),
+        "cess": _find(headers, ("cess",), exclude=("non",)),
+        "total_tax": _find(headers, ("total", "tax"), exclude=("taxable", "invoice")),
+        "supply_type": _find(headers, ("supply", "type")),
+        "status": _find(headers, ("status",)),
+    }
+    if cols["date"] is None or (cols["taxable"] is None and cols["total_tax"] is None and cols["igst"] is None):
+        return None
+    return {role: idx for role, idx in cols.items() if idx is not None}
+
+
+def _empty_totals():
+    return {field: 0.0 for field in AMOUNT_FIELDS + ("tax", "bills")}
+
+
+# Portal exports use day-first dates; ISO forms come from Excel date cells
+DATE_FORMATS = ("%d/%m/%Y %I:%M:%S %p", "%d/%m/%Y %H:%M:%S", "%d/%m/%Y %H:%M", "%d/%m/%Y",
+                "%d-%m-%Y %H:%M:%S", "%d-%m-%Y", "%Y-%m-%d %H:%M:%S", "%Y-%m-%d", "%d-%b-%Y", "%d-%b-%y")
+
+
+def parse_dates(series):
+    """
+    Parses each distinct value once (a year of invoices has only a few
+    hundred dates), vectorised over the known formats; only leftovers fall
+    back to per-value parsing.
+    """
+    text = series.astype(str).str.strip()
+    distinct = pd.Series(text.unique())
+    parsed = pd.Series(pd.NaT, index=distinct.index, dtype="datetime64[ns]")
+    for fmt in DATE_FORMATS:
+        missing = parsed.isna()
+        if not missing.any():
+            break
+        parsed[missing] = pd.to_datetime(distinct[missing], format=fmt, errors="coerce")
+    missing = parsed.isna()
+    if missing.any():
+        parsed[missing] = pd.to_datetime(distinct[missing], format="mixed", dayfirst=True, errors="coerce")
+    return text.map(pd.Series(parsed.values, index=distinct.values)).astype("datetime64[ns]")
+
+
+def parse_amounts(series):
+    """Numbers as-is; only text amounts ('1,23,456.00') go through string cleaning."""
+    values = pd.to_numeric(series, errors="coerce")
+    text = values.isna() & series.notna()
+    if text.any():
+        cleaned = series[text].astype(str).str.replace(",", "", regex=False).str.strip()
+        values[text] = pd.to_numeric(cleaned, errors="coerce")
+    return values.fillna(0.0).astype(float)
+
+
+class EwayBillAggregate:
+    """Running per-month / per-counterparty sums fed one chunk at a time."""
+
+    def __init__(self, months=None):
+        self.months = defaultdict(_empty_totals)
+        self.counterparties = defaultdict(_empty_totals)
+        self.totals = _empty_totals()
+        self.skipped = {"cancelled": 0, "inward": 0, "undated": 0, "outside_fy": 0}
+        self.rows = 0
+        # 'YYYY-MM' months to keep; None keeps every dated bill
+        self.period = set(months) if months else None
+
+    def add_chunk(self, df, cols):
+        self.rows += len(df)
+        if "status" in cols:
+            cancelled = df.iloc[:, cols["status"]].astype(str).str.lower().str.contains("cancel|cnl", na=False)
+            self.skipped["cancelled"] += int(cancelled.sum())
+            df = df[~cancelled]
+        if "supply_type" in cols:
+            inward = df.iloc[:, cols["supply_type"]].astype(str).str.lower().str.startswith("in")
+            self.skipped["inward"] += int(inward.sum())
+            df = df[~inward]
+        if df.empty:
+            return
+
+        frame = pd.DataFrame(index=df.index)
+        dates = parse_dates(df.iloc[:, cols["date"]])
+        frame["month"] = dates.dt.strftime("%Y-%m")
+        frame["gstin"] = (df.iloc[:, cols["gstin"]].astype(str).str.strip().str.upper()
+                          if "gstin" in cols else "")
+        for field in AMOUNT_FIELDS:
+            frame[field] = parse_amounts(df.iloc[:, cols[field]]) if field in cols else 0.0
+        heads = frame["cgst"] + frame["sgst"] + frame["igst"] + frame["cess"]
+        if "total_tax" in cols:
+            # Exports without the tax split only carry a total
+            heads = heads.where(heads != 0, parse_amounts(df.iloc[:, cols["total_tax"]]))
+        frame["tax"] = heads
+        frame["bills"] = 1
+
+        undated = frame["month"].isna()
+        self.skipped["undated"] += int(undated.sum())
+        frame = frame[~undated]
+        if self.period is not None:
+            inside = frame["month"].isin(self.period)
+            self.skipped["outside_fy"] += int((~inside).sum())
+            frame = frame[inside]
+
+        sums = list(AMOUNT_FIELDS) + ["tax", "bills"]
+        self._merge(self.months, frame.groupby("month")[sums].sum())
+        self._merge(self.counterparties, frame.groupby("gstin")[sums].sum())
+        for field in sums:
+            self.totals[field] += float(frame[field].sum())
+
+    @staticmethod
+    def _merge(target, grouped):
+        for key, row in grouped.iterrows():
+            bucket = target[key]
+            for field, value in row.items():
+                bucket[field] += float(value)
+
+    def result(self):
+        return {
+            "total_taxable": round(self.totals["taxable"], 2),
+            "total_tax": round(self.totals["tax"], 2),
+            "totals": dict(self.totals),
+            "months": {k: dict(v) for k, v in sorted(self.months.items())},
+            "counterparties": {k: dict(v) for k, v in self.counterparties.items()},
+            "skipped": dict(self.skipped),
+            "rows": self.rows,
+        }
+
+
+def _csv_chunks(file_path, chunk_rows):
+    with open(file_path, newline="", encoding="utf-8-sig", errors="replace") as f:
+        head = [row for _, row in zip(range(HEADER_SCAN_ROWS), csv.reader(f))]
+    for skip, row in enumerate(head):
+        cols = map_columns(row)
+        if cols:
+            break
+    else:
+        raise ValueError("E-Way Bill header row not found")
+    reader = pd.read_csv(file_path, skiprows=skip, header=0, dtype=str, chunksize=chunk_rows,
+                         encoding="utf-8-sig", encoding_errors="replace", on_bad_lines="skip")
+    for chunk in reader:
+        yield chunk, cols
+
+
+def _xlsx_chunks(file_path, chunk_rows):
+    import openpyxl
+    wb = openpyxl.load_workbook(file_path, read_only=True, data_only=True)
+    try:
+        for ws in wb.worksheets:
+            rows = ws.iter_rows(values_only=True)
+            cols = None
+            for _, row in zip(range(HEADER_SCAN_ROWS), rows):
+                cols = map_columns(row)
+                if cols:
+                    width = len(row)
+                    break
+            if not cols:
+                continue  # Not an e-way bill sheet
+            batch = []
+            for row in rows:
+                if row and any(v is not None for v in row):
+                    batch.append((list(row) + [None] * width)[:width])
+                if len(batch) >= chunk_rows:
+                    yield pd.DataFrame(batch), cols
+                    batch = []
+            if batch:
+                yield pd.DataFrame(batch), cols
+            return
+        raise ValueError("E-Way Bill header row not found")
+    finally:
+        wb.close()
+
+
+def _xls_chunks(file_path, chunk_rows):
+    # Legacy .xls has no streaming reader: load once, then reduce in chunks
+    raw = pd.read_excel(file_path, header=None, dtype=str)
+    for skip in range(min(HEADER_SCAN_ROWS, len(raw))):
+        cols = map_columns(raw.iloc[skip].tolist())
+        if cols:
+            break
+    else:
+        raise ValueError("E-Way Bill header row not found")
+    body = raw.iloc[skip + 1:]
+    for start in range(0, len(body), chunk_rows):
+        yield body.iloc[start:start + chunk_rows], cols
+
+
+def aggregate_eway_bills(file_path, chunk_rows=CHUNK_ROWS, fy=None):
+    """
+    Per-month and per-counterparty totals of an e-way bill export (CSV, XLSX
+    or XLS). Months are 'YYYY-MM' keys of the document date. With fy
+    ('2023-24'), bills dated outside that year are left out and counted in
+    skipped['outside_fy']. Raises ValueError if no e-way bill header is found.
+    """
+    ext = os.path.splitext(file_path)[1].lower()
+    if ext in (".csv", ".txt"):
+        chunks = _csv_chunks(file_path, chunk_rows)
+    elif ext == ".xls":
+        chunks = _xls_chunks(file_path, chunk_rows)
+    else:
+        chunks = _xlsx_chunks(file_path, chunk_rows)
+
+    agg = EwayBillAggregate(fy_months(fy) if fy else None)
+    for chunk, cols in chunks:
+        agg.add_chunk(chunk, cols)
+    return agg.result()
@@ -0,0 +1,170 @@
+"""
+Background queue for document exports (PDF via the isolated render worker,
+DOCX / Word files via a builder function).
+
+Each job freezes its input when it is submitted - the HTML snapshot for a PDF,
+the model captured by the builder for a DOCX - so the officer can keep editing
+while it renders, and a retry re-renders exactly the same document. Output is
+written next to the target and moved into place only when complete.
+
+The queue is GUI-agnostic: listeners are called from worker threads and the
+Qt layer (src/ui/components/export_job_manager.py) marshals them back to the
+GUI thread.
+"""
+import itertools
+import os
+import shutil
+import tempfile
+import threading
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+
+def describe_error(error):
+    """Officer-facing message for a failed render."""
+    err_str = str(error)
+    if "MISSING_DEPENDENCY" in err_str:
+        return ("PDF Generation Unavailable. The system is missing required rendering "
+                "libraries (GTK3). Install the dependencies or use the Word export instead.")
+    if "TIMEOUT" in err_str:
+        return "PDF generation took too long (20s limit) and was cancelled for safety."
+    if "FEATURE_DISABLED" in err_str:
+        return "PDF rendering is disabled in Settings."
+    return err_str or "File generation failed without error message."
+
+
+class ExportJob:
+    """One export: its frozen input, target path and current state."""
+
+    def __init__(self, job_id, title, output_path, html=None, build=None):
+        self.id = job_id
+        self.title = title
+        self.output_path = output_path
+        self.kind = "pdf" if html is not None else os.path.splitext(output_path)[1].lstrip(".").lower()
+        self.html = html
+        self.build = build
+        self.status = QUEUED
+        self.error = None
+        self.attempts = 0
+        self.submitted_at = time.time()
+        self.finished_at = None
+
+    @property
+    def is_active(self):
+        return self.status in (QUEUED, RUNNING)
+
+
+class ExportJobQueue:
+    """
+    Runs export jobs on a small worker pool so several can be in flight.
+    listener(job) is called on every state change, from a worker thread.
+    """
+
+    def __init__(self, max_workers=2, listener=None):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="export")
+        self._jobs = {}
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self.listener = listener
+
+    def submit_pdf(self, title, html_content, output_path):
+        """Queues a PDF render of html_content (kept as the retry snapshot)."""
+        return self._submit(ExportJob(next(self._ids), title, output_path, html=html_content))
+
+    def submit_file(self, title, build, output_path):
+        """Queues build(path), which must write the complete file to path."""
+        return self._submit(ExportJob(next(self._ids), title, output_path, build=build))
+
+    def retry(self, job_id):
+        """Re-runs a failed job from its original snapshot. Returns the job, or None."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or job.status != FAILED:
+                return None
+            job.status, job.error, job.finished_at = QUEUED, None, None
+        self._notify(job)
+        self._executor.submit(self._run, job)
+        return job
+
+    def jobs(self):
+        with self._lock:
+            return list(self._jobs.values())
+
+    def get(self, job_id):
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def active_count(self):
+        with self._lock:
+            return sum(1 for job in self._jobs.values() if job.is_active)
+
+    def clear_finished(self):
+        with self._lock:
+            for job_id in [j.id for j in self._jobs.values() if j.status == DONE]:
+                del self._jobs[job_id]
+
+    def shutdown(self, wait=False):
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+
+    def _submit(self, job):
+        with self._lock:
+            self._jobs[job.id] = job
+        self._notify(job)
+        self._executor.submit(self._run, job)
+        return job
+
+    def _notify(self, job):
+        if self.listener:
+            try:
+                self.listener(job)
+            except Exception as e:
+                print(f"Export listener error: {e}")
+
+    def _run(self, job):
+        with self._lock:
+            job.status = RUNNING
+            job.attempts += 1
+        self._notify(job)
+        try:
+            if job.html is not None:
+                self._render_pdf(job)
+            else:
+                self._build_file(job)
+            status, error = DONE, None
+        except Exception as e:
+            traceback.print_exc()
+            status, error = FAILED, describe_error(e)
+        with self._lock:
+            job.status, job.error, job.finished_at = status, error, time.time()
+        self._notify(job)
+
+    def _render_pdf(self, job):
+        from src.utils.document_generator import DocumentGenerator
+        base = os.path.splitext(os.path.basename(job.output_path))[0]
+        # Job id in the scratch name so parallel renders of the same document don't collide
+        generated_path = DocumentGenerator().generate_pdf_from_html(job.html, f"{base}_job{job.id}")
+        if not generated_path or not os.path.exists(generated_path):
+            raise RuntimeError("File generation failed without error message.")
+        out_dir = os.path.dirname(os.path.abspath(job.output_path))
+        os.makedirs(out_dir, exist_ok=True)
+        shutil.move(generated_path, job.output_path)
+
+    def _build_file(self, job):
+        out_dir = os.path.dirname(os.path.abspath(job.output_path))
+        fd, tmp_path = tempfile.mkstemp(suffix=os.path.splitext(job.output_path)[1], dir=out_dir)
+        os.close(fd)
+        try:
+            job.build(tmp_path)
+            os.replace(tmp_path, job.output_path)
+        except BaseException:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
@@ -0,0 +1,511 @@
+import os
+import re
+import logging
+import fitz  # PyMuPDF
+
+from src.utils.pdf_parsers import _clean_amount
+
+logger = logging.getLogger("gstr9_document")
+
+# Official headings of the GSTR-9 tables (Form GSTR-9, Rule 80).
+# Used to anchor tables by their serial number on the page.
+GSTR9_TABLE_TITLES = {
+    "4": "Details of advances, inward and outward supplies made during the financial year on which tax is payable",
+    "5": "Details of Outward supplies made during the financial year on which tax is not payable",
+    "6": "Details of ITC availed during the financial year",
+    "7": "Details of ITC Reversed and Ineligible ITC for the financial year",
+    "8": "Other ITC related information",
+    "9": "Details of tax paid as declared in returns filed during the financial year",
+    "10": "Supplies / tax declared through Amendments (+) (net of debit notes)",
+    "11": "Supplies / tax reduced through Amendments (-) (net of credit notes)",
+    "12": "Reversal of ITC availed during previous financial year",
+    "13": "ITC availed for the previous financial year",
+    "14": "Differential tax paid on account of declaration in 10 & 11 above",
+    "15": "Particulars of Demands and Refunds",
+    "16": "Information on supplies received from composition taxpayers, deemed supply and goods sent on approval basis",
+    "17": "HSN Wise Summary of outward supplies",
+    "18": "HSN Wise Summary of Inward supplies",
+    "19": "Late fee payable and paid",
+}
+
+# Tables 10-13 are printed as a single value row against the serial number.
+SINGLE_ROW_TABLES = {"10", "11", "12", "13"}
+
+# By default the walk stops before the HSN summaries (17/18), which can run
+# to hundreds of pages and are not needed by any SOP today.
+DEFAULT_UPTO_TABLE = "16"
+
+# Header keyword -> value key. First hit wins, so order matters
+# (Table 9 prints "Tax Payable" / "Paid Through Cash" / "Paid Through ITC"
+# above the heads; Tables 14 and 19 only have "Payable" and "Paid").
+_HEAD_KEYWORDS = [
+    ("payable", "tax_payable"),
+    ("paid through cash", "paid_cash"),
+    ("taxable", "taxable_value"),
+    ("central", "cgst"),
+    ("state", "sgst"),
+    ("integrated", "igst"),
+    ("cess", "cess"),
+    ("interest", "interest"),
+    ("penalty", "penalty"),
+    ("late fee", "late_fee"),
+    ("paid", "tax_paid"),
+    ("type", "type"),
+]
+
+_LABEL_RE = re.compile(r"[A-Z]\d?|\d{1,2}")
+# "17. HSN Wise Summary of outward supplies." is printed as one span
+_TABLE_HEADING_RE = re.compile(r"(\d{1,2})\.\s+\S")
+_AMOUNT_RE = re.compile(r"-?[\d,]+(?:\.\d+)?")
+_GSTIN_RE = re.compile(r"[0-9]{2}[A-Z]{5}[0-9]{4}[A-Z][1-9A-Z]Z[0-9A-Z]")
+
+_LABEL_X_MAX = 80      # Serial numbers / row letters sit in the left margin
+_ROW_Y_TOLERANCE = 3   # Spans within this many points share a visual row
+_EDGE_TOLERANCE = 6    # Right-aligned amounts in one column share an x1
+
+# Parsed documents keyed by (abs path, mtime, size)
+_GSTR9_DOC_CACHE = {}
+
+
+class GSTR9Document:
+    """
+    Page-anchored model of a GSTR-9 (Annual Return) PDF.
+
+    The PDF is opened once and walked page by page using the span layout
+    (``page.get_text("dict")``) instead of a regex over the concatenated text.
+    Tables are anchored by their serial number in the left margin, rows by
+    their letter (A, B, ... H1), and amounts are assigned to value heads by
+    the right edge of each span (all amounts in GSTR-9 are right-aligned).
+
+    tables = {
+        "8": {
+            "title": "Other ITC related information",
+            "pages": [5],
+            "rows": [ {label, description, values: {cgst, sgst, igst, cess}, types: {...}} ],
+            "index": {"A": row, "B": row, ...}
+        }, ...
+    }
+    """
+
+    def __init__(self, file_path, upto_table=DEFAULT_UPTO_TABLE):
+        self.file_path = file_path
+        self.upto_table = upto_table
+        self.metadata = {"gstin": None, "fy": None, "legal_name": None,
+                         "trade_name": None, "arn": None, "filing_date": None}
+        self.tables = {}
+        self.page_count = 0
+        self.complete = False
+
+        # Walk state
+        self._page_idx = 0
+        self._table = None
+        self._row = None
+        self._layout = None
+        self._layout_page = None
+        self._in_header = False
+        self._header_rows = []
+        self._segment_rows = []
+
+        self._load()
+
+    # ------------------------------------------------------------------
+    # Public accessors
+    # ------------------------------------------------------------------
+    def table(self, table_no):
+        return self.tables.get(str(table_no))
+
+    def row(self, table_no, label):
+        tbl = self.table(table_no)
+        if not tbl:
+            return None
+        return tbl["index"].get(label)
+
+    def values(self, table_no, label, heads=("cgst", "sgst", "igst", "cess"), row_type=None):
+        """
+        Returns {head: float} for a table row, defaulting missing heads to 0.0.
+        ``row_type`` selects a Table 6 sub-row (e.g. "Inputs", "Capital Goods").
+        """
+        row = self.row(table_no, label)
+        src = {}
+        if row:
+            src = row["types"].get(row_type, {}) if row_type else row["values"]
+        return {h: float(src.get(h, 0.0)) for h in heads}
+
+    def covers(self, table_no):
+        """True if the walk went far enough to have seen the whole table."""
+        if self.complete or self.upto_table is None:
+            return True
+        return int(table_no) <= int(self.upto_table)
+
+    # ------------------------------------------------------------------
+    # Page walk
+    # ------------------------------------------------------------------
+    def _load(self):
+        doc = fitz.open(self.file_path)
+        try:
+            self.page_count = len(doc)
+            for page_idx in range(self.page_count):
+                self._page_idx = page_idx
+                spans = self._page_spans(doc[page_idx])
+                if page_idx == 0:
+                    self._read_metadata(spans)
+                self._walk_page(page_idx, spans)
+                self._close_segment()
+
+                if self.upto_table and self._table and int(self._table["no"]) > int(self.upto_table):
+                    break
+            else:
+                self.complete = True
+        finally:
+            doc.close()
+
+        self._finalize_rows()
+
+    @staticmethod
+    def _page_spans(page):
+        spans = []
+        for block in page.get_text("dict", flags=fitz.TEXTFLAGS_TEXT).get("blocks", []):
+            for line in block.get("lines", []):
+                for span in line.get("spans", []):
+                    text = span.get("text", "").strip()
+                    x0, y0, x1, y1 = span["bbox"]
+                    # Skip empty spans and the off-page "FINAL" watermark
+                    if not text or y0 < 0:
+                        continue
+                    spans.append((x0, y0, x1, y1, text))
+        return spans
+
+    @staticmethod
+    def _visual_rows(spans):
+        rows = []
+        current = []
+        current_y = None
+        for span in sorted(spans, key=lambda s: (s[1], s[0])):
+            if current_y is not None and span[1] - current_y > _ROW_Y_TOLERANCE:
+                rows.append(sorted(current, key=lambda s: s[0]))
+                current = []
+            if not current:
+                current_y = span[1]
+            current.append(span)
+        if current:
+            rows.append(sorted(current, key=lambda s: s[0]))
+        return rows
+
+    def _read_metadata(self, spans):
+        keys = [
+            ("financial year", "fy"),
+            ("gstin", "gstin"),
+            ("legal name", "legal_name"),
+            ("trade name", "trade_name"),
+            ("arn", "arn"),
+            ("date of filing", "filing_date"),
+        ]
+        last_key = None
+        for vrow in self._visual_rows(spans):
+            first = vrow[0][4]
+            if first.startswith("Pt."):
+                break
+            label = first.lower()
+            value = " ".join(s[4] for s in vrow[1:]).strip()
+            matched = next((k for kw, k in keys if kw in label), None)
+            if matched:
+                last_key = matched
+                if value:
+                    self.metadata[matched] = value
+            elif last_key == "legal_name" and vrow[0][0] > _LABEL_X_MAX:
+                # Legal name wraps onto the next line in the value column
+                self.metadata["legal_name"] = f"{self.metadata['legal_name'] or ''} {first}".strip()
+
+        gstin = self.metadata.get("gstin")
+        if gstin:
+            m = _GSTIN_RE.search(gstin.upper())
+            self.metadata["gstin"] = m.group(0) if m else None
+
+    def _walk_page(self, page_idx, spans):
+        for vrow in self._visual_rows(spans):
+            first = vrow[0][4]
+
+            if first.startswith("Verification"):
+                # Signature block: nothing tabular follows
+                self._close_segment()
+                self._table = None
+                self._row = None
+                break
+
+            heading = _TABLE_HEADING_RE.match(first)
+            if heading and vrow[0][0] < _LABEL_X_MAX and heading.group(1) in GSTR9_TABLE_TITLES:
+                self._open_table(heading.group(1))
+                continue
+
+            if first.startswith("Pt.") or first.startswith("Sr.No"):
+                self._close_segment()
+                self._in_header = True
+                self._header_rows = [vrow] if first.startswith("Sr.No") else []
+                continue
+
+            if self._is_column_number_row(vrow):
+                self._set_layout(page_idx, vrow)
+                continue
+
+            label = None
+            if vrow[0][0] < _LABEL_X_MAX and _LABEL_RE.fullmatch(first):
+                label = first
+            body = vrow[1:] if label else vrow
+            amounts = [s for s in body if _AMOUNT_RE.fullmatch(s[4])]
+            texts = [s for s in body if not _AMOUNT_RE.fullmatch(s[4])]
+
+            if label and label.isdigit() and label in GSTR9_TABLE_TITLES and (not amounts or label in SINGLE_ROW_TABLES):
+                self._open_table(label)
+                if label in SINGLE_ROW_TABLES:
+                    self._open_row(label, texts, amounts)
+                elif self._in_header:
+                    # Table 9 prints its column captions on the serial-number line
+                    self._header_rows.append(vrow)
+                continue
+
+            if self._in_header:
+                self._header_rows.append(vrow)
+                continue
+
+            if self._table is None:
+                continue
+
+            if label:
+                self._open_row(label, texts, amounts)
+            elif amounts:
+                type_spans, desc_spans = self._split_type_spans(texts)
+                if type_spans and self._row is not None:
+                    self._open_sub_row(type_spans, amounts)
+                else:
+                    self._open_row(None, desc_spans, amounts)
+            elif self._row is not None:
+                # Wrapped description or wrapped Type caption ("Capital" / "Goods")
+                type_spans, desc_spans = self._split_type_spans(texts)
+                if type_spans and self._row["_subs"]:
+                    self._rename_last_type(" ".join(s[4] for s in type_spans))
+                if desc_spans:
+                    self._row["description"] = f"{self._row['description']} {' '.join(s[4] for s in desc_spans)}".strip()
+
+    @staticmethod
+    def _is_column_number_row(vrow):
+        if len(vrow) < 3:
+            return False
+        return [s[4] for s in vrow] == [str(i) for i in range(1, len(vrow) + 1)]
+
+    # ------------------------------------------------------------------
+    # Column layout
+    # ------------------------------------------------------------------
+    def _set_layout(self, page_idx, number_row):
+        self._close_segment()
+        centers = [((s[0] + s[2]) / 2) for s in number_row]
+        captions = [""] * len(centers)
+        for vrow in self._header_rows:
+            for s in vrow:
+                if s[0] < _LABEL_X_MAX and _LABEL_RE.fullmatch(s[4]):
+                    continue
+                mid = (s[0] + s[2]) / 2
+                col = min(range(len(centers)), key=lambda i: abs(centers[i] - mid))
+                captions[col] = f"{captions[col]} {s[4]}".strip()
+
+        columns = []
+        type_center = None
+        for idx, caption in enumerate(captions):
+            if idx == 0:
+                continue  # Column 1 is always the description
+            low = caption.lower()
+            key = next((k for kw, k in _HEAD_KEYWORDS if kw in low), None)
+            if key == "type":
+                type_center = centers[idx]
+                continue
+            columns.append({"key": key or f"col{idx + 1}", "center": centers[idx], "edge": None})
+
+        if any("through itc" in c.lower() for c in captions):
+            # Table 9: the tax heads are the "Paid Through ITC" columns
+            for col in columns:
+                if col["key"] in ("cgst", "sgst", "igst", "cess"):
+                    col["key"] = f"itc_{col['key']}"
+
+        self._layout = {"columns": columns, "type_center": type_center, "desc_center": centers[0]}
+        self._layout_page = page_idx
+        self._in_header = False
+        self._header_rows = []
+
+    def _split_type_spans(self, texts):
+        if not self._layout or self._layout.get("type_center") is None:
+            return [], texts
+        t_center = self._layout["type_center"]
+        d_center = self._layout["desc_center"]
+        type_spans, desc_spans = [], []
+        for s in texts:
+            mid = (s[0] + s[2]) / 2
+            # Descriptions are left-aligned and long; compare the start edge too
+            if abs(mid - t_center) < abs(mid - d_center) and s[0] > d_center:
+                type_spans.append(s)
+            else:
+                desc_spans.append(s)
+        return type_spans, desc_spans
+
+    # ------------------------------------------------------------------
+    # Tables / rows
+    # ------------------------------------------------------------------
+    def _open_table(self, table_no):
+        self._close_segment()
+        tbl = self.tables.get(table_no)
+        if tbl is None:
+            tbl = {"no": table_no, "title": GSTR9_TABLE_TITLES[table_no], "pages": [], "rows": [], "index": {}}
+            self.tables[table_no] = tbl
+        self._table = tbl
+        self._row = None
+        self._note_page()
+
+    def _open_row(self, label, texts, amounts):
+        if self._table is None:
+            return
+        type_spans, desc_spans = self._split_type_spans(texts)
+        row = {
+            "label": label,
+            "description": " ".join(s[4] for s in desc_spans).strip(),
+            "values": {},
+            "types": {},
+            "_subs": [],
+            "_cells": [],
+        }
+        self._table["rows"].append(row)
+        if label:
+            self._table["index"][label] = row
+        self._row = row
+        if type_spans:
+            # Table 6 rows carry their first Type on the lettered line
+            self._open_sub_row(type_spans, amounts)
+            return
+        row["_cells"] = [(s[0], s[2], _clean_amount(s[4])) for s in amounts]
+        self._segment_rows.append(row)
+        self._note_page()
+
+    def _open_sub_row(self, type_spans, amounts):
+        sub = {
+            "name": " ".join(s[4] for s in type_spans).strip(),
+            "values": {},
+            "_cells": [(s[0], s[2], _clean_amount(s[4])) for s in amounts],
+        }
+        self._row["_subs"].append(sub)
+        self._segment_rows.append(sub)
+        self._note_page()
+
+    def _rename_last_type(self, suffix):
+        sub = self._row["_subs"][-1]
+        sub["name"] = f"{sub['name']} {suffix}".strip()
+
+    def _note_page(self):
+        page_no = self._page_idx + 1
+        if page_no not in self._table["pages"]:
+            self._table["pages"].append(page_no)
+
+    def _close_segment(self):
+        """
+        Assigns amounts of all rows collected on the current page for the
+        current table to value heads, using the right edges of the spans.
+        """
+        if not self._segment_rows:
+            return
+        cells = [c for target in self._segment_rows for c in target["_cells"]]
+
+        clusters = []
+        for x0, x1, _ in sorted(cells, key=lambda c: c[1]):
+            if clusters and x1 - clusters[-1]["x1"] <= _EDGE_TOLERANCE:
+                clusters[-1]["members"].append((x0, x1))
+            else:
+                clusters.append({"x1": x1, "members": [(x0, x1)]})
+        for c in clusters:
+            c["x1"] = sum(m[1] for m in c["members"]) / len(c["members"])
+            c["mid"] = sum((m[0] + m[1]) / 2 for m in c["members"]) / len(c["members"])
+
+        mapping = self._map_clusters(clusters)
+
+        for target in self._segment_rows:
+            for x0, x1, val in target["_cells"]:
+                cl = min(range(len(clusters)), key=lambda i: abs(clusters[i]["x1"] - x1))
+                key = mapping.get(cl)
+                if key:
+                    target["values"][key] = val
+            target["_cells"] = []
+
+        self._segment_rows = []
+
+    def _finalize_rows(self):
+        for tbl in self.tables.values():
+            tbl.pop("no", None)
+            for row in tbl["rows"]:
+                subs = row.pop("_subs", [])
+                row.pop("_cells", None)
+                if not subs:
+                    continue
+                row["types"] = {sub["name"]: sub["values"] for sub in subs}
+                # Table 6 prints amounts only against each Type; expose the row total too
+                if not row["values"]:
+                    totals = {}
+                    for vals in row["types"].values():
+                        for k, v in vals.items():
+                            totals[k] = totals.get(k, 0.0) + v
+                    row["values"] = totals
+
+    def _map_clusters(self, clusters):
+        columns = self._layout["columns"] if self._layout else []
+        if not columns:
+            return {i: f"col{i + 2}" for i in range(len(clusters))}
+
+        if len(clusters) == len(columns):
+            for col, cl in zip(columns, clusters):
+                col["edge"] = cl["x1"]
+            return {i: columns[i]["key"] for i in range(len(clusters))}
+
+        if len(clusters) > len(columns):
+            offset = len(clusters) - len(columns)
+            return {i + offset: columns[i]["key"] for i in range(len(columns))}
+
+        # Fewer populated columns than heads: prefer the right edges learned
+        # from a fully populated segment, then the header captions on this page.
+        edges = [c["edge"] for c in columns]
+        if all(e is not None for e in edges):
+            mapping = {}
+            for i, cl in enumerate(clusters):
+                j = min(range(len(edges)), key=lambda k: abs(edges[k] - cl["x1"]))
+                if abs(edges[j] - cl["x1"]) <= _EDGE_TOLERANCE:
+                    mapping[i] = columns[j]["key"]
+            if len(mapping) == len(clusters):
+                return mapping
+
+        if self._layout_page == self._page_idx:
+            mapping = {}
+            used = set()
+            for i, cl in enumerate(clusters):
+                order = sorted(range(len(columns)), key=lambda k: abs(columns[k]["center"] - cl["mid"]))
+                j = next((k for k in order if k not in used), None)
+                if j is not None:
+                    used.add(j)
+                    mapping[i] = columns[j]["key"]
+            return mapping
+
+        offset = len(columns) - len(clusters)
+        return {i: columns[i + offset]["key"] for i in range(len(clusters))}
+
+
+def load_gstr9_document(file_path, upto_table=DEFAULT_UPTO_TABLE):
+    """
+    Returns a cached GSTR9Document for the file. The cache is keyed by path,
+    mtime and size so replacing the PDF on disk invalidates it.
+    """
+    abs_path = os.path.abspath(file_path)
+    st = os.stat(abs_path)
+    key = (abs_path, st.st_mtime, st.st_size)
+
+    doc = _GSTR9_DOC_CACHE.get(key)
+    if doc is not None and (upto_table is None and doc.complete or upto_table is not None and doc.covers(upto_table)):
+        return doc
+
+    doc = GSTR9Document(abs_path, upto_table=upto_table)
+    # Drop stale entries for the same path (file replaced on disk)
+    for stale in [k for k in _GSTR9_DOC_CACHE if k[0] == abs_path]:
+        del _GSTR9_DOC_CACHE[stale]
+    _GSTR9_DOC_CACHE[key] = doc
+    return doc
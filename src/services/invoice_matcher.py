@@ -0,0 +1,269 @@
+"""
+Invoice-level matching of GSTR-2A B2B invoices against GSTR-2B and the
+taxpayer's purchase register.
+
+Every source is first reduced to one row per (supplier GSTIN, invoice key).
+Rate-wise lines of the same invoice are summed into that row. The invoice
+key is the invoice number with punctuation removed, upper-cased, and with
+leading zeros dropped. The two sides are then hash-joined (pandas merge) in
+three passes, so nothing loops over rows:
+
+    1. same GSTIN + invoice key           -> exact (values agree) / fuzzy
+    2. same GSTIN + month + taxable value -> fuzzy (number typed differently)
+    3. same GSTIN + digits of the number  -> fuzzy ('INV/0012' vs '12')
+
+Invoices left over on the first side are 'missing'. Those left over on the
+second side are 'extra'. Credit/debit notes (CDNR sheets) are not matched.
+"""
+import os
+import re
+
+import pandas as pd
+
+from .eway_bill_ingestor import parse_amounts, parse_dates
+
+# Rupee difference still treated as the same invoice
+TOLERANCE = 1.0
+HEADER_SCAN_ROWS = 15
+TAX_HEADS = ("igst", "cgst", "sgst", "cess")
+STATUSES = ("exact", "fuzzy", "missing", "extra")
+
+# Role -> pattern on the normalised header text (parent + child header merged)
+ROLE_PATTERNS = {
+    "gstin": r"\bgstin\b",
+    "supplier_name": r"\b(legal|trade)\b.*\bname\b",
+    "invoice_num": r"\b(invoice|document|bill)\b.*\b(number|no)\b",
+    "invoice_date": r"\b(invoice|document|bill)\b.*\bdate\b",
+    "taxable_value": r"\btaxable\b",
+    "igst": r"\b(integrated|igst)\b",
+    "cgst": r"\b(central|cgst)\b",
+    "sgst": r"\b(state|sgst|utgst)\b",
+    "cess": r"\bcess\b",
+    "return_period": r"\bperiod\b",
+    "filing_status": r"\b3b\b.*\bfiling\b.*\bstatus\b",
+    "registration_status": r"\bregistration\b.*\bstatus\b",
+}
+REQUIRED_ROLES = ("gstin", "invoice_num", "taxable_value")
+
+
+def _norm_header(value):
+    if value is None or (isinstance(value, float) and pd.isna(value)):
+        return ""
+    return re.sub(r"[^a-z0-9]+", " ", str(value).lower()).strip()
+
+
+def map_roles(headers):
+    """Role -> column index for a header row; the first matching column wins."""
+    cols = {}
+    for idx, h in enumerate(headers):
+        text = _norm_header(h)
+        if not text:
+            continue
+        for role, pattern in ROLE_PATTERNS.items():
+            # 'State' in 'Place of supply (State)' is not a tax column
+            if role in cols or (role in TAX_HEADS and re.search(r"\b(rate|place)\b", text)):
+                continue
+            if re.search(pattern, text):
+                cols[role] = idx
+                break
+    return cols
+
+
+def _merge_header_rows(parent, child):
+    merged, last_parent = [], ""
+    for p, c in zip(parent, child):
+        p, c = _norm_header(p), _norm_header(c)
+        if p and "unnamed" not in p:
+            last_parent = p
+        merged.append(" ".join(x for x in (last_parent, c) if x))
+    return merged
+
+
+def _find_header(raw):
+    """(role map, first data row) of a sheet read with header=None, or (None, -1)."""
+    gstin_like = re.compile(r"^\d{2}[A-Z]{5}\d{4}[A-Z][A-Z\d]Z[A-Z\d]$")
+    for i in range(min(HEADER_SCAN_ROWS, len(raw))):
+        row = raw.iloc[i].tolist()
+        nxt = raw.iloc[i + 1].tolist() if i + 1 < len(raw) else []
+        single = map_roles(row)
+        next_is_data = any(gstin_like.match(str(v).strip().upper()) for v in nxt)
+        if all(r in single for r in REQUIRED_ROLES) and (next_is_data or not nxt):
+            return single, i + 1
+        # A title row above a one-row header must not be merged into it
+        if nxt and not all(r in map_roles(nxt) for r in REQUIRED_ROLES):
+            merged = map_roles(_merge_header_rows(row, nxt))
+            if all(r in merged for r in REQUIRED_ROLES):
+                return merged, i + 2
+    return None, -1
+
+
+def _read_raw(file_path, sheet_names):
+    ext = os.path.splitext(file_path)[1].lower()
+    if ext in (".csv", ".txt"):
+        return [pd.read_csv(file_path, header=None, dtype=str, encoding="utf-8-sig", encoding_errors="replace")]
+    xl = pd.ExcelFile(file_path)
+    wanted = [s for s in xl.sheet_names if s.strip().upper() in {n.upper() for n in sheet_names}] if sheet_names else []
+    return [xl.parse(s, header=None, dtype=str) for s in (wanted or xl.sheet_names[:1])]
+
+
+def read_invoices(file_path, sheet_names=("B2B",)):
+    """
+    Invoice rows of a GSTR-2A / GSTR-2B B2B sheet or a purchase register
+    (first sheet / CSV when no named sheet exists), with canonical columns.
+    Raises ValueError if no invoice header is found.
+    """
+    frames = []
+    for raw in _read_raw(file_path, sheet_names):
+        cols, start = _find_header(raw)
+        if not cols:
+            continue
+        body = raw.iloc[start:]
+        frame = pd.DataFrame({role: body.iloc[:, idx].values for role, idx in cols.items()})
+        frames.append(frame)
+    if not frames:
+        raise ValueError(f"No invoice table found in {os.path.basename(file_path)}")
+    return normalise(pd.concat(frames, ignore_index=True))
+
+
+def _inv_key(invoice_nos):
+    return invoice_nos.astype(str).str.upper().str.replace(r"[^A-Z0-9]", "", regex=True).str.lstrip("0")
+
+
+def normalise(df):
+    """Adds matching keys and numeric amounts; drops rows without a GSTIN or invoice number."""
+    out = pd.DataFrame(index=df.index)
+    out["gstin"] = df["gstin"].astype(str).str.strip().str.upper()
+    out["invoice_no"] = df["invoice_num"].astype(str).str.strip()
+    out["inv_key"] = _inv_key(out["invoice_no"])
+    out["num_key"] = out["inv_key"].str.replace(r"\D", "", regex=True).str.lstrip("0")
+    dates = parse_dates(df["invoice_date"]) if "invoice_date" in df else pd.Series(pd.NaT, index=df.index)
+    out["invoice_date"] = dates
+    # YYYYMM as an integer (0 = undated): far cheaper to build and join on than text
+    out["month"] = (dates.dt.year * 100 + dates.dt.month).fillna(0).astype(int)
+    out["taxable"] = parse_amounts(df["taxable_value"])
+    for head in TAX_HEADS:
+        out[head] = parse_amounts(df[head]) if head in df else 0.0
+    out["tax"] = out[list(TAX_HEADS)].sum(axis=1)
+    for extra in ("supplier_name", "return_period", "filing_status", "registration_status"):
+        if extra in df:
+            out[extra] = df[extra].fillna("").astype(str).str.strip()
+    # Drops blank, total and note rows
+    valid = out["gstin"].str.len().eq(15) & out["inv_key"].ne("")
+    return out[valid].reset_index(drop=True)
+
+
+def _per_invoice(df):
+    """One row per (gstin, inv_key): rate-wise lines summed."""
+    sums = ["taxable", "tax"] + list(TAX_HEADS)
+    firsts = {c: "first" for c in ("invoice_no", "num_key", "invoice_date", "month") if c in df}
+    grouped = df.groupby(["gstin", "inv_key"], sort=False).agg({**firsts, **{c: "sum" for c in sums}})
+    return grouped.reset_index()
+
+
+def _join_pass(left, right, keys):
+    """1:1 inner join of the still-unmatched rows on keys; duplicate keys stay unmatched."""
+    lk = left.drop_duplicates(keys, keep=False)
+    rk = right.drop_duplicates(keys, keep=False)
+    return lk.reset_index().merge(rk.reset_index(), on=keys, suffixes=("", "_other"))
+
+
+def match_invoices(left, right, tolerance=TOLERANCE):
+    """
+    Matches normalised invoices of left against right. Returns one row per
+    invoice with 'status' (exact / fuzzy / missing / extra) and the matched
+    invoice's number, taxable value and tax in the *_other columns.
+    """
+    left, right = _per_invoice(left), _per_invoice(right)
+    left["round_taxable"] = left["taxable"].round(0)
+    right["round_taxable"] = right["taxable"].round(0)
+    left_open = pd.Series(True, index=left.index)
+    right_open = pd.Series(True, index=right.index)
+    matched = []
+
+    passes = (["gstin", "inv_key"], ["gstin", "month", "round_taxable"], ["gstin", "num_key"])
+    for n, keys in enumerate(passes):
+        lft, rgt = left[left_open], right[right_open]
+        if "month" in keys:
+            # Undated invoices / blank numbers are not evidence of a match
+            lft, rgt = lft[lft["month"] != 0], rgt[rgt["month"] != 0]
+        if "num_key" in keys:
+            lft, rgt = lft[lft["num_key"] != ""], rgt[rgt["num_key"] != ""]
+        pairs = _join_pass(lft, rgt, keys)
+        if pairs.empty:
+            continue
+        left_open[pairs["index"]] = False
+        right_open[pairs["index_other"]] = False
+        same = ((pairs["taxable"] - pairs["taxable_other"]).abs() <= tolerance) & \
+               ((pairs["tax"] - pairs["tax_other"]).abs() <= tolerance)
+        pairs["status"] = "fuzzy"
+        if n == 0:
+            pairs.loc[same, "status"] = "exact"
+        matched.append(pairs)
+
+    columns = ["gstin", "invoice_no", "invoice_date", "month", "taxable", "tax"] + list(TAX_HEADS)
+    other_cols = ["invoice_no_other", "taxable_other", "tax_other"]
+    parts = [p[columns + other_cols + ["status"]] for p in matched]
+    parts.append(left.loc[left_open, columns].assign(status="missing"))
+    parts.append(right.loc[right_open, columns].assign(status="extra"))
+    return pd.concat(parts, ignore_index=True).reindex(columns=columns + other_cols + ["status"])
+
+
+def summarise(matches, by):
+    """
+    {key: {status: {"count", "taxable", "tax"}}} grouped by 'gstin' or 'month'.
+    Extra invoices are counted with their own values.
+    """
+    if matches.empty:
+        return {}
+    grouped = matches.groupby([by, "status"]).agg(count=("status", "size"), taxable=("taxable", "sum"), tax=("tax", "sum"))
+    out = {}
+    for (key, status), row in grouped.iterrows():
+        if by == "month":
+            key = f"{key // 100}-{key % 100:02d}" if key else "Undated"
+        out.setdefault(key, {})[status] = {"count": int(row["count"]), "taxable": round(float(row["taxable"]), 2),
+                                           "tax": round(float(row["tax"]), 2)}
+    return out
+
+
+def status_totals(matches):
+    """{status: {"count", "taxable", "tax", <heads>}} over all invoices."""
+    totals = {}
+    for status in STATUSES:
+        part = matches[matches["status"] == status]
+        totals[status] = {"count": int(len(part)), "taxable": round(float(part["taxable"].sum()), 2),
+                          "tax": round(float(part["tax"].sum()), 2)}
+        for head in TAX_HEADS:
+            totals[status][head] = round(float(part[head].sum()), 2)
+    return totals
+
+
+def status_lookup(matches):
+    """(gstin, inv_key) -> status of first-side invoices, for annotating other tables."""
+    own = matches[matches["status"] != "extra"]
+    keys = invoice_keys(own["gstin"], own["invoice_no"])
+    return dict(zip(keys, own["status"]))
+
+
+def invoice_keys(gstins, invoice_nos):
+    """Matching keys for (gstin, invoice number) pairs from another table."""
+    gstin = pd.Series(list(gstins), dtype=str).str.strip().str.upper()
+    return list(zip(gstin, _inv_key(pd.Series(list(invoice_nos), dtype=str))))
+
+
+def _read_many(paths, sheet_names):
+    frames = [read_invoices(p, sheet_names) for p in paths if p and os.path.exists(p)]
+    return pd.concat(frames, ignore_index=True) if frames else None
+
+
+def reconcile(gstr2a_path, gstr2b_paths=(), purchase_register_path=None, tolerance=TOLERANCE):
+    """
+    Matches GSTR-2A B2B invoices against GSTR-2B, and the purchase register
+    against GSTR-2A. Returns {"gstr2a_vs_2b": df|None, "pr_vs_2a": df|None}.
+    """
+    gstr2a = _read_many([gstr2a_path], ("B2B",))
+    gstr2b = _read_many(gstr2b_paths, ("B2B",))
+    register = _read_many([purchase_register_path], ("Purchase Register", "B2B"))
+    return {
+        "gstr2a_vs_2b": match_invoices(gstr2a, gstr2b, tolerance) if gstr2a is not None and gstr2b is not None else None,
+        "pr_vs_2a": match_invoices(register, gstr2a, tolerance) if register is not None and gstr2a is not None else None,
+    }
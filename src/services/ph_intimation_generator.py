@@ -2,6 +2,7 @@ import os
 import json
 from jinja2 import Environment, FileSystemLoader
 from src.utils.config_manager import ConfigManager
+from src.utils import render_assets
 
 class PHIntimationGenerator:
     def __init__(self):
@@ -38,17 +39,7 @@ class PHIntimationGenerator:
             }
 
             # 2. CSS and Styling
-            css_dir = os.path.join(self.template_dir, 'css')
-            def read_css(filename):
-                path = os.path.join(css_dir, filename)
-                if os.path.exists(path):
-                    with open(path, 'r', encoding='utf-8') as f:
-                        return f.read()
-                return ""
-
-            base_css = read_css('doc_base.css')
-            renderer_css = read_css('doc_qt.css') if for_preview else ""
-            model['full_styles_html'] = f"<style>\n{base_css}\n{renderer_css}\n</style>"
+            model['full_styles_html'] = render_assets.document_styles_html(for_preview)
 
             # 3. Letterhead
             model['letter_head'] = ""
@@ -56,9 +47,8 @@ class PHIntimationGenerator:
                 try:
                     lh_path = self.config.get_letterhead_path('pdf')
                     if lh_path and os.path.exists(lh_path):
-                        with open(lh_path, 'r', encoding='utf-8') as f:
-                            # Simple HTML letterhead injection
-                            model['letter_head'] = f.read()
+                        # Simple HTML letterhead injection
+                        model['letter_head'] = render_assets.letterhead_text(lh_path) or ""
                 except Exception as e:
                     print(f"PH Generator: Letterhead failed: {e}")
 
@@ -0,0 +1,166 @@
+"""
+Streaming export of registers (OC, DRC-01A, SCN, OIO, ASMT-10, taxpayers,
+generated notices) to XLSX or CSV.
+
+Rows are read from DatabaseManager.iter_register_rows in fixed-size batches
+and written straight to a write-only workbook / CSV writer, so memory stays
+flat no matter how many years of entries are exported. Search text and
+date/GSTIN filters are applied in SQL by the register query.
+"""
+import csv
+import os
+import tempfile
+
+# (header, key) per register; key None is the running Sl. No.
+REGISTER_COLUMNS = {
+    'oc': [
+        ("Sl. No.", None), ("OC No.", "OC_Number"), ("Content", "OC_Content"),
+        ("Date", "OC_Date"), ("To", "OC_To"), ("Copy To", "OC_Copy_To"),
+    ],
+    'drc01a': [
+        ("Sl. No.", None), ("GSTIN", "GSTIN"), ("Legal Name", "Legal Name"),
+        ("Issue", "Issue_Description"), ("Financial Year", "Financial_Year"),
+        ("Section Proceeding", "Section"), ("Issue (Section Violated)", "Issue_Description"),
+        ("DRC-01A Date", "OC_Date"),
+        ("Demand (CGST)", "CGST_Demand"), ("Demand (SGST)", "SGST_Demand"),
+        ("Demand (IGST)", "IGST_Demand"), ("Demand (Cess)", "Cess_Demand"),
+        ("Demand (Total)", "Total_Demand"), ("Remarks", "Remarks"),
+    ],
+    'scn': [
+        ("Sl. No.", None), ("GSTIN", "GSTIN"), ("Legal Name", "Legal Name"),
+        ("Issue", "Issue_Description"), ("Financial Year", "Financial_Year"),
+        ("Section Proceeding", "Section"), ("Issue (Section Violated)", "Issue_Description"),
+        ("SCN No.", "SCN_Number"), ("SCN Date", "SCN_Date"),
+        ("Demand (CGST)", "CGST_Demand"), ("Demand (SGST)", "SGST_Demand"),
+        ("Demand (IGST)", "IGST_Demand"), ("Demand (Total)", "Total_Demand"), ("Remarks", "Remarks"),
+    ],
+    'oio': [
+        ("Sl. No.", None), ("GSTIN", "GSTIN"), ("Legal Name", "Legal Name"),
+        ("Issue", "Issue_Description"), ("Financial Year", "Financial_Year"),
+        ("Section Proceeding", "Section"), ("Issue (Section Violated)", "Issue_Description"),
+        ("SCN No.", "SCN_Number"), ("SCN Date", "SCN_Date"),
+        ("OIO No.", "OIO_Number"), ("OIO Date", "OIO_Date"),
+        ("Demand (CGST)", "CGST_Demand"), ("Demand (SGST)", "SGST_Demand"),
+        ("Demand (IGST)", "IGST_Demand"), ("Demand (Total)", "Total_Demand"), ("Remarks", "Remarks"),
+    ],
+    'asmt10': [
+        ("Sl. No.", None), ("GSTIN", "gstin"), ("Financial Year", "financial_year"),
+        ("Issue Date", "issue_date"), ("O.C. No.", "oc_number"), ("Case ID", "case_id"),
+    ],
+    'cases': [
+        ("Date", "Date"), ("GSTIN", "GSTIN"), ("Legal Name", "Legal Name"),
+        ("Form Type", "Form Type"), ("Status", "Status"), ("File Path", "FilePath"),
+    ],
+    'taxpayers': [
+        ("GSTIN", "GSTIN"), ("Legal Name", "Legal Name"), ("Trade Name", "Trade Name"),
+        ("Address", "Address"), ("State", "State"), ("Email", "Email"),
+        ("Mobile", "Mobile"), ("Status", "Status"), ("Constitution", "Constitution"),
+    ],
+}
+
+REGISTER_TITLES = {
+    'oc': "OC Register",
+    'drc01a': "DRC-01A Register",
+    'scn': "SCN Register",
+    'oio': "OIO Register",
+    'asmt10': "ASMT-10 Register",
+    'cases': "Generated Notices",
+    'taxpayers': "Taxpayers",
+}
+
+# Demand columns come back from case_file_register as REAL; whole rupees are
+# written as integers so the sheet does not show "1000.0"
+_NUMERIC_KEYS = {"CGST_Demand", "SGST_Demand", "IGST_Demand", "Cess_Demand", "Total_Demand"}
+
+
+class ExportCancelled(Exception):
+    pass
+
+
+def _cell(key, value):
+    if value is None:
+        return ""
+    if key in _NUMERIC_KEYS and isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
+
+
+def _rows(db, register, columns, search, filters, order_by, descending, batch_size):
+    for serial, record in enumerate(
+            db.iter_register_rows(register, search=search, filters=filters, order_by=order_by,
+                                  descending=descending, batch_size=batch_size), start=1):
+        yield [serial if key is None else _cell(key, record.get(key)) for _, key in columns]
+
+
+def export_register(db, register, output_path, fmt=None, search=None, filters=None, order_by=None,
+                    descending=False, columns=None, batch_size=500, progress=None, is_cancelled=None):
+    """
+    Streams a register to output_path. fmt is 'xlsx' or 'csv' (defaults to the
+    file extension). progress(written, total) is called after every batch;
+    is_cancelled() is polled at the same points.
+
+    The file is written to a temp file next to the target and moved into place
+    only when complete. Returns the number of rows written.
+    """
+    fmt = (fmt or os.path.splitext(output_path)[1].lstrip(".") or "xlsx").lower()
+    if fmt not in ("xlsx", "csv"):
+        raise ValueError(f"Unsupported export format: {fmt}")
+
+    columns = columns or REGISTER_COLUMNS[register]
+    headers = [header for header, _ in columns]
+    total = db.count_register_rows(register, search=search, filters=filters)
+
+    out_dir = os.path.dirname(os.path.abspath(output_path))
+    fd, tmp_path = tempfile.mkstemp(suffix=f".{fmt}", dir=out_dir)
+    os.close(fd)
+
+    written = 0
+    ws = None
+
+    def _tick():
+        if is_cancelled and is_cancelled():
+            raise ExportCancelled()
+        if progress:
+            progress(written, total)
+
+    rows = _rows(db, register, columns, search, filters, order_by, descending, batch_size)
+    try:
+        if fmt == "csv":
+            # utf-8-sig so Excel opens Malayalam / special characters correctly
+            with open(tmp_path, "w", newline="", encoding="utf-8-sig") as f:
+                writer = csv.writer(f)
+                writer.writerow(headers)
+                for row in rows:
+                    writer.writerow(row)
+                    written += 1
+                    if written % batch_size == 0:
+                        _tick()
+        else:
+            from openpyxl import Workbook
+            wb = Workbook(write_only=True)
+            ws = wb.create_sheet(REGISTER_TITLES.get(register, register)[:31])
+            ws.append(headers)
+            for row in rows:
+                ws.append(row)
+                written += 1
+                if written % batch_size == 0:
+                    _tick()
+            wb.save(tmp_path)
+
+        if progress:
+            progress(written, max(total, written))
+        os.replace(tmp_path, output_path)
+        return written
+    except BaseException:
+        rows.close()
+        if ws is not None:
+            # Finish the write-only sheet stream so no half-written XML is left open
+            try:
+                ws.close()
+            except Exception:
+                pass
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
@@ -2,6 +2,10 @@ import os
 import sys
 import argparse
 import base64
+import hashlib
+
+# Page PNGs kept in the shared preview cache (newest first)
+PAGE_CACHE_LIMIT = 300
 
 # [STABILIZATION] isolated imports
 # These are only imported when this script is run as a separate process.
@@ -31,6 +35,80 @@ def render_html_to_png(html_content, output_path):
     except Exception as e:
         return False, str(e)
 
+def _page_key(doc, page, width):
+    """
+    Identity of a laid-out page at a given width: its drawing commands, its
+    text (glyph ids alone depend on the font subset) and its images.
+    """
+    h = hashlib.sha1(f"{width}|{tuple(page.rect)}".encode())
+    h.update(page.read_contents())
+    h.update(page.get_text("text").encode("utf-8"))
+    for img in page.get_images(full=True):
+        h.update(hashlib.sha1(doc.xref_stream_raw(img[0]) or b"").digest())
+    return h.hexdigest()
+
+
+def _prune_cache(cache_dir, keep=PAGE_CACHE_LIMIT):
+    try:
+        files = [os.path.join(cache_dir, f) for f in os.listdir(cache_dir) if f.endswith(".png")]
+        files.sort(key=os.path.getmtime, reverse=True)
+        for stale in files[keep:]:
+            os.remove(stale)
+    except OSError:
+        pass
+
+
+def rasterise_pdf_pages(pdf_bytes, cache_dir, width=1000, first_pages=(0,), emit=print):
+    """
+    Rasterises each page of a PDF with PyMuPDF at `width` pixels. Pages in
+    first_pages (the ones on screen) go first. Each PNG is named after the
+    page's content key, so a page that did not change since an earlier
+    render is reused from cache_dir as is. Reports "PAGES <n>", then
+    "PAGE <index> <width> <height> <path>" as each page is ready.
+    """
+    import fitz
+
+    doc = fitz.open(stream=pdf_bytes, filetype="pdf")
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        emit(f"PAGES {doc.page_count}")
+        first = [p for p in first_pages if 0 <= p < doc.page_count]
+        for index in first + [p for p in range(doc.page_count) if p not in first]:
+            page = doc[index]
+            zoom = width / page.rect.width
+            path = os.path.join(cache_dir, f"{_page_key(doc, page, width)}.png")
+            if os.path.exists(path):
+                os.utime(path)  # Keeps it out of the pruned tail
+                w, h = round(page.rect.width * zoom), round(page.rect.height * zoom)
+            else:
+                pix = page.get_pixmap(matrix=fitz.Matrix(zoom, zoom), alpha=False)
+                tmp = f"{path}.{os.getpid()}.tmp"
+                pix.save(tmp, output="png")
+                os.replace(tmp, path)
+                w, h = pix.width, pix.height
+            emit(f"PAGE {index} {w} {h} {path}")
+    finally:
+        doc.close()
+    _prune_cache(cache_dir)
+
+
+def render_html_to_pages(html_content, cache_dir, width=1000, first_pages=(0,), emit=print):
+    """
+    Paginated preview: lays the HTML out into pages with WeasyPrint (same
+    pagination as the PDF) and rasterises them one by one.
+    """
+    try:
+        from weasyprint import HTML
+        pdf_bytes = HTML(string=html_content).write_pdf()
+        rasterise_pdf_pages(pdf_bytes, cache_dir, width, first_pages, emit)
+        return True, "Success"
+    except OSError as e:
+        if "gobject" in str(e).lower() or "module" in str(e).lower() or "126" in str(e):
+             return False, "MISSING_GTK_DEPENDENCY"
+        return False, str(e)
+    except Exception as e:
+        return False, str(e)
+
 def render_html_to_pdf(html_content, output_path):
     """
     Renders HTML content to a PDF file using WeasyPrint.
@@ -49,8 +127,10 @@ def render_html_to_pdf(html_content, output_path):
 def main():
     parser = argparse.ArgumentParser(description="Isolated Rendering Worker")
     parser.add_argument("--input", required=True, help="Path to input HTML file")
-    parser.add_argument("--output", required=True, help="Path to output image/pdf file")
-    parser.add_argument("--format", choices=["png", "pdf"], default="png", help="Output format")
+    parser.add_argument("--output", required=True, help="Path to output image/pdf file (page cache directory for 'pages')")
+    parser.add_argument("--format", choices=["png", "pdf", "pages"], default="png", help="Output format")
+    parser.add_argument("--width", type=int, default=1000, help="Page image width in pixels ('pages')")
+    parser.add_argument("--first", default="0", help="Comma-separated page indices to render first ('pages')")
     
     args = parser.parse_args()
     
@@ -62,7 +142,11 @@ def main():
         with open(args.input, "r", encoding="utf-8") as f:
             html_content = f.read()
             
-        if args.format == "png":
+        if args.format == "pages":
+            first = [int(p) for p in args.first.split(",") if p.strip().isdigit()]
+            success, msg = render_html_to_pages(html_content, args.output, args.width, first,
+                                                emit=lambda line: print(line, flush=True))
+        elif args.format == "png":
             success, msg = render_html_to_png(html_content, args.output)
         else:
             success, msg = render_html_to_pdf(html_content, args.output)
@@ -0,0 +1,194 @@
+"""
+In-memory model of the "Tax liability and ITC comparison" workbook.
+
+The workbook is opened once with openpyxl; every sheet's cell values are
+kept as rows, and pandas frames (including the multi-row header blocks of
+the ITC sheets) are built from those rows on demand and cached. All SOP
+handlers in ScrutinyParser read the workbook through this model instead of
+calling load_workbook / read_excel themselves.
+"""
+import os
+
+import numpy as np
+import openpyxl
+from openpyxl.utils.cell import coordinate_from_string, column_index_from_string
+from pandas.io.parsers import TextParser
+
+_TAX_HEAD_MARKERS = ("IGST", "CGST", "SGST", "CESS", "TAX")
+
+_WORKBOOK_CACHE = {}
+
+
+def _convert_cell(cell):
+    # Same conversions pandas' openpyxl reader applies, so frames match read_excel
+    value = cell.value
+    if value is None:
+        return ""
+    if cell.data_type == "e":
+        return np.nan
+    if cell.data_type == "n":
+        number = float(value)
+        return int(number) if number.is_integer() else number
+    return value
+
+
+def _fill_header_rows(data, header):
+    """
+    Forward-fills blank cells of a multi-row header within the same parent
+    column (merged group captions), as read_excel does before parsing.
+    """
+    control = [True] * len(data[0])
+    for r in header:
+        if r > len(data) - 1:
+            raise ValueError(f"header index {r} exceeds maximum index {len(data) - 1} of data.")
+        row = data[r]
+        last = row[0]
+        for i in range(1, len(row)):
+            if not control[i]:
+                last = row[i]
+            if row[i] == "" or row[i] is None:
+                row[i] = last
+            else:
+                control[i] = False
+                last = row[i]
+
+
+class TaxLiabilityWorkbook:
+    """Cell values of every sheet, plus cached frames and metadata."""
+
+    def __init__(self, file_path):
+        self.file_path = file_path
+        self._rows = {}
+        self._frames = {}
+        self._metadata = None
+
+        wb = openpyxl.load_workbook(file_path, data_only=True)
+        try:
+            self.sheet_names = list(wb.sheetnames)
+            for ws in wb.worksheets:
+                data = []
+                last_filled = -1
+                for row in ws.iter_rows():
+                    values = [_convert_cell(c) for c in row]
+                    while values and values[-1] == "":
+                        values.pop()
+                    if values:
+                        last_filled = len(data)
+                    data.append(values)
+                data = data[:last_filled + 1]
+                width = max((len(r) for r in data), default=0)
+                self._rows[ws.title] = [r + [""] * (width - len(r)) for r in data]
+        finally:
+            wb.close()
+
+    # ---- Sheets & cells ----
+
+    def find_sheet(self, keyword, exclude_summary=True):
+        """First sheet whose name contains keyword (case-insensitive)."""
+        keyword = keyword.lower()
+        return next((s for s in self.sheet_names
+                     if keyword in s.lower() and not (exclude_summary and "summary" in s.lower())), None)
+
+    def find_sheet_any(self, keywords):
+        """First sheet whose name contains any of keywords (case-sensitive, as the SOP-10 lookup expects)."""
+        return next((s for s in self.sheet_names if any(k in s for k in keywords)), None)
+
+    def cell(self, sheet, ref):
+        """Value of an A1-style cell, None if empty or outside the used range."""
+        col, row = coordinate_from_string(ref)
+        r, c = row - 1, column_index_from_string(col) - 1
+        rows = self._rows.get(sheet, [])
+        if r < len(rows) and c < len(rows[r]):
+            value = rows[r][c]
+            return None if value == "" else value
+        return None
+
+    # ---- Frames ----
+
+    def frame(self, sheet, header=0):
+        """
+        DataFrame of a sheet, equivalent to pd.read_excel(file, sheet_name=sheet,
+        header=header). Cached per (sheet, header); callers must not mutate it.
+        """
+        if sheet not in self._rows:
+            raise ValueError(f"Worksheet named '{sheet}' not found")
+        key = (sheet, tuple(header) if isinstance(header, list) else header)
+        if key not in self._frames:
+            rows = self._rows[sheet]
+            if not rows:
+                import pandas as pd
+                self._frames[key] = pd.DataFrame()
+            else:
+                data = [list(r) for r in rows]
+                if isinstance(header, list) and len(header) > 1:
+                    _fill_header_rows(data, header)
+                elif isinstance(header, list):
+                    header = header[0]
+                with TextParser(data, header=header, skip_blank_lines=False) as parser:
+                    self._frames[key] = parser.read()
+        return self._frames[key]
+
+    def itc_frame(self, sheet):
+        """
+        Frame of an ITC comparison sheet with its header block detected: rows
+        5-7 when the third row carries the tax heads, else rows 5-6.
+        """
+        df = self.frame(sheet, header=[4, 5, 6])
+        if any(any(m in str(col[2]).upper() for m in _TAX_HEAD_MARKERS) for col in df.columns):
+            return df
+        return self.frame(sheet, header=[4, 5])
+
+    def issue_name(self, sheet):
+        """Issue title from row 4 of a sheet, without its leading numbering."""
+        val = str(self.frame(sheet, header=None).iloc[3, 0]).strip()
+        if ". " in val:
+            return val.split(". ", 1)[1]
+        return val
+
+    # ---- Metadata ----
+
+    @property
+    def metadata(self):
+        """GSTIN, legal name and financial year from the header of the first sheet."""
+        if self._metadata is None:
+            metadata = {
+                "gstin": "Unknown",
+                "legal_name": "Unknown",
+                "financial_year": "Unknown",
+                "trade_name": "Unknown"
+            }
+            first = self._rows.get(self.sheet_names[0], []) if self.sheet_names else []
+            for row in first[:10]:
+                row_str = " ".join(str(x) for x in row if x != "" and x == x)
+                if "GSTIN:" in row_str:
+                    parts = row_str.split("GSTIN:")
+                    if len(parts) > 1 and parts[1].split(): metadata["gstin"] = parts[1].split()[0].strip()
+                if "Legal name:" in row_str:
+                    parts = row_str.split("Legal name:")
+                    if len(parts) > 1: metadata["legal_name"] = parts[1].strip()
+                if "Financial Year:" in row_str:
+                    parts = row_str.split("Financial Year:")
+                    if len(parts) > 1 and parts[1].split(): metadata["financial_year"] = parts[1].split()[0].strip()
+            self._metadata = metadata
+        return dict(self._metadata)
+
+
+def load_tax_liability_workbook(file_path):
+    """
+    Returns a cached TaxLiabilityWorkbook for the file. The cache is keyed by
+    path, mtime and size so replacing the workbook on disk invalidates it.
+    """
+    abs_path = os.path.abspath(file_path)
+    st = os.stat(abs_path)
+    key = (abs_path, st.st_mtime, st.st_size)
+
+    model = _WORKBOOK_CACHE.get(key)
+    if model is not None:
+        return model
+
+    model = TaxLiabilityWorkbook(abs_path)
+    # Drop stale entries for the same path (file replaced on disk)
+    for stale in [k for k in _WORKBOOK_CACHE if k[0] == abs_path]:
+        del _WORKBOOK_CACHE[stale]
+    _WORKBOOK_CACHE[key] = model
+    return model
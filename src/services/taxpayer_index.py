@@ -0,0 +1,198 @@
+"""
+Process-wide prefix index over the taxpayer master (taxpayers.csv).
+
+The GSTIN fields of the case wizards and the case search used to read the
+taxpayer CSV themselves: a full GSTIN list for their completers when built,
+and get_taxpayer() - another CSV read - on every GSTIN change. They now
+share one in-memory index, built in a background thread the first time any
+of them asks (warm()) and rebuilt after a taxpayer import (refresh()):
+
+    taxpayer_index.warm()                      # start building, never blocks
+    taxpayer_index.suggest("32AAB", k=10)      # [(label, record), ...] ranked
+    taxpayer_index.lookup("32AABCA1234A1Z5")   # record or None
+    taxpayer_index.gstins()                    # every GSTIN, in file order
+
+Suggestions match the start of the GSTIN, of the legal or trade name, or of
+any word in a name (case-insensitive), ranked in that order and then
+alphabetically; each carries its taxpayer record. Nothing here touches disk
+once the index is built.
+"""
+import re
+import threading
+from bisect import bisect_left
+
+_WORD_RE = re.compile(r"\w+")
+
+# Match kinds, best first
+_KINDS = ("gstin", "legal_name", "trade_name", "name_word")
+
+
+def _text(value):
+    if value is None:
+        return ""
+    text = str(value).strip()
+    return "" if text.lower() == "nan" else text
+
+
+def normalize_gstin(gstin):
+    return _text(gstin).upper()
+
+
+def suggestion_label(record):
+    gstin = normalize_gstin(record.get("GSTIN"))
+    legal = _text(record.get("Legal Name"))
+    trade = _text(record.get("Trade Name"))
+    label = f"{gstin} - {legal}" if legal else gstin
+    if trade and trade.lower() != legal.lower():
+        label += f" ({trade})"
+    return label
+
+
+class TaxpayerIndex:
+    """Sorted (key, record position) lists per match kind, plus GSTIN -> record."""
+
+    def __init__(self, records):
+        self.records = []
+        self.by_gstin = {}
+        keys = {kind: [] for kind in _KINDS}
+        for record in records:
+            gstin = normalize_gstin(record.get("GSTIN"))
+            if not gstin or gstin in self.by_gstin:
+                continue  # First row wins, as in get_taxpayer
+            pos = len(self.records)
+            self.records.append(record)
+            self.by_gstin[gstin] = record
+            keys["gstin"].append((gstin.lower(), pos))
+            words = set()
+            for kind, column in (("legal_name", "Legal Name"), ("trade_name", "Trade Name")):
+                name = _text(record.get(column)).lower()
+                if name:
+                    keys[kind].append((name, pos))
+                    # Every later word of the name, so 'traders' finds 'abc traders'
+                    words.update(name[m.start():] for m in _WORD_RE.finditer(name) if m.start())
+            keys["name_word"].extend((w, pos) for w in words)
+        self._keys = {kind: sorted(entries) for kind, entries in keys.items()}
+
+    def __len__(self):
+        return len(self.records)
+
+    def get(self, gstin):
+        return self.by_gstin.get(normalize_gstin(gstin))
+
+    def suggest(self, text, k=10):
+        """Up to k (label, record) pairs for records matching text, best first."""
+        prefix = _text(text).lower()
+        if not prefix:
+            return []
+        seen, results = set(), []
+        for kind in _KINDS:
+            entries = self._keys[kind]
+            i = bisect_left(entries, (prefix,))
+            while i < len(entries) and len(results) < k and entries[i][0].startswith(prefix):
+                pos = entries[i][1]
+                if pos not in seen:
+                    seen.add(pos)
+                    record = self.records[pos]
+                    results.append((suggestion_label(record), record))
+                i += 1
+            if len(results) >= k:
+                break
+        return results
+
+
+_index = TaxpayerIndex([])
+_ready = threading.Event()   # the index reflects the taxpayer master
+_loaded = threading.Event()  # some build has finished since start-up
+_lock = threading.Lock()
+_generation = 0  # bumped by refresh(); older builds are discarded
+_building = False
+
+
+def _load_records():
+    from src.database.db_manager import DatabaseManager
+    return DatabaseManager().get_all_taxpayers()
+
+
+def _build(generation):
+    global _index, _building
+    try:
+        index = TaxpayerIndex(_load_records())
+    except Exception as e:
+        print(f"Error building taxpayer index: {e}")
+        index = None
+    with _lock:
+        if generation != _generation:
+            return  # A refresh started a newer build
+        if index is not None:
+            _index = index
+        _building = False
+        _ready.set()
+        _loaded.set()
+
+
+def warm():
+    """Starts building the index in the background unless it is built or building."""
+    global _building
+    with _lock:
+        if _ready.is_set() or _building:
+            return
+        _building = True
+        generation = _generation
+    threading.Thread(target=_build, args=(generation,), name="taxpayer-index", daemon=True).start()
+
+
+def refresh():
+    """Rebuilds the index in the background, e.g. after a taxpayer import. The old one serves until then."""
+    global _generation, _building
+    with _lock:
+        _generation += 1
+        _building = False
+        _ready.clear()
+    warm()
+
+
+def install(records):
+    """Replaces the index with one built from records, synchronously."""
+    global _index, _generation, _building
+    index = TaxpayerIndex(records)
+    with _lock:
+        _generation += 1
+        _index = index
+        _building = False
+        _ready.set()
+        _loaded.set()
+
+
+def is_ready():
+    return _ready.is_set()
+
+
+def wait_ready(timeout=None):
+    """Blocks until the index is current; False on timeout."""
+    warm()
+    return _ready.wait(timeout)
+
+
+def suggest(text, k=10):
+    """Ranked suggestions from the current index; never waits for a build."""
+    warm()
+    return _index.suggest(text, k)
+
+
+def lookup(gstin):
+    """
+    The taxpayer record for gstin, or None. Only the very first call can
+    wait, for the initial build (a single read of the taxpayer master).
+    """
+    if not _loaded.is_set():
+        warm()
+        _loaded.wait()
+    return _index.get(gstin)
+
+
+def gstins():
+    """Every GSTIN in the taxpayer master, in file order. Waits like lookup()."""
+    if not _loaded.is_set():
+        warm()
+        _loaded.wait()
+    return list(_index.by_gstin)
@@ -5,9 +5,12 @@ from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushBut
 from PyQt6.QtGui import QAction
 from PyQt6.QtCore import Qt, QStringListModel, QDate, QParallelAnimationGroup, QPropertyAnimation, QAbstractAnimation
 from src.database.db_manager import DatabaseManager
+from src.services import taxpayer_index
+from src.ui.components.taxpayer_completer import TaxpayerCompleter
 from src.utils.constants import PROCEEDING_TYPES, FORMS_MAP, SECTIONS_FILE, TEMPLATES_FILE, TAX_TYPES
 from src.utils.document_generator import DocumentGenerator
 from src.utils.config_manager import ConfigManager
+from src.utils import render_assets
 import datetime
 import pandas as pd
 import json
@@ -27,13 +30,6 @@ class AdjudicationWizard(QWidget):
         self.case_data = {}
         self.current_case_id = None # Track current active case
         
-        # Setup Debounce Timer for Preview (Initialize early)
-        from PyQt6.QtCore import QTimer
-        self.preview_timer = QTimer()
-        self.preview_timer.setSingleShot(True)
-        self.preview_timer.setInterval(300) # 300ms debounce
-        self.preview_timer.timeout.connect(self.update_live_preview)
-        
         self.load_reference_data() # Load reference data first
         self.load_templates() # Load letterhead and form header templates
         self.init_ui()
@@ -138,18 +134,16 @@ class AdjudicationWizard(QWidget):
         self.show_letterhead_cb.show()  # Explicitly show the checkbox
         right_layout.addWidget(self.show_letterhead_cb)
         
-        # Scroll Area for Image Preview
-        self.preview_scroll = QScrollArea()
-        self.preview_scroll.setWidgetResizable(True)
+        # Page-by-page Preview (only pages near the viewport are held in memory)
+        from src.ui.components.paged_preview import PagedPreview
+        self.preview_scroll = PagedPreview()
         self.preview_scroll.setStyleSheet("border: 1px solid #dadce0; background-color: #525659;") # Dark background for PDF feel
-        
-        self.preview_image_label = QLabel()
-        self.preview_image_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        self.preview_image_label.setStyleSheet("background-color: transparent;")
-        
-        self.preview_scroll.setWidget(self.preview_image_label)
+        self.preview_scroll.show_message("Select a Form Type to view preview")
         right_layout.addWidget(self.preview_scroll)
         
+        # 300ms debounce; renders off the GUI thread and only the newest edit is painted
+        self.preview_scheduler = self.preview_scroll.scheduler(self.build_preview_html, delay_ms=300)
+        
         # Add widgets to splitter
         splitter.addWidget(left_widget)
         splitter.addWidget(right_widget)
@@ -188,22 +182,21 @@ class AdjudicationWizard(QWidget):
 
     def trigger_preview_update(self):
         """Restart the debounce timer"""
-        self.preview_timer.start()
+        self.preview_scheduler.schedule()
 
     def update_live_preview(self):
-        """Generate and display the preview image"""
-        from src.utils.preview_generator import PreviewGenerator
-        
+        """Render the preview now instead of after the debounce"""
+        self.preview_scheduler.refresh_now()
+
+    def build_preview_html(self):
+        """HTML for the live preview, or None when there is nothing to render"""
         # Check if form type is selected
         if self.form_combo.currentIndex() <= 0:
             # Show placeholder
-            self.preview_image_label.setText("Select a Form Type to view preview")
-            self.preview_image_label.setStyleSheet("color: #bdc3c7; font-size: 14px; font-weight: bold;")
-            return
-            
-        self.preview_image_label.setStyleSheet("background-color: transparent;")
+            self.preview_scroll.show_message("Select a Form Type to view preview")
+            return None
         
-        # 1. Generate HTML based on form type
+        # Generate HTML based on form type
         form_type = self.form_combo.currentText()
         if "Show Cause Notice" in form_type or "SCN" in form_type:
             html_content = self.generate_scn_html()
@@ -211,19 +204,8 @@ class AdjudicationWizard(QWidget):
             html_content = self.generate_drc01a_html()
         
         if not html_content or "Error" in html_content:
-            return
-
-        # 2. Generate Image
-        img_bytes = PreviewGenerator.generate_preview_image(html_content)
-        
-        if img_bytes:
-            pixmap = PreviewGenerator.get_qpixmap_from_bytes(img_bytes)
-            
-            # Scale to fit width if needed, but keep aspect ratio
-            scaled_pixmap = pixmap.scaledToWidth(self.preview_scroll.width() - 30, Qt.TransformationMode.SmoothTransformation)
-            self.preview_image_label.setPixmap(scaled_pixmap)
-        else:
-            self.preview_image_label.setText("Preview Generation Failed")
+            return None
+        return html_content
 
     def reset_form(self):
         """Reset all form fields to default state"""
@@ -254,9 +236,7 @@ class AdjudicationWizard(QWidget):
         self.add_amount_row() # Add one empty row
         
         # Reset Preview
-        self.preview_image_label.clear()
-        self.preview_image_label.setText("Select a Form Type to view preview")
-        self.preview_image_label.setStyleSheet("color: #bdc3c7; font-size: 14px; font-weight: bold;")
+        self.preview_scroll.show_message("Select a Form Type to view preview")
 
     def load_letterhead(self):
         # Initial load
@@ -276,14 +256,9 @@ class AdjudicationWizard(QWidget):
                 self.templates_list = f.read().split('\n\n')
         except:
             self.templates_list = []
-            
-        # Load GSTINs for auto-complete
-        try:
-            all_taxpayers = self.db.search_taxpayers("")
-            self.gstin_list = [str(t.get('GSTIN', '')) for t in all_taxpayers if t.get('GSTIN')]
-        except Exception as e:
-            print(f"Error loading GSTINs: {e}")
-            self.gstin_list = []
+
+        # GSTIN auto-complete reads the shared taxpayer index; start building it now
+        taxpayer_index.warm()
     
     def load_templates(self):
         """Load letterhead and form header templates"""
@@ -900,9 +875,8 @@ class AdjudicationWizard(QWidget):
         self.gstin_input.textChanged.connect(self.trigger_preview_update)
         
         # Auto-complete
-        completer = QCompleter(self.gstin_list)
-        completer.setCaseSensitivity(Qt.CaseSensitivity.CaseInsensitive)
-        self.gstin_input.setCompleter(completer)
+        self.gstin_completer = TaxpayerCompleter(self.gstin_input)
+        self.gstin_completer.attach(self.gstin_input)
         gstin_layout.addWidget(self.gstin_input)
         
         section2.layout().addLayout(gstin_layout)
@@ -1556,7 +1530,7 @@ class AdjudicationWizard(QWidget):
         if not gstin:
             return
             
-        data = self.db.get_taxpayer(gstin)
+        data = taxpayer_index.lookup(gstin)
         if data:
             # Helper function to safely convert values, handling NaN
             def safe_str(value):
@@ -1858,15 +1832,8 @@ Tax Details:
                     form_html = self.generate_drc01a_html()
                     
                     # Extract letterhead content (just the div)
-                    with open(letterhead_path, 'r', encoding='utf-8') as f:
-                        letterhead_full = f.read()
-                        
-                    # Simple extraction of the letterhead div
-                    import re
-                    match = re.search(r'(<div class="letterhead.*?">.*?</div>)', letterhead_full, re.DOTALL)
-                    if match:
-                        letterhead_div = match.group(1)
-                    else:
+                    letterhead_div = render_assets.letterhead_div(letterhead_path)
+                    if not letterhead_div:
                         letterhead_div = "<div style='text-align:center'><h1>GOVERNMENT OF INDIA</h1></div>"
                         
                     # Inject letterhead INTO the form
@@ -1887,15 +1854,8 @@ Tax Details:
                     form_html = self.generate_scn_html()
                     
                     # Extract letterhead content
-                    with open(letterhead_path, 'r', encoding='utf-8') as f:
-                        letterhead_full = f.read()
-                        
-                    # Simple extraction of the letterhead div
-                    import re
-                    match = re.search(r'(<div class="letterhead.*?">.*?</div>)', letterhead_full, re.DOTALL)
-                    if match:
-                        letterhead_div = match.group(1)
-                    else:
+                    letterhead_div = render_assets.letterhead_div(letterhead_path)
+                    if not letterhead_div:
                         letterhead_div = "<div style='text-align:center'><h1>GOVERNMENT OF INDIA</h1></div>"
                         
                     # Inject letterhead INTO the form
@@ -2,6 +2,8 @@ from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushBut
                              QComboBox, QLineEdit, QStackedWidget, QMessageBox, QFrame, QGridLayout, QCompleter, QRadioButton, QButtonGroup)
 from PyQt6.QtCore import Qt, pyqtSignal
 from src.database.db_manager import DatabaseManager
+from src.services import taxpayer_index
+from src.ui.components.taxpayer_completer import TaxpayerCompleter
 import datetime
 
 class CaseInitiationWizard(QWidget):
@@ -66,12 +68,9 @@ class CaseInitiationWizard(QWidget):
         type_group.addLayout(type_layout)
         form_layout.addLayout(type_group)
         
-        # Auto-complete
-        all_gstins = self.db.get_all_gstins()
-        completer = QCompleter(all_gstins)
-        completer.setCaseSensitivity(Qt.CaseSensitivity.CaseInsensitive)
-        completer.setFilterMode(Qt.MatchFlag.MatchContains)
-        self.gstin_input.setCompleter(completer)
+        # Auto-complete from the shared taxpayer index
+        self.gstin_completer = TaxpayerCompleter(self.gstin_input)
+        self.gstin_completer.attach(self.gstin_input)
         
         self.gstin_input.textChanged.connect(self.on_gstin_changed)
         gstin_group.addWidget(gstin_lbl)
@@ -173,9 +172,9 @@ class CaseInitiationWizard(QWidget):
             self.tp_details_lbl.setText("Enter valid 15-digit GSTIN...")
             
     def fetch_gstin_details(self, gstin):
-        taxpayer = self.db.get_taxpayer(gstin)
+        taxpayer = taxpayer_index.lookup(gstin)
         if taxpayer:
-            self.taxpayer_data = taxpayer
+            self.taxpayer_data = dict(taxpayer)
             info = f"""
             <div style='font-size: 14px; line-height: 1.6;'>
                 <b>Legal Name:</b><br>{taxpayer.get('Legal Name', 'N/A')}<br><br>
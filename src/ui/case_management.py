@@ -363,20 +363,13 @@ class CaseManagement(QWidget):
 
             # 2. Fetch OC Details from oc_register (Secondary / For older schema)
             try:
-                conn = self.db._get_conn()
-                cursor = conn.cursor()
-                cursor.execute("SELECT * FROM oc_register WHERE case_id = ?", (pid,))
-                oc_row = cursor.fetchone()
-                if oc_row:
-                    # SQLite Row to dict
-                    cols = [c[0] for c in cursor.description]
-                    oc_dict = dict(zip(cols, oc_row))
+                oc_dict = self.db.get_oc_entry_for_case(pid)
+                if oc_dict:
                     # Only overwrite if not already found in additional_details
                     if not case_data.get("OC_Number"):
                         case_data["OC_Number"] = oc_dict.get('oc_number')
                     if not case_data.get("OC_Date"):
                         case_data["OC_Date"] = oc_dict.get('oc_date')
-                conn.close()
             except Exception as e:
                 # Table might not exist or connection error, ignore
                 pass
@@ -1,9 +1,12 @@
-from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QTableWidget, QTableWidgetItem, 
+from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QTableView,
                              QHeaderView, QLabel, QPushButton, QHBoxLayout, QAbstractItemView, 
                              QTabWidget, QLineEdit, QFrame, QMenu, QMessageBox)
 from PyQt6.QtCore import Qt
 from PyQt6.QtGui import QColor, QBrush
 from src.database.db_manager import DatabaseManager
+from src.ui.components.paged_table_model import PagedTableModel
+from src.ui.components.register_export_worker import start_register_export
+from src.services.register_export import REGISTER_COLUMNS, REGISTER_TITLES
 
 class CaseRegister(QWidget):
     def __init__(self):
@@ -64,6 +67,13 @@ class CaseRegister(QWidget):
         refresh_btn.clicked.connect(self.load_all_data)
         header_layout.addWidget(refresh_btn)
         
+        # Export Button (current register, as filtered)
+        export_btn = QPushButton("Export Register")
+        export_btn.setCursor(Qt.CursorShape.PointingHandCursor)
+        export_btn.setStyleSheet(refresh_btn.styleSheet().replace("#3498db", "#27ae60").replace("#2980b9", "#219653"))
+        export_btn.clicked.connect(self.export_current_register)
+        header_layout.addWidget(export_btn)
+        
         layout.addWidget(header_widget)
         
         # Tab Widget
@@ -142,22 +152,29 @@ class CaseRegister(QWidget):
         
         # Table Style
         table.setStyleSheet("""
-            QTableWidget::item {
+            QTableView::item {
                 padding: 5px;
                 border-bottom: 1px solid #f0f0f0;
             }
         """)
         
+        # Sorting runs in SQL through the paged model
+        header.setSortIndicator(-1, Qt.SortOrder.AscendingOrder)
+        table.setSortingEnabled(True)
+        
         # Enable Context Menu
         table.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
         table.customContextMenuRequested.connect(self.show_context_menu)
 
+    def create_register_table(self, register, columns):
+        """QTableView over a paged register model (Sl. No. column is key None)"""
+        table = QTableView()
+        table.setModel(PagedTableModel(self.db, register, columns, parent=table))
+        return table
+
     def create_oc_table(self):
         """Create OC Register table with 6 columns"""
-        table = QTableWidget()
-        table.setColumnCount(6)
-        headers = ["Sl. No.", "OC No.", "Content", "Date", "To", "Copy To"]
-        table.setHorizontalHeaderLabels(headers)
+        table = self.create_register_table('oc', REGISTER_COLUMNS['oc'])
         
         self.setup_table_style(table)
         
@@ -173,14 +190,7 @@ class CaseRegister(QWidget):
 
     def create_scn_table(self):
         """Create SCN Register table with 14 columns"""
-        table = QTableWidget()
-        table.setColumnCount(14)
-        headers = [
-            "Sl. No.", "GSTIN", "Legal Name", "Issue", "Financial Year", 
-            "Section Proceeding", "Issue (Section Violated)", "SCN No.", "SCN Date",
-            "Demand (CGST)", "Demand (SGST)", "Demand (IGST)", "Demand (Total)", "Remarks"
-        ]
-        table.setHorizontalHeaderLabels(headers)
+        table = self.create_register_table('scn', REGISTER_COLUMNS['scn'])
         
         self.setup_table_style(table)
         
@@ -200,15 +210,7 @@ class CaseRegister(QWidget):
 
     def create_oio_table(self):
         """Create OIO Register table with 16 columns"""
-        table = QTableWidget()
-        table.setColumnCount(16)
-        headers = [
-            "Sl. No.", "GSTIN", "Legal Name", "Issue", "Financial Year", 
-            "Section Proceeding", "Issue (Section Violated)", "SCN No.", "SCN Date",
-            "OIO No.", "OIO Date",
-            "Demand (CGST)", "Demand (SGST)", "Demand (IGST)", "Demand (Total)", "Remarks"
-        ]
-        table.setHorizontalHeaderLabels(headers)
+        table = self.create_register_table('oio', REGISTER_COLUMNS['oio'])
         
         self.setup_table_style(table)
         
@@ -228,16 +230,8 @@ class CaseRegister(QWidget):
         return table
 
     def create_drc01a_table(self):
-        """Create DRC-01A Register table with 13 columns (No SCN No)"""
-        table = QTableWidget()
-        table.setColumnCount(13)
-        headers = [
-            "Sl. No.", "GSTIN", "Legal Name", "Issue", "Financial Year", 
-            "Section Proceeding", "Issue (Section Violated)", "DRC-01A Date",
-            "Demand (CGST)", "Demand (SGST)", "Demand (IGST)", "Demand (Cess)", "Demand (Total)", "Remarks"
-        ]
-        table.setColumnCount(len(headers))
-        table.setHorizontalHeaderLabels(headers)
+        """Create DRC-01A Register table (No SCN No)"""
+        table = self.create_register_table('drc01a', REGISTER_COLUMNS['drc01a'])
         
         self.setup_table_style(table)
         
@@ -270,100 +264,27 @@ class CaseRegister(QWidget):
 
     def load_oc_register(self):
         """Load OC Register data"""
-        entries = self.db.get_oc_register_entries()
-        self.oc_table.setRowCount(len(entries))
-        
-        for i, entry in enumerate(entries):
-            self.oc_table.setItem(i, 0, QTableWidgetItem(str(i + 1)))
-            self.oc_table.setItem(i, 1, QTableWidgetItem(str(entry.get('OC_Number', ''))))
-            self.oc_table.setItem(i, 2, QTableWidgetItem(str(entry.get('OC_Content', ''))))
-            self.oc_table.setItem(i, 3, QTableWidgetItem(str(entry.get('OC_Date', ''))))
-            self.oc_table.setItem(i, 4, QTableWidgetItem(str(entry.get('OC_To', ''))))
-            self.oc_table.setItem(i, 5, QTableWidgetItem(str(entry.get('OC_Copy_To', ''))))
-            
-            # Store data for deletion
-            self.oc_table.item(i, 0).setData(Qt.ItemDataRole.UserRole, entry)
+        self.oc_table.model().reload()
 
     def load_drc01a_register(self):
         """Load DRC-01A Register data"""
-        cases = self.db.get_drc01a_register_cases()
-        self.drc01a_table.setRowCount(len(cases))
-        
-        for i, case in enumerate(cases):
-            self.drc01a_table.setItem(i, 0, QTableWidgetItem(str(i + 1)))
-            self.drc01a_table.setItem(i, 1, QTableWidgetItem(str(case.get('GSTIN', ''))))
-            self.drc01a_table.setItem(i, 2, QTableWidgetItem(str(case.get('Legal Name', ''))))
-            self.drc01a_table.setItem(i, 3, QTableWidgetItem(str(case.get('Issue_Description', ''))))
-            self.drc01a_table.setItem(i, 4, QTableWidgetItem(str(case.get('Financial_Year', ''))))
-            self.drc01a_table.setItem(i, 5, QTableWidgetItem(str(case.get('Section', ''))))
-            self.drc01a_table.setItem(i, 6, QTableWidgetItem(str(case.get('Issue_Description', ''))))
-            self.drc01a_table.setItem(i, 7, QTableWidgetItem(str(case.get('OC_Date', ''))))
-            self.drc01a_table.setItem(i, 8, QTableWidgetItem(str(case.get('CGST_Demand', ''))))
-            self.drc01a_table.setItem(i, 9, QTableWidgetItem(str(case.get('SGST_Demand', ''))))
-            self.drc01a_table.setItem(i, 10, QTableWidgetItem(str(case.get('IGST_Demand', ''))))
-            self.drc01a_table.setItem(i, 11, QTableWidgetItem(str(case.get('Cess_Demand', ''))))
-            self.drc01a_table.setItem(i, 12, QTableWidgetItem(str(case.get('Total_Demand', ''))))
-            self.drc01a_table.setItem(i, 13, QTableWidgetItem(str(case.get('Remarks', ''))))
-            
-            # Store data for deletion
-            self.drc01a_table.item(i, 0).setData(Qt.ItemDataRole.UserRole, case)
+        self.drc01a_table.model().reload()
 
     def load_scn_register(self):
         """Load SCN Register data"""
-        cases = self.db.get_scn_register_cases()
-        self.scn_table.setRowCount(len(cases))
-        
-        for i, case in enumerate(cases):
-            self.scn_table.setItem(i, 0, QTableWidgetItem(str(i + 1)))
-            self.scn_table.setItem(i, 1, QTableWidgetItem(str(case.get('GSTIN', ''))))
-            self.scn_table.setItem(i, 2, QTableWidgetItem(str(case.get('Legal Name', ''))))
-            self.scn_table.setItem(i, 3, QTableWidgetItem(str(case.get('Issue_Description', ''))))
-            self.scn_table.setItem(i, 4, QTableWidgetItem(str(case.get('Financial_Year', ''))))
-            self.scn_table.setItem(i, 5, QTableWidgetItem(str(case.get('Section', ''))))
-            self.scn_table.setItem(i, 6, QTableWidgetItem(str(case.get('Issue_Description', ''))))
-            self.scn_table.setItem(i, 7, QTableWidgetItem(str(case.get('SCN_Number', ''))))
-            self.scn_table.setItem(i, 8, QTableWidgetItem(str(case.get('SCN_Date', ''))))
-            self.scn_table.setItem(i, 9, QTableWidgetItem(str(case.get('CGST_Demand', ''))))
-            self.scn_table.setItem(i, 10, QTableWidgetItem(str(case.get('SGST_Demand', ''))))
-            self.scn_table.setItem(i, 11, QTableWidgetItem(str(case.get('IGST_Demand', ''))))
-            self.scn_table.setItem(i, 12, QTableWidgetItem(str(case.get('Total_Demand', ''))))
-            self.scn_table.setItem(i, 13, QTableWidgetItem(str(case.get('Remarks', ''))))
-            
-            # Store data for deletion
-            self.scn_table.item(i, 0).setData(Qt.ItemDataRole.UserRole, case)
+        self.scn_table.model().reload()
 
     def load_oio_register(self):
         """Load OIO Register data"""
-        cases = self.db.get_oio_register_cases()
-        self.oio_table.setRowCount(len(cases))
-        
-        for i, case in enumerate(cases):
-            self.oio_table.setItem(i, 0, QTableWidgetItem(str(i + 1)))
-            self.oio_table.setItem(i, 1, QTableWidgetItem(str(case.get('GSTIN', ''))))
-            self.oio_table.setItem(i, 2, QTableWidgetItem(str(case.get('Legal Name', ''))))
-            self.oio_table.setItem(i, 3, QTableWidgetItem(str(case.get('Issue_Description', ''))))
-            self.oio_table.setItem(i, 4, QTableWidgetItem(str(case.get('Financial_Year', ''))))
-            self.oio_table.setItem(i, 5, QTableWidgetItem(str(case.get('Section', ''))))
-            self.oio_table.setItem(i, 6, QTableWidgetItem(str(case.get('Issue_Description', ''))))
-            self.oio_table.setItem(i, 7, QTableWidgetItem(str(case.get('SCN_Number', ''))))
-            self.oio_table.setItem(i, 8, QTableWidgetItem(str(case.get('SCN_Date', ''))))
-            self.oio_table.setItem(i, 9, QTableWidgetItem(str(case.get('OIO_Number', ''))))
-            self.oio_table.setItem(i, 10, QTableWidgetItem(str(case.get('OIO_Date', ''))))
-            self.oio_table.setItem(i, 11, QTableWidgetItem(str(case.get('CGST_Demand', ''))))
-            self.oio_table.setItem(i, 12, QTableWidgetItem(str(case.get('SGST_Demand', ''))))
-            self.oio_table.setItem(i, 13, QTableWidgetItem(str(case.get('IGST_Demand', ''))))
-            self.oio_table.setItem(i, 14, QTableWidgetItem(str(case.get('Total_Demand', ''))))
-            self.oio_table.setItem(i, 15, QTableWidgetItem(str(case.get('Remarks', ''))))
-            
-            # Store data for deletion
-            self.oio_table.item(i, 0).setData(Qt.ItemDataRole.UserRole, case)
+        self.oio_table.model().reload()
 
     def create_asmt10_table(self):
         """Create ASMT-10 Register table"""
-        table = QTableWidget()
-        table.setColumnCount(7)
-        headers = ["Sl. No.", "GSTIN", "Financial Year", "Issue Date", "O.C. No.", "Case ID", "Actions"]
-        table.setHorizontalHeaderLabels(headers)
+        table = self.create_register_table('asmt10', REGISTER_COLUMNS['asmt10'] + [("Actions", "_action")])
+        # Rendered as a link-style cell; a widget per row would defeat paging
+        model = table.model()
+        model.display_fn = lambda key, entry: "View" if key == "_action" else None
+        model.foreground_fn = lambda key, entry: QBrush(QColor("#3b82f6")) if key == "_action" else None
         
         self.setup_table_style(table)
         
@@ -379,24 +300,7 @@ class CaseRegister(QWidget):
 
     def load_asmt10_register(self):
         """Load ASMT-10 Register data"""
-        entries = self.db.get_asmt10_register_entries()
-        self.asmt10_table.setRowCount(len(entries))
-        
-        for i, entry in enumerate(entries):
-            self.asmt10_table.setItem(i, 0, QTableWidgetItem(str(i + 1)))
-            self.asmt10_table.setItem(i, 1, QTableWidgetItem(str(entry.get('gstin', ''))))
-            self.asmt10_table.setItem(i, 2, QTableWidgetItem(str(entry.get('financial_year', ''))))
-            self.asmt10_table.setItem(i, 3, QTableWidgetItem(str(entry.get('issue_date', ''))))
-            self.asmt10_table.setItem(i, 4, QTableWidgetItem(str(entry.get('oc_number', ''))))
-            self.asmt10_table.setItem(i, 5, QTableWidgetItem(str(entry.get('case_id', ''))))
-            
-            # Action Button (Placeholder for now, or View)
-            btn = QPushButton("View")
-            btn.setStyleSheet("padding: 2px 8px; background: transparent; color: #3b82f6; border: 1px solid #3b82f6; border-radius: 4px;")
-            self.asmt10_table.setCellWidget(i, 6, btn)
-            
-            # Store data for deletion/actions
-            self.asmt10_table.item(i, 0).setData(Qt.ItemDataRole.UserRole, entry)
+        self.asmt10_table.model().reload()
 
     def on_tab_changed(self, index):
 
@@ -406,38 +310,30 @@ class CaseRegister(QWidget):
         self.filter_current_table(self.search_input.text())
 
     def filter_current_table(self, text):
-        """Filter the currently visible table"""
+        """Filter the currently visible table (matched in SQL by the register model)"""
         current_widget = self.tabs.currentWidget()
         # Find the table inside the widget
-        table = current_widget.findChild(QTableWidget)
+        table = current_widget.findChild(QTableView)
         
         if not table:
             return
             
-        text = text.lower()
-        for row in range(table.rowCount()):
-            match = False
-            for col in range(table.columnCount()):
-                item = table.item(row, col)
-                if item and text in item.text().lower():
-                    match = True
-                    break
-            table.setRowHidden(row, not match)
+        table.model().set_search(text)
 
     def show_context_menu(self, position):
         """Show context menu for table items"""
         # Identify sender table
         sender_table = self.sender()
-        if not isinstance(sender_table, QTableWidget):
+        if not isinstance(sender_table, QTableView):
             return
 
         menu = QMenu()
         
         # Handle right-click on unselected row
-        item = sender_table.itemAt(position)
-        if item and not item.isSelected():
+        index = sender_table.indexAt(position)
+        if index.isValid() and not sender_table.selectionModel().isSelected(index):
             sender_table.clearSelection()
-            sender_table.selectRow(item.row())
+            sender_table.selectRow(index.row())
         
         selection = sender_table.selectionModel().selectedRows()
         count = len(selection)
@@ -450,6 +346,16 @@ class CaseRegister(QWidget):
             if action == delete_action:
                 self.delete_selected_entries(sender_table)
 
+    def export_current_register(self):
+        """Export the visible register (with its current search and sort) to XLSX/CSV"""
+        table = self.tabs.currentWidget().findChild(QTableView)
+        if not table:
+            return
+        model = table.model()
+        from datetime import date
+        default_name = f"{REGISTER_TITLES[model.register].replace(' ', '_')}_{date.today().isoformat()}.xlsx"
+        self._export_worker = start_register_export(self, self.db, model, default_name)
+
     def delete_selected_entries(self, table):
         """Delete selected entries from the given table"""
         selection = table.selectionModel().selectedRows()
@@ -471,7 +377,7 @@ class CaseRegister(QWidget):
             
             for index in selection:
                 row = index.row()
-                case_data = table.item(row, 0).data(Qt.ItemDataRole.UserRole)
+                case_data = table.model().row_data(row)
                 
                 if not case_data:
                     continue
@@ -0,0 +1,157 @@
+import os
+import sys
+import subprocess
+
+from PyQt6.QtCore import Qt, QObject, pyqtSignal
+from PyQt6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QTableWidget, QTableWidgetItem,
+                             QHeaderView, QPushButton, QProgressBar, QLabel, QAbstractItemView)
+
+from src.services.export_jobs import ExportJobQueue, QUEUED, RUNNING, DONE, FAILED
+
+
+def open_file(path):
+    """Opens a generated file with the system viewer; failures are only logged."""
+    try:
+        if hasattr(os, "startfile"):
+            os.startfile(path)
+        elif sys.platform == "darwin":
+            subprocess.Popen(["open", path])
+        else:
+            subprocess.Popen(["xdg-open", path])
+    except Exception as e:
+        print(f"Could not open file: {e}")
+
+
+class ExportJobManager(QObject):
+    """
+    Application-wide export queue. Jobs render on background workers; state
+    changes arrive as job_changed(job, status) on the GUI thread, and the
+    per-job on_success callback (e.g. registering the document) runs there too.
+    status is the state at emit time - job.status may already have moved on.
+    """
+    job_changed = pyqtSignal(object, str)
+    job_finished = pyqtSignal(object)
+
+    _instance = None
+
+    @classmethod
+    def instance(cls):
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._callbacks = {}
+        # Emitted from worker threads; queued onto the GUI thread by Qt
+        self.queue = ExportJobQueue(max_workers=2, listener=lambda job: self.job_changed.emit(job, job.status))
+        self.job_changed.connect(self._on_job_changed)
+
+    def submit_pdf(self, title, html_content, output_path, on_success=None):
+        job = self.queue.submit_pdf(title, html_content, output_path)
+        self._callbacks[job.id] = on_success
+        return job
+
+    def submit_file(self, title, build, output_path, on_success=None):
+        job = self.queue.submit_file(title, build, output_path)
+        self._callbacks[job.id] = on_success
+        return job
+
+    def retry(self, job_id):
+        return self.queue.retry(job_id)
+
+    def jobs(self):
+        return self.queue.jobs()
+
+    def active_count(self):
+        return self.queue.active_count()
+
+    def _on_job_changed(self, job, status):
+        if status not in (DONE, FAILED):
+            return
+        if status == DONE:
+            callback = self._callbacks.pop(job.id, None)
+            if callback:
+                try:
+                    callback(job)
+                except Exception as e:
+                    print(f"Export completion handler failed for {job.title}: {e}")
+        self.job_finished.emit(job)
+
+
+class ExportJobsDialog(QDialog):
+    """Non-modal list of queued / running / finished exports with Retry and Open."""
+
+    STATUS_TEXT = {QUEUED: "Queued", RUNNING: "Rendering...", DONE: "Completed", FAILED: "Failed"}
+
+    def __init__(self, manager=None, parent=None):
+        super().__init__(parent)
+        self.manager = manager or ExportJobManager.instance()
+        self.setWindowTitle("Document Exports")
+        self.setModal(False)
+        self.resize(760, 320)
+
+        layout = QVBoxLayout(self)
+        self.summary_lbl = QLabel()
+        layout.addWidget(self.summary_lbl)
+
+        self.table = QTableWidget(0, 4)
+        self.table.setHorizontalHeaderLabels(["Document", "Saved To", "Status", ""])
+        self.table.horizontalHeader().setSectionResizeMode(1, QHeaderView.ResizeMode.Stretch)
+        self.table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.table.verticalHeader().setVisible(False)
+        layout.addWidget(self.table)
+
+        btn_row = QHBoxLayout()
+        btn_row.addStretch()
+        clear_btn = QPushButton("Clear Completed")
+        clear_btn.clicked.connect(self._clear_completed)
+        close_btn = QPushButton("Close")
+        close_btn.clicked.connect(self.hide)
+        btn_row.addWidget(clear_btn)
+        btn_row.addWidget(close_btn)
+        layout.addLayout(btn_row)
+
+        self.manager.job_changed.connect(lambda _job, _status: self.refresh())
+        self.refresh()
+
+    def refresh(self):
+        jobs = sorted(self.manager.jobs(), key=lambda j: j.id, reverse=True)
+        self.table.setRowCount(len(jobs))
+        for row, job in enumerate(jobs):
+            self.table.setItem(row, 0, QTableWidgetItem(job.title))
+            path_item = QTableWidgetItem(job.output_path)
+            path_item.setToolTip(job.output_path)
+            self.table.setItem(row, 1, path_item)
+
+            if job.status in (QUEUED, RUNNING):
+                bar = QProgressBar()
+                bar.setRange(0, 0 if job.status == RUNNING else 1)
+                bar.setFormat(self.STATUS_TEXT[job.status])
+                bar.setTextVisible(True)
+                self.table.setCellWidget(row, 2, bar)
+            else:
+                self.table.removeCellWidget(row, 2)
+                status_item = QTableWidgetItem(self.STATUS_TEXT[job.status])
+                if job.error:
+                    status_item.setToolTip(job.error)
+                    status_item.setForeground(Qt.GlobalColor.red)
+                self.table.setItem(row, 2, status_item)
+
+            if job.status == FAILED:
+                action = QPushButton("Retry")
+                action.clicked.connect(lambda _=False, jid=job.id: self.manager.retry(jid))
+                self.table.setCellWidget(row, 3, action)
+            elif job.status == DONE:
+                action = QPushButton("Open")
+                action.clicked.connect(lambda _=False, p=job.output_path: open_file(p))
+                self.table.setCellWidget(row, 3, action)
+            else:
+                self.table.removeCellWidget(row, 3)
+
+        active = sum(1 for j in jobs if j.is_active)
+        self.summary_lbl.setText(f"{active} export(s) in progress" if active else "No exports in progress")
+
+    def _clear_completed(self):
+        self.manager.queue.clear_finished()
+        self.refresh()
@@ -0,0 +1,196 @@
+from PyQt6.QtWidgets import QScrollArea, QWidget, QVBoxLayout, QLabel, QApplication
+from PyQt6.QtCore import Qt
+from PyQt6.QtGui import QPixmap
+
+from src.utils.preview_generator import PreviewGenerator
+
+
+class PagedPreview(QScrollArea):
+    """
+    Document preview as a column of page images (see
+    PreviewGenerator.render_pages). Every page gets a placeholder of its
+    final size, but only pages in or next to the viewport hold a pixmap;
+    the rest are dropped as they scroll out. Memory follows the viewport,
+    not the document length. Pages on screen are requested first and shown
+    as soon as the worker writes them. render_html blocks until the document
+    is done; scheduler() renders off the GUI thread, newest edit wins.
+    """
+
+    A4_RATIO = 297 / 210
+
+    def __init__(self, parent=None, margin_pages=1, spacing=20):
+        super().__init__(parent)
+        self.margin_pages = margin_pages
+        self.setWidgetResizable(True)
+        self.setAlignment(Qt.AlignmentFlag.AlignHCenter)
+
+        self._container = QWidget()
+        self._layout = QVBoxLayout(self._container)
+        self._layout.setAlignment(Qt.AlignmentFlag.AlignHCenter | Qt.AlignmentFlag.AlignTop)
+        self._layout.setSpacing(spacing)
+        self._layout.setContentsMargins(spacing, spacing, spacing, spacing)
+        self.setWidget(self._container)
+
+        self._labels = []
+        self._pages = {}
+        self._loaded = set()
+        self._message = None
+        self._reset_pending = False
+        self.verticalScrollBar().valueChanged.connect(self._refresh_visible)
+
+    def page_width(self):
+        return max(200, self.viewport().width() - 2 * self._layout.contentsMargins().left())
+
+    def render_html(self, html_content):
+        """Renders html into the view; returns False if no page could be produced."""
+        job = self.prepare_render(html_content)
+        try:
+            pages = self.render_job(job, None, self._apply_now)
+        except RuntimeError as e:
+            self.render_failed(e)
+            return False
+        return self.finish_render(pages)
+
+    def scheduler(self, build_html, delay_ms=300, parent=None):
+        """
+        A PreviewScheduler rendering build_html() into this view off the GUI
+        thread. build_html runs on the GUI thread and may return None to skip.
+        """
+        from src.ui.components.preview_scheduler import PreviewScheduler
+
+        def build():
+            html_content = build_html()
+            return self.prepare_render(html_content) if html_content else None
+
+        return PreviewScheduler(build, self.render_job, self.finish_render, delay_ms=delay_ms,
+                                progress=self.apply_progress, failed=self.render_failed,
+                                parent=parent or self)
+
+    # ---- Render steps (render_job may run on any thread) ----
+
+    def prepare_render(self, html_content):
+        """GUI-thread part: the pages on screen and the pixel width to render at."""
+        self._reset_pending = True
+        width = int(self.page_width() * self.devicePixelRatioF())
+        return html_content, width, self.visible_pages() or [0, 1]
+
+    @staticmethod
+    def render_job(job, cancel, report):
+        html_content, width, first = job
+        return PreviewGenerator.render_pages(
+            html_content, width=width, first_pages=first, cancel=cancel,
+            on_page=lambda page: report(("page", page)),
+            on_count=lambda count: report(("count", count)))
+
+    def apply_progress(self, item):
+        # The previous document stays up until the new one starts arriving
+        if self._reset_pending:
+            self._reset_pending = False
+            self._clear(keep_labels=True)
+        kind, value = item
+        if kind == "count":
+            self._on_count(value)
+        else:
+            self._on_page(value)
+
+    def finish_render(self, pages):
+        if not pages:
+            self.show_message("Preview Generation Failed")
+            return False
+        self._refresh_visible()
+        return True
+
+    def render_failed(self, error):
+        if isinstance(error, RuntimeError):
+            self.show_message("Preview unavailable: rendering components are missing.")
+        else:
+            self.show_message("Preview Generation Failed")
+
+    def _apply_now(self, item):
+        self.apply_progress(item)
+        QApplication.processEvents()
+
+    def show_message(self, text):
+        self._reset_pending = False
+        self._clear()
+        self._message = QLabel(text)
+        self._message.setStyleSheet("color: #bdc3c7; font-size: 14px; font-weight: bold;")
+        self._message.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self._layout.addWidget(self._message)
+
+    def clear_preview(self):
+        self._clear()
+
+    def visible_pages(self):
+        """Indices of pages intersecting the viewport."""
+        top = self.verticalScrollBar().value()
+        bottom = top + self.viewport().height()
+        return [i for i, label in enumerate(self._labels)
+                if label.y() < bottom and label.y() + label.height() > top]
+
+    # ---- Rendering callbacks ----
+
+    def _on_count(self, count):
+        width = self.page_width()
+        placeholder_height = int(width * self.A4_RATIO)
+        while len(self._labels) < count:
+            label = QLabel()
+            label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+            label.setStyleSheet("background-color: white; border: 1px solid #ccc;")
+            self._layout.addWidget(label)
+            self._labels.append(label)
+        for label in self._labels[count:]:
+            label.deleteLater()
+        del self._labels[count:]
+        for i, label in enumerate(self._labels):
+            if i not in self._pages:
+                label.setFixedSize(width, placeholder_height)
+
+    def _on_page(self, page):
+        self._pages[page.index] = page
+        label = self._labels[page.index]
+        ratio = self.devicePixelRatioF()
+        label.setFixedSize(int(page.width / ratio), int(page.height / ratio))
+        if self._is_near_view(page.index):
+            self._load(page.index)
+
+    # ---- Viewport bookkeeping ----
+
+    def _is_near_view(self, index):
+        visible = self.visible_pages()
+        if not visible:
+            return index <= self.margin_pages
+        return visible[0] - self.margin_pages <= index <= visible[-1] + self.margin_pages
+
+    def _load(self, index):
+        page = self._pages.get(index)
+        if page is None or index in self._loaded:
+            return
+        pixmap = QPixmap(page.path)
+        if pixmap.isNull():
+            return
+        pixmap.setDevicePixelRatio(self.devicePixelRatioF())
+        self._labels[index].setPixmap(pixmap)
+        self._loaded.add(index)
+
+    def _refresh_visible(self, *_):
+        for index in list(self._loaded):
+            if not self._is_near_view(index):
+                self._labels[index].clear()
+                self._loaded.discard(index)
+        for index in range(len(self._labels)):
+            if self._is_near_view(index):
+                self._load(index)
+
+    def _clear(self, keep_labels=False):
+        if self._message is not None:
+            self._message.deleteLater()
+            self._message = None
+        self._pages.clear()
+        self._loaded.clear()
+        for label in self._labels:
+            label.clear()
+        if not keep_labels:
+            for label in self._labels:
+                label.deleteLater()
+            self._labels = []
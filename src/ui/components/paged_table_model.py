@@ -0,0 +1,144 @@
+from PyQt6.QtCore import Qt, QAbstractTableModel, QModelIndex
+
+
+class PagedTableModel(QAbstractTableModel):
+    """
+    Read-only table model over a register in DatabaseManager (see
+    src/database/register_queries.py). Rows are pulled a page at a time as the
+    view scrolls (canFetchMore/fetchMore); sorting and filtering are pushed
+    down to SQL, so opening a register costs one COUNT and one page no matter
+    how many records it holds.
+
+    columns: list of (header, key). key None renders the running Sl. No.
+    """
+
+    SERIAL = None
+
+    def __init__(self, db, register, columns, page_size=200, parent=None):
+        super().__init__(parent)
+        self.db = db
+        self.register = register
+        self.columns = columns
+        self.page_size = page_size
+
+        self._rows = []
+        self._total = 0
+        self._search = ""
+        self._filters = {}
+        self._order_by = None
+        self._descending = False
+
+        # Optional per-cell hooks: fn(key, record) -> value for the role (None = default)
+        self.display_fn = None
+        self.background_fn = None
+        self.foreground_fn = None
+
+    # ---- Qt model interface ----
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.columns)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            return self.columns[section][0]
+        return None
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or index.row() >= len(self._rows):
+            return None
+        record = self._rows[index.row()]
+        key = self.columns[index.column()][1]
+
+        if role == Qt.ItemDataRole.DisplayRole:
+            if key is self.SERIAL:
+                return str(index.row() + 1)
+            if self.display_fn:
+                text = self.display_fn(key, record)
+                if text is not None:
+                    return text
+            value = record.get(key)
+            return "" if value is None else str(value)
+        if role == Qt.ItemDataRole.UserRole:
+            return record
+        if role == Qt.ItemDataRole.BackgroundRole and self.background_fn:
+            return self.background_fn(key, record)
+        if role == Qt.ItemDataRole.ForegroundRole and self.foreground_fn:
+            return self.foreground_fn(key, record)
+        return None
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and len(self._rows) < self._total
+
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid():
+            return
+        page = self.db.fetch_register_page(
+            self.register,
+            offset=len(self._rows),
+            limit=self.page_size,
+            order_by=self._order_by,
+            descending=self._descending,
+            search=self._search,
+            filters=self._filters,
+        )
+        if not page:
+            # Source shrank underneath us; stop asking for more
+            self._total = len(self._rows)
+            return
+        start = len(self._rows)
+        self.beginInsertRows(QModelIndex(), start, start + len(page) - 1)
+        self._rows.extend(page)
+        self.endInsertRows()
+
+    def sort(self, column, order=Qt.SortOrder.AscendingOrder):
+        key = self.columns[column][1] if 0 <= column < len(self.columns) else self.SERIAL
+        if key is self.SERIAL:
+            # Sl. No. follows the register's default order
+            self._order_by = None
+            self._descending = False
+        else:
+            self._order_by = key
+            self._descending = order == Qt.SortOrder.DescendingOrder
+        self.reload()
+
+    # ---- Register controls ----
+
+    def reload(self):
+        """Re-count and drop loaded rows; the view pulls the first page again."""
+        self.beginResetModel()
+        self._rows = []
+        self._total = self.db.count_register_rows(self.register, search=self._search, filters=self._filters)
+        self.endResetModel()
+        if self.canFetchMore():
+            self.fetchMore()
+
+    def set_search(self, text):
+        text = (text or "").strip()
+        if text != self._search:
+            self._search = text
+            self.reload()
+
+    def set_filters(self, filters):
+        self._filters = dict(filters or {})
+        self.reload()
+
+    def query_state(self):
+        """Current search/filters/sort, e.g. to export exactly what the view shows."""
+        return {
+            'search': self._search,
+            'filters': dict(self._filters),
+            'order_by': self._order_by,
+            'descending': self._descending,
+        }
+
+    def total_rows(self):
+        return self._total
+
+    def row_data(self, row):
+        """Record dict behind a view row (for delete/open actions)."""
+        if 0 <= row < len(self._rows):
+            return self._rows[row]
+        return None
@@ -0,0 +1,94 @@
+import threading
+
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal
+
+
+class PreviewScheduler(QObject):
+    """
+    Debounced, latest-wins live preview.
+
+    schedule() (re)starts the debounce timer. When it fires, build() runs on
+    the GUI thread and returns a job (e.g. the HTML, read from the form), or
+    None if there is nothing to render. render(job, cancel, report) then
+    runs on a background thread. Each new job sets the cancel Event of the
+    one before it, and render is expected to stop (and kill any worker
+    process) when that happens. Only the newest job reaches the GUI:
+    report(item) calls arrive as progress(item), the return value as
+    paint(result), and an exception as failed(exc). Anything from a
+    superseded job is dropped, however late it arrives.
+    """
+    _progress = pyqtSignal(int, object)
+    _finished = pyqtSignal(int, object, object)
+
+    def __init__(self, build, render, paint, delay_ms=300, progress=None, failed=None, parent=None):
+        super().__init__(parent)
+        self._build = build
+        self._render = render
+        self._paint = paint
+        self._on_progress = progress
+        self._on_failed = failed
+        self._generation = 0
+        self._cancel = None
+
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(delay_ms)
+        self._timer.timeout.connect(self.refresh_now)
+
+        # Emitted from render threads; queued onto the GUI thread by Qt
+        self._progress.connect(self._deliver_progress)
+        self._finished.connect(self._deliver_result)
+
+    def schedule(self):
+        """Restarts the debounce timer."""
+        self._timer.start()
+
+    def refresh_now(self):
+        """Starts a render of the current state immediately."""
+        self._timer.stop()
+        self.cancel()
+        job = self._build()
+        if job is None:
+            return
+        generation = self._generation
+        cancel = threading.Event()
+        self._cancel = cancel
+        threading.Thread(target=self._run, args=(generation, job, cancel), daemon=True).start()
+
+    def cancel(self):
+        """Stops the pending timer and any render in flight; nothing from it will be painted."""
+        self._timer.stop()
+        self._generation += 1
+        if self._cancel is not None:
+            self._cancel.set()
+            self._cancel = None
+
+    def is_busy(self):
+        return self._cancel is not None
+
+    def _run(self, generation, job, cancel):
+        def report(item):
+            if not cancel.is_set():
+                self._progress.emit(generation, item)
+
+        try:
+            result, error = self._render(job, cancel, report), None
+        except Exception as e:
+            result, error = None, e
+        if not cancel.is_set():
+            self._finished.emit(generation, result, error)
+
+    def _deliver_progress(self, generation, item):
+        if generation == self._generation and self._on_progress:
+            self._on_progress(item)
+
+    def _deliver_result(self, generation, result, error):
+        if generation != self._generation:
+            return  # Superseded by a newer edit
+        self._cancel = None
+        if error is None:
+            self._paint(result)
+        elif self._on_failed:
+            self._on_failed(error)
+        else:
+            print(f"Preview render failed: {error}")
@@ -0,0 +1,83 @@
+import os
+
+from PyQt6.QtCore import Qt, QThread, pyqtSignal
+from PyQt6.QtWidgets import QFileDialog, QMessageBox, QProgressDialog
+
+from src.services.register_export import export_register, ExportCancelled
+
+
+class RegisterExportWorker(QThread):
+    """
+    Runs export_register off the GUI thread.
+    Emits progress(written, total) per batch and finished_export(success, message).
+    """
+    progress = pyqtSignal(int, int)
+    finished_export = pyqtSignal(bool, str)
+
+    def __init__(self, db, register, output_path, search=None, filters=None, order_by=None,
+                 descending=False, parent=None):
+        super().__init__(parent)
+        self.db = db
+        self.register = register
+        self.output_path = output_path
+        self.search = search
+        self.filters = filters
+        self.order_by = order_by
+        self.descending = descending
+
+    def run(self):
+        try:
+            written = export_register(
+                self.db, self.register, self.output_path,
+                search=self.search, filters=self.filters,
+                order_by=self.order_by, descending=self.descending,
+                progress=lambda done, total: self.progress.emit(done, total),
+                is_cancelled=self.isInterruptionRequested,
+            )
+            self.finished_export.emit(True, f"Exported {written} rows to {self.output_path}")
+        except ExportCancelled:
+            self.finished_export.emit(False, "Export cancelled.")
+        except Exception as e:
+            self.finished_export.emit(False, f"Export failed: {e}")
+
+
+def start_register_export(parent, db, model, default_name):
+    """
+    Asks for a target file and exports what the paged model currently shows
+    (same search, filters and sort) in the background with a cancellable
+    progress dialog. Returns the worker, or None if the user cancelled.
+    """
+    path, selected = QFileDialog.getSaveFileName(
+        parent, "Export Register", default_name,
+        "Excel Workbook (*.xlsx);;CSV (*.csv)"
+    )
+    if not path:
+        return None
+    if not os.path.splitext(path)[1]:
+        path += ".csv" if "csv" in selected.lower() else ".xlsx"
+
+    state = model.query_state()
+    worker = RegisterExportWorker(db, model.register, path, parent=parent, **state)
+
+    dialog = QProgressDialog("Exporting register...", "Cancel", 0, 0, parent)
+    dialog.setWindowTitle("Export")
+    dialog.setWindowModality(Qt.WindowModality.WindowModal)
+    dialog.setMinimumDuration(300)
+    dialog.canceled.connect(worker.requestInterruption)
+
+    def on_progress(done, total):
+        dialog.setMaximum(max(total, 1))
+        dialog.setValue(min(done, max(total, 1)))
+
+    def on_finished(success, message):
+        dialog.reset()
+        if success:
+            QMessageBox.information(parent, "Export Complete", message)
+        elif not worker.isInterruptionRequested():
+            QMessageBox.critical(parent, "Export Failed", message)
+        worker.deleteLater()
+
+    worker.progress.connect(on_progress)
+    worker.finished_export.connect(on_finished)
+    worker.start()
+    return worker
@@ -1,11 +1,13 @@
-import re
 from PyQt6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, 
                              QPushButton, QLineEdit, QTreeWidget, QTreeWidgetItem, 
                              QLabel, QHeaderView)
-from PyQt6.QtCore import Qt
+from PyQt6.QtCore import Qt, QTimer
 from src.database.db_manager import DatabaseManager
+from src.utils.section_catalogue import SectionCatalogue, WHOLE_SECTION
 
 class SectionSelectorDialog(QDialog):
+    FILTER_DELAY_MS = 150
+
     def __init__(self, parent=None):
         super().__init__(parent)
         self.setWindowTitle("Select Legal Sections")
@@ -13,6 +15,12 @@ class SectionSelectorDialog(QDialog):
         self.setMinimumHeight(600)
         self.db = DatabaseManager()
         self.sections = [] # List of dicts {title, content, section_number, id}
+        self.catalogue = SectionCatalogue([])
+        self._items = []
+        self._hidden = set()
+        self.filter_timer = QTimer(self)
+        self.filter_timer.setSingleShot(True)
+        self.filter_timer.timeout.connect(self._apply_filter)
         
         self.init_ui()
         self.load_sections()
@@ -30,7 +38,7 @@ class SectionSelectorDialog(QDialog):
         search_lbl = QLabel("Search:")
         self.search_input = QLineEdit()
         self.search_input.setPlaceholderText("Filter sections by number, title, or content...")
-        self.search_input.textChanged.connect(self.filter_tree)
+        self.search_input.textChanged.connect(self._schedule_filter)
         search_layout.addWidget(search_lbl)
         search_layout.addWidget(self.search_input)
         layout.addLayout(search_layout)
@@ -70,48 +78,18 @@ class SectionSelectorDialog(QDialog):
         layout.addLayout(action_layout)
 
     def load_sections(self):
-        self.sections = self.db.get_cgst_sections()
-        self.populate_tree(self.sections)
-
-    def parse_subsections(self, content):
-        """
-        Parses content to identify subsections starting with (1), (2), etc.
-        Returns a list of tuples: (subsection_label, content_text)
-        """
-        # Regex to match (1), (2), (a), etc. at start of line
-        # We look for: newline + (digits/letters) + space
-        pattern = r'(?:^|\n)(\([0-9a-zA-Z]+\))\s'
-        parts = re.split(pattern, content)
-        
-        subsections = []
-        
-        # If parts has content before first match (intro text), handle it
-        if parts and parts[0].strip():
-            subsections.append(("Intro", parts[0].strip()))
-            
-        # Iterate over split parts. 
-        # re.split includes capturing groups, so we get: [Intro, (1), Content1, (2), Content2...]
-        for i in range(1, len(parts), 2):
-            label = parts[i]
-            text = parts[i+1].strip() if i+1 < len(parts) else ""
-            subsections.append((label, text))
-            
-        return subsections
+        self.catalogue = self.db.get_cgst_section_catalogue()
+        self.sections = [entry.section for entry in self.catalogue.entries]
+        self.populate_tree(self.catalogue)
 
-    def populate_tree(self, sections):
+    def populate_tree(self, catalogue):
         self.tree_widget.clear()
-        
-        for sec in sections:
-            # Prepare Parent Item
-            title = sec.get('title', 'Unknown Section')
-            sec_num = sec.get('section_number')
-            content = sec.get('content', '')
-            
-            if sec_num:
-                display_text = f"Section {sec_num} - {title}"
-            else:
-                display_text = title
-            
+        self._items = []  # [(parent item, [child items])], in catalogue order
+        self._hidden = set()  # catalogue keys of hidden items
+
+        for entry in catalogue.entries:
+            display_text = entry.display_text
+
             parent_item = QTreeWidgetItem(self.tree_widget)
             parent_item.setText(0, display_text)
             parent_item.setFlags(parent_item.flags() | Qt.ItemFlag.ItemIsUserCheckable | Qt.ItemFlag.ItemIsAutoTristate)
@@ -120,72 +98,72 @@ class SectionSelectorDialog(QDialog):
             # Store full section data in parent
             parent_item.setData(0, Qt.ItemDataRole.UserRole, {
                 'type': 'section',
-                'raw_data': sec
+                'raw_data': entry.section
             })
             
-            # Parse Subsections
-            subsections = self.parse_subsections(content)
-            
-            if len(subsections) > 1: # Only create children if actual subsections exist
-                for sub_label, sub_content in subsections:
-                    child_item = QTreeWidgetItem(parent_item)
-                    child_text = f"{sub_label} {sub_content[:100]}..."
-                    child_item.setText(0, child_text)
-                    child_item.setToolTip(0, sub_content)
-                    child_item.setFlags(child_item.flags() | Qt.ItemFlag.ItemIsUserCheckable)
-                    child_item.setCheckState(0, Qt.CheckState.Unchecked)
-                    
-                    child_item.setData(0, Qt.ItemDataRole.UserRole, {
-                        'type': 'subsection',
-                        'label': sub_label,
-                        'content': sub_content,
-                        'parent_title': display_text
-                    })
-            else:
-                # If no subsections formatted, allow selecting parent typically
-                pass
+            # Subsections were split when the catalogue was built;
+            # sections without them can only be selected whole
+            children = []
+            for sub_label, sub_content in entry.subsections:
+                child_item = QTreeWidgetItem(parent_item)
+                child_text = f"{sub_label} {sub_content[:100]}..."
+                child_item.setText(0, child_text)
+                child_item.setToolTip(0, sub_content)
+                child_item.setFlags(child_item.flags() | Qt.ItemFlag.ItemIsUserCheckable)
+                child_item.setCheckState(0, Qt.CheckState.Unchecked)
+
+                child_item.setData(0, Qt.ItemDataRole.UserRole, {
+                    'type': 'subsection',
+                    'label': sub_label,
+                    'content': sub_content,
+                    'parent_title': display_text
+                })
+                children.append(child_item)
+            self._items.append((parent_item, children))
+
+    def _schedule_filter(self, text):
+        # Filter once typing pauses, not on every keystroke
+        self.filter_timer.start(self.FILTER_DELAY_MS)
+
+    def _apply_filter(self):
+        self.filter_tree(self.search_input.text())
 
     def filter_tree(self, text):
-        text = text.lower()
-        
-        # Hide/Show items based on filter
-        root = self.tree_widget.invisibleRootItem()
-        child_count = root.childCount()
-        
-        for i in range(child_count):
-            item = root.child(i)
-            self._filter_recursive(item, text)
-
-    def _filter_recursive(self, item, text):
-        # customized logic: if parent matches, show. If child matches, show parent and child.
-        data = item.data(0, Qt.ItemDataRole.UserRole)
-        match = False
-        
-        if data:
-            if data['type'] == 'section':
-                sec = data['raw_data']
-                if (text in sec.get('title', '').lower() or 
-                    text in sec.get('content', '').lower() or 
-                    text in str(sec.get('section_number', '')).lower()):
-                    match = True
-            elif data['type'] == 'subsection':
-                if (text in data['content'].lower() or 
-                    text in data['label'].lower()):
-                    match = True
-        
-        # Check children
-        child_match = False
-        for i in range(item.childCount()):
-            child = item.child(i)
-            if self._filter_recursive(child, text):
-                child_match = True
-        
-        should_show = match or child_match
-        item.setHidden(not should_show)
-        if should_show:
-             item.setExpanded(True) # Expand if matches found inside
-             
-        return should_show
+        """
+        Shows sections matching every word of text (the last as a prefix),
+        and within them the matching subsections. Only items whose
+        visibility changes are touched.
+        """
+        self.filter_timer.stop()
+        hits = self.catalogue.search(text)
+
+        if hits is None:
+            hidden = set()
+        else:
+            shown_sections = {s for s, _ in hits}
+            hidden = set()
+            for s, (_, children) in enumerate(self._items):
+                if s not in shown_sections:
+                    hidden.add((s, WHOLE_SECTION))
+                    continue
+                hidden.update((s, k) for k in range(len(children)) if (s, k) not in hits)
+
+        changed = hidden ^ self._hidden
+        if not changed and not hits:
+            return
+        self.tree_widget.setUpdatesEnabled(False)
+        try:
+            for s, k in changed:
+                parent, children = self._items[s]
+                item = parent if k == WHOLE_SECTION else children[k]
+                item.setHidden((s, k) in hidden)
+            if hits:
+                # Open matching sections that have a matching subsection
+                for s in {s for s, k in hits if k != WHOLE_SECTION}:
+                    self._items[s][0].setExpanded(True)
+        finally:
+            self.tree_widget.setUpdatesEnabled(True)
+        self._hidden = hidden
 
     def select_all(self):
         root = self.tree_widget.invisibleRootItem()
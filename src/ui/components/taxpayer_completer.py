@@ -0,0 +1,82 @@
+from PyQt6.QtCore import QModelIndex, Qt, pyqtSignal
+from PyQt6.QtGui import QStandardItem, QStandardItemModel
+from PyQt6.QtWidgets import QComboBox, QCompleter
+
+from src.services import taxpayer_index
+
+GSTIN_ROLE = Qt.ItemDataRole.UserRole
+RECORD_ROLE = Qt.ItemDataRole.UserRole + 1
+
+
+class TaxpayerCompleter(QCompleter):
+    """
+    GSTIN completer backed by the shared taxpayer index.
+
+    On each edit the popup is refilled with the top suggestions for the
+    typed text (GSTIN, legal or trade name prefix), shown as
+    'GSTIN - Legal Name'; choosing one puts the GSTIN in the field and
+    emits taxpayer_selected with the record.
+    """
+    taxpayer_selected = pyqtSignal(dict)
+
+    def __init__(self, parent=None, limit=10):
+        super().__init__(parent)
+        self.limit = limit
+        self._model = QStandardItemModel(self)
+        self.setModel(self._model)
+        self.setCompletionRole(GSTIN_ROLE)
+        self.setCompletionMode(QCompleter.CompletionMode.UnfilteredPopupCompletion)
+        self.activated[QModelIndex].connect(self._on_activated)
+        taxpayer_index.warm()
+
+    def attach(self, widget):
+        """Installs the completer on a QLineEdit or an editable QComboBox."""
+        widget.setCompleter(self)
+        line_edit = widget.lineEdit() if isinstance(widget, QComboBox) else widget
+        line_edit.textEdited.connect(self.update_suggestions)
+
+    def update_suggestions(self, text):
+        self._model.clear()
+        for label, record in taxpayer_index.suggest(text, self.limit):
+            item = QStandardItem(label)
+            item.setData(taxpayer_index.normalize_gstin(record.get('GSTIN')), GSTIN_ROLE)
+            item.setData(record, RECORD_ROLE)
+            item.setEditable(False)
+            self._model.appendRow(item)
+        if self._model.rowCount():
+            self.complete()
+        else:
+            self.popup().hide()
+
+    def _on_activated(self, index):
+        record = index.data(RECORD_ROLE)
+        if record:
+            self.taxpayer_selected.emit(record)
+
+
+class TaxpayerComboBox(QComboBox):
+    """
+    Editable GSTIN combo box with a TaxpayerCompleter. Its drop-down lists
+    every GSTIN in the taxpayer master, taken from the shared index when
+    the list is opened, so building the widget reads nothing.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setEditable(True)
+        self.taxpayer_completer = TaxpayerCompleter(self)
+        self.taxpayer_completer.attach(self)
+        self._gstins = []
+
+    def showPopup(self):
+        gstins = taxpayer_index.gstins()
+        if gstins != self._gstins:
+            text = self.currentText()
+            self.blockSignals(True)
+            self.clear()
+            self.addItems(gstins)
+            self.setCurrentIndex(-1)
+            self.setEditText(text)
+            self.blockSignals(False)
+            self._gstins = gstins
+        super().showPopup()
@@ -3,6 +3,7 @@ from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton,
 from PyQt6.QtCore import Qt, QPropertyAnimation, QEasingCurve
 from src.database.db_manager import DatabaseManager
 from src.ui.styles import Theme, Styles
+from src.utils.constants import WorkflowStage
 
 class DashboardCard(QFrame):
     def __init__(self, title, index, color, callback):
@@ -91,6 +92,17 @@ class DashboardCard(QFrame):
         """)
 
 class Dashboard(QWidget):
+    STAT_TILES = [
+        ('scrutiny', "Scrutiny Cases"),
+        ('asmt10_issued', "ASMT-10 Issued"),
+        ('adjudication', "Adjudication Cases"),
+        ('scn_issued', "SCN Issued"),
+        ('orders_issued', "Orders Issued"),
+        ('case_files', "Case Files (Register)"),
+        ('drc01a_demand', "Demand in DRC-01A"),
+        ('scn_demand', "Demand in SCN"),
+    ]
+
     def __init__(self, navigate_callback):
         super().__init__()
         self.navigate_callback = navigate_callback
@@ -113,6 +125,32 @@ class Dashboard(QWidget):
         
         layout.addSpacing(20)
 
+        # Case Statistics (materialised in SQLite; see case_stats.py)
+        stats_grid = QGridLayout()
+        stats_grid.setSpacing(15)
+        self.stat_labels = {}
+        for i, (key, caption) in enumerate(self.STAT_TILES):
+            tile = QFrame()
+            tile.setStyleSheet(f"""
+                QFrame {{
+                    background-color: {Theme.SURFACE};
+                    border-radius: 10px;
+                    border: 1px solid {Theme.BORDER};
+                }}
+            """)
+            tile_layout = QVBoxLayout(tile)
+            value = QLabel("-")
+            value.setStyleSheet(f"font-size: 26px; font-weight: 800; color: {Theme.PRIMARY}; border: none;")
+            label = QLabel(caption)
+            label.setStyleSheet(f"font-size: 13px; color: {Theme.TEXT_SECONDARY}; border: none;")
+            tile_layout.addWidget(value)
+            tile_layout.addWidget(label)
+            self.stat_labels[key] = value
+            stats_grid.addWidget(tile, i // 4, i % 4)
+        layout.addLayout(stats_grid)
+
+        layout.addSpacing(20)
+
         # Placeholder for Graphs
         placeholder_frame = QFrame()
         placeholder_frame.setStyleSheet("""
@@ -135,7 +173,29 @@ class Dashboard(QWidget):
         frame_layout.addWidget(sub_label)
         
         layout.addWidget(placeholder_frame)
+
+        self.refresh_counts()
         
     def refresh_counts(self):
-        # Placeholder for future data refresh
-        pass
+        """Reads the case statistics summary (a handful of rows, whatever the case load)"""
+        stats = self.db.get_case_statistics()
+        if not stats:
+            return
+        from src.utils.formatting import format_indian_number
+
+        def at_stage(source, minimum):
+            return sum(n for stage, n in stats['by_stage'].get(source, {}).items() if stage >= minimum)
+
+        issue_demand = stats['demand'].get('ISSUES', {})
+        values = {
+            'scrutiny': stats['cases'].get('SCRUTINY', 0),
+            'asmt10_issued': at_stage('SCRUTINY', WorkflowStage.ASMT10_ISSUED),
+            'adjudication': stats['cases'].get('ADJUDICATION', 0),
+            'scn_issued': at_stage('ADJUDICATION', WorkflowStage.SCN_ISSUED),
+            'orders_issued': at_stage('ADJUDICATION', WorkflowStage.ORDER_ISSUED),
+            'case_files': stats['cases'].get('CASE_FILE', 0),
+            'drc01a_demand': format_indian_number(issue_demand.get('DRC-01A', 0), prefix_rs=True),
+            'scn_demand': format_indian_number(issue_demand.get('SCN', 0), prefix_rs=True),
+        }
+        for key, value in values.items():
+            self.stat_labels[key].setText(str(value))
@@ -1,6 +1,8 @@
 import json
 import traceback
 
+from src.utils import calc_runtime
+
 class LogicValidator:
     @staticmethod
     def validate_logic(logic_code, test_inputs):
@@ -11,27 +13,12 @@ class LogicValidator:
         Returns: (bool, result_or_error_message)
         """
         try:
-            # Create a restricted local scope
-            local_scope = {}
-            
-            # Execute the code definition
-            exec(logic_code, {}, local_scope)
-            
-            # Check if 'compute' function exists
-            if 'compute' not in local_scope:
-                return False, "Code must define a 'compute(v)' function."
-                
-            compute_func = local_scope['compute']
-            
-            # Run the function with test inputs
-            result = compute_func(test_inputs)
-            
-            # Validate result is a dict (JSON object)
-            if not isinstance(result, dict):
-                return False, f"Function returned {type(result)}, expected dict."
-                
+            # Same compiled, restricted runtime the issue cards use
+            result = calc_runtime.run(logic_code, test_inputs)
             return True, result
-            
+
+        except calc_runtime.CalcLogicError as e:
+            return False, str(e)
         except Exception as e:
             return False, f"Execution Error: {str(e)}\n{traceback.format_exc()}"
 
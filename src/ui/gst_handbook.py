@@ -2,17 +2,22 @@ import sys
 import json
 import os
 import re
+import html
 from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QTabWidget, 
                              QTreeWidget, QTreeWidgetItem, QTextEdit, QSplitter,
-                             QLineEdit, QLabel, QFrame, QPushButton)
+                             QLineEdit, QLabel, QFrame, QPushButton, QStackedWidget)
 from PyQt6.QtCore import Qt, QTimer
 from PyQt6.QtGui import QFont, QColor
 from src.database.db_manager import DatabaseManager
+from src.utils.legal_text import split_footnotes, format_chapter_label
 
 class GSTHandbook(QWidget):
+    SECTION_CACHE_SIZE = 64
+
     def __init__(self):
         super().__init__()
         self.db = DatabaseManager()
+        self.section_cache = {}
         self.search_timer = QTimer()
         self.search_timer.setSingleShot(True)
         self.search_timer.timeout.connect(self.perform_search)
@@ -63,6 +68,11 @@ class GSTHandbook(QWidget):
         
         # Act Tab
         self.act_tab, self.act_tree, self.act_content, self.act_search = self.create_handbook_tab("GST Acts")
+        self.act_tree_stack = self.act_tree.parentWidget()
+        self.act_results_tree = self.act_tree_stack.widget(1)
+        self.act_tree.itemExpanded.connect(self.on_item_expanded)
+        self.act_tree.itemClicked.connect(self.display_content)
+        self.act_results_tree.itemClicked.connect(self.display_content)
         self.tabs.addTab(self.act_tab, "📖 GST Acts")
         
         # Rules Tab (placeholder)
@@ -155,7 +165,17 @@ class GSTHandbook(QWidget):
         tree_font.setPointSize(10)
         tree.setFont(tree_font)
         
-        splitter.addWidget(tree)
+        # Search results get their own tree so clearing a search does not rebuild the outline
+        results_tree = QTreeWidget()
+        results_tree.setHeaderLabel("🔍 Search Results")
+        results_tree.setStyleSheet(tree.styleSheet())
+        results_tree.setFont(tree_font)
+        
+        tree_stack = QStackedWidget()
+        tree_stack.setMinimumWidth(350)
+        tree_stack.addWidget(tree)
+        tree_stack.addWidget(results_tree)
+        splitter.addWidget(tree_stack)
         
         # Content Area (Right) with modern styling
         content = QTextEdit()
@@ -185,82 +205,84 @@ class GSTHandbook(QWidget):
         return widget, tree, content, search_input
 
     def load_act_data(self):
-        """Loads GST Act data with hierarchical structure: Acts > Chapters > Sections"""
+        """
+        Loads the Acts > Chapters outline only. Sections are added when a node is
+        expanded and their text is fetched when clicked, so opening the handbook
+        no longer reads every section up front.
+        """
         try:
             self.act_tree.clear()
-            
-            # Get all Acts from DB
-            acts = self.db.get_gst_acts()
-            
-            for act in acts:
+            self.section_cache.clear()
+
+            for act in self.db.get_handbook_outline():
                 # Create Act item (Level 1)
                 act_item = QTreeWidgetItem(self.act_tree)
                 act_item.setText(0, f"📚 {act['title']}")
                 act_item.setData(0, Qt.ItemDataRole.UserRole, {
                     'type': 'act',
+                    'act_id': act['act_id'],
+                    # Acts without chapters list their sections directly
+                    'loaded': bool(act['chapters']),
                     'content': f"<h1 style='color: #1a237e;'>{act['title']}</h1>"
                 })
-                
+                act_item.setChildIndicatorPolicy(QTreeWidgetItem.ChildIndicatorPolicy.ShowIndicator)
+
                 # Set bold font for act
                 font = act_item.font(0)
                 font.setBold(True)
                 font.setPointSize(11)
                 act_item.setFont(0, font)
                 act_item.setForeground(0, QColor("#1a237e"))
-                
-                # Get chapters for this act
-                chapters = self.db.get_act_chapters(act['act_id'])
-                
-                if chapters:
-                    # Act has chapters - create hierarchical structure
-                    for chapter in chapters:
-                        # Create Chapter item (Level 2)
-                        chapter_item = QTreeWidgetItem(act_item)
-                        # Format chapter ID with uppercase Roman numerals
-                        chapter_id_display = chapter['chapter_id'].replace('CHAPTER_', 'CHAPTER ').upper()
-                        chapter_display = f"📖 {chapter_id_display}"
-                        if chapter['chapter_name']:
-                            chapter_display += f" - {chapter['chapter_name']}"
-                        chapter_item.setText(0, chapter_display)
-                        chapter_item.setData(0, Qt.ItemDataRole.UserRole, {
-                            'type': 'chapter',
-                            'content': f"<h2 style='color: #1976d2;'>{chapter_display}</h2>"
-                        })
-                        
-                        # Set font for chapter
-                        chapter_font = chapter_item.font(0)
-                        chapter_font.setBold(True)
-                        chapter_font.setPointSize(10)
-                        chapter_item.setFont(0, chapter_font)
-                        chapter_item.setForeground(0, QColor("#1976d2"))
-                        
-                        # Get sections for this chapter
-                        sections = self.db.get_act_sections(act['act_id'], chapter['chapter_id'])
-                        
-                        for section in sections:
-                            self.add_section_item(chapter_item, section)
-                    
-                    # Expand first act by default (usually CGST Act 2017)
-                    if "Central Goods and Services Tax Act, 2017" in act['title']:
-                        act_item.setExpanded(True)
-                else:
-                    # Act has no chapters - add sections directly
-                    sections = self.db.get_act_sections(act['act_id'])
-                    for section in sections:
-                        self.add_section_item(act_item, section)
 
-            self.act_tree.itemClicked.connect(self.display_content)
+                for chapter in act['chapters']:
+                    # Create Chapter item (Level 2), sections filled in on expand
+                    chapter_item = QTreeWidgetItem(act_item)
+                    chapter_display = f"📖 {format_chapter_label(chapter['chapter_id'], chapter['chapter_name'])}"
+                    chapter_item.setText(0, chapter_display)
+                    chapter_item.setData(0, Qt.ItemDataRole.UserRole, {
+                        'type': 'chapter',
+                        'act_id': act['act_id'],
+                        'chapter_id': chapter['chapter_id'],
+                        'loaded': False,
+                        'content': f"<h2 style='color: #1976d2;'>{chapter_display}</h2>"
+                    })
+                    chapter_item.setChildIndicatorPolicy(QTreeWidgetItem.ChildIndicatorPolicy.ShowIndicator)
+
+                    # Set font for chapter
+                    chapter_font = chapter_item.font(0)
+                    chapter_font.setBold(True)
+                    chapter_font.setPointSize(10)
+                    chapter_item.setFont(0, chapter_font)
+                    chapter_item.setForeground(0, QColor("#1976d2"))
+
+                # Expand first act by default (usually CGST Act 2017)
+                if "Central Goods and Services Tax Act, 2017" in act['title']:
+                    act_item.setExpanded(True)
 
         except Exception as e:
             self.act_content.setText(f"<div style='color: red; padding: 20px;'>Error loading data: {str(e)}</div>")
 
+    def on_item_expanded(self, item):
+        """Populate a chapter (or a chapter-less act) the first time it is opened"""
+        data = item.data(0, Qt.ItemDataRole.UserRole)
+        if not data or data.get('loaded'):
+            return
+
+        data['loaded'] = True
+        item.setData(0, Qt.ItemDataRole.UserRole, data)
+
+        sections = self.db.get_section_headers(data['act_id'], data.get('chapter_id'))
+        for section in sections:
+            self.add_section_item(item, section)
+        if not sections:
+            item.setChildIndicatorPolicy(QTreeWidgetItem.ChildIndicatorPolicy.DontShowIndicatorWhenChildless)
+
     def add_section_item(self, parent_item, section):
-        """Add a section item to the tree"""
+        """Add a section item to the tree (content is loaded on click)"""
         section_item = QTreeWidgetItem(parent_item)
         
-        title = section['title']
+        title = section['title'] or ""
         section_no = section['section_number']
-        content = section['content']
         
         # Display text with section number
         if section_no:
@@ -273,12 +295,23 @@ class GSTHandbook(QWidget):
             display_text += "..."
         
         section_item.setText(0, display_text)
-        
+        section_item.setData(0, Qt.ItemDataRole.UserRole, {
+            'type': 'section',
+            'section_id': section['id'],
+            'snippet': section.get('snippet')
+        })
+        return section_item
+
+    def format_section(self, section):
+        """Full HTML view of a section"""
+        title = section['title'] or ""
+        section_no = section['section_number']
+
         # Separate main content from footnotes
-        main_content, footnotes = self.extract_footnotes(content)
+        main_content, footnotes = self.extract_footnotes(section['content'] or "")
         
         # Format content for display with section number in heading
-        formatted_content = f"""
+        return f"""
         <div style="padding: 20px; max-width: 900px;">
             <div style="background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); 
                         padding: 20px; border-radius: 10px; margin-bottom: 20px;">
@@ -296,28 +329,39 @@ class GSTHandbook(QWidget):
             {self.format_footnotes(footnotes) if footnotes else ''}
         </div>
         """
-        
-        section_item.setData(0, Qt.ItemDataRole.UserRole, {
-            'type': 'section',
-            'content': formatted_content
-        })
 
     def display_content(self, item, column):
         """Display content of the selected item"""
         data = item.data(0, Qt.ItemDataRole.UserRole)
-        if data and 'content' in data:
+        if not data:
+            return
+
+        if data.get('type') == 'section':
+            section_id = data['section_id']
+            html_content = self.section_cache.get(section_id)
+            if html_content is None:
+                section = self.db.get_section(section_id)
+                if not section:
+                    return
+                html_content = self.format_section(section)
+                if len(self.section_cache) >= self.SECTION_CACHE_SIZE:
+                    self.section_cache.pop(next(iter(self.section_cache)))
+                self.section_cache[section_id] = html_content
+            self.act_content.setHtml(html_content)
+        elif 'content' in data:
             self.act_content.setHtml(data['content'])
 
     def on_search_changed(self, text):
         """Handle search input changes with debouncing"""
         self.search_timer.stop()
         if text.strip():
-            self.search_timer.start(500)  # 500ms delay
+            self.search_timer.start(250)
         else:
-            self.load_act_data()  # Reset to full view
+            # Outline is still loaded (and keeps its expanded state), just switch back
+            self.act_tree_stack.setCurrentWidget(self.act_tree)
 
     def perform_search(self):
-        """Perform the actual search"""
+        """Ranked full-text search; results show in their own tree with snippets"""
         query = self.act_search.text().strip()
         if not query:
             return
@@ -325,26 +369,25 @@ class GSTHandbook(QWidget):
         try:
             results = self.db.search_handbook(query)
             
-            self.act_tree.clear()
+            self.act_results_tree.clear()
+            self.act_tree_stack.setCurrentWidget(self.act_results_tree)
             
             if not results:
-                no_results = QTreeWidgetItem(self.act_tree)
+                no_results = QTreeWidgetItem(self.act_results_tree)
                 no_results.setText(0, "No results found")
+                self.act_content.setHtml("<div style='padding: 20px; color: #666;'>No results found</div>")
                 return
             
-            # Group results by act
+            # Group results by act, keeping rank order within each group
             acts_dict = {}
             for result in results:
                 act_title = result.get('act_title', 'Unknown Act')
-                if act_title not in acts_dict:
-                    acts_dict[act_title] = []
-                acts_dict[act_title].append(result)
+                acts_dict.setdefault(act_title, []).append(result)
             
             # Display grouped results
             for act_title, sections in acts_dict.items():
-                act_item = QTreeWidgetItem(self.act_tree)
+                act_item = QTreeWidgetItem(self.act_results_tree)
                 act_item.setText(0, f"📚 {act_title} ({len(sections)} results)")
-                act_item.setExpanded(True)
                 
                 font = act_item.font(0)
                 font.setBold(True)
@@ -352,48 +395,36 @@ class GSTHandbook(QWidget):
                 
                 for section in sections:
                     self.add_section_item(act_item, section)
+                act_item.setExpanded(True)
+
+            self.act_content.setHtml(self.format_search_results(query, results))
             
         except Exception as e:
             print(f"Search error: {e}")
+
+    def format_search_results(self, query, results):
+        """Ranked hit list with highlighted snippets for the content pane"""
+        rows = []
+        for result in results:
+            heading = f"Section {result['section_number']} - {result['title']}" if result['section_number'] else result['title']
+            chapter = format_chapter_label(result['chapter_id'], result['chapter_name']) if result.get('chapter_id') else ""
+            rows.append(f"""
+                <div style="margin-bottom: 14px; padding-bottom: 10px; border-bottom: 1px solid #eee;">
+                    <div style="font-size: 15px; font-weight: bold; color: #1a237e;">{html.escape(heading or '')}</div>
+                    <div style="font-size: 11px; color: #888;">{html.escape(result.get('act_title') or '')}{' &middot; ' + html.escape(chapter) if chapter else ''}</div>
+                    <div style="font-size: 13px; color: #333; margin-top: 4px;">{result.get('snippet') or ''}</div>
+                </div>
+            """)
+        return f"""
+            <div style="padding: 20px;">
+                <h3 style="color: #1976d2;">{len(results)} results for "{html.escape(query)}"</h3>
+                {''.join(rows)}
+            </div>
+        """
     
     def extract_footnotes(self, content):
-        """
-        Separate main content from footnotes.
-        Footnotes typically start with patterns like:
-        '1. Subs.', '2. Ins.', '1. The word', etc.
-        """
-        import re
-        
-        # Split content into lines
-        lines = content.split('\n')
-        
-        main_lines = []
-        footnote_lines = []
-        in_footnotes = False
-        
-        for line in lines:
-            # Check if line starts a footnote
-            # Pattern: starts with number followed by period and common footnote keywords
-            if re.match(r'^\d+\.\s+(Subs\.|Ins\.|The\s+word|The\s+proviso|Clause|Omitted|Explanation)', line):
-                in_footnotes = True
-                footnote_lines.append(line)
-            elif in_footnotes:
-                # Continue collecting footnote lines
-                # Stop if we hit a new section or empty line followed by non-footnote content
-                if line.strip() == '':
-                    footnote_lines.append(line)
-                elif any(keyword in line for keyword in ['Act', 'ibid', 'w.e.f', 's.', 'for']):
-                    footnote_lines.append(line)
-                else:
-                    # Might be end of footnotes
-                    main_lines.append(line)
-            else:
-                main_lines.append(line)
-        
-        main_content = '\n'.join(main_lines).strip()
-        footnotes = '\n'.join(footnote_lines).strip()
-        
-        return main_content, footnotes
+        """Separate main content from footnotes."""
+        return split_footnotes(content)
     
     def format_footnotes(self, footnotes):
         """Format footnotes with distinct styling"""
@@ -10,6 +10,8 @@ from src.ui.components.modern_card import ModernCard
 from src.ui.ui_helpers import render_grid_to_table_widget, MonetaryDelegate
 from src.utils.formatting import format_indian_number
 from src.utils.number_utils import safe_int
+from src.utils.issue_renderer import IssueRenderer, CANONICAL_PLACEHOLDER
+from src.utils import calc_runtime
 from src.ui.styles import Theme
 
 class CollapsibleSection(QWidget):
@@ -68,7 +70,7 @@ class IssueCard(QFrame):
     from src.ui.developer.grid_adapter import GridAdapter
     
     # [CONST] Idempotency Contract
-    CANONICAL_PLACEHOLDER = "[Enter Brief Facts here]"
+    CANONICAL_PLACEHOLDER = CANONICAL_PLACEHOLDER
 
     def init_ui(self):
         """
@@ -1291,13 +1293,22 @@ class IssueCard(QFrame):
 
     def calculate_values(self):
         """Centralized value calculation and UI sync."""
-        if getattr(self, '_calculating', False):
+        if not self.begin_calculation():
             return
-            
+        job = self.calc_job()
+        self.finish_calculation(calc_runtime.run_many([job])[0] if job else None)
+
+    def begin_calculation(self):
+        """
+        First half of calculate_values: validation and grid calculations.
+        False if the card is already calculating (or not built yet); otherwise
+        finish_calculation must follow.
+        """
+        if getattr(self, '_calculating', False) or not hasattr(self, 'table'):
+            return False
+
         self._calculating = True
         try:
-            if not hasattr(self, 'table'): return
-            
             # Trigger validation
             valid = self.validate_tax_inputs(show_ui=True)
             # We don't block the calculation itself, just highlight the UI
@@ -1312,20 +1323,24 @@ class IssueCard(QFrame):
                      self.calculate_grid(data=tbl)
 
             # (Recursion point removed: calculate_excel_table is handled via signals)
-                
+        except Exception:
+            self._calculating = False
+            raise
+        return True
+
+    def calc_job(self):
+        """(calc_logic, variables) for calc_runtime, or None without legacy logic."""
+        # Execute legacy logic even if grid exists, to allow hybrid calcs
+        return (self.calc_logic, self.variables) if self.calc_logic else None
+
+    def finish_calculation(self, outcome=None):
+        """Applies a calc_logic outcome (result dict or the exception it raised) and updates the UI."""
+        try:
             # 2. Handle Legacy Python Logic
-            # (Execute legacy logic even if grid exists, to allow hybrid calcs)
-            if self.calc_logic:
-                try:
-                    local_scope = {}
-                    exec(self.calc_logic, {}, local_scope)
-                    compute_func = local_scope.get('compute')
-                    
-                    if compute_func:
-                        results = compute_func(self.variables)
-                        self.variables.update(results)
-                except Exception as e:
-                    print(f"Legacy Calculation Error: {e}")
+            if isinstance(outcome, Exception):
+                print(f"Legacy Calculation Error: {outcome}")
+            elif outcome:
+                self.variables.update(outcome)
 
             # 3. Update UI
             self.refresh_totals_ui()
@@ -1460,19 +1475,7 @@ class IssueCard(QFrame):
 
     def extract_html_body(self, html, allow_raw=True):
         """Extract content from body tag. If allow_raw is True and no body found, returns original."""
-        import re
-        if not html: return ""
-        
-        # Check if it's just an empty Qt paragraph
-        plain_text = re.sub(r'<[^>]+>', '', html).strip()
-        if not plain_text and "<br" not in html and "<img" not in html and "<table" not in html:
-            return ""
-            
-        match = re.search(r'<body[^>]*>(.*?)</body>', html, re.DOTALL | re.IGNORECASE)
-        if match:
-            return match.group(1).strip()
-        
-        return html if allow_raw else ""
+        return IssueRenderer.extract_html_body(html, allow_raw)
 
     def _validate_template_variables(self, template_text: str, variables: dict) -> list:
         """Extract all {{ placeholders }} and check if they exist in variables."""
@@ -1483,9 +1486,6 @@ class IssueCard(QFrame):
 
     def update_editor_content(self, is_recalculation=False):
         """Populate editor with template text. Syncs with variables."""
-        import re
-        t = self.template.get('templates', {})
-        
         if not hasattr(self, 'editor'): return
         
         # SAFEGUARD: Detection of manual edits
@@ -1499,96 +1499,8 @@ class IssueCard(QFrame):
         if hasattr(self, 'sync_warning'):
             self.sync_warning.hide()
 
-        # [STRICT AUDIT LOGGING]
-        print(f"\n--- Narrrative Sync Start: {self.issue_id} (Mode: {self.mode}) ---")
-
-        def get_and_log(key, label, fallbacks=None):
-            val = t.get(key)
-            path = f"templates.{key}"
-            
-            if not val and fallbacks:
-                for f_key in fallbacks:
-                    val = t.get(f_key)
-                    if val:
-                        path = f"templates.{f_key} (fallback)"
-                        break
-            
-            if not val:
-                # Last resort: check root if requested (only for Brief Facts as per user)
-                if label == "Brief Facts":
-                    val = self.template.get('brief_facts')
-                    if val: path = "root.brief_facts (fallback)"
-
-            content = self.extract_html_body(str(val)) if val else ""
-            if content:
-                print(f"DEBUG: Found {label} via {path}")
-            else:
-                # [DIAGNOSTIC] Print raw value to see why it's considered missing
-                raw_repr = repr(val)[:100] + ("..." if len(repr(val)) > 100 else "")
-                print(f"DEBUG: Missing {label} (Tried {path}) | Raw Value: {raw_repr} | Type: {type(val)}")
-            return content
-
-        # 1. Resolve Sections
-        if self.mode == "DRC-01A":
-            brief_facts = get_and_log('brief_facts_drc01a', "Brief Facts", fallbacks=['brief_facts'])
-            grounds = get_and_log('grounds', "Grounds")
-            legal = get_and_log('legal', "Legal")
-            conclusion = get_and_log('conclusion', "Conclusion")
-        elif self.mode == "SCN":
-            brief_facts = get_and_log('brief_facts_scn', "Brief Facts", fallbacks=['brief_facts'])
-            grounds = get_and_log('grounds', "Grounds")
-            legal = get_and_log('legal', "Legal")
-            conclusion = get_and_log('conclusion', "Conclusion")
-        else:
-            brief_facts = get_and_log('brief_facts', "Brief Facts")
-            grounds = get_and_log('grounds', "Grounds")
-            legal = get_and_log('legal', "Legal")
-            conclusion = get_and_log('conclusion', "Conclusion")
-
-        # 2. Bypass visibility flags temporarily for raw testing
-        include_grounds = True
-        include_conclusion = True
-
-        # 3. Build structured HTML
-        html_sections = []
-        
-        if brief_facts.strip():
-            html_sections.append(f'<div style="margin-bottom: 15px;"><b>Brief Facts:</b><br>{brief_facts}</div>')
-        
-        if include_grounds and grounds.strip():
-            html_sections.append(f'<div style="margin-bottom: 15px;"><b>Grounds / Discussions:</b><br>{grounds}</div>')
-        
-        if legal.strip():
-            html_sections.append(f'<div style="margin-bottom: 15px;"><b>Legal Provisions:</b><br>{legal}</div>')
-        
-        if include_conclusion and conclusion.strip():
-            html_sections.append(f'<div style="margin-bottom: 15px;"><b>Conclusion:</b><br>{conclusion}</div>')
-            
-        html = "".join(html_sections)
-        if not html:
-            html = f"<i>{self.CANONICAL_PLACEHOLDER}</i>"
-
-        print(f"--- Narrative Sync End: {self.issue_id} ---\n")
-        
-        # --- PHASE 3: Refined Centralized Template Rendering ---
-        from src.utils.template_engine import TemplateEngine
-        from src.utils.issue_context_builder import IssueContextBuilder
-
-        # Build comprehensive context (Metadata + Grid Variables + Lazy Table)
-        context = IssueContextBuilder.build_issue_context(
-            issue_id=self.issue_id,
-            case_data=self.case_data,
-            grid_results=self.variables, # Note: self.variables contains computed grid values after calculate_grid
-            issue_metadata=self.template,
-            table_generator=(self.generate_table_html, self.template, self.variables)
-        )
-
-        # Delegate rendering to the centralized TemplateEngine
-        try:
-            html = TemplateEngine.render_issue_template(html, context)
-            print(f"[IssueCard] Rendered via Centralized TemplateEngine for {self.issue_id}")
-        except Exception as e:
-            print(f"[IssueCard] Rendering failed for {self.issue_id}: {e}")
+        # Note: self.variables contains computed grid values after calculate_grid
+        html = IssueRenderer.render_narrative(self.issue_id, self.template, self.variables, self.mode, self.case_data)
 
         self.editor.setHtml(html)
         self.last_rendered_html = html # Update baseline
@@ -1600,255 +1512,7 @@ class IssueCard(QFrame):
     @staticmethod
     def generate_table_html(template, variables):
         """Generate HTML for the table portion of the card"""
-        html = ""
-        
-        # 0. Grid Data Support (Excel Import) - High Priority check
-        # [FIX] Check both template and variables for grid_data to ensure table renders
-        grid_source = None
-        if 'grid_data' in template:
-            grid_source = template['grid_data']
-        elif 'grid_data' in variables:
-            grid_source = variables['grid_data']
-            
-        if grid_source:
-            grid_data = grid_source
-            
-            # [FIX] Robust Normalization for Canonical Grid (List vs Dict)
-            # The new IssueCard enforces {'columns': ..., 'rows': ...} but legacy data might be List[List].
-            # We must normalize to List[List] for HTML generation.
-            rows_data = []
-            if isinstance(grid_data, dict):
-                rows_data = grid_data.get('rows', [])
-            elif isinstance(grid_data, list):
-                rows_data = grid_data
-            
-            
-            # [CRITICAL FIX] Overwrite variables context so downstream logic sees a List
-            # This prevents KeyError: 0 when Jinja/Legacy logic tries to index it numerically
-            if 'grid_data' in variables:
-                 variables['grid_data'] = rows_data
-                 
-            rows = len(rows_data)
-            
-            # [FIX] Generate Table HTML manually to ensure it appears
-            # ... (Rest of existing logic, but we need to see the loop below)
-            
-            html += """
-            <div style="margin-bottom: 20px; margin-top: 15px;">
-                <p style="font-weight: bold; margin-bottom: 8px; font-size: 11pt;">Calculation Table</p>
-                <table style="width: 100%; border-collapse: collapse; font-size: 10pt; font-family: 'Bookman Old Style', serif; border: 2px solid #000;">
-            """
-            
-            # Attempt to get header columns if possible
-            skip_first_col = False
-            if isinstance(grid_data, dict) and 'columns' in grid_data:
-                columns = grid_data['columns']
-                
-                # [POLISH] Suppress index column if present
-                if columns:
-                    first_col = columns[0]
-                    first_label = ""
-                    if isinstance(first_col, dict):
-                        first_label = (first_col.get('label') or first_col.get('header') or first_col.get('name', '')).strip().lower()
-                    else:
-                        first_label = str(first_col).strip().lower()
-                    
-                    if first_label in ['sl no', 'sl no.', 'si no', 'si no.', 'sl.no', '#', 'no.']:
-                        skip_first_col = True
-
-                html += "<tr>"
-                for c, col in enumerate(columns):
-                    if c == 0 and skip_first_col: continue
-                    # [FIX] Prioritize 'label' (canonical), then 'header', then 'name'
-                    if isinstance(col, dict):
-                        col_name = col.get('label') or col.get('header') or col.get('name', 'Column')
-                    else:
-                        col_name = str(col)
-                    html += f'<th style="border: 1px solid black; padding: 6px; text-align: center; background-color: #f2f2f2; font-weight: bold; font-size: 10pt;">{col_name}</th>'
-                html += "</tr>"
-            
-            for r, row_data in enumerate(rows_data):
-                html += "<tr>"
-                
-                cells = []
-                if isinstance(row_data, list):
-                    cells = row_data
-                elif isinstance(row_data, dict):
-                    if 'cells' in row_data:
-                        cells = row_data['cells']
-                    elif isinstance(grid_data, dict) and 'columns' in grid_data:
-                        columns = grid_data['columns']
-                        for col in columns:
-                            if isinstance(col, dict):
-                                col_key = col.get('key') or col.get('id') or col.get('name', '')
-                            else:
-                                col_key = str(col)
-                            cell_value = row_data.get(col_key, '')
-                            cells.append(cell_value)
-                    else:
-                        cells = list(row_data.values())
-
-                for c, cell_info in enumerate(cells):
-                    if c == 0 and skip_first_col: continue
-                    val = ""
-                    var_name = None
-                    
-                    if isinstance(cell_info, dict):
-                        val = cell_info.get('value', '')
-                        var_name = cell_info.get('var')
-                    else:
-                        val = str(cell_info)
-                    
-                    # Resolve Value
-                    if var_name:
-                        if var_name in variables:
-                            val = variables[var_name]
-                        else:
-                            # [DISPLAY FALLBACK] Unresolved variables default to 0 in HTML view
-                            val = 0
-                    
-                    # [POLISH] Professional Table Cell Styling
-                    style = "border: 1px solid black; padding: 4px 6px; font-size: 10pt;"
-                    
-                    # Alignment logic
-                    if isinstance(val, (int, float)):
-                        style += "text-align: right;"
-                    else:
-                        try:
-                            clean_val = str(val).replace(',', '').replace('₹', '').strip()
-                            if clean_val and all(c in '0123456789.-' for c in clean_val):
-                                safe_int(clean_val)
-                                style += "text-align: right;"
-                            else:
-                                style += "text-align: left;"
-                        except:
-                            style += "text-align: left;"
-                            
-                    # Format float
-                    try:
-                        if isinstance(val, (int, float)):
-                            # Check if it looks like currency/tax
-                            s_var = str(var_name).lower() if var_name else ""
-                            if 'tax' in s_var or 'int' in s_var or 'pen' in s_var or val > 1000:
-                                val = f"{val:,.2f}"
-                            else:
-                                val = str(val)
-                    except:
-                        pass
-                        
-                    html += f"<td style='{style}'>{val}</td>"
-                html += "</tr>"
-                
-            html += """
-                </table>
-            </div>
-            """
-            return html
-
-        # New Schema Table Support (Excel-like Dict)
-        if isinstance(template.get('tables'), dict) and template['tables'].get('rows', 0) > 0:
-            table_data = template['tables']
-            rows = table_data.get('rows', 0)
-            cols = table_data.get('cols', 0)
-            
-            html += """
-            <div style="margin-bottom: 20px; margin-top: 15px;">
-                <p style="font-weight: bold; margin-bottom: 8px; font-size: 11pt;">Calculation Table</p>
-                <table style="width: 100%; border-collapse: collapse; font-size: 10pt; font-family: 'Bookman Old Style', serif; border: 2px solid #000;">
-            """
-            
-            # Reconstruct grid from variables (A1, B1, etc.)
-            for r in range(rows):
-                html += "<tr>"
-                for c in range(cols):
-                    # Calculate address (A1, B1...)
-                    col_label = ""
-                    temp = c
-                    while temp >= 0:
-                        col_label = chr(ord('A') + (temp % 26)) + col_label
-                        temp = (temp // 26) - 1
-                    addr = f"{col_label}{r+1}"
-                    
-                    # Get value
-                    val = variables.get(addr, "")
-                    
-                    # Basic Styling
-                    style = "border: 1px solid #000; padding: 8px; word-wrap: break-word; vertical-align: top;"
-                    
-                    # Heuristic: First row is usually header
-                    if r == 0:
-                        style += "background-color: #f2f2f2; font-weight: bold; text-align: center;"
-                        
-                        # Set Column Widths
-                        if cols > 1:
-                            if c == 0:
-                                style += "width: 40%;"
-                            else:
-                                width_pct = 60 // (cols - 1)
-                                style += f"width: {width_pct}%;"
-                    else:
-                        # Check if numeric
-                        try:
-                            safe_int(val)
-                            style += "text-align: right;"
-                        except:
-                            style += "text-align: left;"
-                            
-                    html += f"<td style='{style}'>{val}</td>"
-                html += "</tr>"
-                
-            html += """
-                </table>
-            </div>
-            """
-
-        # Legacy Table Support (Single Table)
-        elif 'table' in template:
-            table = template['table']
-            html += f"""
-            <div style="margin-bottom: 20px; margin-top: 15px;">
-                <p style="font-weight: bold; margin-bottom: 8px; font-size: 11pt;">{table.get('title', 'Table')}</p>
-                <table style="width: 100%; border-collapse: collapse; font-size: 10pt; font-family: 'Bookman Old Style', serif; border: 2px solid #000;">
-                    <thead>
-                        <tr>
-            """
-            
-            for col in table['columns']:
-                html += f"<th style='border: 1px solid #000; padding: 8px; background-color: #f2f2f2; text-align: center; font-weight: bold;'>{col['label']}</th>"
-                
-            html += """
-                        </tr>
-                    </thead>
-                    <tbody>
-            """
-            
-            for row in table['rows']:
-                html += "<tr>"
-                for col in table['columns']:
-                    key = col['key']
-                    val_template = row.get(key, "")
-                    val = str(val_template)
-                    for var_name, var_val in variables.items():
-                        val = val.replace(f"{{{{{var_name}}}}}", str(var_val))
-                    
-                    # Align numbers to right
-                    align = "left"
-                    try:
-                        safe_int(val)
-                        align = "right"
-                    except:
-                        pass
-                        
-                    html += f"<td style='border: 1px solid #000; padding: 8px; text-align: {align};'>{val}</td>"
-                html += "</tr>"
-                
-            html += """
-                    </tbody>
-                </table>
-            </div>
-            """
-            
-        return html
+        return IssueRenderer.generate_table_html(template, variables)
 
     def generate_html(self):
         """Generate HTML for preview/PDF"""
@@ -2024,235 +1688,20 @@ class IssueCard(QFrame):
         if not self.is_included:
             return {}
             
-        breakdown = {}
-        
-        def get_v(key):
-            return safe_int(self.variables.get(key, 0))
-
-        # [REORDERED] PRIORITY 1: Canonical-First Logic (Strict Adherence to tax_demand_mapping)
-        if hasattr(self, 'tax_mapping') and self.tax_mapping:
-            has_mapped_data = False
-            for act in ['IGST', 'CGST', 'SGST', 'Cess']:
-                var_name = self.tax_mapping.get(act)
-                if var_name:
-                    val = get_v(var_name)
-                    has_mapped_data = True
-                    if act not in breakdown:
-                        breakdown[act] = {'tax': 0, 'interest': 0, 'penalty': 0}
-                    breakdown[act]['tax'] = val
-            
-            if has_mapped_data:
-                return breakdown
-
-        # [REORDERED] PRIORITY 2: Structured Liability Config (Contract Mode)
-        liability_config = self.template.get('liability_config')
-        if liability_config:
-            model = liability_config.get('model')
-            heads = liability_config.get('column_heads', [])
-            indices = liability_config.get('row_indices', [])
-            
-            def get_row_var(idx, head):
-                return f"row{idx+1}_{head.lower()}"
-
-            if model in ['single_row', 'single_column', 'multiple_rows']:
-                for r_idx in indices:
-                    for head in heads:
-                        var_name = get_row_var(r_idx, head)
-                        val = get_v(var_name)
-                        act = head # CGST, SGST, IGST
-                        if act == 'Amount': act = 'IGST' 
-                        
-                        if act not in breakdown:
-                            breakdown[act] = {'tax': 0, 'interest': 0, 'penalty': 0}
-                        breakdown[act]['tax'] += val
-                
-                if breakdown: 
-                    return breakdown
-
-            elif model == 'sum_of_rows':
-                current_grid = self.grid_data if hasattr(self, 'grid_data') and self.grid_data else self.template.get('grid_data')
-                if current_grid and isinstance(current_grid, dict):
-                    columns = current_grid.get('columns', [])
-                    col_map = {}
-                    for col in columns:
-                        if isinstance(col, dict):
-                             lbl = str(col.get('label', '')).upper()
-                             cid = col.get('id')
-                             for head in heads:
-                                 if head.upper() in lbl: col_map[head] = cid
-                    
-                    if col_map:
-                        rows = current_grid.get('rows', [])
-                        for row in rows:
-                            is_total = False
-                            for cell in row.values():
-                                if isinstance(cell, dict) and 'value' in cell:
-                                    if "TOTAL" in str(cell['value']).upper(): is_total = True; break
-                            if is_total: continue
-
-                            for head, cid in col_map.items():
-                                cell = row.get(cid)
-                                if isinstance(cell, dict):
-                                    val = 0.0
-                                    if cell.get('var'): val = get_v(cell['var'])
-                                    else: val = safe_int(cell.get('value', 0))
-                                    
-                                    if head not in breakdown:
-                                        breakdown[head] = {'tax': 0, 'interest': 0, 'penalty': 0}
-                                    breakdown[head]['tax'] += val
-                        
-                        if breakdown: 
-                            print("BREAKDOWN GENERATED:", breakdown)
-                            return breakdown
-
-        # [FALLBACK] Legacy / Explicit Act variables (High risk of hijacking)
-        igst = get_v('tax_igst') or get_v('igst_tax')
-        cgst = get_v('tax_cgst') or get_v('cgst_tax')
-        sgst = get_v('tax_sgst') or get_v('sgst_tax')
-        cess = get_v('tax_cess') or get_v('cess_tax')
-        
-        if igst or cgst or sgst or cess:
-            if igst: breakdown['IGST'] = {'tax': igst, 'interest': get_v('interest_igst'), 'penalty': get_v('penalty_igst')}
-            if cgst: breakdown['CGST'] = {'tax': cgst, 'interest': get_v('interest_cgst'), 'penalty': get_v('penalty_cgst')}
-            if sgst: breakdown['SGST'] = {'tax': sgst, 'interest': get_v('interest_sgst'), 'penalty': get_v('penalty_sgst')}
-            if cess: breakdown['Cess'] = {'tax': cess, 'interest': get_v('interest_cess'), 'penalty': get_v('penalty_cess')}
-            print("BREAKDOWN GENERATED:", breakdown)
-            return breakdown
-
-        # 2. Smart Detection for Grid Tables (if mapping is missing)
-        # Support both Legacy 'tables' and Modern 'grid_data'
-        target_tables = []
-        if isinstance(self.template.get('tables'), dict) and self.template['tables'].get('rows', 0) > 0:
-            target_tables.append(('legacy', self.template['tables']))
-        
-        # [FIX] Add grid_data support for heuristics
-        # We look at self.grid_data which is the runtime state, or template default
-        current_grid = self.grid_data if hasattr(self, 'grid_data') and self.grid_data else self.template.get('grid_data')
-        if current_grid and isinstance(current_grid, dict) and 'rows' in current_grid:
-            target_tables.append(('grid', current_grid))
-
-        if target_tables:
-            try:
-                for t_type, table_data in target_tables:
-                    if t_type == 'legacy':
-                        # ... Existing Legacy Logic (Preserved) ...
-                        rows = table_data.get('rows', 0)
-                        cols = table_data.get('cols', 0)
-                        cells = table_data.get('cells', [])
-                        
-                        # Find Header Row (usually row 0)
-                        header_map = {} # 'CGST': col_index
-                        if rows > 0 and len(cells) > 0:
-                            for c, val in enumerate(cells[0]):
-                                val_str = str(val).upper()
-                                if 'CGST' in val_str: header_map['CGST'] = c
-                                elif 'SGST' in val_str: header_map['SGST'] = c
-                                elif 'IGST' in val_str: header_map['IGST'] = c
-                                elif 'CESS' in val_str: header_map['Cess'] = c
-                        
-                        # Find Data Row (Difference, Tax, Total)
-                        for r in range(rows - 1, 0, -1):
-                            row_label = str(cells[r][0]).upper() if len(cells[r]) > 0 else ""
-                            if 'DIFFERENCE' in row_label or 'TAX' in row_label or 'TOTAL' in row_label:
-                                for act, col_idx in header_map.items():
-                                    col_label = ""
-                                    temp = col_idx
-                                    while temp >= 0:
-                                        col_label = chr(ord('A') + (temp % 26)) + col_label
-                                        temp = (temp // 26) - 1
-                                    addr = f"{col_label}{r+1}"
-                                    
-                                    val = get_v(addr)
-                                    if val > 0:
-                                        if act not in breakdown:
-                                            breakdown[act] = {'tax': 0.0, 'interest': 0.0, 'penalty': 0.0}
-                                        breakdown[act]['tax'] = val
-                                if breakdown: return breakdown
-
-                    elif t_type == 'grid':
-                        # [NEW] Grid Data Heuristic
-                        # 1. Map Columns by Label
-                        columns = table_data.get('columns', [])
-                        col_map = {} # 'CGST': 'col2'
-                        
-                        for col in columns:
-                            if isinstance(col, dict):
-                                label = str(col.get('label', '')).upper()
-                                cid = col.get('id')
-                                if 'CGST' in label: col_map['CGST'] = cid
-                                elif 'SGST' in label: col_map['SGST'] = cid
-                                elif 'IGST' in label: col_map['IGST'] = cid
-                                elif 'CESS' in label: col_map['Cess'] = cid
-                        
-                        if not col_map: continue
-                        
-                        # 2. Iterate Rows and Sum (Assumption: All rows contribute to liability unless labeled otherwise?)
-                        # Or should we look for Total row?
-                        # Start by Summing ALL numeric values in these columns (Safe for simple lists)
-                        # If we find a "Total" row, we might double count? 
-                        # GridAdapter usually doesn't have "Total" rows unless static.
-                        
-                        temp_totals = {k: 0.0 for k in col_map.keys()}
-                        
-                        rows = table_data.get('rows', [])
-                        for row in rows:
-                            # Skip Header-like rows if any (usually handled by columns)
-                            # Check Row Label if exists
-                            # In GridAdapter, row is dict: {col_id: cell_obj}
-                            
-                            is_total_row = False
-                            # Heuristic: Check ALL string cells for "Total" or "Difference"
-                            # This is safer than assuming first col is always the label (e.g. checkbox cols)
-                            for cell in row.values():
-                                if isinstance(cell, dict) and 'value' in cell:
-                                    val_str = str(cell['value']).strip().upper()
-                                    if val_str == "TOTAL" or "TOTAL " in val_str or " TOTAL" in val_str:
-                                        is_total_row = True
-                                        break
-                                    if "DIFFERENCE" in val_str:
-                                        is_total_row = True 
-                                        break
-                            
-                            if is_total_row: continue
-
-                            for act, cid in col_map.items():
-                                cell = row.get(cid)
-                                if isinstance(cell, dict):
-                                    # Try 'var' first (bound value)
-                                    val = 0
-                                    raw_val = None
-                                    if 'var' in cell and cell['var']:
-                                         raw_val = get_v(cell['var'])
-                                         val = raw_val
-                                    else:
-                                         # Try static/input value
-                                         val = safe_int(cell.get('value', 0))
-                                    
-                                    if val > 0:
-                                        temp_totals[act] += val
-                        
-                        # Transfer to breakdown
-                        has_val = False
-                        for act, total in temp_totals.items():
-                            if total > 0:
-                                if act not in breakdown: breakdown[act] = {'tax': 0, 'interest': 0, 'penalty': 0}
-                                breakdown[act]['tax'] = total
-                                has_val = True
-                        
-                        if has_val: return breakdown
-
-            except Exception as e:
-                print(f"Smart Tax Detection Error: {e}")
-
-        # 3. Fallback to mapped totals (Legacy)
-        # If we only have total tax, we don't know the Act.
-        # We default to IGST to ensure it appears in the table.
-        tax = get_v(self.tax_mapping.get('tax', 'calculated_tax'))
-        interest = get_v(self.tax_mapping.get('interest', 'calculated_interest'))
-        penalty = get_v(self.tax_mapping.get('penalty', 'calculated_penalty'))
-        
-        if tax or interest or penalty:
-            breakdown['IGST'] = {'tax': tax, 'interest': interest, 'penalty': penalty}
-            
-        print("BREAKDOWN GENERATED:", breakdown)
-        return breakdown
+        return IssueRenderer.tax_breakdown(self.template, self.variables, self.grid_data)
+
+
+def recalculate_issue_cards(cards):
+    """
+    Recalculates a whole proceeding's cards, evaluating all their calc_logic
+    in one calc_runtime.run_many call (each template compiled once).
+    """
+    started = []
+    try:
+        started.extend(card for card in cards if card.begin_calculation())
+    finally:
+        # Cards that began are always finished, even if a later one raised
+        jobs = [card.calc_job() for card in started]
+        outcomes = iter(calc_runtime.run_many([job for job in jobs if job]))
+        for card, job in zip(started, jobs):
+            card.finish_calculation(next(outcomes) if job else None)
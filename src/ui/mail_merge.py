@@ -4,8 +4,10 @@ from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, QComboBo
                              QAbstractItemView, QMessageBox, QProgressBar, QFileDialog)
 from PyQt6.QtCore import Qt, QDate
 from src.database.db_manager import DatabaseManager
+from src.database import oc_sequence
 from src.ui.rich_text_editor import RichTextEditor
 from src.utils.config_manager import ConfigManager
+from src.utils import render_assets
 from src.services.asmt10_generator import ASMT10Generator
 import datetime
 import os
@@ -230,14 +232,10 @@ class MailMergeTab(QWidget):
         """Load template for communication type from DB or fallbacks"""
         try:
             # Query templates from SQLite
-            with self.db._get_conn() as conn:
-                cursor = conn.cursor()
-                cursor.execute("SELECT content FROM templates WHERE type = ? OR name LIKE ? LIMIT 1", 
-                             (comm_type, f"%{comm_type}%"))
-                row = cursor.fetchone()
-                if row:
-                    self.editor.setHtml(row[0])
-                    return
+            content = self.db.get_template_content(comm_type)
+            if content:
+                self.editor.setHtml(content)
+                return
         except Exception as e:
             print(f"Error loading template from DB: {e}")
 
@@ -304,13 +302,7 @@ class MailMergeTab(QWidget):
         
         # 3. Inject Letterhead
         lh_path = self.config.get_letterhead_path('pdf')
-        lh_content = ""
-        if os.path.exists(lh_path):
-            with open(lh_path, 'r', encoding='utf-8') as f:
-                import re
-                full_lh = f.read()
-                match = re.search(r"<body[^>]*>(.*?)</body>", full_lh, re.DOTALL | re.IGNORECASE)
-                lh_content = match.group(1) if match else full_lh
+        lh_content = render_assets.letterhead_body(lh_path) or ""
 
         # 4. Wrap with letterhead and A4 styling (like ASMT10Generator)
         final_html = f"""
@@ -347,7 +339,7 @@ class MailMergeTab(QWidget):
         else:
             QMessageBox.critical(self, "Error", "Failed to generate preview.")
 
-    def fill_placeholders(self, content, data):
+    def fill_placeholders(self, content, data, oc_no=None):
         """Replace placeholders with data"""
         replacements = {
             "{{Legal Name}}": data.get('Legal Name', ''),
@@ -355,7 +347,7 @@ class MailMergeTab(QWidget):
             "{{GSTIN}}": data.get('GSTIN', ''),
             "{{Address}}": data.get('Address', ''),
             "{{Email}}": data.get('Email', ''),
-            "{{OC No}}": self.oc_number_input.text(),
+            "{{OC No}}": oc_no or self.oc_number_input.text(),
             "{{Date}}": self.oc_date_input.text()
         }
         
@@ -391,11 +383,21 @@ class MailMergeTab(QWidget):
         reply = QMessageBox.question(
             self, 
             "Confirm Issuance", 
-            f"Generating {len(selected)} documents.\n\nDo you want to add these to the OFFICIAL OC Register (Issue)?",
+            f"Generating {len(selected)} documents.\n\nDo you want to add these to the OFFICIAL OC Register (Issue)?\n"
+            f"Each document will get its own OC number from the register sequence.",
             QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
         )
         should_register = (reply == QMessageBox.StandardButton.Yes)
 
+        # Reserve one OC number per document for the whole batch in a single transaction
+        oc_numbers = []
+        if should_register:
+            parsed = oc_sequence.split(oc_no_base)
+            oc_numbers = self.db.allocate_oc_numbers(parsed[1] if parsed else None, len(selected))
+            if len(oc_numbers) != len(selected):
+                QMessageBox.critical(self, "Error", "Could not reserve OC numbers for this batch.")
+                return
+
         comm_type = self.comm_type_combo.currentText()
         content_template = self.editor.toHtml()
         
@@ -409,20 +411,14 @@ class MailMergeTab(QWidget):
         
         # Load Letterhead
         lh_path = self.config.get_letterhead_path('pdf')
-        lh_content = ""
-        if os.path.exists(lh_path):
-            with open(lh_path, 'r', encoding='utf-8') as f:
-                import re
-                full_lh = f.read()
-                match = re.search(r"<body[^>]*>(.*?)</body>", full_lh, re.DOTALL | re.IGNORECASE)
-                lh_content = match.group(1) if match else full_lh
+        lh_content = render_assets.letterhead_body(lh_path) or ""
 
         for i, recipient in enumerate(selected):
             try:
-                current_oc_no = oc_no_base
+                current_oc_no = oc_numbers[i] if should_register else oc_no_base
 
                 # 2. Fill Placeholders
-                filled_content = self.fill_placeholders(content_template, recipient)
+                filled_content = self.fill_placeholders(content_template, recipient, current_oc_no)
                 
                 # 3. Final HTML
                 final_html = f"""
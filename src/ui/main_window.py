@@ -17,6 +17,8 @@ from src.ui.proceedings_workspace import ProceedingsWorkspace
 from src.ui.template_management import TemplateManagement
 from src.ui.developer.developer_console import DeveloperConsole
 from src.ui.components.sidebar import Sidebar
+from src.ui.components.export_job_manager import ExportJobManager, ExportJobsDialog
+from src.services.export_jobs import QUEUED, DONE
 from src.ui.styles import Styles, Theme
 
 class MainWindow(QMainWindow):
@@ -102,6 +104,16 @@ class MainWindow(QMainWindow):
         # Set initial state
         self.sidebar.set_active_btn(0)
 
+        # Background document exports: status bar indicator + completion notices
+        self.export_jobs = ExportJobManager.instance()
+        self.export_jobs_dialog = None
+        self.export_jobs_btn = QPushButton("Exports")
+        self.export_jobs_btn.setFlat(True)
+        self.export_jobs_btn.clicked.connect(self.show_export_jobs)
+        self.statusBar().addPermanentWidget(self.export_jobs_btn)
+        self.export_jobs.job_changed.connect(self._on_export_job_changed)
+        self.export_jobs.job_finished.connect(self._on_export_job_finished)
+
     def navigate_to(self, index):
         self.stack.setCurrentIndex(index)
         self.sidebar.set_active_btn(index) # Sync sidebar state
@@ -158,10 +170,30 @@ class MainWindow(QMainWindow):
         self.adjudication_wizard.load_case_data(case_data, mode)
         self.adjudication_stack.setCurrentIndex(4) # Show Old Wizard
 
+    def show_export_jobs(self):
+        if self.export_jobs_dialog is None:
+            self.export_jobs_dialog = ExportJobsDialog(self.export_jobs, self)
+        self.export_jobs_dialog.show()
+        self.export_jobs_dialog.raise_()
+
+    def _on_export_job_changed(self, job, status):
+        active = self.export_jobs.active_count()
+        self.export_jobs_btn.setText(f"Exports ({active} running)" if active else "Exports")
+        if status == QUEUED:
+            self.statusBar().showMessage(f"{job.title}: queued for export", 4000)
+
+    def _on_export_job_finished(self, job):
+        if job.status == DONE:
+            self.statusBar().showMessage(f"{job.title} saved to {job.output_path}", 10000)
+        else:
+            self.statusBar().showMessage(f"{job.title} failed: {job.error}", 15000)
+            # Surface failures (with Retry) without blocking the officer
+            self.show_export_jobs()
+
     def go_home(self):
         self.navigate_to(0)
-        # Refresh dashboard counts if needed
-        # self.dashboard.refresh_counts()
+        # Refresh dashboard counts (summary-table reads)
+        self.dashboard.refresh_counts()
 
     def resume_case(self, case_data):
         # Load data into wizard and switch to it
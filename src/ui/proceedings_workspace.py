@@ -1,7 +1,7 @@
 from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, 
                              QListWidget, QStackedWidget, QSplitter, QScrollArea, QTextEdit, QTextBrowser,
                              QMessageBox, QFrame, QCheckBox, QTableWidget, QTableWidgetItem, QHeaderView, QDateEdit, QComboBox, QLineEdit, QFileDialog, QDialog, QGridLayout, QSpacerItem, QSizePolicy, QGraphicsDropShadowEffect, QToolTip)
-from PyQt6.QtCore import Qt, QDate, pyqtSignal, QRect
+from PyQt6.QtCore import Qt, QDate, pyqtSignal, QRect, QUrl, QTimer
 from PyQt6 import QtCore
 from PyQt6.QtGui import QPixmap, QShortcut, QKeySequence, QIcon, QResizeEvent, QColor, QCursor
 from src.database.db_manager import DatabaseManager
@@ -10,15 +10,19 @@ from src.utils.preview_generator import PreviewGenerator
 from src.ui.collapsible_box import CollapsibleBox
 from src.ui.rich_text_editor import RichTextEditor
 from src.ui.components.modern_card import ModernCard
-from src.ui.issue_card import IssueCard
+from src.ui.issue_card import IssueCard, recalculate_issue_cards
 from src.ui.adjudication_setup_dialog import AdjudicationSetupDialog
 from src.ui.components.side_nav_card import SideNavCard # Canonical import
 from src.ui.components.finalization_panel import FinalizationPanel
 from src.services.asmt10_generator import ASMT10Generator
 from src.services.ph_intimation_generator import PHIntimationGenerator
+from src.services import document_service
 from src.ui.styles import Theme, Styles
 from src.utils.constants import WorkflowStage
 from src.utils.number_utils import safe_int
+from src.utils import render_assets
+from src.ui.components.export_job_manager import ExportJobManager, open_file
+from src.ui.components.preview_scheduler import PreviewScheduler
 import os
 import json
 import copy
@@ -115,15 +119,10 @@ class ASMT10ReferenceDialog(QDialog):
         layout = QVBoxLayout(self)
         layout.setContentsMargins(10, 10, 10, 10)
         
-        # Scroll Area for preview
-        scroll = QScrollArea()
-        scroll.setWidgetResizable(True)
-        container = QWidget()
-        container_layout = QVBoxLayout(container)
-        container_layout.setSpacing(20)
-        container_layout.setAlignment(Qt.AlignmentFlag.AlignHCenter)
-        scroll.setWidget(container)
-        layout.addWidget(scroll)
+        # Paged preview: pages are rasterised once and loaded as they scroll into view
+        from src.ui.components.paged_preview import PagedPreview
+        self.preview = PagedPreview()
+        layout.addWidget(self.preview)
         
         # Close Button
         btn_close = QPushButton("Close Reference")
@@ -141,22 +140,137 @@ class ASMT10ReferenceDialog(QDialog):
         """)
         layout.addWidget(btn_close)
         
-        # Render HTML to images
+        # Render once the dialog is laid out so pages match the viewport width
         if html:
-            images = PreviewGenerator.generate_preview_image(html, all_pages=True)
-            if images:
-                for img_bytes in images:
-                    pixmap = PreviewGenerator.get_qpixmap_from_bytes(img_bytes)
-                    if pixmap:
-                        lbl = QLabel()
-                        # Fixed width for modal
-                        lbl.setPixmap(pixmap.scaledToWidth(900, Qt.TransformationMode.SmoothTransformation))
-                        lbl.setStyleSheet("border: 1px solid #ccc; background-color: white;")
-                        container_layout.addWidget(lbl)
-            else:
-                container_layout.addWidget(QLabel("Preview Generation Failed"))
+            QTimer.singleShot(0, lambda: self.preview.render_html(html))
         else:
-            container_layout.addWidget(QLabel("No ASMT-10 Data Found"))
+            self.preview.show_message("No ASMT-10 Data Found")
+
+
+def _write_scn_docx(model, file_path):
+    """Writes the SCN Word draft for a _get_scn_model() snapshot (runs on an export worker)."""
+    from src.utils import docx_skeleton
+    from src.utils.docx_skeleton import paragraph, run
+
+    body = [
+        # Title
+        paragraph(run("SHOW CAUSE NOTICE", bold=True, size=16), align="center"),
+
+        # Header
+        paragraph(f"GSTIN: {model.get('gstin', '')}"),
+        paragraph(f"Legal Name: {model.get('legal_name', '')}"),
+        paragraph(f"OC Number: {model.get('oc_no', '')}"),
+        paragraph(f"Date: {model.get('issue_date', '')}"),
+        paragraph(),
+
+        # Paragraph 1: Intro
+        paragraph(run("1. ", bold=True),
+                  "A brief of the case and the grounds for initiating proceedings are as follows:"),
+    ]
+
+    # Issues
+    for issue in model['issues']:
+        p_num = issue['index'] + 2 # Starts at 3
+        title = issue['title']
+
+        body.append(paragraph(run(f"{p_num}. Issue No. {issue['index']}: {title}", bold=True)))
+        body.extend(
+            paragraph(run(f"{p_num}.{s_idx} ", bold=True), para, align="justify")
+            for s_idx, para in enumerate(issue['paras'], start=1)
+        )
+
+    # Demands
+    num = model['para_demand']
+    body.append(paragraph(run(f"{num}. Summary of Tax Liability:", bold=True)))
+    body.append(paragraph(f"The total tax liability is determined as ₹{model['total_amount']}."))
+
+    # Proper Officer
+    body.append(paragraph())
+    body.append(paragraph(run("Proper Officer", bold=True), align="right"))
+
+    docx_skeleton.blank().save(file_path, body, margins={"top": 0.8, "bottom": 0.8, "left": 1, "right": 1})
+
+
+def _write_drc01a_docx(drc_model, file_path):
+    """Writes the DRC-01A Word draft for a _get_drc01a_model() snapshot (runs on an export worker)."""
+    from docx import Document
+    from docx.shared import Pt, Inches
+    from docx.enum.text import WD_ALIGN_PARAGRAPH
+
+    doc = Document()
+    for section in doc.sections:
+        section.top_margin = Inches(1)
+        section.bottom_margin = Inches(1)
+        section.left_margin = Inches(1)
+        section.right_margin = Inches(1)
+
+    # Title
+    title = doc.add_paragraph()
+    title.alignment = WD_ALIGN_PARAGRAPH.CENTER
+    run = title.add_run("FORM DRC-01A")
+    run.bold = True
+    run.font.size = Pt(16)
+
+    # Case details
+    doc.add_paragraph(f"Case ID: {drc_model.get('case_id', 'N/A')}")
+    doc.add_paragraph(f"GSTIN: {drc_model.get('gstin', 'N/A')}")
+    doc.add_paragraph(f"Legal Name: {drc_model.get('legal_name', 'N/A')}")
+    doc.add_paragraph(f"Address: {drc_model.get('address', 'N/A')}")
+    doc.add_paragraph()
+
+    # Tax Demand Table (Data-Driven)
+    tax_rows = drc_model.get('tax_rows', [])
+    if tax_rows:
+        heading = doc.add_paragraph()
+        run = heading.add_run("Tax Demand Details:")
+        run.bold = True
+        run.font.size = Pt(14)
+
+        # Create table
+        table = doc.add_table(rows=len(tax_rows) + 1, cols=7)
+        table.style = 'Light Grid Accent 1'
+
+        # Headers
+        headers = ["Act", "Tax Period From", "Tax Period To", "Tax (₹)", "Interest (₹)", "Penalty (₹)", "Total (₹)"]
+        for col, header in enumerate(headers):
+            cell = table.rows[0].cells[col]
+            cell.text = header
+            cell.paragraphs[0].runs[0].bold = True
+
+        # Data
+        for r_idx, row in enumerate(tax_rows, start=1):
+            table.rows[r_idx].cells[0].text = row.get('Act', '')
+            table.rows[r_idx].cells[1].text = row.get('Period', '')
+            table.rows[r_idx].cells[2].text = row.get('Period', '')
+            table.rows[r_idx].cells[3].text = row.get('Tax', '0')
+            table.rows[r_idx].cells[4].text = row.get('Interest', '0')
+            table.rows[r_idx].cells[5].text = row.get('Penalty', '0')
+            table.rows[r_idx].cells[6].text = row.get('Total', '0')
+
+        doc.add_paragraph()
+
+    # Issues & Sections (Simplified for now)
+    heading = doc.add_paragraph()
+    run = heading.add_run("Details of Discrepancies:")
+    run.bold = True
+    run.font.size = Pt(14)
+    doc.add_paragraph("Please refer to the SCN preview/PDF for full issue narratives.")
+    doc.add_paragraph()
+
+    # Advice Text
+    advice_text = drc_model.get('AdviceText', "Please pay the amount as ascertained.")
+    p = doc.add_paragraph()
+    p.add_run(advice_text)
+
+    # Signatures
+    doc.add_paragraph()
+    sig = doc.add_paragraph()
+    sig.alignment = WD_ALIGN_PARAGRAPH.RIGHT
+    run = sig.add_run("Proper Officer\n(Signature)\nName: ____________________\nDesignation: ____________________\nJurisdiction: ____________________")
+    run.bold = True
+
+    doc.save(file_path)
+
 
 class ProceedingsWorkspace(QWidget):
     # [PHASE 3] Strict Transition Matrix
@@ -408,8 +522,12 @@ class ProceedingsWorkspace(QWidget):
         # Initial Context
         self.apply_context_layout("summary")
 
-    def add_drc01a_issue_card(self, template, data=None):
-        """Reusable helper to add an issue card to the DRC-01A draft"""
+    def add_drc01a_issue_card(self, template, data=None, calculate=True):
+        """
+        Reusable helper to add an issue card to the DRC-01A draft.
+        calculate=False leaves the calculation to the caller (a whole restore
+        is recalculated in one batch).
+        """
         from src.ui.issue_card import IssueCard
         card = IssueCard(template, data=data, mode="DRC-01A", case_data=self.proceeding_data)
         
@@ -421,8 +539,9 @@ class ProceedingsWorkspace(QWidget):
         self.issue_cards.append(card)
         
         # Trigger initial calculation
-        card.calculate_values()
-        self.calculate_grand_totals()
+        if calculate:
+            card.calculate_values()
+            self.calculate_grand_totals()
         return card
 
     def restore_drc01a_draft_state(self):
@@ -463,6 +582,7 @@ class ProceedingsWorkspace(QWidget):
             # 3. Hydrate Cards
             if records:
                 print(f"DRC-01A Hydration: Restoring {len(records)} issues from DB.")
+                restored = []
                 for record in records:
                     issue_id = record['issue_id']
                     data_payload = record.get('data', {})
@@ -477,10 +597,13 @@ class ProceedingsWorkspace(QWidget):
                         # Deepcopy to avoid mutating master
                         import copy
                         card_template = copy.deepcopy(template)
-                        self.add_drc01a_issue_card(card_template, data=data_payload)
+                        restored.append(self.add_drc01a_issue_card(card_template, data=data_payload, calculate=False))
                     else:
                         print(f"Warning: Template not found for issue {issue_id}")
 
+                recalculate_issue_cards(restored)
+                self.calculate_grand_totals()
+
             # 4. Restore Sections Violated
             metadata = self.proceeding_data.get('additional_details', {}).get('drc01a_metadata', {})
             if 'sections_violated_html' in metadata:
@@ -744,10 +867,11 @@ class ProceedingsWorkspace(QWidget):
             full_data['gstin'] = gstin
             
             # [ALIGNMENT] Use "professional" style mode for high-fidelity A4 parity
-            html_content = generator.generate_html(full_data, issues, for_preview=True, show_letterhead=self.asmt10_show_letterhead, style_mode="professional")
+            html_content = generator.generate_html(full_data, issues, for_preview=True, show_letterhead=self.asmt10_show_letterhead,
+                                                   style_mode="professional", inline_assets=False)
             
-            # Update the browser directly
-            self.asmt10_browser.setHtml(html_content)
+            # Update the browser directly (file base URL so the referenced letterhead loads)
+            self.asmt10_browser.setHtml(html_content, QUrl.fromLocalFile(render_assets.base_url()))
                 
         except Exception as e:
             print(f"ASMT-10 Render Error: {e}")
@@ -1510,10 +1634,12 @@ class ProceedingsWorkspace(QWidget):
         self.issue_cards = []
         self.ACT_PRIORITY = ["IGST", "CGST", "SGST", "UTGST", "Cess"]
         
-        # Debounce timer for preview refresh
-        self.drc01a_refresh_timer = QtCore.QTimer()
-        self.drc01a_refresh_timer.setSingleShot(True)
-        self.drc01a_refresh_timer.timeout.connect(self._run_refresh_step4)
+        # Debounced preview refresh; the notice is rendered off the GUI thread, newest edit wins
+        self.drc01a_preview_scheduler = PreviewScheduler(
+            self._build_drc01a_preview,
+            lambda model, cancel, report: self.render_drc01a_html(model),
+            self._paint_drc01a_preview,
+            delay_ms=500, parent=self)
 
         # --- DRAFT CONTAINER ---
         self.drc01a_draft_container = QWidget()
@@ -1769,21 +1895,24 @@ class ProceedingsWorkspace(QWidget):
 
     def trigger_drc01a_refresh(self):
         """Debounced preview refresh"""
-        self.drc01a_refresh_timer.start(500)
+        self.drc01a_preview_scheduler.schedule()
 
-    def _run_refresh_step4(self):
-        """Actual preview generation for Step 4"""
+    def _build_drc01a_preview(self):
+        """Reads the Step 1-3 inputs into the model (GUI thread); the HTML is rendered in the background"""
         try:
             model = self._get_drc01a_model()
-            html = self.render_drc01a_html(model)
-            self.step4_browser.setHtml(html)
             
             # Update tax summary table in Step 3
             self._update_drc01a_tax_summary_table(model.get('tax_rows'))
+            return model
             
         except Exception as e:
             print(f"Error refreshing DRC-01A preview: {e}")
             traceback.print_exc()
+            return None
+
+    def _paint_drc01a_preview(self, html):
+        self.step4_browser.setHtml(html)
 
     def _update_drc01a_tax_summary_table(self, tax_rows):
         """Populate the Step 3 summary table"""
@@ -2010,14 +2139,7 @@ class ProceedingsWorkspace(QWidget):
         print(f"[DRC-01A] Section resolve -> raw_sec='{raw_sec}'")
         
         # Normalize common patterns to a bare number string: '73', '74'
-        import re
-        sec_match = re.search(r'(73|74)', raw_sec)
-        if not raw_sec:
-            raise ValueError("DRC-01A: adjudication_section is blank. Cannot build model. Ensure section is set during case setup.")
-        elif sec_match:
-            model['section_base'] = sec_match.group(1)  # '73' or '74'
-        else:
-            raise ValueError(f"Invalid section_base for DRC-01A derived from: '{raw_sec}'. Must contain '73' or '74'.")
+        model['section_base'] = document_service.section_base(raw_sec)
             
         model['section_title'] = f"section {model['section_base']}(5)"
         model['section_body'] = f"{model['section_base']}(5)"
@@ -2091,34 +2213,15 @@ class ProceedingsWorkspace(QWidget):
         model['tax_period_to'] = f"31/03/{model['financial_year'][5:]}" if len(model['financial_year']) > 5 else ""
         
         # 6. Strict Advice Paragraph Generation
-        payment_date = model['payment_date']
-        base = model['section_base']
-        
-        if base == "73":
-            model['advice_paragraph'] = f"You are hereby advised to pay the amount of tax as ascertained above alongwith the amount of applicable interest in full by {payment_date}, failing which Show Cause Notice will be issued under section 73(1)."
-        elif base == "74":
-            model['advice_paragraph'] = f"You are hereby advised to pay the amount of tax as ascertained above alongwith the amount of applicable interest and penalty under section 74(5) by {payment_date}, failing which Show Cause Notice will be issued under section 74(1)."
+        model['advice_paragraph'] = document_service.drc01a_advice_paragraph(model['section_base'], model['payment_date'])
 
         # HTML Table String Injection
         model['tax_table_html'] = self.generate_tax_table_html(tax_rows) 
         
         # 7. Extract Officer Data (Deterministic Snapshot Logic)
-        import json
-        snapshot_json = self.proceeding_data.get('issuing_officer_snapshot')
-        officer_data = {}
-        if snapshot_json:
-            try:
-                parsed_snap = json.loads(snapshot_json)
-                if 'DRC-01A' in parsed_snap:
-                    officer_data = parsed_snap['DRC-01A']
-                elif 'name' in parsed_snap:
-                    officer_data = parsed_snap # Fallback for old flat format
-            except json.JSONDecodeError:
-                pass
-        
-        if not officer_data:
-            officer_id = self.proceeding_data.get('issuing_officer_id') or (getattr(self, 'officer_combo', None) and self.officer_combo.currentData())
-            officer_data = self.db.get_officer_by_id(officer_id) if officer_id else {}
+        officer_data = document_service.resolve_officer(
+            self.proceeding_data, 'DRC-01A', self.db,
+            officer_id=getattr(self, 'officer_combo', None) and self.officer_combo.currentData())
 
         model['officer_name'] = officer_data.get('name', 'Proper Officer')
         model['designation'] = officer_data.get('designation', 'Superintendent')
@@ -2173,86 +2276,7 @@ class ProceedingsWorkspace(QWidget):
         Pure function: Map SSoT model to Jinja context and render.
         Accepts dict: { 'gstin', 'legal_name', 'address', 'case_id', 'oc_no', 'oc_date', 'tax_rows', 'issues_html' }
         """
-        if not model:
-            return "<h3>Data Validation Failed</h3>"
-
-        try:
-            from src.utils.template_engine import TemplateEngine
-            from src.utils.formatting import format_indian_number
-            from jinja2 import Environment, FileSystemLoader
-            import os
-            import datetime
-            import re
-            
-            # Defense against None type aggregation
-            total = model.get('grand_total_liability', 0)
-            formatted_total = format_indian_number(total) if total is not None else "0"
-
-            # --- 2. Backend String Sanitization ---
-            advice_paragraph = model.get('advice_paragraph', '')
-            advice_paragraph = re.sub(r'\s+', ' ', advice_paragraph).strip()
-            
-            raw_issues_html = model.get('issues_html', '')
-            
-            # --- 3. Structural Cleanup of issues_html ---
-            sanitized_issues = re.sub(r'\s+', ' ', raw_issues_html).strip()
-            
-            # Remove inline styles ONLY from <p> and <span> to preserve <table> borders and grid styling
-            sanitized_issues = re.sub(r'(<(?:p|span)[^>]*?)\s+style="[^"]*"', r'\1', sanitized_issues, flags=re.IGNORECASE)
-            
-            # Remove empty paragraphs
-            sanitized_issues = re.sub(r'<p>\s*</p>', '', sanitized_issues)
-            
-            # Collapse multiple <br>
-            sanitized_issues = re.sub(r'(<br\s*/?>\s*){2,}', '<br>', sanitized_issues)
-            
-            # Trim outer whitespace
-            sanitized_issues = sanitized_issues.strip()
-            
-            context = {
-                'gstin': model['gstin'],
-                'legal_name': model['legal_name'],
-                'trade_name': f"({model['trade_name']})" if model.get('trade_name') and model['trade_name'] != model['legal_name'] else "",
-                'address': model['address'],
-                'case_id': model['case_id'],
-                'oc_no': model['oc_no'],
-                'oc_date': model['oc_date'],
-                'financial_year': model['financial_year'],
-                'form_type': model['form_type'],
-                'section_base': model['section_base'],
-                'tax_table_html': model.get('tax_table_html', ''),
-                'issues_html': sanitized_issues,
-                'grand_total': formatted_total,
-                'advice_paragraph': advice_paragraph,
-                'last_date_reply': model['reply_date'],
-                'officer_name': model.get('officer_name', 'Proper Officer'),
-                'designation': model.get('designation', 'Superintendent'),
-                'jurisdiction': model.get('jurisdiction', 'Paravur Range')
-            }
-            
-            # 8. Strict Contract Validation
-            required_keys = [
-                'gstin', 'legal_name', 'trade_name', 'address', 'case_id', 'oc_no', 'oc_date', 
-                'financial_year', 'form_type', 'section_base', 'tax_table_html', 'issues_html', 
-                'grand_total', 'advice_paragraph', 'last_date_reply', 'officer_name', 'designation', 'jurisdiction'
-            ]
-            
-            for key in required_keys:
-                if key not in context or context[key] is None:
-                    raise KeyError(f"CRITICAL: Missing required contract key for DRC-01A rendering: {key}")
-
-            # Use Centralized TemplateEngine
-            rendered = TemplateEngine.render_document("drc01a.html", context)
-            
-            print("--- HTML OUTPUT START (First 200 chars) ---")
-            print(rendered[:200])
-            print("--- HTML OUTPUT END ---")
-            print(f"DEBUG: Rendered HTML Length: {len(rendered)}")
-            return rendered
-            
-        except Exception as e:
-            print(f"Error rendering DRC-01A: {e}\n{traceback.format_exc()}")
-            return f"<h3>Rendering Error: {str(e)}</h3>"
+        return document_service.render_drc01a_html(model)
 
     def export_drc01a(self, format="pdf"):
         """
@@ -3491,7 +3515,7 @@ class ProceedingsWorkspace(QWidget):
         
         # 2. Render HTML and load into WebEngineView
         html = self.render_scn(is_preview=True)
-        self.scn_final_preview.setHtml(html)
+        self.scn_final_preview.setHtml(html, QUrl.fromLocalFile(render_assets.base_url()))
         
         # Mark as initialized to prevent auto-render on every future tab switch
         self.preview_initialized = True
@@ -3508,12 +3532,11 @@ class ProceedingsWorkspace(QWidget):
             # 3. Update Register (SCN Register entry - implicitly done via status or explicit call?)
             # Also Add OC Entry for SCN
             oc_data = {
-                'OC_Number': self.scn_oc_input.text(),
                 'OC_Date': self.scn_date_input.date().toString("yyyy-MM-dd"),
                 'OC_Content': f"Show Cause Notice Issued. SCN No: {self.scn_no_input.text()}. {self.scn_fin_panel.fin_scn_remarks.toPlainText()}",
                 'OC_To': self.proceeding_data.get('legal_name', '')
             }
-            self.db.add_oc_entry(self.proceeding_id, oc_data)
+            self.register_oc(self.scn_oc_input, oc_data)
             
             QMessageBox.information(self, "Success", "Show Cause Notice Finalized Successfully.")
             
@@ -4791,6 +4814,10 @@ class ProceedingsWorkspace(QWidget):
                     widget.deleteLater()
             self.demand_tiles = []
             
+            # [REFRESH] Force state synchronization before generating demand text
+            # This ensures liability rows are extracted from grid into variables
+            recalculate_issue_cards(self.scn_issue_cards)
+
             # Iterate through SCN issue cards
             tax_numerals = []
             
@@ -4803,9 +4830,6 @@ class ProceedingsWorkspace(QWidget):
                 print(f"SYNC ISSUE INDEX: {i}")
                 print(f"SYNC ISSUE ID: {issue_id}")
 
-                # [REFRESH] Force state synchronization before generating demand text
-                # This ensures liability rows are extracted from grid into variables
-                card.calculate_values() 
                 data = card.get_data() # Fresh snapshot
                 print(f"BREAKDOWN SENT TO GENERATOR (Issue {i}):", data.get('tax_breakdown'))
 
@@ -5255,52 +5279,8 @@ class ProceedingsWorkspace(QWidget):
         model['cgst_total_val'] = cgst_total
         model['sgst_total_val'] = sgst_total
         
-        # Helper: Indian Currency Format (Hardened)
-        def format_indian_currency(value):
-            if value is None: return "0"
-            try:
-                val = safe_int(value)
-            except (ValueError, TypeError):
-                return str(value)
-            
-            is_negative = val < 0
-            val = abs(val)
-            
-            # Format to 2 decimals first to handle rounding
-            s_val = f"{val:.2f}"
-            
-            # Extract integer and decimal parts
-            if "." in s_val:
-                integer_part, decimal_part = s_val.split(".")
-            else:
-                integer_part, decimal_part = s_val, "00"
-            
-            # Drop decimal if zero
-            if decimal_part == "00":
-                decimal_suffix = ""
-            else:
-                decimal_suffix = "." + decimal_part
-                
-            # Apply commas to integer part
-            if len(integer_part) > 3:
-                last3 = integer_part[-3:]
-                rest = integer_part[:-3]
-                # split rest into chunks of 2 from right
-                parts = []
-                while len(rest) > 2:
-                    parts.insert(0, rest[-2:])
-                    rest = rest[:-2]
-                parts.insert(0, rest)
-                formatted_int = ",".join(parts) + "," + last3
-            else:
-                formatted_int = integer_part
-                
-            result = formatted_int + decimal_suffix
-            if is_negative:
-                result = "-" + result
-            return result
-
         # Formatted totals using Indian Format
+        format_indian_currency = document_service.format_indian_currency
         model['total_amount'] = format_indian_currency(total_tax)
         model['igst_total'] = format_indian_currency(igst_total)
         model['cgst_total'] = format_indian_currency(cgst_total)
@@ -5309,15 +5289,7 @@ class ProceedingsWorkspace(QWidget):
         # 3. Dynamic Paragraph Numbering
         # Intro=Para 1, Jurisdiction=Para 2, Issues start at Para 3
         # If we have N issues, they occupy Para 3 to 3+(N-1)
-        next_para = 3 + len(issues_data)
-        model['para_demand'] = next_para
-        model['para_waiver'] = next_para + 1
-        model['para_cancellation'] = next_para + 2
-        model['para_hearing'] = next_para + 3
-        model['para_exparte'] = next_para + 4
-        model['para_prejudice'] = next_para + 5
-        model['para_amendment'] = next_para + 6
-        model['para_reliance'] = next_para + 7
+        model.update(document_service.scn_paragraph_numbers(len(issues_data)))
 
         # 4. Additional Data (Reliance, Copy To)
         rel_text = self.reliance_editor.toPlainText()
@@ -5381,139 +5353,7 @@ class ProceedingsWorkspace(QWidget):
         return model
     def render_scn(self, is_preview=False, for_pdf=False):
         """Render SCN HTML using Jinja2 template"""
-        model = self._get_scn_model()
-        if not model:
-            return "<h3>No Case Data Loaded</h3>"
-            
-        model['is_preview'] = is_preview
-        
-        try:
-            # 1. Format Issues HTML from the centralized model
-            issues_html = ""
-            for issue in model['issues']:
-                current_para_num = issue['index'] + 2 # Paras 1&2 are fixed, Issues start at 3
-                title = issue['title']
-                
-                # No wrapper for the whole issue to avoid pagination truncation of multi-block content
-                
-                # Issue Heading
-                issues_html += f"""
-                <div class="issue-header">
-                    <table class="para-table">
-                        <tr>
-                            <td class="para-num">{current_para_num}.</td>
-                            <td class="para-content"><h3>Issue No. {issue['index']}: {title}</h3></td>
-                        </tr>
-                    </table>
-                </div>
-                """
-                
-                # Sub Paragraphs
-                sub_para_count = 1
-                for p_content in issue['paras']:
-                    num_str = f"{current_para_num}.{sub_para_count}"
-                    issues_html += f"""
-                    <table class="para-table">
-                        <tr>
-                            <td class="para-num">{num_str}</td>
-                            <td class="para-content">
-                                <p class="legal-para">{p_content}</p>
-                            </td>
-                        </tr>
-                    </table>
-                    """
-                    sub_para_count += 1
-                
-                # Table as Sub-Para (Unwrapped for pagination splitting)
-                if issue['table_html'] and issue['table_html'].strip():
-                    num_str = f"{current_para_num}.{sub_para_count}"
-                    issues_html += f"""
-                    <table class="para-table">
-                        <tr>
-                            <td class="para-num">{num_str}</td>
-                            <td class="para-content">
-                                <p class="legal-para">The details of the discrepancies are as follows:</p>
-                            </td>
-                        </tr>
-                    </table>
-                    {issue['table_html']}
-                    """
-                
-                # End issue
-            
-            model['issues_content'] = issues_html
-            model['issues_templates'] = issues_html
-            
-            # Letterhead
-            import base64
-            model['letter_head'] = ""
-            if model['show_letterhead']:
-                try:
-                    from src.utils.config_manager import ConfigManager
-                    config = ConfigManager()
-                    lh_filename = config.get_pdf_letterhead()
-                    lh_path = config.get_letterhead_path('pdf')
-                    
-                    if lh_path and os.path.exists(lh_path):
-                        ext = os.path.splitext(lh_path)[1][1:].lower()
-                        
-                        # Fetch visual adjustments for this specific letterhead
-                        adj = config.get_letterhead_adjustments(lh_filename)
-                        width_val = min(adj.get('width', 100), 100)
-                        
-                        lh_style = f"width: {width_val}%; padding-top: {adj.get('padding_top', 0)}px; margin-bottom: {adj.get('margin_bottom', 20)}px;"
-                        
-                        if ext == "html":
-                            # Case 1: HTML letterhead - read as text
-                            with open(lh_path, 'r', encoding='utf-8') as f:
-                                lh_full = f.read()
-                                # Extract body content if present, otherwise use full content
-                                match = re.search(r"<body[^>]*>(.*?)</body>", lh_full, re.DOTALL | re.IGNORECASE)
-                                inner_html = match.group(1) if match else lh_full
-                                model['letter_head'] = f'<div style="{lh_style} text-align: center;">{inner_html}</div>'
-                        else:
-                            # Case 2: Image letterhead - read as binary and base64 encode
-                            with open(lh_path, "rb") as image_file:
-                                encoded_string = base64.b64encode(image_file.read()).decode('utf-8')
-                            if ext == "jpg": ext = "jpeg"
-                            model['letter_head'] = f'<div style="{lh_style} text-align: center;"><img src="data:image/{ext};base64,{encoded_string}" alt="Letterhead" style="max-width: 100%; height: auto;"></div>'
-                except Exception as e:
-                    print(f"Letterhead failed: {e}")
-                    model['letter_head'] = ""
-
-            # Standard SCN context variables
-            model['section'] = model.get('initiating_section', '')
-            model['for_pdf'] = for_pdf
-            
-            # Load CSS explicitly for SCN injection (since TemplateEngine doesn't do this yet)
-            template_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "templates")
-            css_dir = os.path.join(template_dir, 'css')
-            
-            def read_css(filename):
-                path = os.path.join(css_dir, filename)
-                if os.path.exists(path):
-                    with open(path, 'r', encoding='utf-8') as f:
-                        return f.read()
-                return ""
-
-            model['base_css'] = read_css('doc_base.css')
-            renderer_mode = 'pdf' if not is_preview else 'qt'
-            if renderer_mode == 'pdf':
-                model['renderer_css'] = ""
-            else:
-                model['renderer_css'] = read_css('doc_qt.css')
-
-            model['full_styles_html'] = f"<style>\n{model['base_css']}\n{model['renderer_css']}\n</style>"
-            
-            # Use Centralized TemplateEngine
-            from src.utils.template_engine import TemplateEngine
-            return TemplateEngine.render_document("scn.html", model)
-            
-        except Exception as e:
-            print(f"Error rendering SCN: {e}")
-            import traceback
-            traceback.print_exc()
-            return f"<h3>Render Error: {str(e)}</h3>"
+        return document_service.render_scn_html(self._get_scn_model(), is_preview=is_preview, for_pdf=for_pdf)
 
     def save_drc01a_metadata(self):
         """Save DRC-01A Metadata (OC No, Dates, etc.) to DB"""
@@ -5620,53 +5460,7 @@ class ProceedingsWorkspace(QWidget):
         PURE FUNCTION: Generate HTML table rows from structured data.
         Accepts list of dicts: [{'act', 'period', 'tax', 'interest', 'penalty', 'total'}, ...]
         """
-        rows_html = ""
-        if not tax_rows:
-            return "<tr><td colspan='7' style='text-align: center;'>No tax details found.</td></tr>"
-
-        from src.utils.formatting import format_indian_number
-        
-        total_tax = 0
-        total_int = 0
-        total_pen = 0
-        total_grand = 0
-
-        for row in tax_rows:
-            act = row.get('act', '')
-            period = row.get('period', '')
-            tax = row.get('tax', 0)
-            interest = row.get('interest', 0)
-            penalty = row.get('penalty', 0)
-            total = row.get('total', 0)
-            
-            total_tax += tax
-            total_int += interest
-            total_pen += penalty
-            total_grand += total
-
-            # DRC-01A expects 6 columns: Act | Period | Tax | Interest | Penalty | Total
-            rows_html += f"""
-            <tr>
-                <td style="border: 1px solid black; padding: 5px; text-align: center;">{act}</td>
-                <td style="border: 1px solid black; padding: 5px; text-align: center;">{period}</td>
-                <td style="border: 1px solid black; padding: 5px; text-align: right;">{format_indian_number(tax)}</td>
-                <td style="border: 1px solid black; padding: 5px; text-align: right;">{format_indian_number(interest)}</td>
-                <td style="border: 1px solid black; padding: 5px; text-align: right;">{format_indian_number(penalty)}</td>
-                <td style="border: 1px solid black; padding: 5px; text-align: right;"><b>{format_indian_number(total)}</b></td>
-            </tr>
-            """
-        
-        # Add a Grand Total row for the DRC-01A/SCN Table inject
-        rows_html += f"""
-        <tr style="background-color: #f2f2f2; font-weight: bold;">
-            <td colspan="2" style="border: 1px solid black; padding: 5px; text-align: right;">Total</td>
-            <td style="border: 1px solid black; padding: 5px; text-align: right;">{format_indian_number(total_tax)}</td>
-            <td style="border: 1px solid black; padding: 5px; text-align: right;">{format_indian_number(total_int)}</td>
-            <td style="border: 1px solid black; padding: 5px; text-align: right;">{format_indian_number(total_pen)}</td>
-            <td style="border: 1px solid black; padding: 5px; text-align: right;">{format_indian_number(total_grand)}</td>
-        </tr>
-        """
-        return rows_html
+        return document_service.tax_table_html(tax_rows)
 
     def generate_pdf(self):
         """Generate PDF for current tab"""
@@ -5736,61 +5530,25 @@ class ProceedingsWorkspace(QWidget):
             )
             
             if file_path:
-                # Generate PDF using the correct method
-                import shutil
-                import os
-                from src.utils.document_generator import DocumentGenerator
-                
-                # [ULTRA-SAFE] UI Mitigation
-                from PyQt6.QtWidgets import QApplication
-                QApplication.setOverrideCursor(Qt.CursorShape.WaitCursor)
-                
-                filename_only = os.path.splitext(os.path.basename(file_path))[0]
-                doc_gen = DocumentGenerator()
-                try:
-                    generated_path = doc_gen.generate_pdf_from_html(html_content, filename_only)
-                    
-                    if generated_path and os.path.exists(generated_path):
-                        # Move the file to user-selected location
-                        shutil.move(generated_path, file_path)
-                        
-                        # 3. Save Document Record to DB
-                        doc_data = {
-                            'proceeding_id': self.proceeding_data.get('id'),
-                            'doc_type': doc_type,
-                            'content_html': html_content,
-                            'template_id': None,
-                            'template_version': 1,
-                            'version_no': 1,
-                            'is_final': 1,
-                            'snapshot_path': file_path
-                        }
-                        self.db.save_document(doc_data)
-                        
-                        QMessageBox.information(self, "Success", f"PDF generated and Registered successfully!\n\nSaved to: {file_path}")
-                    else:
-                        raise RuntimeError("File generation failed without error message.")
-                        
-                except Exception as e:
-                    err_str = str(e)
-                    if "MISSING_DEPENDENCY" in err_str:
-                        msg = ("PDF Generation Unavailable.\n\n"
-                               "The system is missing required rendering libraries (GTK3).\n"
-                               "Please install the dependencies or use 'Draft Word' instead.")
-                        QMessageBox.critical(self, "Dependency Error", msg)
-                    elif "TIMEOUT" in err_str:
-                        QMessageBox.warning(self, "Timeout", "PDF generation took too long (20s limit) and was cancelled for safety.")
-                    else:
-                        QMessageBox.critical(self, "Error", f"Failed to generate {doc_type} PDF: {err_str}")
-                finally:
-                    QApplication.restoreOverrideCursor()
-                
-                # Open the file if it exists and was successfully moved
-                if os.path.exists(file_path):
-                    try:
-                        os.startfile(file_path)
-                    except Exception as e:
-                        print(f"Could not open file: {e}")
+                # Render in the background from this HTML snapshot; the officer can keep editing
+                proceeding_id = self.proceeding_data.get('id')
+
+                def on_pdf_ready(job):
+                    # Register the document exactly as rendered (retries reuse the same snapshot)
+                    self.db.save_document({
+                        'proceeding_id': proceeding_id,
+                        'doc_type': doc_type,
+                        'content_html': job.html,
+                        'template_id': None,
+                        'template_version': 1,
+                        'version_no': 1,
+                        'is_final': 1,
+                        'snapshot_path': job.output_path
+                    })
+                    open_file(job.output_path)
+
+                ExportJobManager.instance().submit_pdf(f"{doc_type} PDF", html_content, file_path,
+                                                       on_success=on_pdf_ready)
                         
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Error during export: {str(e)}")
@@ -5814,11 +5572,6 @@ class ProceedingsWorkspace(QWidget):
                      QMessageBox.warning(self, "Error", "Failed to build SCN model.")
                      return
                 
-                from script_docx import Document # Using a helper if available, or docx.Document
-                from docx import Document
-                from docx.shared import Pt, Inches
-                from docx.enum.text import WD_ALIGN_PARAGRAPH
-                
                 case_id = model.get('case_id', 'DRAFT').replace('/', '_')
                 default_filename = f"SCN_{case_id}.docx"
                 
@@ -5826,61 +5579,11 @@ class ProceedingsWorkspace(QWidget):
                 file_path, _ = QFileDialog.getSaveFileName(self, "Save SCN DOCX As", default_filename, "Word Documents (*.docx)")
                 if not file_path: return
 
-                doc = Document()
-                for section in doc.sections:
-                    section.top_margin = Inches(0.8)
-                    section.bottom_margin = Inches(0.8)
-                    section.left_margin = Inches(1)
-                    section.right_margin = Inches(1)
-
-                # Title
-                p = doc.add_paragraph()
-                p.alignment = WD_ALIGN_PARAGRAPH.CENTER
-                run = p.add_run("SHOW CAUSE NOTICE")
-                run.bold = True
-                run.font.size = Pt(16)
-                
-                # Header
-                doc.add_paragraph(f"GSTIN: {model.get('gstin', '')}")
-                doc.add_paragraph(f"Legal Name: {model.get('legal_name', '')}")
-                doc.add_paragraph(f"OC Number: {model.get('oc_no', '')}")
-                doc.add_paragraph(f"Date: {model.get('issue_date', '')}")
-                doc.add_paragraph()
-
-                # Paragraph 1: Intro
-                p = doc.add_paragraph()
-                p.add_run("1. ").bold = True
-                p.add_run("A brief of the case and the grounds for initiating proceedings are as follows:")
-                
-                # Issues
-                for issue in model['issues']:
-                    p_num = issue['index'] + 2 # Starts at 3
-                    title = issue['title']
-                    
-                    p = doc.add_paragraph()
-                    p.add_run(f"{p_num}. Issue No. {issue['index']}: {title}").bold = True
-                    
-                    for s_idx, para in enumerate(issue['paras'], start=1):
-                        sp = doc.add_paragraph()
-                        sp.alignment = WD_ALIGN_PARAGRAPH.JUSTIFY
-                        sp.add_run(f"{p_num}.{s_idx} ").bold = True
-                        sp.add_run(para)
-                
-                # Demands
-                num = model['para_demand']
-                p = doc.add_paragraph()
-                p.add_run(f"{num}. Summary of Tax Liability:").bold = True
-                doc.add_paragraph(f"The total tax liability is determined as ₹{model['total_amount']}.")
-
-                # Proper Officer
-                doc.add_paragraph()
-                sig = doc.add_paragraph()
-                sig.alignment = WD_ALIGN_PARAGRAPH.RIGHT
-                sig.add_run("Proper Officer").bold = True
-                
-                doc.save(file_path)
-                import os
-                os.startfile(file_path)
+                # Build and save in the background from a snapshot of the model
+                scn_model = copy.deepcopy(model)
+                ExportJobManager.instance().submit_file(
+                    "Show Cause Notice DOCX", lambda path: _write_scn_docx(scn_model, path), file_path,
+                    on_success=lambda job: open_file(job.output_path))
                 return
 
             # 1. Regenerate model & Validate (DRC-01A Only)
@@ -5894,10 +5597,6 @@ class ProceedingsWorkspace(QWidget):
                 drc_model = {}
 
             from PyQt6.QtWidgets import QFileDialog
-            from docx import Document
-            from docx.shared import Pt, Inches
-            from docx.enum.text import WD_ALIGN_PARAGRAPH
-            import os
             
             # Ask user for save location
             case_id = self.proceeding_data.get('case_id', 'DRAFT').replace('/', '_')
@@ -5906,82 +5605,11 @@ class ProceedingsWorkspace(QWidget):
             file_path, _ = QFileDialog.getSaveFileName(self, "Save DOCX As", default_filename, "Word Documents (*.docx)")
             if not file_path: return
 
-            # Create DOCX document
-            doc = Document()
-            for section in doc.sections:
-                section.top_margin = Inches(1)
-                section.bottom_margin = Inches(1)
-                section.left_margin = Inches(1)
-                section.right_margin = Inches(1)
-            
-            # Title
-            title = doc.add_paragraph()
-            title.alignment = WD_ALIGN_PARAGRAPH.CENTER
-            run = title.add_run("FORM DRC-01A")
-            run.bold = True
-            run.font.size = Pt(16)
-            
-            # Case details
-            doc.add_paragraph(f"Case ID: {drc_model.get('case_id', 'N/A')}")
-            doc.add_paragraph(f"GSTIN: {drc_model.get('gstin', 'N/A')}")
-            doc.add_paragraph(f"Legal Name: {drc_model.get('legal_name', 'N/A')}")
-            doc.add_paragraph(f"Address: {drc_model.get('address', 'N/A')}")
-            doc.add_paragraph()
-            
-            # Tax Demand Table (Data-Driven)
-            tax_rows = drc_model.get('tax_rows', [])
-            if tax_rows:
-                heading = doc.add_paragraph()
-                run = heading.add_run("Tax Demand Details:")
-                run.bold = True
-                run.font.size = Pt(14)
-                
-                # Create table
-                table = doc.add_table(rows=len(tax_rows) + 1, cols=7)
-                table.style = 'Light Grid Accent 1'
-                
-                # Headers
-                headers = ["Act", "Tax Period From", "Tax Period To", "Tax (₹)", "Interest (₹)", "Penalty (₹)", "Total (₹)"]
-                for col, header in enumerate(headers):
-                    cell = table.rows[0].cells[col]
-                    cell.text = header
-                    cell.paragraphs[0].runs[0].bold = True
-                
-                # Data
-                for r_idx, row in enumerate(tax_rows, start=1):
-                    table.rows[r_idx].cells[0].text = row.get('Act', '')
-                    table.rows[r_idx].cells[1].text = row.get('Period', '')
-                    table.rows[r_idx].cells[2].text = row.get('Period', '')
-                    table.rows[r_idx].cells[3].text = row.get('Tax', '0')
-                    table.rows[r_idx].cells[4].text = row.get('Interest', '0')
-                    table.rows[r_idx].cells[5].text = row.get('Penalty', '0')
-                    table.rows[r_idx].cells[6].text = row.get('Total', '0')
-                
-                doc.add_paragraph()
-            
-            # Issues & Sections (Simplified for now)
-            heading = doc.add_paragraph()
-            run = heading.add_run("Details of Discrepancies:")
-            run.bold = True
-            run.font.size = Pt(14)
-            doc.add_paragraph("Please refer to the SCN preview/PDF for full issue narratives.")
-            doc.add_paragraph()
-            
-            # Advice Text
-            advice_text = drc_model.get('AdviceText', "Please pay the amount as ascertained.")
-            p = doc.add_paragraph()
-            p.add_run(advice_text)
-            
-            # Signatures
-            doc.add_paragraph()
-            sig = doc.add_paragraph()
-            sig.alignment = WD_ALIGN_PARAGRAPH.RIGHT
-            run = sig.add_run("Proper Officer\n(Signature)\nName: ____________________\nDesignation: ____________________\nJurisdiction: ____________________")
-            run.bold = True
-            
-            doc.save(file_path)
-            QMessageBox.information(self, "Success", f"DOCX generated successfully!\n\nSaved to: {file_path}")
-            os.startfile(file_path)
+            # Build and save in the background from a snapshot of the model
+            drc_snapshot = copy.deepcopy(drc_model)
+            ExportJobManager.instance().submit_file(
+                "DRC-01A DOCX", lambda path: _write_drc01a_docx(drc_snapshot, path), file_path,
+                on_success=lambda job: open_file(job.output_path))
                     
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Error generating DOCX: {str(e)}")
@@ -6094,12 +5722,11 @@ class ProceedingsWorkspace(QWidget):
             
         try:
             oc_data = {
-                'OC_Number': self.ph_oc_input.text(),
                 'OC_Date': self.ph_oc_date.date().toString("yyyy-MM-dd"),
                 'OC_Content': f"Personal Hearing Intimation issued for GSTIN {self.proceeding_data.get('gstin','')}.",
                 'OC_To': self.proceeding_data.get('legal_name', '')
             }
-            self.db.add_oc_entry(self.proceeding_id, oc_data)
+            self.register_oc(self.ph_oc_input, oc_data)
             
             # Update status
             self.db.update_proceeding(self.proceeding_id, {
@@ -6172,12 +5799,11 @@ class ProceedingsWorkspace(QWidget):
         try:
             # 1. Register in OC Register
             oc_data = {
-                'OC_Number': oc_no,
                 'OC_Date': self.ph_edit_oc_date.date().toString("yyyy-MM-dd"),
                 'OC_Content': f"Personal Hearing Intimation for Case {self.proceeding_id}",
                 'OC_To': self.proceeding_data.get('legal_name', '')
             }
-            self.db.add_oc_entry(self.proceeding_id, oc_data)
+            oc_no = self.register_oc(self.ph_edit_oc, oc_data)
             
             # 2. Mark entry as registered
             entry = {
@@ -6443,42 +6069,9 @@ class ProceedingsWorkspace(QWidget):
         
         file_path, _ = QFileDialog.getSaveFileName(self, "Save PH Intimation PDF", default_filename, "PDF Files (*.pdf)")
         if file_path:
-            from src.utils.document_generator import DocumentGenerator
-            import shutil
-            import os
-            from PyQt6.QtWidgets import QApplication
-            
-            filename_only = os.path.splitext(os.path.basename(file_path))[0]
-            doc_gen = DocumentGenerator()
-            
-            # [ULTRA-SAFE] UI Mitigation
-            QApplication.setOverrideCursor(Qt.CursorShape.WaitCursor)
-            # Disable triggering button if we had a direct reference, 
-            # but since this is a general handler we rely on the modal wait cursor.
-            
-            try:
-                generated_path = doc_gen.generate_pdf_from_html(html, filename_only)
-                
-                if generated_path and os.path.exists(generated_path):
-                    shutil.move(generated_path, file_path)
-                    QMessageBox.information(self, "Success", f"PH Intimation PDF saved to: {file_path}")
-                    os.startfile(file_path)
-                else:
-                    raise RuntimeError("File generation failed without error message.")
-                    
-            except Exception as e:
-                err_str = str(e)
-                if "MISSING_DEPENDENCY" in err_str:
-                    msg = ("PDF Generation Unavailable.\n\n"
-                           "The system is missing required rendering libraries (GTK3).\n"
-                           "Please install the dependencies or use 'Draft DOCX' instead.")
-                    QMessageBox.critical(self, "Dependency Error", msg)
-                elif "TIMEOUT" in err_str:
-                    QMessageBox.warning(self, "Timeout", "PDF generation took too long (20s limit) and was cancelled for safety.")
-                else:
-                    QMessageBox.critical(self, "Error", f"Failed to generate PDF: {err_str}")
-            finally:
-                QApplication.restoreOverrideCursor()
+            # Rendered in the background; the officer can keep editing PH entries meanwhile
+            ExportJobManager.instance().submit_pdf("PH Intimation PDF", html, file_path,
+                                                   on_success=lambda job: open_file(job.output_path))
 
     def generate_ph_docx(self):
         """Generate DOCX Document for the active PH Intimation entry"""
@@ -6582,12 +6175,11 @@ class ProceedingsWorkspace(QWidget):
             
         try:
             oc_data = {
-                'OC_Number': self.order_oc_input.text(),
                 'OC_Date': self.order_oc_date.date().toString("yyyy-MM-dd"),
                 'OC_Content': f"Final Order (DRC-07) issued for GSTIN {self.proceeding_data.get('gstin','')}.",
                 'OC_To': self.proceeding_data.get('legal_name', '')
             }
-            self.db.add_oc_entry(self.proceeding_id, oc_data)
+            self.register_oc(self.order_oc_input, oc_data)
             
             # 2. Transition State (Atomic Update)
             self.transition_to(WorkflowStage.ORDER_ISSUED)
@@ -6608,10 +6200,28 @@ class ProceedingsWorkspace(QWidget):
             
             formatted_oc = f"{next_num}/{current_year}"
             input_field.setText(formatted_oc)
+            input_field.setProperty("suggested_oc", formatted_oc)
             
         except Exception as e:
             print(f"Error suggesting OC: {e}")
 
+    def register_oc(self, input_field: QLineEdit, oc_data):
+        """
+        Issue oc_data in the OC Register with the number in input_field.
+        A number still as suggested is only a preview, so it is left blank
+        for the register to allocate in its own transaction; a typed number
+        that is already issued is refused. Shows and returns the number used.
+        """
+        oc_number = input_field.text().strip()
+        if oc_number == input_field.property("suggested_oc"):
+            oc_number = ""
+        issued = self.db.add_oc_entry(self.proceeding_id, {**oc_data, 'OC_Number': oc_number}, is_issuance=True)
+        if not issued:
+            raise RuntimeError("Could not write to the OC Register.")
+        input_field.setText(issued)
+        input_field.setProperty("suggested_oc", None)
+        return issued
+
     # [PHASE 3] Restored Finalization Methods & New PH Logic
 
     def confirm_drc01a_finalization(self):
@@ -6625,12 +6235,11 @@ class ProceedingsWorkspace(QWidget):
             
             # 3. Add OC Entry for DRC-01A
             oc_data = {
-                'OC_Number': self.oc_number_input.text(),
                 'OC_Date': self.oc_date_input.date().toString("yyyy-MM-dd"),
                 'OC_Content': f"DRC-01A Issued. Case ID: {self.proceeding_data.get('case_id')}",
                 'OC_To': self.proceeding_data.get('legal_name', '')
             }
-            self.db.add_oc_entry(self.proceeding_id, oc_data)
+            self.register_oc(self.oc_number_input, oc_data)
             
             QMessageBox.information(self, "Success", "DRC-01A Finalized Successfully.")
             
@@ -6652,12 +6261,11 @@ class ProceedingsWorkspace(QWidget):
             
             # 3. Add OC Entry for SCN
             oc_data = {
-                'OC_Number': self.scn_oc_input.text(),
                 'OC_Date': self.scn_date_input.date().toString("yyyy-MM-dd"),
                 'OC_Content': f"Show Cause Notice Issued. SCN No: {self.scn_no_input.text()}. {self.scn_fin_panel.fin_scn_remarks.toPlainText()}",
                 'OC_To': self.proceeding_data.get('legal_name', '')
             }
-            self.db.add_oc_entry(self.proceeding_id, oc_data)
+            self.register_oc(self.scn_oc_input, oc_data)
             
             QMessageBox.information(self, "Success", "Show Cause Notice Finalized Successfully.")
             
@@ -6678,12 +6286,11 @@ class ProceedingsWorkspace(QWidget):
             
             # 2. Add OC Entry for PH
             oc_data = {
-                'OC_Number': self.ph_edit_oc.text(),
                 'OC_Date': self.ph_date.date().toString("yyyy-MM-dd"),
                 'OC_Content': f"PH Intimation Issued. Hearing on {self.ph_date.date().toString('dd/MM/yyyy')} at {self.ph_time.time().toString('hh:mm A')}",
                 'OC_To': self.proceeding_data.get('legal_name', '')
             }
-            self.db.add_oc_entry(self.proceeding_id, oc_data)
+            self.register_oc(self.ph_edit_oc, oc_data)
             
             QMessageBox.information(self, "Success", "Personal Hearing Intimated Successfully.")
             
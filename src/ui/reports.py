@@ -1,7 +1,9 @@
 from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, 
-                             QTableWidget, QTableWidgetItem, QHeaderView, QDateEdit, QLineEdit)
+                             QTableView, QHeaderView, QDateEdit, QLineEdit, QAbstractItemView)
 from PyQt6.QtCore import Qt, QDate
 from src.database.db_manager import DatabaseManager
+from src.ui.components.paged_table_model import PagedTableModel
+from src.ui.components.register_export_worker import start_register_export
 import pandas as pd
 import os
 
@@ -48,47 +50,56 @@ class ReportsTab(QWidget):
         
         layout.addLayout(filter_layout)
 
-        # Table
-        self.table = QTableWidget()
-        self.table.setColumnCount(6)
-        self.table.setHorizontalHeaderLabels(["Date", "GSTIN", "Legal Name", "Form Type", "Status", "File Path"])
+        # Register totals (materialised counts; no table scan)
+        self.summary_label = QLabel()
+        self.summary_label.setStyleSheet("color: #555; margin: 6px 0;")
+        layout.addWidget(self.summary_label)
+
+        # Table (paged; filters are applied in SQL)
+        self.model = PagedTableModel(self.db, 'cases', [
+            ("Date", "Date"), ("GSTIN", "GSTIN"), ("Legal Name", "Legal Name"),
+            ("Form Type", "Form Type"), ("Status", "Status"), ("File Path", "FilePath"),
+        ])
+        self.table = QTableView()
+        self.table.setModel(self.model)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
         self.table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        self.table.horizontalHeader().setSortIndicator(-1, Qt.SortOrder.AscendingOrder)
+        self.table.setSortingEnabled(True)
         layout.addWidget(self.table)
         
         self.load_data()
 
+    def current_filters(self):
+        return {
+            'date_from': self.date_from.date().toString("yyyy-MM-dd"),
+            'date_to': self.date_to.date().toString("yyyy-MM-dd"),
+            'gstin': self.gstin_filter.text().strip().upper(),
+        }
+
     def load_data(self):
-        all_cases = self.db.get_all_cases()
-        
-        # Apply filters (basic implementation)
-        filtered_cases = []
-        start_date = self.date_from.date().toString("yyyy-MM-dd")
-        end_date = self.date_to.date().toString("yyyy-MM-dd")
-        gstin_query = self.gstin_filter.text().strip().upper()
-        
-        for case in all_cases:
-            case_date = str(case.get('Date', ''))
-            case_gstin = str(case.get('GSTIN', '')).upper()
-            
-            if start_date <= case_date <= end_date:
-                if not gstin_query or gstin_query in case_gstin:
-                    filtered_cases.append(case)
-        
-        self.table.setRowCount(len(filtered_cases))
-        for row, case in enumerate(filtered_cases):
-            self.table.setItem(row, 0, QTableWidgetItem(str(case.get('Date', ''))))
-            self.table.setItem(row, 1, QTableWidgetItem(str(case.get('GSTIN', ''))))
-            self.table.setItem(row, 2, QTableWidgetItem(str(case.get('Legal Name', ''))))
-            self.table.setItem(row, 3, QTableWidgetItem(str(case.get('Form Type', ''))))
-            self.table.setItem(row, 4, QTableWidgetItem(str(case.get('Status', ''))))
-            self.table.setItem(row, 5, QTableWidgetItem(str(case.get('FilePath', ''))))
+        self.model.set_filters(self.current_filters())
+        self.refresh_summary()
+
+    def refresh_summary(self):
+        stats = self.db.get_case_statistics()
+        if not stats:
+            self.summary_label.clear()
+            return
+        from src.utils.formatting import format_indian_number
+        cases = stats['cases']
+        # Per stage: a case's SCN demand usually restates its DRC-01A demand
+        issue_demand = stats['demand'].get('ISSUES', {})
+        rs = lambda amount: format_indian_number(amount, prefix_rs=True)
+        self.summary_label.setText(
+            f"Scrutiny: {cases.get('SCRUTINY', 0)}  |  Adjudication: {cases.get('ADJUDICATION', 0)}  |  "
+            f"Case Files: {cases.get('CASE_FILE', 0)}  |  DRC-01A Demand: {rs(issue_demand.get('DRC-01A', 0))}  |  "
+            f"SCN Demand: {rs(issue_demand.get('SCN', 0))}")
 
     def export_data(self):
-        # Basic export logic
-        try:
-            path = "reports_export.xlsx" # Should ask user for path
-            # For simplicity, just dump current filtered data
-            # Re-fetch or iterate table
-            pass
-        except:
-            pass
+        """Export the filtered notices (streamed in the background)"""
+        from datetime import date
+        self.model.set_filters(self.current_filters())
+        default_name = f"Generated_Notices_{date.today().isoformat()}.xlsx"
+        self._export_worker = start_register_export(self, self.db, self.model, default_name)
@@ -1,73 +1,93 @@
+import threading
+
 from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QToolBar, 
                              QPushButton, QFontComboBox, QSpinBox, QTextEdit, QColorDialog)
 from PyQt6.QtGui import QTextCharFormat, QFont, QColor, QTextCursor, QIcon, QAction
 from PyQt6.QtCore import Qt, pyqtSignal
 
+from src.utils import html_sanitizer
+
 
 class SCNTextEdit(QTextEdit):
     """
     Enhanced QTextEdit with structured HTML sanitization on paste.
-    Prevents MSO/Word contamination by enforcing a strict whitelist and stripping all attributes.
+    Prevents MSO/Word contamination by enforcing a strict whitelist and stripping all attributes
+    (see src/utils/html_sanitizer.py). Large pastes are sanitised on a worker thread and
+    inserted run by run, so the editor stays responsive.
     """
+    # Pasted HTML at least this long is sanitised off the GUI thread
+    ASYNC_PASTE_CHARS = 256 * 1024
+
+    _paste_run = pyqtSignal(int, str)
+    _paste_done = pyqtSignal(int)
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._paste_generation = 0
+        self._paste_cursor = None
+        self._paste_first = True
+        # Emitted from the worker thread; queued onto the GUI thread by Qt
+        self._paste_run.connect(self._insert_paste_run)
+        self._paste_done.connect(self._finish_paste)
+
     def insertFromMimeData(self, source):
         if source.hasHtml():
-            clean_html = self.sanitize_html(source.html())
-            self.insertHtml(clean_html)
+            html = source.html()
+            if len(html) >= self.ASYNC_PASTE_CHARS:
+                self.paste_html_async(html)
+            else:
+                clean_html = self.sanitize_html(html)
+                self.insertHtml(clean_html)
         else:
             super().insertFromMimeData(source)
 
     def sanitize_html(self, html):
         """
-        Structured sanitization using a hidden QTextDocument fragment.
-        Preserves: <p>, <b>, <i>, <u>, <ul>, <ol>, <li>, <br>.
+        Whitelist sanitization (single pass, linear time).
+        Preserves: <p>, <b>, <i>, <u>, <ul>, <ol>, <li>, <br> and simple tables.
         Strips: Everything else, including ALL attributes (style, class, etc.).
         """
-        import re
-        
-        # 1. Preliminary strip of head and style blocks which QTextDocument might miss
-        html = re.sub(r'<(style|script|meta|link|title|head).*?>.*?</\1>', '', html, flags=re.DOTALL | re.IGNORECASE)
-        html = re.sub(r'<!--.*?-->', '', html, flags=re.DOTALL) # Strip comments
-        
-        # 2. Use a temporary QTextDocument to parse and reconstruct clean content
-        from PyQt6.QtGui import QTextDocument, QTextCursor, QTextBlockFormat, QTextCharFormat
-        doc = QTextDocument()
-        doc.setHtml(html)
-        
-        clean_fragments = []
-        root = doc.rootFrame()
-        
-        # Traverse blocks
-        it = doc.begin()
-        while it != doc.end():
-            block = it
-            fragments = []
-            
-            # Traverse fragments in block (text spans)
-            fragment_it = block.begin()
-            while not fragment_it.atEnd():
-                frag = fragment_it.fragment()
-                text = frag.text()
-                fmt = frag.charFormat()
-                
-                # Apply whitelisted formatting to text
-                if fmt.fontWeight() == QFont.Weight.Bold:
-                    text = f"<b>{text}</b>"
-                if fmt.fontItalic():
-                    text = f"<i>{text}</i>"
-                if fmt.fontUnderline():
-                    text = f"<u>{text}</u>"
-                
-                fragments.append(text)
-                fragment_it += 1
-            
-            # Join fragments and wrap in <p>
-            block_text = "".join(fragments).strip()
-            if block_text:
-                clean_fragments.append(f"<p>{block_text}</p>")
-            
-            it = it.next()
-            
-        return "".join(clean_fragments)
+        return html_sanitizer.sanitize(html)
+
+    def paste_html_async(self, html):
+        """Sanitises html on a worker thread and inserts it at the cursor as runs arrive."""
+        self._paste_generation += 1
+        generation = self._paste_generation
+        self._paste_cursor = self.textCursor()
+        self._paste_cursor.removeSelectedText()
+        self._paste_first = True
+
+        def work():
+            for run in html_sanitizer.iter_sanitized(html):
+                if generation != self._paste_generation:
+                    return  # Superseded by a newer paste
+                self._paste_run.emit(generation, run)
+            self._paste_done.emit(generation)
+
+        threading.Thread(target=work, daemon=True).start()
+
+    def is_pasting(self):
+        return self._paste_cursor is not None
+
+    def _insert_paste_run(self, generation, run):
+        if generation != self._paste_generation or self._paste_cursor is None:
+            return
+        cursor = self._paste_cursor
+        # One undo step for the whole paste
+        if self._paste_first:
+            cursor.beginEditBlock()
+        else:
+            cursor.joinPreviousEditBlock()
+            cursor.insertBlock()
+        cursor.insertHtml(run)
+        cursor.endEditBlock()
+        self._paste_first = False
+
+    def _finish_paste(self, generation):
+        if generation != self._paste_generation or self._paste_cursor is None:
+            return
+        self.setTextCursor(self._paste_cursor)
+        self._paste_cursor = None
 
 class RichTextEditor(QWidget):
     """
@@ -11,6 +11,8 @@ from src.services.asmt10_generator import ASMT10Generator
 from src.services.scrutiny_parser import ScrutinyParser
 from src.services.file_validation_service import FileValidationService
 from src.database.db_manager import DatabaseManager
+from src.services import taxpayer_index
+from src.ui.components.taxpayer_completer import TaxpayerComboBox
 import os
 import json
 import uuid
@@ -22,6 +24,15 @@ from src.utils.formatting import format_indian_number
 from src.utils.number_utils import safe_int
 from src.services.gstr_2a_analyzer import GSTR2AAnalyzer
 from src.ui.components.header_selection_dialog import HeaderSelectionDialog
+from src.ui.components.export_job_manager import ExportJobManager
+
+
+def _save_asmt10_word(html, path):
+    """Export-job builder for the Word-ready ASMT-10; raises so the job is marked failed."""
+    success, msg = ASMT10Generator.save_docx(html, path)
+    if not success:
+        raise RuntimeError(msg)
+
 
 class FinalizationConfirmationDialog(QDialog):
     def __init__(self, data, issues, parent=None):
@@ -872,6 +883,11 @@ class CompliancePointCard(QFrame):
         self.title_lbl = QLabel(title)
         self.title_lbl.setStyleSheet("font-weight: 600; color: #1e293b; font-size: 13px; margin-left: 5px;")
         header_layout.addWidget(self.title_lbl, 1)
+
+        # Re-analysis marker: whether the last run recomputed this point or reused it
+        self.freshness_lbl = QLabel()
+        self.freshness_lbl.setVisible(False)
+        header_layout.addWidget(self.freshness_lbl)
         
         # Status Badge
         self.status_container = QFrame()
@@ -1016,11 +1032,24 @@ class CompliancePointCard(QFrame):
         self.table_widget.setColumnCount(0)
         self.html_view.setVisible(False)
         self.html_view.clear()
+        self.freshness_lbl.setVisible(False)
         
         # Reset animation/expansion if needed?
         if self.is_expanded:
             self.collapse()
 
+    def set_freshness(self, recomputed):
+        """Marks whether the last analysis recomputed this point or reused the stored result."""
+        if recomputed:
+            self.freshness_lbl.setText("Recomputed")
+            self.freshness_lbl.setStyleSheet("color: #1d4ed8; font-size: 10px; font-weight: 600; margin-right: 8px;")
+            self.freshness_lbl.setToolTip("Inputs changed since the last analysis; this point was recalculated.")
+        else:
+            self.freshness_lbl.setText("Unchanged")
+            self.freshness_lbl.setStyleSheet("color: #94a3b8; font-size: 10px; font-weight: 600; margin-right: 8px;")
+            self.freshness_lbl.setToolTip("Inputs unchanged since the last analysis; the stored result was reused.")
+        self.freshness_lbl.setVisible(True)
+
     def set_status(self, status, value_text=None, details=None):
         """Update status and optionally details."""
         if status == 'pass':
@@ -1256,6 +1285,13 @@ class ComplianceDashboard(QScrollArea):
         else:
             print(f"[DEBUG UI] KEY MISMATCH for {issue_id}. Card not found. Available keys: {list(self.cards.keys())}")
             
+    def mark_recomputed(self, analyzed_ids, recomputed_ids):
+        """Shows per point whether the last (re-)analysis recomputed it or reused the stored result."""
+        recomputed_ids = set(recomputed_ids or [])
+        for issue_id in analyzed_ids:
+            if issue_id in self.cards:
+                self.cards[issue_id].set_freshness(issue_id in recomputed_ids)
+
     def reset_all(self):
         # [ROBUSTNESS] Guard against crashes if DB load failed
         if not hasattr(self, 'cards') or not self.cards:
@@ -1496,16 +1532,9 @@ class ScrutinyTab(QWidget):
         gstin_lbl = QLabel("Taxpayer (GSTIN):")
         gstin_lbl.setStyleSheet("font-weight: bold; color: #555;")
         card_layout.addWidget(gstin_lbl)
-        self.gstin_combo = QComboBox()
-        self.gstin_combo.setEditable(True)
+        self.gstin_combo = TaxpayerComboBox()
         self.gstin_combo.setPlaceholderText("Search GSTIN...")
         self.gstin_combo.setStyleSheet("padding: 8px; border: 1px solid #bdc3c7; border-radius: 4px;")
-        gstins = self.db.get_all_gstins()
-        self.gstin_combo.addItems(gstins)
-        completer = QCompleter(gstins)
-        completer.setCaseSensitivity(Qt.CaseSensitivity.CaseInsensitive)
-        completer.setFilterMode(Qt.MatchFlag.MatchContains)
-        self.gstin_combo.setCompleter(completer)
         self.gstin_combo.currentTextChanged.connect(self.on_gstin_changed)
         card_layout.addWidget(self.gstin_combo)
         self.details_frame = QFrame()
@@ -1957,6 +1986,16 @@ class ScrutinyTab(QWidget):
             g9_paths = {k: v for k, v in self.file_paths.items() if k.startswith("gstr9")}
             self.gstr9_group.set_state(g9_freq, g9_paths)
 
+        # E-Way Bill export
+        if hasattr(self, 'eway_group'):
+            ewb_paths = {k: v for k, v in self.file_paths.items() if k.startswith("eway_bill")}
+            self.eway_group.set_state("Yearly", ewb_paths)
+
+        # Purchase register
+        if hasattr(self, 'purchase_group'):
+            pr_paths = {k: v for k, v in self.file_paths.items() if k.startswith("purchase_register")}
+            self.purchase_group.set_state("Yearly", pr_paths)
+
     def _restore_identity_only(self, proc):
         """Restore basic case metadata (GSTIN, FY, Header Labels). PURE UI ONLY."""
         # FIX: Removed identity assignment. Identity is strictly bound in resume_case.
@@ -2288,6 +2327,14 @@ class ScrutinyTab(QWidget):
                 g9_paths = {k: v for k, v in persisted_paths.items() if k.startswith("gstr9")}
                 self.gstr9_group.set_state(g9_freq, g9_paths)
 
+                # E-Way Bill export
+                ewb_paths = {k: v for k, v in persisted_paths.items() if k.startswith("eway_bill")}
+                self.eway_group.set_state("Yearly", ewb_paths)
+
+                # Purchase register
+                pr_paths = {k: v for k, v in persisted_paths.items() if k.startswith("purchase_register")}
+                self.purchase_group.set_state("Yearly", pr_paths)
+
             try:
                 saved_issues_str = proc['selected_issues']
                 if saved_issues_str and saved_issues_str != '{}':
@@ -2489,6 +2536,24 @@ class ScrutinyTab(QWidget):
         )
         up_layout.addWidget(self.gstr9_group)
 
+        # E-Way Bill export (SOP Point 6); read in chunks, so CSV is accepted too
+        self.eway_group = DynamicUploadGroup(
+            "6. E-Way Bill Export (Optional)", "eway_bill",
+            ["Yearly"],
+            self.handle_file_upload, self.handle_file_delete,
+            file_filter="E-Way Bill Export (*.xlsx *.xls *.csv)"
+        )
+        up_layout.addWidget(self.eway_group)
+
+        # Purchase register, matched invoice-by-invoice against GSTR-2A (SOP Points 4, 7, 8)
+        self.purchase_group = DynamicUploadGroup(
+            "7. Purchase Register (Optional)", "purchase_register",
+            ["Yearly"],
+            self.handle_file_upload, self.handle_file_delete,
+            file_filter="Purchase Register (*.xlsx *.xls *.csv)"
+        )
+        up_layout.addWidget(self.purchase_group)
+
         up_layout.addStretch()
 
         upload_page.setWidget(up_content)
@@ -2761,6 +2826,10 @@ class ScrutinyTab(QWidget):
             self.gstr2a_group.set_file_path(key, file_path)
         elif key.startswith("gstr9"):
             self.gstr9_group.set_file_path(key, file_path)
+        elif key.startswith("eway_bill"):
+            self.eway_group.set_file_path(key, file_path)
+        elif key.startswith("purchase_register"):
+            self.purchase_group.set_file_path(key, file_path)
         
         # 6. Enable Analysis Button (Common Condition)
         # CHECK: Only enable analysis if primary files are present
@@ -2831,6 +2900,10 @@ class ScrutinyTab(QWidget):
             self.gstr2a_group.set_file_path(key, None)
         elif key.startswith("gstr9"):
             self.gstr9_group.set_file_path(key, None)
+        elif key.startswith("eway_bill"):
+            self.eway_group.set_file_path(key, None)
+        elif key.startswith("purchase_register"):
+            self.purchase_group.set_file_path(key, None)
 
     def analyze_file(self):
         """Analyze the Tax Liability file or GSTR 9 PDF"""
@@ -2897,8 +2970,10 @@ class ScrutinyTab(QWidget):
                 print(f"Error fetching DB schemas: {e}")
                 db_schemas = None
 
-            # Run All Analysis
-            results = self.parser.parse_file(main_file, self.file_paths, configs, gstr2a_analyzer=self.gstr2a_analyzer, db_schemas=db_schemas)
+            # Run All Analysis (points whose inputs are unchanged since the last run are reused)
+            prior_results = self.db.get_analysis_results(self.current_case_id) if self.current_case_id else None
+            results = self.parser.parse_file(main_file, self.file_paths, configs, gstr2a_analyzer=self.gstr2a_analyzer,
+                                             db_schemas=db_schemas, prior_results=prior_results)
             
             if "error" in results:
                 QMessageBox.critical(self, "Analysis Failed", results["error"])
@@ -2914,6 +2989,7 @@ class ScrutinyTab(QWidget):
                 
                 # PERSIST: Immediate State Consistency for Analysis Completion
                 self._persist_additional_details()
+                self.db.save_analysis_results(self.current_case_id, results.get("analysis_steps", {}))
                 
                 # STATE TRANSITION 
                 # [FIX - PHASE 22] Auto-Recovery for blanched INIT state
@@ -2951,6 +3027,11 @@ class ScrutinyTab(QWidget):
 
             # 3. RENDER (Strictly after state set)
             self.populate_results_view(issues)
+            if prior_results and hasattr(self, 'compliance_dashboard'):
+                self.compliance_dashboard.mark_recomputed(
+                    [i.get('issue_id') for i in issues if isinstance(i, dict)],
+                    results.get("recomputed", [])
+                )
             
             # VERIFICATION ASSERTION
             if hasattr(self, 'compliance_dashboard'):
@@ -2970,7 +3051,11 @@ class ScrutinyTab(QWidget):
             self.finalize_btn.setEnabled(True) # Unlock Finalization only now
             
             analyzed_count = results.get("summary", {}).get("analyzed_count", 0) # Ensure analyzed_count is defined
-            QMessageBox.information(self, "Analysis Complete", f"Analysis Complete. Analyzed {analyzed_count} SOP points.")
+            msg = f"Analysis Complete. Analyzed {analyzed_count} SOP points."
+            if prior_results:
+                recomputed = set(results.get("recomputed", []))
+                msg += f"\n{len(recomputed)} point(s) recomputed from changed inputs; the rest were unchanged."
+            QMessageBox.information(self, "Analysis Complete", msg)
             
         except Exception as e:
             self.analyze_btn.setText("Analyze SOP Points")
@@ -3004,7 +3089,7 @@ class ScrutinyTab(QWidget):
 
     def on_gstin_changed(self, text):
         if len(text) == 15:
-            taxpayer = self.db.get_taxpayer(text)
+            taxpayer = taxpayer_index.lookup(text)
             if taxpayer:
                 self.tp_name_lbl.setText(f"Legal Name: {taxpayer.get('Legal Name', 'Unknown')}")
                 self.tp_trade_lbl.setText(f"Trade Name: {taxpayer.get('Trade Name', '')}")
@@ -3061,10 +3146,13 @@ class ScrutinyTab(QWidget):
             if hasattr(self, 'gstr2b_group'): self.gstr2b_group.set_state("Yearly", {})
             if hasattr(self, 'gstr2a_group'): self.gstr2a_group.set_state("Yearly", {})
             if hasattr(self, 'gstr9_group'): self.gstr9_group.set_state("Yearly", {})
+            if hasattr(self, 'eway_group'): self.eway_group.set_state("Yearly", {})
+            if hasattr(self, 'purchase_group'): self.purchase_group.set_state("Yearly", {})
             
             # Reset Case Info
             self.case_info_lbl.setText("No Case Selected")
             self.gstin_combo.setCurrentIndex(-1)
+            self.gstin_combo.clearEditText()
             self.details_frame.setVisible(False)
             
             if hasattr(self, 'recent_container'):
@@ -3642,9 +3730,7 @@ class ScrutinyTab(QWidget):
         else:
             path, _ = QFileDialog.getSaveFileName(self, "Save ASMT-10 Word", f"ASMT10_{proc['gstin']}.doc", "Word Files (*.doc)")
             if path:
-                success, msg = ASMT10Generator.save_docx(html, path)
-                if success: QMessageBox.information(self, "Success", "Word document (HTML-based) saved successfully.")
-                else: QMessageBox.critical(self, "Error", msg)
+                ExportJobManager.instance().submit_file("ASMT-10 Word", lambda out: _save_asmt10_word(html, out), path)
 
     def on_pdf_finished(self, path, success):
         """Callback for PDF printing"""
@@ -3891,9 +3977,10 @@ class ScrutinyTab(QWidget):
         # Write strictly to DRC-01A stage
         self.db.save_case_issues(self.current_case_id, structured_issues, stage='DRC-01A')
         
-        # Prepare Data for Transaction
+        # Prepare Data for Transaction. A number still as suggested is only a
+        # preview: leave it blank so the register allocates it in the transaction.
         oc_data = {
-            'OC_Number': oc_num,
+            'OC_Number': "" if oc_num == self.oc_num_input.property("suggested_oc") else oc_num,
             'OC_Date': issue_date,
             'OC_Content': f"ASMT-10 Issued for GSTIN {gstin}. Discrepancies noted in returns.",
             'OC_To': legal_name
@@ -3940,6 +4027,7 @@ class ScrutinyTab(QWidget):
             
             formatted_oc = f"{next_num}/{current_year}"
             input_field.setText(formatted_oc)
+            input_field.setProperty("suggested_oc", formatted_oc)
             
         except Exception as e:
             print(f"Error suggesting OC: {e}")
@@ -1,12 +1,14 @@
 from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
                              QComboBox, QTextBrowser, QFileDialog, QMessageBox, QTabWidget, QLineEdit,
                              QProgressBar, QFrame, QListWidget, QListWidgetItem, QSplitter, QApplication,
-                             QSlider, QFormLayout, QTableWidget, QTableWidgetItem, QHeaderView, QAbstractItemView)
+                             QSlider, QFormLayout, QTableWidget, QTableWidgetItem, QTableView, QHeaderView, QAbstractItemView)
 from PyQt6.QtWebEngineWidgets import QWebEngineView
 from PyQt6.QtCore import Qt, QSize, QUrl
 from PyQt6.QtGui import QColor
 from src.utils.config_manager import ConfigManager
 from src.database.db_manager import DatabaseManager
+from src.services import taxpayer_index
+from src.ui.components.paged_table_model import PagedTableModel
 import os
 import shutil
 import base64
@@ -681,24 +683,37 @@ class SettingsTab(QWidget):
         lbl_table.setStyleSheet("font-size: 14px; font-weight: bold; color: #7f8c8d; margin-bottom: 5px;")
         bottom_layout.addWidget(lbl_table)
         
-        self.taxpayer_table = QTableWidget()
+        # Paged model: rows are fetched from the indexed taxpayer mirror as the view scrolls
+        self.taxpayer_model = PagedTableModel(self.db, 'taxpayers', [
+            ("GSTIN", "GSTIN"), ("Trade Name", "Trade Name"), ("Legal Name", "Legal Name"),
+            ("Status", "Status"), ("Address", "Address"), ("Constitution", "Constitution"),
+        ])
+        status_colors = {
+            'Active': QColor('#d4edda'),
+            'Suspended': QColor('#fff3cd'),
+            'Cancelled': QColor('#f8d7da')
+        }
+        self.taxpayer_model.background_fn = lambda key, tp: status_colors.get(tp.get('Status')) if key == "Status" else None
+
+        self.taxpayer_table = QTableView()
+        self.taxpayer_table.setModel(self.taxpayer_model)
         self.taxpayer_table.setAlternatingRowColors(True)
         self.taxpayer_table.setShowGrid(False)
         self.taxpayer_table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
         self.taxpayer_table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
         self.taxpayer_table.verticalHeader().setVisible(False)
         self.taxpayer_table.setStyleSheet("""
-            QTableWidget { border: 1px solid #e0e0e0; border-radius: 4px; background-color: white; }
+            QTableView { border: 1px solid #e0e0e0; border-radius: 4px; background-color: white; }
             QHeaderView::section { background-color: #f1f5f9; padding: 6px; border: none; font-weight: bold; color: #555; }
-            QTableWidget::item { padding: 4px; }
-            QTableWidget::item:selected { background-color: #e3f2fd; color: black; }
+            QTableView::item { padding: 4px; }
+            QTableView::item:selected { background-color: #e3f2fd; color: black; }
         """)
         
-        columns = ["GSTIN", "Trade Name", "Legal Name", "Status", "Address", "Constitution"]
-        self.taxpayer_table.setColumnCount(len(columns))
-        self.taxpayer_table.setHorizontalHeaderLabels(columns)
         self.taxpayer_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
-        self.taxpayer_table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.ResizeToContents) # GSTIN
+        self.taxpayer_table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.Interactive) # GSTIN
+        self.taxpayer_table.setColumnWidth(0, 150)
+        self.taxpayer_table.horizontalHeader().setSortIndicator(-1, Qt.SortOrder.AscendingOrder)
+        self.taxpayer_table.setSortingEnabled(True)
         
         bottom_layout.addWidget(self.taxpayer_table)
         
@@ -711,38 +726,7 @@ class SettingsTab(QWidget):
 
     def refresh_taxpayer_table(self):
         """Reload taxpayer data into the table"""
-        taxpayers = self.db.get_all_taxpayers()
-        self.taxpayer_table.setRowCount(0)
-        
-        # Status Colors
-        status_colors = {
-            'Active': '#d4edda',
-            'Suspended': '#fff3cd',
-            'Cancelled': '#f8d7da'
-        }
-        
-        for row_idx, tp in enumerate(taxpayers):
-            self.taxpayer_table.insertRow(row_idx)
-            
-            # Helper to create item
-            def create_item(text):
-                item = QTableWidgetItem(str(text))
-                return item
-                
-            self.taxpayer_table.setItem(row_idx, 0, create_item(tp.get('GSTIN', '')))
-            self.taxpayer_table.setItem(row_idx, 1, create_item(tp.get('Trade Name', '')))
-            self.taxpayer_table.setItem(row_idx, 2, create_item(tp.get('Legal Name', '')))
-            
-            # Status badge-like item
-            status = tp.get('Status', '')
-            status_item = create_item(status)
-            if status in status_colors:
-                status_item.setBackground(QColor(status_colors[status])) # Need QColor import?
-                # Actually, simple background is easier with setBackground or just let it be text for now
-            self.taxpayer_table.setItem(row_idx, 3, status_item)
-            
-            self.taxpayer_table.setItem(row_idx, 4, create_item(tp.get('Address', '')))
-            self.taxpayer_table.setItem(row_idx, 5, create_item(tp.get('Constitution', '')))
+        self.taxpayer_model.reload()
 
     # Removed browse_file as it is handled by FileUploaderWidget now (or used by other tabs? No, only Data Tab uses it)
     
@@ -761,6 +745,7 @@ class SettingsTab(QWidget):
             if success:
                 QMessageBox.information(self, "Success", msg)
                 self.import_status.setText("Database cleared.")
+                taxpayer_index.refresh()
                 self.refresh_taxpayer_table() # REFRESH TABLE
             else:
                 QMessageBox.critical(self, "Error", msg)
@@ -812,6 +797,7 @@ class SettingsTab(QWidget):
                 self.suspended_file_input.clear()
                 self.cancelled_file_input.clear()
                 
+                taxpayer_index.refresh()
                 self.refresh_taxpayer_table() # REFRESH TABLE
             else:
                 self.import_status.setText("Import Failed.")
@@ -1,6 +1,9 @@
-from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QLabel, QPushButton, 
-                             QFileDialog, QMessageBox, QTableWidget, QTableWidgetItem, QHeaderView)
+from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QLabel, QPushButton, QLineEdit,
+                             QFileDialog, QMessageBox, QTableView, QHeaderView, QAbstractItemView)
+from PyQt6.QtCore import Qt
 from src.database.db_manager import DatabaseManager
+from src.services import taxpayer_index
+from src.ui.components.paged_table_model import PagedTableModel
 
 class TaxpayersTab(QWidget):
     def __init__(self, home_callback):
@@ -25,57 +28,40 @@ class TaxpayersTab(QWidget):
         btn_layout.addWidget(import_btn)
         layout.addLayout(btn_layout)
 
-        # Search
-        # (Can add search bar here later)
+        # Search (runs in SQL against the indexed taxpayer mirror)
+        self.search_input = QLineEdit()
+        self.search_input.setPlaceholderText("Search by GSTIN, Legal Name or Trade Name...")
+        self.search_input.textChanged.connect(lambda text: self.model.set_search(text))
+        layout.addWidget(self.search_input)
 
-        # Table Preview (Show first 50 or search results)
-        self.table = QTableWidget()
-        self.table.setColumnCount(8)
-        self.table.setHorizontalHeaderLabels(["GSTIN", "Legal Name", "Trade Name", "Address", "State", "Email", "Mobile", "Constitution"])
-        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.ResizeToContents)
+        # Table (rows are fetched page by page as the view scrolls)
+        self.model = PagedTableModel(self.db, 'taxpayers', [
+            ("GSTIN", "GSTIN"), ("Legal Name", "Legal Name"), ("Trade Name", "Trade Name"),
+            ("Address", "Address"), ("State", "State"), ("Email", "Email"),
+            ("Mobile", "Mobile"), ("Constitution", "Constitution"),
+        ])
+        self.table = QTableView()
+        self.table.setModel(self.model)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        # ResizeToContents would measure every row; size columns interactively instead
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Interactive)
+        self.table.horizontalHeader().setStretchLastSection(True)
+        self.table.horizontalHeader().setSortIndicator(-1, Qt.SortOrder.AscendingOrder)
+        self.table.setSortingEnabled(True)
         layout.addWidget(self.table)
         
         self.load_data()
 
     def load_data(self):
-        self.table.setRowCount(0)
-        try:
-            # Load all data
-            # Note: In a real app with large data, we should paginate or limit this.
-            # For now, we load all as requested.
-            import pandas as pd
-            from src.utils.constants import TAXPAYERS_FILE
-            import os
-            
-            if not os.path.exists(TAXPAYERS_FILE):
-                return
-
-            df = pd.read_csv(TAXPAYERS_FILE)
-            # Ensure new columns exist in display even if not in file yet
-            for col in ["Email", "Mobile", "Constitution"]:
-                if col not in df.columns:
-                    df[col] = ""
-                    
-            df = df.fillna("")
-            
-            self.table.setRowCount(len(df))
-            for row, record in df.iterrows():
-                self.table.setItem(row, 0, QTableWidgetItem(str(record['GSTIN'])))
-                self.table.setItem(row, 1, QTableWidgetItem(str(record['Legal Name'])))
-                self.table.setItem(row, 2, QTableWidgetItem(str(record['Trade Name'])))
-                self.table.setItem(row, 3, QTableWidgetItem(str(record['Address'])))
-                self.table.setItem(row, 4, QTableWidgetItem(str(record['State'])))
-                self.table.setItem(row, 5, QTableWidgetItem(str(record.get('Email', ''))))
-                self.table.setItem(row, 6, QTableWidgetItem(str(record.get('Mobile', ''))))
-                self.table.setItem(row, 7, QTableWidgetItem(str(record.get('Constitution', ''))))
-        except Exception as e:
-            print(f"Error loading data: {e}")
+        self.model.reload()
 
     def import_data(self):
         fname, _ = QFileDialog.getOpenFileName(self, "Open File", "", "CSV Files (*.csv);;Excel Files (*.xlsx *.xls)")
         if fname:
             success, msg = self.db.import_taxpayers(fname)
             if success:
+                taxpayer_index.refresh()
                 QMessageBox.information(self, "Success", msg)
                 self.load_data()
             else:
@@ -4,7 +4,7 @@ from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushBut
 from PyQt6.QtCore import Qt
 from PyQt6.QtGui import QPixmap
 from src.database.db_manager import DatabaseManager
-from src.utils.preview_generator import PreviewGenerator
+from src.ui.components.paged_preview import PagedPreview
 from src.ui.styles import Theme
 from src.utils.config_manager import ConfigManager
 import os
@@ -135,21 +135,10 @@ class TemplateManagement(QWidget):
         
         layout.addLayout(header_layout)
         
-        # Preview Area
-        self.preview_scroll = QScrollArea()
-        self.preview_scroll.setWidgetResizable(True)
+        # Preview Area (pages are rendered on demand as they scroll into view)
+        self.preview_scroll = PagedPreview()
         self.preview_scroll.setStyleSheet("background-color: #525659; border: 1px solid #ccc;")
         
-        # Container for pages
-        self.preview_container = QWidget()
-        self.preview_container.setStyleSheet("background-color: #525659;")
-        self.preview_layout = QVBoxLayout(self.preview_container)
-        self.preview_layout.setAlignment(Qt.AlignmentFlag.AlignHCenter | Qt.AlignmentFlag.AlignTop)
-        self.preview_layout.setSpacing(20)
-        self.preview_layout.setContentsMargins(20, 20, 20, 20)
-        
-        self.preview_scroll.setWidget(self.preview_container)
-        
         layout.addWidget(self.preview_scroll)
         
     def setup_edit_mode(self):
@@ -228,10 +217,7 @@ class TemplateManagement(QWidget):
     def generate_preview(self, html_content):
         if not html_content:
             # Clear preview
-            while self.preview_layout.count():
-                child = self.preview_layout.takeAt(0)
-                if child.widget():
-                    child.widget().deleteLater()
+            self.preview_scroll.clear_preview()
             return
             
         # --- Letterhead Injection ---
@@ -258,36 +244,7 @@ class TemplateManagement(QWidget):
             print(f"Letterhead Injection Error: {e}")
 
         # --- Generate Preview ---
-        # Pass all_pages=True to get list of images
-        img_bytes_list = PreviewGenerator.generate_preview_image(html_content, all_pages=True)
-        
-        # Clear existing preview
-        while self.preview_layout.count():
-            child = self.preview_layout.takeAt(0)
-            if child.widget():
-                child.widget().deleteLater()
-                
-        if img_bytes_list:
-            for img_bytes in img_bytes_list:
-                pixmap = PreviewGenerator.get_qpixmap_from_bytes(img_bytes)
-                if pixmap:
-                    label = QLabel()
-                    label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-                    label.setStyleSheet("background-color: white; margin-bottom: 20px; border: 1px solid #ddd;")
-                    
-                    # Scale to fit width
-                    width = self.preview_scroll.width() - 60 # Margin for scrollbar and padding
-                    if width > 0:
-                        scaled_pixmap = pixmap.scaledToWidth(width, Qt.TransformationMode.SmoothTransformation)
-                        label.setPixmap(scaled_pixmap)
-                    else:
-                        label.setPixmap(pixmap)
-                        
-                    self.preview_layout.addWidget(label)
-        else:
-            error_label = QLabel("Preview Generation Failed")
-            error_label.setStyleSheet("color: white; font-size: 16px;")
-            self.preview_layout.addWidget(error_label)
+        self.preview_scroll.render_html(html_content)
 
     def switch_to_edit_mode(self):
         self.main_stack.setCurrentIndex(1)
@@ -358,9 +315,6 @@ class TemplateManagement(QWidget):
             self.current_template_id = None
             self.view_title.setText("Select a template")
             # Clear preview
-            while self.preview_layout.count():
-                child = self.preview_layout.takeAt(0)
-                if child.widget():
-                    child.widget().deleteLater()
+            self.preview_scroll.clear_preview()
             self.edit_btn.setEnabled(False)
             self.main_stack.setCurrentIndex(0)
@@ -0,0 +1,152 @@
+"""
+Shared runtime for the legacy calc_logic of issue templates.
+
+A template's calc_logic is Python source defining compute(v) -> dict. It is
+compiled once per distinct source (keyed by its sha256) and the resulting
+function is reused by every card built from that template, every time the
+proceeding is reopened in this process, and by the Logic Lab.
+
+Before compiling, the source is checked (check_source) and rejected if it
+names a dunder or reaches for a private or introspection attribute
+(v.__class__, gen.gi_frame, ...), which is how code escapes a namespace.
+It then runs with a whitelist of builtins, and only the modules in
+ALLOWED_MODULES can be imported - as copies holding their public,
+non-module attributes. Templates are written by the office, so this
+guards against mistakes and casual misuse rather than a determined
+attacker.
+
+    compute = get_compute(source)          # compiled on first use
+    results = run(source, variables)       # compute(variables)
+    outcomes = run_many([(source, v), ...]) # one call for a whole proceeding
+"""
+import ast
+import builtins
+import hashlib
+import threading
+import types
+
+ALLOWED_MODULES = ("math", "decimal", "datetime")
+
+_SAFE_BUILTINS = {
+    name: getattr(builtins, name) for name in (
+        "abs", "all", "any", "bool", "dict", "divmod", "enumerate", "filter", "float", "int",
+        "isinstance", "len", "list", "map", "max", "min", "pow", "range", "round", "set",
+        "sorted", "str", "sum", "tuple", "zip", "Exception", "KeyError", "TypeError",
+        "ValueError", "ZeroDivisionError",
+    )
+}
+
+
+# Frame, code and generator internals reachable without a dunder
+_UNSAFE_ATTRS = frozenset({
+    "gi_frame", "gi_code", "gi_yieldfrom", "cr_frame", "cr_code", "cr_await", "ag_frame", "ag_code",
+    "f_back", "f_builtins", "f_globals", "f_locals", "f_code", "tb_frame", "tb_next", "mro",
+})
+
+# module name -> public copy handed to calc_logic
+_modules = {}
+
+
+def _public_module(name):
+    module = _modules.get(name)
+    if module is None:
+        real = __import__(name)
+        module = types.ModuleType(name)
+        module.__dict__.update({k: v for k, v in vars(real).items()
+                                if not k.startswith("_") and not isinstance(v, types.ModuleType)})
+        module = _modules.setdefault(name, module)
+    return module
+
+
+def _import(name, globals=None, locals=None, fromlist=(), level=0):
+    if level or name not in ALLOWED_MODULES:
+        raise ImportError(f"import of '{name}' is not allowed in calc_logic")
+    return _public_module(name)
+
+
+_SAFE_BUILTINS["__import__"] = _import
+
+
+class CalcLogicError(Exception):
+    """calc_logic that does not compile or does not define compute(v)."""
+
+
+# sha256(source) -> compute function, or the CalcLogicError it failed with
+_compiled = {}
+_lock = threading.Lock()
+
+
+def source_key(source):
+    return hashlib.sha256(source.encode("utf-8")).hexdigest()
+
+
+def check_source(tree):
+    """Raises CalcLogicError if the parsed source uses a dunder or an unsafe attribute."""
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Attribute):
+            if node.attr.startswith("_") or node.attr in _UNSAFE_ATTRS:
+                raise CalcLogicError(f"line {node.lineno}: attribute '{node.attr}' is not allowed in calc_logic")
+        elif isinstance(node, ast.Name):
+            if node.id.startswith("__"):
+                raise CalcLogicError(f"line {node.lineno}: name '{node.id}' is not allowed in calc_logic")
+        elif isinstance(node, ast.alias):
+            if node.name.startswith("_"):
+                raise CalcLogicError(f"import of '{node.name}' is not allowed in calc_logic")
+
+
+def _compile(source):
+    namespace = {"__builtins__": _SAFE_BUILTINS, "__name__": "calc_logic"}
+    try:
+        tree = ast.parse(source, "<calc_logic>")
+        check_source(tree)
+        exec(compile(tree, "<calc_logic>", "exec"), namespace)
+    except CalcLogicError as e:
+        return e
+    except Exception as e:
+        return CalcLogicError(f"{type(e).__name__}: {e}")
+    compute = namespace.get("compute")
+    if not callable(compute):
+        return CalcLogicError("Code must define a 'compute(v)' function.")
+    return compute
+
+
+def get_compute(source):
+    """The compiled compute function for source; raises CalcLogicError."""
+    key = source_key(source)
+    with _lock:
+        compute = _compiled.get(key)
+    if compute is None:
+        compute = _compile(source)
+        with _lock:
+            compute = _compiled.setdefault(key, compute)
+    if isinstance(compute, CalcLogicError):
+        raise compute
+    return compute
+
+
+def run(source, variables):
+    """compute(variables) for source; the result must be a dict."""
+    result = get_compute(source)(variables)
+    if not isinstance(result, dict):
+        raise CalcLogicError(f"Function returned {type(result)}, expected dict.")
+    return result
+
+
+def run_many(jobs):
+    """
+    Evaluates [(source, variables), ...] in one call, compiling each distinct
+    source at most once. Returns a list, in order, of result dicts or the
+    exception that job raised - one failing issue does not stop the rest.
+    """
+    outcomes = []
+    for source, variables in jobs:
+        try:
+            outcomes.append(run(source, variables))
+        except Exception as e:
+            outcomes.append(e)
+    return outcomes
+
+
+def clear_cache():
+    with _lock:
+        _compiled.clear()
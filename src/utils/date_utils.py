@@ -65,6 +65,16 @@ def get_fy_end_year(fy_str):
     start_year = int(p1)
     return start_year + 1
 
+def fy_months(fy_str):
+    """
+    The 'YYYY-MM' months of an FY, April to March.
+    Example: '2023-24' -> ['2023-04', ..., '2024-03']. Empty list if invalid.
+    """
+    end_year = get_fy_end_year(fy_str)
+    if not end_year:
+        return []
+    return [f"{end_year - 1 if m >= 4 else end_year}-{m:02d}" for m in list(range(4, 13)) + [1, 2, 3]]
+
 def validate_gstin_format(gstin):
     """
     Strict regex validation for Indian 15-digit GSTIN.
@@ -87,3 +97,29 @@ def validate_fy_sanity(fy_str):
         return False
     start_year = int(norm.split('-')[0])
     return 2017 <= start_year <= datetime.now().year + 1
+
+def return_period_to_month(period_str):
+    """
+    Maps a return period to its 'YYYY-MM' calendar month.
+    Handles: 'April 2023-24' (month + FY), 'March-2024', 'Mar 2024'.
+    Returns None for yearly or unrecognised periods.
+    """
+    if not period_str:
+        return None
+    match = re.match(r'^\s*([A-Za-z]+)[\s\-]*(.*)$', str(period_str))
+    if not match:
+        return None
+    try:
+        month = datetime.strptime(match.group(1)[:3].title(), "%b").month
+    except ValueError:
+        return None
+    rest = re.sub(r'\s+', '', match.group(2))
+    if re.match(r'^\d{4}$', rest):
+        return f"{rest}-{month:02d}"
+    fy = normalize_financial_year(rest)
+    if not fy:
+        return None
+    start_year = int(fy.split('-')[0])
+    # FY runs April-March: Jan-Mar fall in the end year
+    year = start_year + 1 if month <= 3 else start_year
+    return f"{year}-{month:02d}"
@@ -1,6 +1,8 @@
 import sqlite3
 import json
 
+from src.database.blob_store import get_text
+
 import os
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 db_path = os.path.join(BASE_DIR, 'src', 'database', 'gst_scrutiny.db')
@@ -20,7 +22,7 @@ for pid, sid in procs:
     # SCN Issues
     c.execute("SELECT issue_id, data_json FROM case_issues WHERE proceeding_id=? AND stage='SCN'", (pid,))
     scn_issues = c.fetchall()
-    asmt_derived = [i for i in scn_issues if json.loads(i[1]).get('origin') == 'ASMT10']
+    asmt_derived = [i for i in scn_issues if json.loads(get_text(c, i[1])).get('origin') == 'ASMT10']
     print(f"  SCN Hydrated ASMT-Derived Issues (Count: {len(asmt_derived)}): {asmt_derived}")
 
 print("\n--- AUDIT: ZERO-ISSUE ENFORCEMENT ---")
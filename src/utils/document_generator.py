@@ -10,6 +10,7 @@ from docx.enum.text import WD_ALIGN_PARAGRAPH
 # from xhtml2pdf import pisa
 # from docx2pdf import convert
 from src.utils.constants import OUTPUT_DIR
+from src.utils import docx_skeleton
 
 class DocumentGenerator:
     def __init__(self):
@@ -139,21 +140,59 @@ class DocumentGenerator:
             if not os.path.exists(docx_letterhead_path):
                 raise FileNotFoundError(f"Letterhead template not found: {docx_letterhead_path}")
             
-            # Load the letterhead template
-            doc = Document(docx_letterhead_path)
-            
-            # Add form content
-            self._add_content_to_docx(doc, data)
-            
-            # Save
             filepath = os.path.join(OUTPUT_DIR, filename + ".docx")
-            doc.save(filepath)
-            
+            try:
+                # Letterhead parsed once; content spliced in as prebuilt XML
+                skeleton = docx_skeleton.load(docx_letterhead_path)
+            except docx_skeleton.DocxSkeletonError:
+                doc = Document(docx_letterhead_path)
+                self._add_content_to_docx(doc, data)
+                doc.save(filepath)
+                return filepath
+
+            skeleton.save(filepath, self._content_fragments(data, skeleton))
             return filepath
             
         except Exception as e:
             raise Exception(f"Failed to generate Word document from DOCX: {str(e)}")
     
+    def _content_fragments(self, data, skeleton):
+        """The same content as _add_content_to_docx, as WordprocessingML for a DocxSkeleton"""
+        body = {'font': 'Bookman Old Style', 'size': 11}
+        fragments = [docx_skeleton.page_break()]
+
+        heading = f"NOTICE: {data.get('form_type', 'NOTICE')}"
+        if skeleton.has_style('Heading1'):
+            fragments.append(docx_skeleton.paragraph(heading, align='center', style='Heading1'))
+        else:
+            fragments.append(docx_skeleton.paragraph(
+                docx_skeleton.run(heading, bold=True, size=14, font=body['font']), align='center'))
+
+        for line in [
+            f"Date: {data.get('date', '')}",
+            f"GSTIN: {data.get('gstin', '')}",
+            f"Legal Name: {data.get('legal_name', '')}",
+            f"Address: {data.get('address', '')}",
+            f"Subject: Notice under {data.get('proceeding_type', '')}",
+            data.get('facts', ''),
+        ]:
+            fragments.append(docx_skeleton.paragraph(docx_skeleton.run(line, **body), align='justify'))
+
+        if 'tax_data' in data and data['tax_data']:
+            rows = [["Act", "From", "To", "Tax", "Interest", "Penalty", "Total"]]
+            for row_data in data['tax_data']:
+                rows.append([
+                    str(row_data.get('Act', '')),
+                    str(row_data.get('From', '')),
+                    str(row_data.get('To', '')),
+                    str(row_data.get('Tax', 0)),
+                    str(row_data.get('Interest', 0)),
+                    str(row_data.get('Penalty', 0)),
+                    str(row_data.get('Total', 0))
+                ])
+            fragments.append(docx_skeleton.table(rows, font=body['font'], size=10))
+        return fragments
+
     def _add_content_to_docx(self, doc, data, skip_page_break=False):
         """Add form content to a DOCX document"""
         # Add a page break to separate letterhead from content (unless skipped for PNG)
@@ -0,0 +1,246 @@
+"""
+Pre-parsed .docx packages for fast Word export.
+
+python-docx re-reads and re-parses the whole package (styles, numbering,
+media, the letterhead body) for every Document() it opens, then builds the
+content one lxml element at a time. A DocxSkeleton reads a package once -
+the letterhead, or python-docx's blank default template - and keeps its
+parts as bytes, with word/document.xml split around the point where body
+content goes (just before the final section properties). Writing a
+document is then string concatenation:
+
+    skeleton = docx_skeleton.load(letterhead_path)   # parsed once per file version
+    skeleton.save(path, [
+        docx_skeleton.paragraph(docx_skeleton.run("SHOW CAUSE NOTICE", bold=True, size=16), align="center"),
+        docx_skeleton.table([["Act", "Tax"], ["CGST", "1,000"]]),
+    ], margins={"top": 0.8, "bottom": 0.8})
+
+The fragment helpers below return WordprocessingML strings (Fragment, a
+str subclass, so that plain text passed alongside them is always escaped)
+with all formatting inline, so they do not depend on which styles the letterhead
+defines. Unchanged parts are written back to the zip as-is.
+"""
+import io
+import os
+import re
+import threading
+import zipfile
+from xml.sax.saxutils import escape
+
+_TWIPS_PER_INCH = 1440
+# Text width used to split table columns evenly (A4 / Letter with 1" margins)
+TEXT_WIDTH_TWIPS = 9360
+
+_ALIGN = {"left": "left", "center": "center", "right": "right", "justify": "both"}
+# Characters XML 1.0 cannot carry (python-docx refuses them outright)
+_INVALID_XML_RE = re.compile("[\x00-\x08\x0b\x0c\x0e-\x1f]")
+_OFFICE_DOC_RE = re.compile(
+    r'<Relationship\b[^>]*Type="[^"]*/officeDocument"[^>]*Target="/?([^"]+)"'
+    r'|<Relationship\b[^>]*Target="/?([^"]+)"[^>]*Type="[^"]*/officeDocument"'
+)
+_STYLE_ID_RE = re.compile(r'<w:style\b[^>]*w:styleId="([^"]+)"')
+_PG_MAR_RE = re.compile(r"<w:pgMar\b[^>]*/>")
+# Opening, closing and self-closing <w:sectPr> tags (not w:sectPrChange)
+_SECT_TAG_RE = re.compile(r"<(/?)w:sectPr(?=[\s/>])[^>]*?(/?)>")
+_STORED_EXTS = (".png", ".jpeg", ".jpg", ".gif", ".emf", ".wmf")
+
+
+class DocxSkeletonError(Exception):
+    """A package this module cannot split (no WordprocessingML body)."""
+
+
+class DocxSkeleton:
+
+    def __init__(self, data):
+        with zipfile.ZipFile(data) as z:
+            self._members = [(info, z.read(info.filename)) for info in z.infolist()]
+        parts = {info.filename: content for info, content in self._members}
+
+        rels = parts.get("_rels/.rels", b"").decode("utf-8", "replace")
+        match = _OFFICE_DOC_RE.search(rels)
+        self.document_part = (match.group(1) or match.group(2)) if match else "word/document.xml"
+        if self.document_part not in parts:
+            raise DocxSkeletonError(f"{self.document_part} missing from package")
+
+        document = parts[self.document_part].decode("utf-8")
+        body_end = document.rfind("</w:body>")
+        if body_end < 0:
+            raise DocxSkeletonError("document has no <w:body>")
+        # Content goes before the body-level sectPr, which is the body's last child
+        split = _final_sect_start(document, body_end)
+        if split is None:
+            split = body_end
+        self._head = document[:split]
+        self._tail = document[split:]
+
+        styles = parts.get("word/styles.xml", b"").decode("utf-8", "replace")
+        self.style_ids = frozenset(_STYLE_ID_RE.findall(styles))
+
+    def has_style(self, style_id):
+        return style_id in self.style_ids
+
+    def document_xml(self, fragments, margins=None):
+        tail = self._tail
+        if margins:
+            tail = _PG_MAR_RE.sub(lambda m: _set_margins(m.group(0), margins), tail, count=1)
+        return "".join([self._head, *fragments, tail]).encode("utf-8")
+
+    def save(self, path, fragments, margins=None):
+        """
+        Writes the package with fragments appended to the body.
+        margins: {"top"/"bottom"/"left"/"right": inches} for the last section.
+        """
+        document = self.document_xml(fragments, margins)
+        with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as out:
+            for info, content in self._members:
+                target = zipfile.ZipInfo(info.filename, date_time=info.date_time)
+                target.external_attr = info.external_attr
+                target.compress_type = (zipfile.ZIP_STORED if info.filename.lower().endswith(_STORED_EXTS)
+                                        else zipfile.ZIP_DEFLATED)
+                out.writestr(target, document if info.filename == self.document_part else content)
+        return path
+
+
+def _final_sect_start(document, body_end):
+    """Where the sectPr closing the body starts, or None if the body does not end with one."""
+    content_end = len(document[:body_end].rstrip())
+    depth, start = 0, None
+    for m in _SECT_TAG_RE.finditer(document, 0, body_end):
+        closing, self_closing = m.group(1), m.group(2)
+        if closing:
+            depth -= 1
+        elif not self_closing:
+            depth += 1
+            if depth == 1:
+                start = m.start()
+            continue
+        else:
+            if depth == 0:
+                start = m.start()
+        if depth == 0 and m.end() == content_end:
+            return start
+    return None
+
+
+def _set_margins(pg_mar, margins):
+    for side, inches in margins.items():
+        value = str(int(round(inches * _TWIPS_PER_INCH)))
+        attr = f'w:{side}="'
+        if attr in pg_mar:
+            pg_mar = re.sub(rf'w:{side}="[^"]*"', f'w:{side}="{value}"', pg_mar)
+        else:
+            pg_mar = pg_mar.replace("/>", f' w:{side}="{value}"/>')
+    return pg_mar
+
+
+# (abspath, mtime, size) -> DocxSkeleton
+_skeletons = {}
+_lock = threading.Lock()
+
+
+def load(path):
+    """The skeleton for a .docx, parsed on first use and again only when the file changes."""
+    st = os.stat(path)
+    key = (os.path.abspath(path), st.st_mtime_ns, st.st_size)
+    with _lock:
+        skeleton = _skeletons.get(key)
+    if skeleton is None:
+        with open(path, "rb") as f:
+            skeleton = DocxSkeleton(io.BytesIO(f.read()))
+        with _lock:
+            for stale in [k for k in _skeletons if k[0] == key[0]]:
+                del _skeletons[stale]
+            skeleton = _skeletons.setdefault(key, skeleton)
+    return skeleton
+
+
+def blank():
+    """Skeleton of python-docx's default template (what Document() starts from)."""
+    import docx
+    return load(os.path.join(os.path.dirname(docx.__file__), "templates", "default.docx"))
+
+
+def clear_cache():
+    with _lock:
+        _skeletons.clear()
+
+
+# ---- WordprocessingML fragments ----
+
+class Fragment(str):
+    """WordprocessingML produced by the helpers below; any other string is text."""
+
+
+def _text(text):
+    return escape(_INVALID_XML_RE.sub("", str(text)))
+
+
+def _attr(value):
+    return escape(_INVALID_XML_RE.sub("", str(value)), {'"': "&quot;"})
+
+
+def run(text, bold=False, size=None, font=None):
+    """A run; size in points. Newlines become line breaks."""
+    props = []
+    if font:
+        f = _attr(font)
+        props.append(f'<w:rFonts w:ascii="{f}" w:hAnsi="{f}" w:cs="{f}"/>')
+    if bold:
+        props.append("<w:b/><w:bCs/>")
+    if size:
+        half_points = int(round(size * 2))
+        props.append(f'<w:sz w:val="{half_points}"/><w:szCs w:val="{half_points}"/>')
+    rpr = f"<w:rPr>{''.join(props)}</w:rPr>" if props else ""
+    lines = str(text).split("\n")
+    body = "<w:br/>".join(f'<w:t xml:space="preserve">{_text(line)}</w:t>' for line in lines)
+    return Fragment(f"<w:r>{rpr}{body}</w:r>")
+
+
+def paragraph(*runs, align=None, style=None):
+    """A paragraph of runs (run() fragments; anything else is text for an unformatted run)."""
+    props = []
+    if style:
+        props.append(f'<w:pStyle w:val="{_attr(style)}"/>')
+    if align:
+        props.append(f'<w:jc w:val="{_ALIGN[align]}"/>')
+    ppr = f"<w:pPr>{''.join(props)}</w:pPr>" if props else ""
+    content = "".join(r if isinstance(r, Fragment) else run(r)
+                      for r in runs if r not in (None, ""))
+    return Fragment(f"<w:p>{ppr}{content}</w:p>")
+
+
+def page_break():
+    return Fragment('<w:p><w:r><w:br w:type="page"/></w:r></w:p>')
+
+
+_BORDERS = "".join(f'<w:{side} w:val="single" w:sz="4" w:space="0" w:color="000000"/>'
+                   for side in ("top", "left", "bottom", "right", "insideH", "insideV"))
+
+
+def table(rows, header_rows=1, align="center", cell_align="center", font=None, size=None,
+          width=TEXT_WIDTH_TWIPS):
+    """
+    A bordered table of text cells (one string per cell). The first
+    header_rows rows are bold and repeat on each page.
+    """
+    columns = max((len(r) for r in rows), default=0)
+    if not columns:
+        return Fragment("")
+    col_width = width // columns
+    grid = "".join(f'<w:gridCol w:w="{col_width}"/>' for _ in range(columns))
+    parts = [
+        f'<w:tbl><w:tblPr><w:tblW w:w="{col_width * columns}" w:type="dxa"/>'
+        f'<w:jc w:val="{_ALIGN[align]}"/><w:tblBorders>{_BORDERS}</w:tblBorders>'
+        f'<w:tblLayout w:type="fixed"/></w:tblPr><w:tblGrid>{grid}</w:tblGrid>'
+    ]
+    for r_idx, cells in enumerate(rows):
+        header = r_idx < header_rows
+        parts.append("<w:tr><w:trPr><w:tblHeader/></w:trPr>" if header else "<w:tr>")
+        for value in list(cells) + [""] * (columns - len(cells)):
+            text = "" if value is None else str(value)
+            content = run(text, bold=header, size=size, font=font) if text else ""
+            parts.append(f'<w:tc><w:tcPr><w:tcW w:w="{col_width}" w:type="dxa"/></w:tcPr>'
+                         f'{paragraph(content, align=cell_align)}</w:tc>')
+        parts.append("</w:tr>")
+    parts.append("</w:tbl>")
+    return Fragment("".join(parts))
@@ -0,0 +1,278 @@
+"""
+Single-pass sanitiser for HTML pasted into the drafting editors.
+
+Word / browser clipboard HTML is tokenised in one left-to-right pass of a
+compiled regex (linear in the input) and re-emitted with a strict
+whitelist:
+
+    <p> <b> <i> <u> <ul> <ol> <li> <br> and simple tables (<table> <tr>
+    <td> <th>, keeping only numeric colspan/rowspan; tables may nest)
+
+Every other attribute is dropped. <strong>/<em> and spans styled bold,
+italic or underlined become <b>/<i>/<u>. Headings, <div> and other blocks
+become paragraphs, and inline text outside a block is wrapped in one.
+<style>, <script>, <head> and the like are removed with their content;
+comments and Word's conditional markup disappear. A '<' that does not
+start a complete tag is kept as text. Output is always well formed.
+
+sanitize(html) returns the whole result. iter_sanitized(html) yields it
+in self-contained runs of whole top-level blocks, so a caller can insert a
+long paste piece by piece.
+"""
+import re
+from html import escape, unescape
+
+# Tags whose content is dropped along with them
+_DROP = {"style", "script", "head", "title", "meta", "link", "xml", "template", "object", "noscript"}
+# Output tag for each accepted inline tag
+_INLINE = {"b": "b", "strong": "b", "i": "i", "em": "i", "u": "u", "ins": "u"}
+# Inputs that become paragraphs
+_BLOCKS = {"p", "div", "h1", "h2", "h3", "h4", "h5", "h6", "blockquote", "pre", "address",
+           "section", "article", "header", "footer", "center"}
+_HEADINGS = {"h1", "h2", "h3", "h4", "h5", "h6"}
+_LISTS = {"ul", "ol"}
+_CELLS = {"td", "th"}
+_VOID = {"br", "img", "hr", "input", "col", "area", "base", "wbr", "meta", "link"}
+
+_TABLE_OPEN = '<table border="1" cellspacing="0" cellpadding="4">'
+_SPAN_ATTRS = ("colspan", "rowspan")
+
+_BOLD_RE = re.compile(r"font-weight\s*:\s*(bold|[6-9]00)", re.IGNORECASE)
+_ITALIC_RE = re.compile(r"font-style\s*:\s*italic", re.IGNORECASE)
+_UNDERLINE_RE = re.compile(r"text-decoration[^;]*underline", re.IGNORECASE)
+_SPACE_RE = re.compile(r"\s+")
+
+_TOKEN_RE = re.compile(r"""
+      <!--.*?(?:-->|\Z)                                  # comments, Word's <!--[if ...]>
+    | <[!?][^<>]*>                                       # doctype, <![if ...]>, <?xml ...?>
+    | <(/?)([A-Za-z][\w:.-]*)((?:[^<>"']|"[^<"]*"|'[^<']*')*)>  # start / end tag
+    | [^<]+                                              # text
+    | <                                                  # stray '<'
+""", re.S | re.X)
+_ATTR_RE = re.compile(r"""([\w:.-]+)\s*(?:=\s*(?:"([^"]*)"|'([^']*)'|([^\s"'>]+)))?""")
+# Raw-text elements: skip straight to their end tag
+_RAW_END_RE = {tag: re.compile(rf"</{tag}\s*>", re.I) for tag in ("script", "style")}
+
+# Flush iter_sanitized output once this many characters are ready
+CHUNK_CHARS = 32 * 1024
+
+
+def _attrs(text):
+    return {m.group(1).lower(): unescape(m.group(2) or m.group(3) or m.group(4) or "")
+            for m in _ATTR_RE.finditer(text)}
+
+
+class _Sanitizer:
+
+    def __init__(self):
+        self.out = []          # output since the last top-level boundary
+        self.ready = []        # completed top-level runs
+        self.stack = []        # open output tags
+        self.frames = []       # (input tag, output depth to close back to)
+        self.drop_depth = 0
+
+    # ---- output helpers ----
+
+    def _open(self, tag, markup=None):
+        self.out.append(markup or f"<{tag}>")
+        self.stack.append(tag)
+
+    def _close_to(self, depth):
+        while len(self.stack) > depth:
+            self.out.append(f"</{self.stack.pop()}>")
+        # Input tags whose output started at or above this depth are closed with it
+        while self.frames and self.frames[-1][1] >= depth:
+            self.frames.pop()
+        if not self.stack and self.out:
+            self.ready.append("".join(self.out))
+            self.out = []
+
+    def _in(self, *tags):
+        return any(t in self.stack for t in tags)
+
+    def _innermost(self, *tags):
+        """The most recently opened of tags, or None (tables can nest)."""
+        for tag in reversed(self.stack):
+            if tag in tags:
+                return tag
+        return None
+
+    def _close_paragraph(self):
+        if "p" in self.stack:
+            self._close_to(len(self.stack) - 1 - self.stack[::-1].index("p"))
+
+    def _close_sibling(self, kinds, barriers):
+        """Implicitly closes an open li / tr / cell when the next one starts (unless nested deeper)."""
+        for i in range(len(self.stack) - 1, -1, -1):
+            if self.stack[i] in barriers:
+                return
+            if self.stack[i] in kinds:
+                self._close_to(i)
+                return
+
+    def _ensure_block(self):
+        """Inline content needs a paragraph, list item or cell; False where it has no place."""
+        where = self._innermost("p", "li", "td", "th", "table", "tr")
+        if where in ("table", "tr"):
+            return False  # Stray content between cells
+        if where:
+            return True
+        self._open("p")
+        return True
+
+    def _formats(self, tag, attrs):
+        tags = []
+        if tag in _INLINE:
+            tags.append(_INLINE[tag])
+        if tag in _HEADINGS:
+            tags.append("b")
+        style = attrs.get("style", "")
+        if _BOLD_RE.search(style):
+            tags.append("b")
+        if _ITALIC_RE.search(style):
+            tags.append("i")
+        if _UNDERLINE_RE.search(style):
+            tags.append("u")
+        # No point re-opening a format that is already on
+        return [t for t in dict.fromkeys(tags) if t not in self.stack]
+
+    # ---- parser callbacks ----
+
+    def handle_starttag(self, tag, attrs):
+        if self.drop_depth or tag in _DROP:
+            if tag not in _VOID:
+                self.drop_depth += 1
+            return
+        if tag == "br":
+            if self._ensure_block():
+                self.out.append("<br>")
+            return
+        if tag in _VOID:
+            return
+        if tag in _BLOCKS:
+            self._close_paragraph()
+            depth = len(self.stack)
+            if self._innermost("table", "tr", "td", "th") not in ("table", "tr"):
+                self._open("p")
+        elif tag in _LISTS:
+            self._close_paragraph()
+            depth = len(self.stack)
+            self._open(tag)
+        elif tag == "li":
+            self._close_paragraph()
+            self._close_sibling(("li",), _LISTS)
+            depth = len(self.stack)
+            if not self._in("ul", "ol"):
+                self._open("ul")
+            self._open("li")
+        elif tag == "table":
+            self._close_paragraph()
+            depth = len(self.stack)
+            self._open("table", _TABLE_OPEN)
+        elif tag == "tr":
+            self._close_sibling(("tr",), ("table",))
+            depth = len(self.stack)
+            if self._innermost("table", "tr", "td", "th") == "table":
+                self._open("tr")
+        elif tag in _CELLS:
+            self._close_sibling(_CELLS, ("tr",))
+            depth = len(self.stack)
+            if self._innermost("table", "tr", "td", "th") == "tr":
+                spans = "".join(f' {a}="{attrs[a]}"' for a in _SPAN_ATTRS if attrs.get(a, "").isdigit())
+                self._open(tag, f"<{tag}{spans}>")
+        else:
+            depth = len(self.stack)
+
+        formats = self._formats(tag, attrs)
+        if formats and self._ensure_block():
+            if tag not in _BLOCKS:
+                depth = len(self.stack)
+            for fmt in formats:
+                self._open(fmt)
+        if len(self.stack) > depth:
+            # Tags that opened nothing have nothing for their end tag to close
+            self.frames.append((tag, depth))
+
+    def handle_endtag(self, tag):
+        if self.drop_depth:
+            if tag not in _VOID:
+                self.drop_depth -= 1
+            return
+        # Close back to where the matching start tag was (strays are ignored)
+        for i in range(len(self.frames) - 1, -1, -1):
+            if self.frames[i][0] == tag:
+                depth = self.frames[i][1]
+                del self.frames[i:]
+                self._close_to(depth)
+                return
+
+    def handle_data(self, data):
+        if self.drop_depth:
+            return
+        text = _SPACE_RE.sub(" ", unescape(data))
+        if text == " " and not self._in("p", "li", "td", "th"):
+            return  # Layout whitespace between blocks
+        if text and self._ensure_block():
+            self.out.append(escape(text, quote=False))
+
+    # ---- driver ----
+
+    def tokens(self, html):
+        """Feeds html through the callbacks, yielding the top-level runs as they complete."""
+        pos, end = 0, len(html)
+        while pos < end:
+            m = _TOKEN_RE.match(html, pos)
+            pos = m.end()
+            name = m.group(2)
+            if name is None:
+                if not m.group(0).startswith("<") or m.group(0) == "<":
+                    self.handle_data(m.group(0))
+                continue
+            tag = name.lower()
+            if m.group(1):
+                self.handle_endtag(tag)
+                continue
+            raw = m.group(3)
+            self.handle_starttag(tag, _attrs(raw) if "=" in raw else {})
+            if tag in _RAW_END_RE:
+                close = _RAW_END_RE[tag].search(html, pos)
+                pos = close.end() if close else end
+                self.handle_endtag(tag)
+            elif raw.rstrip().endswith("/") and tag not in _VOID:
+                self.handle_endtag(tag)
+            if self.ready:
+                yield from self.take()
+        self.drop_depth = 0
+        self._close_to(0)
+        yield from self.take()
+
+    def take(self):
+        ready, self.ready = self.ready, []
+        return ready
+
+
+_EMPTY_P_RE = re.compile(r"<p>\s*</p>")
+
+
+def iter_sanitized(html, chunk_chars=CHUNK_CHARS):
+    """
+    Yields the sanitised HTML in runs of whole top-level blocks, each at
+    least chunk_chars long (except the last), so each run can be inserted
+    on its own.
+    """
+    buffered, size = [], 0
+    for run in _Sanitizer().tokens(html or ""):
+        run = _EMPTY_P_RE.sub("", run)
+        if run:
+            buffered.append(run)
+            size += len(run)
+        if size >= chunk_chars:
+            yield "".join(buffered)
+            buffered, size = [], 0
+    if buffered:
+        yield "".join(buffered)
+
+
+def sanitize(html):
+    """The whole paste, sanitised."""
+    return "".join(iter_sanitized(html, chunk_chars=float("inf")))
@@ -0,0 +1,581 @@
+"""
+Qt-free rendering of a single issue: its calculation table, its narrative
+and its tax breakdown by Act.
+
+IssueCard delegates to these for its live view, and the headless
+DocumentService uses them to rebuild notices straight from case_issues, so
+both paths produce the same HTML and totals.
+"""
+import re
+
+from src.utils.number_utils import safe_int
+
+CANONICAL_PLACEHOLDER = "[Enter Brief Facts here]"
+
+# Template keys for the brief facts of each document mode (first found wins)
+BRIEF_FACTS_KEYS = {
+    "DRC-01A": ("brief_facts_drc01a", "brief_facts"),
+    "SCN": ("brief_facts_scn", "brief_facts"),
+}
+
+
+class IssueRenderer:
+
+    @staticmethod
+    def extract_html_body(html, allow_raw=True):
+        """Extract content from body tag. If allow_raw is True and no body found, returns original."""
+        if not html: return ""
+        
+        # Check if it's just an empty Qt paragraph
+        plain_text = re.sub(r'<[^>]+>', '', html).strip()
+        if not plain_text and "<br" not in html and "<img" not in html and "<table" not in html:
+            return ""
+            
+        match = re.search(r'<body[^>]*>(.*?)</body>', html, re.DOTALL | re.IGNORECASE)
+        if match:
+            return match.group(1).strip()
+        
+        return html if allow_raw else ""
+
+    @staticmethod
+    def compose_narrative(template, mode):
+        """
+        The unrendered narrative of an issue for a document mode: brief facts,
+        grounds, legal provisions and conclusion, in that order.
+        """
+        t = template.get('templates', {})
+
+        def section(*keys):
+            for key in keys:
+                val = t.get(key)
+                if val:
+                    return IssueRenderer.extract_html_body(str(val))
+            return ""
+
+        brief_facts = section(*BRIEF_FACTS_KEYS.get(mode, ("brief_facts",)))
+        if not brief_facts and template.get('brief_facts'):
+            brief_facts = IssueRenderer.extract_html_body(str(template['brief_facts']))
+
+        html_sections = []
+        for label, content in (("Brief Facts", brief_facts),
+                               ("Grounds / Discussions", section('grounds')),
+                               ("Legal Provisions", section('legal')),
+                               ("Conclusion", section('conclusion'))):
+            if content.strip():
+                html_sections.append(f'<div style="margin-bottom: 15px;"><b>{label}:</b><br>{content}</div>')
+
+        return "".join(html_sections) or f"<i>{CANONICAL_PLACEHOLDER}</i>"
+
+    @staticmethod
+    def render_narrative(issue_id, template, variables, mode, case_data=None):
+        """compose_narrative() with the issue's placeholders filled in."""
+        from src.utils.template_engine import TemplateEngine
+        from src.utils.issue_context_builder import IssueContextBuilder
+
+        html = IssueRenderer.compose_narrative(template, mode)
+        # Build comprehensive context (Metadata + Grid Variables + Lazy Table)
+        context = IssueContextBuilder.build_issue_context(
+            issue_id=issue_id,
+            case_data=case_data,
+            grid_results=variables,
+            issue_metadata=template,
+            table_generator=(IssueRenderer.generate_table_html, template, variables)
+        )
+        try:
+            return TemplateEngine.render_issue_template(html, context)
+        except Exception as e:
+            print(f"[IssueRenderer] Rendering failed for {issue_id}: {e}")
+            return html
+
+    @staticmethod
+    def generate_table_html(template, variables):
+        """Generate HTML for the table portion of the card"""
+        html = ""
+        
+        # 0. Grid Data Support (Excel Import) - High Priority check
+        # [FIX] Check both template and variables for grid_data to ensure table renders
+        grid_source = None
+        if 'grid_data' in template:
+            grid_source = template['grid_data']
+        elif 'grid_data' in variables:
+            grid_source = variables['grid_data']
+            
+        if grid_source:
+            grid_data = grid_source
+            
+            # [FIX] Robust Normalization for Canonical Grid (List vs Dict)
+            # The new IssueCard enforces {'columns': ..., 'rows': ...} but legacy data might be List[List].
+            # We must normalize to List[List] for HTML generation.
+            rows_data = []
+            if isinstance(grid_data, dict):
+                rows_data = grid_data.get('rows', [])
+            elif isinstance(grid_data, list):
+                rows_data = grid_data
+            
+            
+            # [CRITICAL FIX] Overwrite variables context so downstream logic sees a List
+            # This prevents KeyError: 0 when Jinja/Legacy logic tries to index it numerically
+            if 'grid_data' in variables:
+                 variables['grid_data'] = rows_data
+                 
+            rows = len(rows_data)
+            
+            # [FIX] Generate Table HTML manually to ensure it appears
+            # ... (Rest of existing logic, but we need to see the loop below)
+            
+            html += """
+            <div style="margin-bottom: 20px; margin-top: 15px;">
+                <p style="font-weight: bold; margin-bottom: 8px; font-size: 11pt;">Calculation Table</p>
+                <table style="width: 100%; border-collapse: collapse; font-size: 10pt; font-family: 'Bookman Old Style', serif; border: 2px solid #000;">
+            """
+            
+            # Attempt to get header columns if possible
+            skip_first_col = False
+            if isinstance(grid_data, dict) and 'columns' in grid_data:
+                columns = grid_data['columns']
+                
+                # [POLISH] Suppress index column if present
+                if columns:
+                    first_col = columns[0]
+                    first_label = ""
+                    if isinstance(first_col, dict):
+                        first_label = (first_col.get('label') or first_col.get('header') or first_col.get('name', '')).strip().lower()
+                    else:
+                        first_label = str(first_col).strip().lower()
+                    
+                    if first_label in ['sl no', 'sl no.', 'si no', 'si no.', 'sl.no', '#', 'no.']:
+                        skip_first_col = True
+
+                html += "<tr>"
+                for c, col in enumerate(columns):
+                    if c == 0 and skip_first_col: continue
+                    # [FIX] Prioritize 'label' (canonical), then 'header', then 'name'
+                    if isinstance(col, dict):
+                        col_name = col.get('label') or col.get('header') or col.get('name', 'Column')
+                    else:
+                        col_name = str(col)
+                    html += f'<th style="border: 1px solid black; padding: 6px; text-align: center; background-color: #f2f2f2; font-weight: bold; font-size: 10pt;">{col_name}</th>'
+                html += "</tr>"
+            
+            for r, row_data in enumerate(rows_data):
+                html += "<tr>"
+                
+                cells = []
+                if isinstance(row_data, list):
+                    cells = row_data
+                elif isinstance(row_data, dict):
+                    if 'cells' in row_data:
+                        cells = row_data['cells']
+                    elif isinstance(grid_data, dict) and 'columns' in grid_data:
+                        columns = grid_data['columns']
+                        for col in columns:
+                            if isinstance(col, dict):
+                                col_key = col.get('key') or col.get('id') or col.get('name', '')
+                            else:
+                                col_key = str(col)
+                            cell_value = row_data.get(col_key, '')
+                            cells.append(cell_value)
+                    else:
+                        cells = list(row_data.values())
+
+                for c, cell_info in enumerate(cells):
+                    if c == 0 and skip_first_col: continue
+                    val = ""
+                    var_name = None
+                    
+                    if isinstance(cell_info, dict):
+                        val = cell_info.get('value', '')
+                        var_name = cell_info.get('var')
+                    else:
+                        val = str(cell_info)
+                    
+                    # Resolve Value
+                    if var_name:
+                        if var_name in variables:
+                            val = variables[var_name]
+                        else:
+                            # [DISPLAY FALLBACK] Unresolved variables default to 0 in HTML view
+                            val = 0
+                    
+                    # [POLISH] Professional Table Cell Styling
+                    style = "border: 1px solid black; padding: 4px 6px; font-size: 10pt;"
+                    
+                    # Alignment logic
+                    if isinstance(val, (int, float)):
+                        style += "text-align: right;"
+                    else:
+                        try:
+                            clean_val = str(val).replace(',', '').replace('₹', '').strip()
+                            if clean_val and all(c in '0123456789.-' for c in clean_val):
+                                safe_int(clean_val)
+                                style += "text-align: right;"
+                            else:
+                                style += "text-align: left;"
+                        except:
+                            style += "text-align: left;"
+                            
+                    # Format float
+                    try:
+                        if isinstance(val, (int, float)):
+                            # Check if it looks like currency/tax
+                            s_var = str(var_name).lower() if var_name else ""
+                            if 'tax' in s_var or 'int' in s_var or 'pen' in s_var or val > 1000:
+                                val = f"{val:,.2f}"
+                            else:
+                                val = str(val)
+                    except:
+                        pass
+                        
+                    html += f"<td style='{style}'>{val}</td>"
+                html += "</tr>"
+                
+            html += """
+                </table>
+            </div>
+            """
+            return html
+
+        # New Schema Table Support (Excel-like Dict)
+        if isinstance(template.get('tables'), dict) and template['tables'].get('rows', 0) > 0:
+            table_data = template['tables']
+            rows = table_data.get('rows', 0)
+            cols = table_data.get('cols', 0)
+            
+            html += """
+            <div style="margin-bottom: 20px; margin-top: 15px;">
+                <p style="font-weight: bold; margin-bottom: 8px; font-size: 11pt;">Calculation Table</p>
+                <table style="width: 100%; border-collapse: collapse; font-size: 10pt; font-family: 'Bookman Old Style', serif; border: 2px solid #000;">
+            """
+            
+            # Reconstruct grid from variables (A1, B1, etc.)
+            for r in range(rows):
+                html += "<tr>"
+                for c in range(cols):
+                    # Calculate address (A1, B1...)
+                    col_label = ""
+                    temp = c
+                    while temp >= 0:
+                        col_label = chr(ord('A') + (temp % 26)) + col_label
+                        temp = (temp // 26) - 1
+                    addr = f"{col_label}{r+1}"
+                    
+                    # Get value
+                    val = variables.get(addr, "")
+                    
+                    # Basic Styling
+                    style = "border: 1px solid #000; padding: 8px; word-wrap: break-word; vertical-align: top;"
+                    
+                    # Heuristic: First row is usually header
+                    if r == 0:
+                        style += "background-color: #f2f2f2; font-weight: bold; text-align: center;"
+                        
+                        # Set Column Widths
+                        if cols > 1:
+                            if c == 0:
+                                style += "width: 40%;"
+                            else:
+                                width_pct = 60 // (cols - 1)
+                                style += f"width: {width_pct}%;"
+                    else:
+                        # Check if numeric
+                        try:
+                            safe_int(val)
+                            style += "text-align: right;"
+                        except:
+                            style += "text-align: left;"
+                            
+                    html += f"<td style='{style}'>{val}</td>"
+                html += "</tr>"
+                
+            html += """
+                </table>
+            </div>
+            """
+
+        # Legacy Table Support (Single Table)
+        elif 'table' in template:
+            table = template['table']
+            html += f"""
+            <div style="margin-bottom: 20px; margin-top: 15px;">
+                <p style="font-weight: bold; margin-bottom: 8px; font-size: 11pt;">{table.get('title', 'Table')}</p>
+                <table style="width: 100%; border-collapse: collapse; font-size: 10pt; font-family: 'Bookman Old Style', serif; border: 2px solid #000;">
+                    <thead>
+                        <tr>
+            """
+            
+            for col in table['columns']:
+                html += f"<th style='border: 1px solid #000; padding: 8px; background-color: #f2f2f2; text-align: center; font-weight: bold;'>{col['label']}</th>"
+                
+            html += """
+                        </tr>
+                    </thead>
+                    <tbody>
+            """
+            
+            for row in table['rows']:
+                html += "<tr>"
+                for col in table['columns']:
+                    key = col['key']
+                    val_template = row.get(key, "")
+                    val = str(val_template)
+                    for var_name, var_val in variables.items():
+                        val = val.replace(f"{{{{{var_name}}}}}", str(var_val))
+                    
+                    # Align numbers to right
+                    align = "left"
+                    try:
+                        safe_int(val)
+                        align = "right"
+                    except:
+                        pass
+                        
+                    html += f"<td style='border: 1px solid #000; padding: 8px; text-align: {align};'>{val}</td>"
+                html += "</tr>"
+                
+            html += """
+                    </tbody>
+                </table>
+            </div>
+            """
+            
+        return html
+
+    @staticmethod
+    def tax_breakdown(template, variables, grid_data=None):
+        """
+        Tax breakdown by Act as integers. grid_data is the live grid when it
+        differs from the template's.
+        """
+        tax_mapping = template.get('tax_demand_mapping') or {}
+        breakdown = {}
+        
+        def get_v(key):
+            return safe_int(variables.get(key, 0))
+
+        # [REORDERED] PRIORITY 1: Canonical-First Logic (Strict Adherence to tax_demand_mapping)
+        if tax_mapping:
+            has_mapped_data = False
+            for act in ['IGST', 'CGST', 'SGST', 'Cess']:
+                var_name = tax_mapping.get(act)
+                if var_name:
+                    val = get_v(var_name)
+                    has_mapped_data = True
+                    if act not in breakdown:
+                        breakdown[act] = {'tax': 0, 'interest': 0, 'penalty': 0}
+                    breakdown[act]['tax'] = val
+            
+            if has_mapped_data:
+                return breakdown
+
+        # [REORDERED] PRIORITY 2: Structured Liability Config (Contract Mode)
+        liability_config = template.get('liability_config')
+        if liability_config:
+            model = liability_config.get('model')
+            heads = liability_config.get('column_heads', [])
+            indices = liability_config.get('row_indices', [])
+            
+            def get_row_var(idx, head):
+                return f"row{idx+1}_{head.lower()}"
+
+            if model in ['single_row', 'single_column', 'multiple_rows']:
+                for r_idx in indices:
+                    for head in heads:
+                        var_name = get_row_var(r_idx, head)
+                        val = get_v(var_name)
+                        act = head # CGST, SGST, IGST
+                        if act == 'Amount': act = 'IGST' 
+                        
+                        if act not in breakdown:
+                            breakdown[act] = {'tax': 0, 'interest': 0, 'penalty': 0}
+                        breakdown[act]['tax'] += val
+                
+                if breakdown: 
+                    return breakdown
+
+            elif model == 'sum_of_rows':
+                current_grid = grid_data or template.get('grid_data')
+                if current_grid and isinstance(current_grid, dict):
+                    columns = current_grid.get('columns', [])
+                    col_map = {}
+                    for col in columns:
+                        if isinstance(col, dict):
+                             lbl = str(col.get('label', '')).upper()
+                             cid = col.get('id')
+                             for head in heads:
+                                 if head.upper() in lbl: col_map[head] = cid
+                    
+                    if col_map:
+                        rows = current_grid.get('rows', [])
+                        for row in rows:
+                            is_total = False
+                            for cell in row.values():
+                                if isinstance(cell, dict) and 'value' in cell:
+                                    if "TOTAL" in str(cell['value']).upper(): is_total = True; break
+                            if is_total: continue
+
+                            for head, cid in col_map.items():
+                                cell = row.get(cid)
+                                if isinstance(cell, dict):
+                                    val = 0.0
+                                    if cell.get('var'): val = get_v(cell['var'])
+                                    else: val = safe_int(cell.get('value', 0))
+                                    
+                                    if head not in breakdown:
+                                        breakdown[head] = {'tax': 0, 'interest': 0, 'penalty': 0}
+                                    breakdown[head]['tax'] += val
+                        
+                        if breakdown: 
+                            print("BREAKDOWN GENERATED:", breakdown)
+                            return breakdown
+
+        # [FALLBACK] Legacy / Explicit Act variables (High risk of hijacking)
+        igst = get_v('tax_igst') or get_v('igst_tax')
+        cgst = get_v('tax_cgst') or get_v('cgst_tax')
+        sgst = get_v('tax_sgst') or get_v('sgst_tax')
+        cess = get_v('tax_cess') or get_v('cess_tax')
+        
+        if igst or cgst or sgst or cess:
+            if igst: breakdown['IGST'] = {'tax': igst, 'interest': get_v('interest_igst'), 'penalty': get_v('penalty_igst')}
+            if cgst: breakdown['CGST'] = {'tax': cgst, 'interest': get_v('interest_cgst'), 'penalty': get_v('penalty_cgst')}
+            if sgst: breakdown['SGST'] = {'tax': sgst, 'interest': get_v('interest_sgst'), 'penalty': get_v('penalty_sgst')}
+            if cess: breakdown['Cess'] = {'tax': cess, 'interest': get_v('interest_cess'), 'penalty': get_v('penalty_cess')}
+            print("BREAKDOWN GENERATED:", breakdown)
+            return breakdown
+
+        # 2. Smart Detection for Grid Tables (if mapping is missing)
+        # Support both Legacy 'tables' and Modern 'grid_data'
+        target_tables = []
+        if isinstance(template.get('tables'), dict) and template['tables'].get('rows', 0) > 0:
+            target_tables.append(('legacy', template['tables']))
+        
+        # [FIX] Add grid_data support for heuristics
+        # We look at grid_data which is the runtime state, or template default
+        current_grid = grid_data or template.get('grid_data')
+        if current_grid and isinstance(current_grid, dict) and 'rows' in current_grid:
+            target_tables.append(('grid', current_grid))
+
+        if target_tables:
+            try:
+                for t_type, table_data in target_tables:
+                    if t_type == 'legacy':
+                        # ... Existing Legacy Logic (Preserved) ...
+                        rows = table_data.get('rows', 0)
+                        cols = table_data.get('cols', 0)
+                        cells = table_data.get('cells', [])
+                        
+                        # Find Header Row (usually row 0)
+                        header_map = {} # 'CGST': col_index
+                        if rows > 0 and len(cells) > 0:
+                            for c, val in enumerate(cells[0]):
+                                val_str = str(val).upper()
+                                if 'CGST' in val_str: header_map['CGST'] = c
+                                elif 'SGST' in val_str: header_map['SGST'] = c
+                                elif 'IGST' in val_str: header_map['IGST'] = c
+                                elif 'CESS' in val_str: header_map['Cess'] = c
+                        
+                        # Find Data Row (Difference, Tax, Total)
+                        for r in range(rows - 1, 0, -1):
+                            row_label = str(cells[r][0]).upper() if len(cells[r]) > 0 else ""
+                            if 'DIFFERENCE' in row_label or 'TAX' in row_label or 'TOTAL' in row_label:
+                                for act, col_idx in header_map.items():
+                                    col_label = ""
+                                    temp = col_idx
+                                    while temp >= 0:
+                                        col_label = chr(ord('A') + (temp % 26)) + col_label
+                                        temp = (temp // 26) - 1
+                                    addr = f"{col_label}{r+1}"
+                                    
+                                    val = get_v(addr)
+                                    if val > 0:
+                                        if act not in breakdown:
+                                            breakdown[act] = {'tax': 0.0, 'interest': 0.0, 'penalty': 0.0}
+                                        breakdown[act]['tax'] = val
+                                if breakdown: return breakdown
+
+                    elif t_type == 'grid':
+                        # [NEW] Grid Data Heuristic
+                        # 1. Map Columns by Label
+                        columns = table_data.get('columns', [])
+                        col_map = {} # 'CGST': 'col2'
+                        
+                        for col in columns:
+                            if isinstance(col, dict):
+                                label = str(col.get('label', '')).upper()
+                                cid = col.get('id')
+                                if 'CGST' in label: col_map['CGST'] = cid
+                                elif 'SGST' in label: col_map['SGST'] = cid
+                                elif 'IGST' in label: col_map['IGST'] = cid
+                                elif 'CESS' in label: col_map['Cess'] = cid
+                        
+                        if not col_map: continue
+                        
+                        # 2. Iterate Rows and Sum (Assumption: All rows contribute to liability unless labeled otherwise?)
+                        # Or should we look for Total row?
+                        # Start by Summing ALL numeric values in these columns (Safe for simple lists)
+                        # If we find a "Total" row, we might double count? 
+                        # GridAdapter usually doesn't have "Total" rows unless static.
+                        
+                        temp_totals = {k: 0.0 for k in col_map.keys()}
+                        
+                        rows = table_data.get('rows', [])
+                        for row in rows:
+                            # Skip Header-like rows if any (usually handled by columns)
+                            # Check Row Label if exists
+                            # In GridAdapter, row is dict: {col_id: cell_obj}
+                            
+                            is_total_row = False
+                            # Heuristic: Check ALL string cells for "Total" or "Difference"
+                            # This is safer than assuming first col is always the label (e.g. checkbox cols)
+                            for cell in row.values():
+                                if isinstance(cell, dict) and 'value' in cell:
+                                    val_str = str(cell['value']).strip().upper()
+                                    if val_str == "TOTAL" or "TOTAL " in val_str or " TOTAL" in val_str:
+                                        is_total_row = True
+                                        break
+                                    if "DIFFERENCE" in val_str:
+                                        is_total_row = True 
+                                        break
+                            
+                            if is_total_row: continue
+
+                            for act, cid in col_map.items():
+                                cell = row.get(cid)
+                                if isinstance(cell, dict):
+                                    # Try 'var' first (bound value)
+                                    val = 0
+                                    raw_val = None
+                                    if 'var' in cell and cell['var']:
+                                         raw_val = get_v(cell['var'])
+                                         val = raw_val
+                                    else:
+                                         # Try static/input value
+                                         val = safe_int(cell.get('value', 0))
+                                    
+                                    if val > 0:
+                                        temp_totals[act] += val
+                        
+                        # Transfer to breakdown
+                        has_val = False
+                        for act, total in temp_totals.items():
+                            if total > 0:
+                                if act not in breakdown: breakdown[act] = {'tax': 0, 'interest': 0, 'penalty': 0}
+                                breakdown[act]['tax'] = total
+                                has_val = True
+                        
+                        if has_val: return breakdown
+
+            except Exception as e:
+                print(f"Smart Tax Detection Error: {e}")
+
+        # 3. Fallback to mapped totals (Legacy)
+        # If we only have total tax, we don't know the Act.
+        # We default to IGST to ensure it appears in the table.
+        tax = get_v(tax_mapping.get('tax', 'calculated_tax'))
+        interest = get_v(tax_mapping.get('interest', 'calculated_interest'))
+        penalty = get_v(tax_mapping.get('penalty', 'calculated_penalty'))
+        
+        if tax or interest or penalty:
+            breakdown['IGST'] = {'tax': tax, 'interest': interest, 'penalty': penalty}
+            
+        print("BREAKDOWN GENERATED:", breakdown)
+        return breakdown
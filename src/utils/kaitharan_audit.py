@@ -2,6 +2,8 @@ import sqlite3
 import json
 import os
 
+from src.database.blob_store import get_text
+
 import os
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 db_path = os.path.join(BASE_DIR, 'data', 'adjudication.db')
@@ -36,7 +38,7 @@ else:
             issues = c.fetchall()
             print(f"  Found {len(issues)} issues in DRC-01A stage for SOURCE.")
             for i_id, stage, data_json in issues:
-                data = json.loads(data_json)
+                data = json.loads(get_text(c, data_json))
                 print(f"    - ID: {i_id}, Shortfall: {data.get('total_shortfall')}, Desc: {data.get('description')}")
         
         # Check own issues
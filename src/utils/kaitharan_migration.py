@@ -21,6 +21,7 @@ issues = json.loads(selected_json) if selected_json else []
 print(f"Found {len(issues)} issues in selected_issues.")
 
 from src.utils.number_utils import safe_int
+from src.database.blob_store import put_text
 
 # 2. Filter for active issues (shortfall > 0)
 active_issues = [i for i in issues if safe_int(i.get('total_shortfall', 0)) > 0]
@@ -40,7 +41,7 @@ for item in active_issues:
     c.execute("""
         INSERT INTO case_issues (proceeding_id, issue_id, stage, data_json, category, description, amount)
         VALUES (?, ?, ?, ?, ?, ?, ?)
-    """, (pid, issue_id, 'DRC-01A', data_json, category, description, amount))
+    """, (pid, issue_id, 'DRC-01A', put_text(c, data_json), category, description, amount))
 
 conn.commit()
 print("Migration successful. case_issues (DRC-01A) populated.")
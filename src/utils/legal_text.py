@@ -0,0 +1,45 @@
+import re
+
+# Footnotes typically start with patterns like '1. Subs.', '2. Ins.', '1. The word', etc.
+_FOOTNOTE_START = re.compile(r'^\d+\.\s+(Subs\.|Ins\.|The\s+word|The\s+proviso|Clause|Omitted|Explanation)')
+_FOOTNOTE_CONTINUATION = ('Act', 'ibid', 'w.e.f', 's.', 'for')
+
+
+def split_footnotes(content):
+    """
+    Separate main content of a section from its amendment footnotes.
+    Returns (main_content, footnotes).
+    """
+    if not content:
+        return "", ""
+
+    main_lines = []
+    footnote_lines = []
+    in_footnotes = False
+
+    for line in content.split('\n'):
+        if _FOOTNOTE_START.match(line):
+            in_footnotes = True
+            footnote_lines.append(line)
+        elif in_footnotes:
+            # Continue collecting footnote lines
+            # Stop if we hit a new section or empty line followed by non-footnote content
+            if line.strip() == '':
+                footnote_lines.append(line)
+            elif any(keyword in line for keyword in _FOOTNOTE_CONTINUATION):
+                footnote_lines.append(line)
+            else:
+                # Might be end of footnotes
+                main_lines.append(line)
+        else:
+            main_lines.append(line)
+
+    return '\n'.join(main_lines).strip(), '\n'.join(footnote_lines).strip()
+
+
+def format_chapter_label(chapter_id, chapter_name=None):
+    """'CHAPTER_V', 'Input Tax Credit' -> 'CHAPTER V - Input Tax Credit'"""
+    label = (chapter_id or "").replace('CHAPTER_', 'CHAPTER ').upper()
+    if chapter_name:
+        label += f" - {chapter_name}"
+    return label
@@ -519,17 +519,12 @@ def parse_gstr9_pdf_metadata(file_path):
     meta = {"gstin": None, "fy": None}
     if not file_path: return meta
     try:
-        import fitz
-        doc = fitz.open(file_path)
-        text = ""
-        for i in range(min(2, len(doc))):
-            text += doc[i].get_text() + "\n"
-        doc.close()
-        
-        gstin_match = re.search(r"GSTIN\s+([0-9]{2}[A-Z]{5}[0-9]{4}[A-Z][1-9A-Z]Z[0-9A-Z])", text, re.IGNORECASE)
-        if gstin_match: meta["gstin"] = gstin_match.group(1).upper()
-        
-        meta["fy"] = _extract_fy_from_text(text)
+        # Shares the parsed document with SOP-12 (one PDF open per file)
+        from src.services.gstr9_document import load_gstr9_document
+        doc_meta = load_gstr9_document(file_path).metadata
+
+        if doc_meta.get("gstin"): meta["gstin"] = doc_meta["gstin"].upper()
+        meta["fy"] = doc_meta.get("fy")
                 
     except Exception as e:
         logger.error(f"Error extracting GSTR-9 metadata from {file_path}: {e}")
@@ -2,8 +2,11 @@ import io
 import os
 import subprocess
 import tempfile
+import threading
+import time
 import sys
 import logging
+from collections import namedtuple
 from PyQt6.QtGui import QImage, QPixmap
 from PyQt6.QtCore import QByteArray, QBuffer, QIODevice
 from src.utils.config_manager import ConfigManager
@@ -22,6 +25,13 @@ if not logger.handlers:
     except:
         pass # Fallback to no logging if folder is read-only
 
+# One rendered page image; the PNG stays on disk until a viewer needs it
+PreviewPage = namedtuple("PreviewPage", "index width height path")
+
+# Shared across worker runs so unchanged pages are not rasterised again
+PAGE_CACHE_DIR = os.path.join(tempfile.gettempdir(), "gst_preview_pages")
+
+
 class PreviewGenerator:
     """
     [STABILIZATION] Sandboxed Preview Generator.
@@ -50,6 +60,13 @@ class PreviewGenerator:
             print("[STABILIZATION] Preview skipped: Feature disabled by default.")
             return [] if all_pages else None
 
+        if all_pages:
+            images = []
+            for page in PreviewGenerator.render_pages(html_content, width=width or 1000):
+                with open(page.path, "rb") as f:
+                    images.append(f.read())
+            return images
+
         worker_script = PreviewGenerator._get_worker_path()
         
         # Create temporary files for communication
@@ -116,6 +133,98 @@ class PreviewGenerator:
                 
         return [] if all_pages else None
 
+    @staticmethod
+    def render_pages(html_content, width=1000, first_pages=(0,), on_page=None, on_count=None, timeout=20.0,
+                     cancel=None):
+        """
+        Renders HTML as one PNG per page (A4 pagination, `width` pixels wide)
+        in the isolated worker. Pages in first_pages are produced first.
+        on_count(n) is called once the page count is known, and on_page(page)
+        as each page is written. Returns the PreviewPages in document order,
+        or [] on failure. Only file paths cross the process boundary.
+        Setting the optional `cancel` threading.Event kills the worker; no
+        further callbacks are made and [] is returned.
+        """
+        if not PreviewGenerator._is_enabled():
+            return []
+
+        pages = {}
+        with tempfile.TemporaryDirectory() as tmpdir:
+            input_file = os.path.join(tmpdir, "input.html")
+            with open(input_file, "w", encoding="utf-8") as f:
+                f.write(html_content)
+
+            cmd = [
+                sys.executable,
+                PreviewGenerator._get_worker_path(),
+                "--input", input_file,
+                "--output", PAGE_CACHE_DIR,
+                "--format", "pages",
+                "--width", str(int(width)),
+                "--first", ",".join(str(p) for p in first_pages),
+            ]
+            logger.info(f"Spawning render worker for PAGED PREVIEW (timeout={timeout}s, html_len={len(html_content)})")
+            # stderr goes to a file: a pipe nobody drains while stdout is
+            # being read can fill up and block the worker
+            stderr_path = os.path.join(tmpdir, "stderr.log")
+            try:
+                with open(stderr_path, "w", encoding="utf-8") as stderr_file:
+                    proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=stderr_file, text=True)
+            except Exception as e:
+                logger.error(f"Render manager error: {e}")
+                return []
+
+            timed_out = threading.Event()
+            done = threading.Event()
+            cancel = cancel or threading.Event()
+
+            def _watch():
+                # Polls so that a cancelled render is killed within ~50 ms
+                deadline = time.monotonic() + timeout
+                while not done.wait(0.05):
+                    if cancel.is_set() or time.monotonic() > deadline:
+                        if not cancel.is_set():
+                            timed_out.set()
+                        proc.kill()
+                        return
+
+            watchdog = threading.Thread(target=_watch, daemon=True)
+            watchdog.start()
+            messages = []
+            try:
+                for line in proc.stdout:
+                    if cancel.is_set():
+                        continue  # Drain until the kill lands
+                    parts = line.strip().split(" ", 4)
+                    if parts[0] == "PAGES" and on_count:
+                        on_count(int(parts[1]))
+                    elif parts[0] == "PAGE" and len(parts) == 5:
+                        page = PreviewPage(int(parts[1]), int(parts[2]), int(parts[3]), parts[4])
+                        pages[page.index] = page
+                        if on_page:
+                            on_page(page)
+                    else:
+                        messages.append(line.strip())
+                proc.wait()
+                with open(stderr_path, encoding="utf-8", errors="replace") as f:
+                    stderr = f.read() or "\n".join(messages)
+            finally:
+                done.set()
+
+            if cancel.is_set():
+                logger.info(f"Paged render cancelled ({len(pages)} pages done).")
+                return []
+            if timed_out.is_set():
+                logger.error(f"Paged render worker TIMED OUT ({timeout}s limit reached, {len(pages)} pages done).")
+            elif proc.returncode == 5:
+                logger.error("Render failed: MISSING_GTK_DEPENDENCY")
+                raise RuntimeError("MISSING_DEPENDENCY")
+            elif proc.returncode != 0:
+                logger.error(f"Paged render worker failed (Code {proc.returncode}): {(stderr or '')[:2000]}")
+                return []
+
+        return [pages[i] for i in sorted(pages)]
+
     @staticmethod
     def generate_pdf(html_content, output_path):
         """
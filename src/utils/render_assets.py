@@ -0,0 +1,180 @@
+"""
+Shared cache of the static assets every document render pulls in: the
+letterhead (HTML body or base64-encoded image) and the doc_base.css /
+doc_qt.css stylesheets.
+
+Entries are keyed by path, mtime and size, so editing or replacing a file on
+disk (e.g. uploading a new letterhead in Settings) is picked up on the next
+render while unchanged files are read and encoded only once per session.
+
+Letterhead images can also be referenced instead of inlined (file:// URL):
+image letterheads point at the file itself, and base64 images embedded in an
+HTML letterhead are written out once to a cache directory. That keeps preview
+HTML small, but only works where the target can load local files: QWebEngine
+views given a file base URL (see base_url) and WeasyPrint.
+Saved snapshots and QTextDocument output keep the inlined data URI.
+"""
+import base64
+import hashlib
+import os
+import re
+import tempfile
+import threading
+from pathlib import Path
+
+_ROOT_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+CSS_DIR = os.path.join(_ROOT_DIR, "templates", "css")
+LETTERHEADS_DIR = os.path.join(_ROOT_DIR, "templates", "letterheads")
+# Images extracted from HTML letterheads, named by content hash
+EXTRACTED_DIR = os.path.join(tempfile.gettempdir(), "gst_render_assets")
+
+_IMAGE_MIME = {"png": "png", "jpg": "jpeg", "jpeg": "jpeg", "gif": "gif", "bmp": "bmp", "svg": "svg+xml"}
+
+_BODY_RE = re.compile(r"<body[^>]*>(.*?)</body>", re.DOTALL | re.IGNORECASE)
+_LETTERHEAD_DIV_RE = re.compile(r'(<div class="letterhead.*?">.*?</div>)', re.DOTALL)
+_DATA_URI_RE = re.compile(r"data:image/([a-z+]+);base64,([A-Za-z0-9+/=\s]+)")
+
+_cache = {}
+_lock = threading.Lock()
+
+
+def _cached(kind, path, loader):
+    """
+    loader(abs_path) result for the current version of the file, or None if
+    the file does not exist.
+    """
+    abs_path = os.path.abspath(path)
+    try:
+        st = os.stat(abs_path)
+    except OSError:
+        return None
+    key = (kind, abs_path, st.st_mtime_ns, st.st_size)
+    with _lock:
+        if key in _cache:
+            return _cache[key]
+
+    value = loader(abs_path)
+    with _lock:
+        # Drop older versions of the same file
+        for stale in [k for k in _cache if k[0] == kind and k[1] == abs_path]:
+            del _cache[stale]
+        _cache[key] = value
+    return value
+
+
+def clear():
+    with _lock:
+        _cache.clear()
+
+
+def _read_text(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return f.read()
+
+
+def _encode_image(path):
+    with open(path, "rb") as f:
+        return base64.b64encode(f.read()).decode("utf-8")
+
+
+# ---- Stylesheets ----
+
+def read_css(filename):
+    """Contents of templates/css/<filename>, "" if missing."""
+    return _cached("css", os.path.join(CSS_DIR, filename), _read_text) or ""
+
+
+def document_styles_html(for_preview):
+    """<style> block with doc_base.css, plus doc_qt.css for on-screen previews."""
+    base_css = read_css("doc_base.css")
+    renderer_css = read_css("doc_qt.css") if for_preview else ""
+    return f"<style>\n{base_css}\n{renderer_css}\n</style>"
+
+
+# ---- Letterheads ----
+
+def letterhead_text(path):
+    """Raw contents of an HTML letterhead, None if missing."""
+    return _cached("text", path, _read_text)
+
+
+def _extract_image(match):
+    mime, payload = match.group(1), re.sub(r"\s+", "", match.group(2))
+    ext = {"jpeg": "jpg", "svg+xml": "svg"}.get(mime, mime)
+    name = hashlib.sha1(payload.encode("ascii")).hexdigest() + "." + ext
+    target = os.path.join(EXTRACTED_DIR, name)
+    if not os.path.exists(target):
+        os.makedirs(EXTRACTED_DIR, exist_ok=True)
+        tmp = target + ".part"
+        with open(tmp, "wb") as f:
+            f.write(base64.b64decode(payload))
+        os.replace(tmp, target)
+    return Path(target).as_uri()
+
+
+def letterhead_body(path, inline=True):
+    """
+    Inner <body> of an HTML letterhead (the whole file if it has no body),
+    None if missing. With inline=False embedded base64 images are replaced by
+    file:// URLs of extracted copies.
+    """
+    def load(abs_path):
+        full = _read_text(abs_path)
+        match = _BODY_RE.search(full)
+        return match.group(1) if match else full
+
+    if inline:
+        return _cached("body", path, load)
+    return _cached("body-ref", path, lambda abs_path: _DATA_URI_RE.sub(_extract_image, load(abs_path)))
+
+
+def letterhead_div(path):
+    """First <div class="letterhead..."> block of an HTML letterhead, None if missing or absent."""
+    def load(abs_path):
+        match = _LETTERHEAD_DIV_RE.search(_read_text(abs_path))
+        return match.group(1) if match else None
+    return _cached("div", path, load)
+
+
+def image_src(path, inline=True):
+    """
+    src for an image letterhead: a base64 data URI (encoded once per file
+    version) or, with inline=False, a file:// URL. None if missing.
+    """
+    if not os.path.exists(path):
+        return None
+    if not inline:
+        return Path(os.path.abspath(path)).as_uri()
+    ext = os.path.splitext(path)[1][1:].lower()
+    mime = _IMAGE_MIME.get(ext, ext)
+    encoded = _cached("b64", path, _encode_image)
+    return f"data:image/{mime};base64,{encoded}"
+
+
+def letterhead_block(path, adjustments=None, inline=True):
+    """
+    Letterhead wrapped in a centred div carrying the Settings adjustments
+    (width capped at 100%, top padding, bottom margin). HTML letterheads
+    contribute their <body>; images become an <img>. "" if the file is missing.
+    """
+    if not path or not os.path.exists(path):
+        return ""
+    adj = adjustments or {}
+    # [RENDER-TIME CAP] Prevent extreme width adjustments (e.g. 623%) from breaking layout
+    width_val = min(adj.get('width', 100), 100)
+    lh_style = f"width: {width_val}%; padding-top: {adj.get('padding_top', 0)}px; margin-bottom: {adj.get('margin_bottom', 20)}px;"
+
+    if os.path.splitext(path)[1][1:].lower() == "html":
+        inner_html = letterhead_body(path, inline=inline) or ""
+        return f'<div style="{lh_style} text-align: center;">{inner_html}</div>'
+
+    src = image_src(path, inline=inline)
+    return f'<div style="{lh_style} text-align: center;"><img src="{src}" alt="Letterhead" style="max-width: 100%; height: auto;"></div>'
+
+
+def base_url():
+    """
+    Local directory to pass as the base URL of QWebEngine views, so
+    referenced (non-inlined) letterhead images are allowed to load.
+    """
+    return LETTERHEADS_DIR + os.sep
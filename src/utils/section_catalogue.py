@@ -0,0 +1,132 @@
+"""
+Pre-indexed catalogue of legal sections for the section selector.
+
+A catalogue is built once per revision of gst_sections (see
+DatabaseManager.get_cgst_section_catalogue): every section is split into
+its (1), (2), (a) ... subsections a single time, and an inverted index maps
+each lower-cased word of the section numbers, titles, labels and text to
+the entries containing it. Searching is then a few dictionary lookups:
+
+    catalogue = get_catalogue(key, loader)   # built on first use per key
+    hits = catalogue.search("input tax 16")  # {(section, sub), ...}
+
+An entry is (section index, -1) for a whole section and (section index,
+subsection index) for one of its subsections. Every query word must occur
+in the entry; the last one may be a prefix, for search-as-you-type.
+"""
+import re
+import threading
+from bisect import bisect_left
+
+# (1), (2), (a), (ia) ... at the start of a line
+_SUBSECTION_RE = re.compile(r'(?:^|\n)(\([0-9a-zA-Z]+\))\s')
+_WORD_RE = re.compile(r"\w+")
+
+WHOLE_SECTION = -1
+
+
+def parse_subsections(content):
+    """
+    Splits section text at (1), (2), (a) ... labels. Returns a list of
+    (label, text); text before the first label is labelled 'Intro'.
+    """
+    parts = _SUBSECTION_RE.split(content or "")
+    subsections = []
+    if parts and parts[0].strip():
+        subsections.append(("Intro", parts[0].strip()))
+    # re.split keeps the captured labels: [intro, label1, text1, label2, text2, ...]
+    for i in range(1, len(parts), 2):
+        text = parts[i + 1].strip() if i + 1 < len(parts) else ""
+        subsections.append((parts[i], text))
+    return subsections
+
+
+def tokenize(text):
+    return _WORD_RE.findall((text or "").lower())
+
+
+class SectionEntry:
+    __slots__ = ("section", "display_text", "subsections")
+
+    def __init__(self, section):
+        self.section = section
+        number = section.get('section_number')
+        title = section.get('title') or 'Unknown Section'
+        self.display_text = f"Section {number} - {title}" if number else title
+        subsections = parse_subsections(section.get('content') or '')
+        # A lone block is not worth a child row
+        self.subsections = subsections if len(subsections) > 1 else []
+
+
+class SectionCatalogue:
+
+    def __init__(self, sections):
+        self.entries = [SectionEntry(sec) for sec in sections]
+        postings = {}
+        for s, entry in enumerate(self.entries):
+            sec = entry.section
+            for word in tokenize(f"{sec.get('section_number') or ''} {sec.get('title') or ''} "
+                                 f"{sec.get('content') or ''}"):
+                postings.setdefault(word, set()).add((s, WHOLE_SECTION))
+            for k, (label, text) in enumerate(entry.subsections):
+                for word in tokenize(f"{label} {text}"):
+                    postings.setdefault(word, set()).add((s, k))
+        self._postings = postings
+        self._words = sorted(postings)
+
+    def __len__(self):
+        return len(self.entries)
+
+    def _prefixed(self, prefix):
+        """Union of the postings of every indexed word starting with prefix."""
+        matched = set()
+        i = bisect_left(self._words, prefix)
+        while i < len(self._words) and self._words[i].startswith(prefix):
+            matched |= self._postings[self._words[i]]
+            i += 1
+        return matched
+
+    def search(self, text):
+        """
+        Entries matching every word of text (the last word as a prefix), or
+        None for an empty query.
+        """
+        words = tokenize(text)
+        if not words:
+            return None
+        # Rarest exact words first keeps the intersection small
+        exact = sorted((self._postings.get(w, set()) for w in dict.fromkeys(words[:-1])), key=len)
+        hits = None
+        for postings in exact:
+            hits = set(postings) if hits is None else hits & postings
+            if not hits:
+                return set()
+        last = self._prefixed(words[-1])
+        return last if hits is None else hits & last
+
+
+# key -> SectionCatalogue
+_catalogues = {}
+_lock = threading.Lock()
+
+
+def get_catalogue(key, loader):
+    """
+    The catalogue for key (e.g. database path and gst_sections revision),
+    built from loader() the first time it is asked for. Catalogues of older
+    keys for the same database are dropped.
+    """
+    with _lock:
+        catalogue = _catalogues.get(key)
+    if catalogue is None:
+        catalogue = SectionCatalogue(loader())
+        with _lock:
+            for stale in [k for k in _catalogues if k[:-1] == key[:-1]]:
+                del _catalogues[stale]
+            catalogue = _catalogues.setdefault(key, catalogue)
+    return catalogue
+
+
+def clear_cache():
+    with _lock:
+        _catalogues.clear()
@@ -0,0 +1,89 @@
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.services.analysis_cache import AnalysisStepCache, TRANSIENT_KEY, step_fingerprint
+from src.services.scrutiny_parser import ScrutinyParser
+
+
+class TestAnalysisCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.eway = self._write("eway.xlsx", b"eway v1")
+        self.gstr9 = self._write("gstr9.pdf", b"gstr9 v1")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def _write(self, name, content):
+        path = os.path.join(self.tmp_dir, name)
+        with open(path, "wb") as f:
+            f.write(content)
+        # Distinct mtime even on coarse filesystems, so the digest memo is refreshed
+        st = os.stat(path)
+        os.utime(path, (st.st_atime, st.st_mtime + len(content)))
+        return path
+
+    def test_fingerprint_follows_content_not_path(self):
+        copy = self._write("renamed.xlsx", b"eway v1")
+        fp = step_fingerprint(files={'eway': [self.eway]})
+        self.assertEqual(fp, step_fingerprint(files={'eway': [copy]}))
+        self._write("eway.xlsx", b"eway v2")
+        self.assertNotEqual(fp, step_fingerprint(files={'eway': [self.eway]}))
+        self.assertNotEqual(fp, step_fingerprint(files={'eway': [self.eway]}, configs={'fy': '2023-24'}))
+
+    def test_transient_results_are_not_stored(self):
+        cache = AnalysisStepCache()
+        cache.store("sop5", "fp", [{"issue_id": "TDS_TCS_MISMATCH", TRANSIENT_KEY: True}], 0)
+        self.assertEqual(cache.recomputed, ["sop5"])
+        self.assertNotIn("sop5", cache.results)
+
+    def test_reanalysis_recomputes_only_changed_steps(self):
+        calls = []
+
+        def fake_step(handler, issue_ids):
+            def run(parser, ctx):
+                calls.append(handler)
+                return [{"issue_id": i, "status": "pass", "total_shortfall": 0} for i in issue_ids], 1
+            return run
+
+        patches = [patch.object(ScrutinyParser, handler, fake_step(handler, issue_ids))
+                   for _, handler, issue_ids, _, _ in ScrutinyParser.ANALYSIS_STEPS]
+        patches.append(patch.object(ScrutinyParser, '_extract_metadata', lambda parser, path: {}))
+        for p in patches:
+            p.start()
+            self.addCleanup(p.stop)
+
+        parser = ScrutinyParser()
+        extra_files = {'eway_bill_summary': self.eway, 'gstr9_yearly': self.gstr9}
+
+        first = parser.parse_file(None, extra_files)
+        self.assertEqual(len(calls), len(ScrutinyParser.ANALYSIS_STEPS))
+
+        calls.clear()
+        second = parser.parse_file(None, extra_files, prior_results=first["analysis_steps"])
+        self.assertEqual(calls, [])
+        self.assertEqual(second["recomputed"], [])
+        self.assertEqual([i["issue_id"] for i in second["issues"]], [i["issue_id"] for i in first["issues"]])
+        self.assertEqual(second["summary"], first["summary"])
+
+        self._write("eway.xlsx", b"eway v2")
+        third = parser.parse_file(None, extra_files, prior_results=second["analysis_steps"])
+        self.assertEqual(calls, ["_step_eway_bill"])
+        self.assertEqual(third["recomputed"], ["EWAY_BILL_MISMATCH"])
+
+        # A schema edit in the admin console invalidates only its own point
+        calls.clear()
+        parser.parse_file(None, extra_files, db_schemas={"ITC_3B_2B_9X4": {"rows": []}},
+                          prior_results=third["analysis_steps"])
+        self.assertEqual(calls, ["_step_gstr9"])
+
+
+if __name__ == '__main__':
+    unittest.main()
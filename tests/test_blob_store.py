@@ -0,0 +1,119 @@
+import os
+import sys
+import json
+import base64
+import shutil
+import sqlite3
+import tempfile
+import unittest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.database.schema import init_db
+from src.database.db_manager import DatabaseManager
+from src.database import blob_store
+
+LETTERHEAD = "data:image/png;base64," + base64.b64encode(os.urandom(6000)).decode("ascii")
+
+
+def _document_html(body):
+    return f'<html><body><img src="{LETTERHEAD}"><p>{body}</p>{"<p>Para</p>" * 200}</body></html>'
+
+
+class TestBlobStore(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.db_file = os.path.join(self.tmp_dir, "blobs.db")
+        init_db(self.db_file)
+
+        self.db = DatabaseManager.__new__(DatabaseManager)
+        self.db.db_path = self.db_file
+        self.db.db_file = self.db_file
+
+        conn = sqlite3.connect(self.db_file)
+        conn.execute("INSERT INTO case_registry (id, source_type) VALUES ('p1', 'ADJUDICATION')")
+        conn.execute("INSERT INTO adjudication_cases (id, gstin, financial_year, workflow_stage) VALUES ('p1', 'G', '2023-24', 10)")
+        conn.commit()
+        conn.close()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def _blob_rows(self):
+        conn = sqlite3.connect(self.db_file)
+        rows = conn.execute("SELECT codec, COUNT(*) FROM content_blobs GROUP BY codec").fetchall()
+        conn.close()
+        return dict(rows)
+
+    def test_documents_share_content_and_letterhead(self):
+        first = self.db.save_document({'proceeding_id': 'p1', 'doc_type': 'SCN', 'content_html': _document_html("A")})
+        self.db.save_document({'proceeding_id': 'p1', 'doc_type': 'SCN', 'content_html': _document_html("A")})
+        self.db.save_document({'proceeding_id': 'p1', 'doc_type': 'ORDER', 'content_html': _document_html("B")})
+
+        # Two distinct bodies, one letterhead image between them
+        self.assertEqual(self._blob_rows(), {'zlib': 2, 'b64': 1})
+
+        listed = self.db.get_documents('p1')
+        self.assertEqual(len(listed), 3)
+        self.assertNotIn('content_html', listed[0])
+        self.assertEqual(self.db.get_document_content(first), _document_html("A"))
+        full = self.db.get_documents('p1', with_content=True)
+        self.assertEqual(sorted(d['content_html'][-300:] for d in full)[0], _document_html("A")[-300:])
+
+        # Short values stay inline
+        short_id = self.db.save_document({'proceeding_id': 'p1', 'doc_type': 'PH', 'content_html': '<p>x</p>'})
+        conn = sqlite3.connect(self.db_file)
+        self.assertEqual(conn.execute("SELECT content_html FROM documents WHERE id = ?", (short_id,)).fetchone()[0], '<p>x</p>')
+        conn.close()
+
+    def test_case_issue_roundtrip_and_legacy_rows(self):
+        data = {'issue': 'ITC mismatch', 'summary_table': {'rows': [{'col0': i} for i in range(200)]}}
+        self.assertTrue(self.db.save_case_issues('p1', [{'issue_id': 'ITC', 'data': data}], stage='DRC-01A'))
+
+        conn = sqlite3.connect(self.db_file)
+        stored = conn.execute("SELECT data_json FROM case_issues").fetchone()[0]
+        self.assertTrue(blob_store.is_ref(stored))
+        # A row written before the store existed is read as is
+        conn.execute("INSERT INTO case_issues (proceeding_id, issue_id, stage, data_json) VALUES ('p1', 'OLD', 'SCN', ?)",
+                     (json.dumps({'issue': 'legacy'}),))
+        conn.commit()
+        conn.close()
+
+        self.assertEqual(self.db.get_case_issues('p1', stage='DRC-01A')[0]['data'], data)
+        self.assertEqual(self.db.get_case_issues('p1', stage='SCN')[0]['data'], {'issue': 'legacy'})
+
+    def test_migration_of_existing_rows(self):
+        html = _document_html("Issued")
+        issue = json.dumps({'issue': 'x' * 5000})
+        conn = sqlite3.connect(self.db_file)
+        conn.execute("INSERT INTO documents (id, proceeding_id, doc_type, content_html) VALUES ('d1', 'p1', 'SCN', ?)", (html,))
+        conn.execute("INSERT INTO documents (id, proceeding_id, doc_type, content_html) VALUES ('d2', 'p1', 'SCN', ?)", (html,))
+        conn.execute("INSERT INTO case_issues (proceeding_id, issue_id, stage, data_json) VALUES ('p1', 'I1', 'DRC-01A', ?)", (issue,))
+        # DRC-01A issued: the immutability trigger must not block the rewrite
+        conn.execute("UPDATE adjudication_cases SET workflow_stage = 40 WHERE id = 'p1'")
+        conn.execute("INSERT INTO content_blobs (hash, codec, raw_size, stored_size, data) VALUES ('orphan', 'zlib', 1, 1, x'00')")
+        conn.commit()
+
+        report = blob_store.migrate(conn)
+        self.assertEqual({c['column']: c['rows'] for c in report['columns']},
+                         {'documents.content_html': 2, 'case_issues.data_json': 1})
+        self.assertEqual(report['garbage_blobs'], 1)
+        self.assertGreater(report['saved_bytes'], len(html))
+        self.assertIn("Space saved by this run", blob_store.format_report(report))
+
+        triggers = {r[0] for r in conn.execute("SELECT name FROM sqlite_master WHERE type = 'trigger' AND tbl_name = 'case_issues'")}
+        self.assertIn('block_drc01a_update', triggers)
+        with self.assertRaises(sqlite3.DatabaseError):
+            conn.execute("UPDATE case_issues SET data_json = '{}' WHERE issue_id = 'I1'")
+
+        cursor = conn.cursor()
+        refs = [r[0] for r in conn.execute("SELECT content_html FROM documents ORDER BY id")]
+        self.assertEqual(refs[0], refs[1])
+        self.assertEqual(blob_store.get_text(cursor, refs[0]), html)
+        self.assertEqual(blob_store.migrate(conn)['columns'], [])
+        conn.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,119 @@
+import os
+import sys
+import json
+import unittest
+from decimal import Decimal
+from unittest import mock
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.utils import calc_runtime
+from src.utils.calc_runtime import CalcLogicError
+
+TEMPLATES = os.path.join(os.path.dirname(__file__), '..', 'data', 'issues_templates.json')
+
+
+class TestCalcRuntime(unittest.TestCase):
+
+    def setUp(self):
+        calc_runtime.clear_cache()
+        self.source = "def compute(v):\n    return {'tax': round(float(v.get('value', 0)) * 0.18, 2)}\n"
+
+    def test_compiled_once_per_source(self):
+        with mock.patch.object(calc_runtime, "compile", wraps=compile, create=True) as compiled:
+            results = [calc_runtime.run(self.source, {"value": value}) for value in (100, 50, 10)]
+        self.assertEqual(results, [{"tax": 18.0}, {"tax": 9.0}, {"tax": 1.8}])
+        self.assertEqual(compiled.call_count, 1)
+
+    def test_errors(self):
+        with self.assertRaises(ZeroDivisionError):
+            calc_runtime.run("def compute(v): return 1 / 0", {})
+        with self.assertRaises(CalcLogicError):
+            calc_runtime.run("x = 1", {})
+        self.assertEqual(calc_runtime.run(self.source, {"value": 1}), {"tax": 0.18})
+
+    def test_batch_reports_errors_per_job(self):
+        with mock.patch.object(calc_runtime, "compile", wraps=compile, create=True) as compiled:
+            results = calc_runtime.run_many([("def compute(v): return 1 / 0", {}), ("x = 1", {}),
+                                             (self.source, {"value": 1}), (self.source, {"value": 2})])
+        self.assertIsInstance(results[0], ZeroDivisionError)
+        self.assertIsInstance(results[1], CalcLogicError)
+        self.assertEqual(results[2:], [{"tax": 0.18}, {"tax": 0.36}])
+        self.assertEqual(compiled.call_count, 3)
+
+    def test_restricted_namespace(self):
+        with self.assertRaises(CalcLogicError):
+            calc_runtime.get_compute("import os\ndef compute(v): return {}")
+        with self.assertRaises(NameError):
+            calc_runtime.run("def compute(v): return {'f': open('x')}", {})
+        ok = "import math\nfrom decimal import Decimal\ndef compute(v): return {'r': math.ceil(v['a']), 'd': Decimal('1.5')}"
+        self.assertEqual(calc_runtime.run(ok, {"a": 1.2}), {"r": 2, "d": Decimal("1.5")})
+
+    def test_escapes_are_rejected_before_compiling(self):
+        escapes = [
+            "def compute(v): return {'x': ().__class__.__base__.__subclasses__()}",
+            "def compute(v): return {'b': __builtins__}",
+            "def compute(v):\n    g = (x for x in [1])\n    return {'f': g.gi_frame.f_back}",
+            "from datetime import sys\ndef compute(v): return {}",
+        ]
+        for source in escapes:
+            with self.assertRaises(CalcLogicError, msg=source):
+                calc_runtime.run(source, {})
+        # Imported modules carry no other modules
+        with self.assertRaises(AttributeError):
+            calc_runtime.run("import datetime\ndef compute(v): return {'m': datetime.sys.modules}", {})
+
+    def test_shipped_templates_compile(self):
+        with open(TEMPLATES, encoding="utf-8") as f:
+            sources = [t["calc_logic"] for t in json.load(f)["issues"] if t.get("calc_logic")]
+        self.assertTrue(sources)
+        for source in sources:
+            self.assertIsInstance(calc_runtime.run(source, {}), dict)
+
+
+
+def _real_qt():
+    """False when an earlier test module has replaced PyQt6 with stand-ins."""
+    try:
+        from PyQt6 import QtWidgets
+    except ImportError:
+        return False
+    return getattr(QtWidgets, "__file__", None) is not None
+
+
+class _Card:
+    def __init__(self, calc_logic, variables, busy=False):
+        self.calc_logic, self.variables, self.busy, self.outcome = calc_logic, variables, busy, "unset"
+
+    def begin_calculation(self):
+        return not self.busy
+
+    def calc_job(self):
+        return (self.calc_logic, self.variables) if self.calc_logic else None
+
+    def finish_calculation(self, outcome=None):
+        self.outcome = outcome
+
+
+@unittest.skipUnless(_real_qt(), "needs the real PyQt6")
+class TestRecalculateIssueCards(unittest.TestCase):
+
+    def test_one_batch_for_all_cards(self):
+        from src.ui.issue_card import recalculate_issue_cards
+
+        source = "def compute(v): return {'tax': v['value'] * 2}"
+        cards = [_Card(source, {"value": 1}), _Card("", {}), _Card(source, {"value": 5}, busy=True),
+                 _Card("def compute(v): return 1 / 0", {}), _Card(source, {"value": 3})]
+        with mock.patch.object(calc_runtime, "run_many", wraps=calc_runtime.run_many) as run_many:
+            recalculate_issue_cards(cards)
+        self.assertEqual(run_many.call_count, 1)
+        self.assertEqual(len(run_many.call_args[0][0]), 3)
+        self.assertEqual(cards[0].outcome, {"tax": 2})
+        self.assertIsNone(cards[1].outcome)
+        self.assertEqual(cards[2].outcome, "unset")  # Already calculating
+        self.assertIsInstance(cards[3].outcome, ZeroDivisionError)
+        self.assertEqual(cards[4].outcome, {"tax": 6})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,84 @@
+import os
+import sys
+import csv
+import shutil
+import sqlite3
+import tempfile
+import unittest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.database.schema import init_db
+from src.database.db_manager import DatabaseManager
+
+
+class TestCaseFileRegister(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.db_file = os.path.join(self.tmp_dir, "case_files.db")
+        init_db(self.db_file)
+
+        self.db = DatabaseManager.__new__(DatabaseManager)
+        self.db.db_path = self.db_file
+        self.db.db_file = self.db_file
+
+        self.csv_path = os.path.join(self.tmp_dir, "case_files.csv")
+        with open(self.csv_path, "w", newline="") as f:
+            w = csv.writer(f)
+            w.writerow(["CaseID", "GSTIN", "Legal Name", "Section", "Status", "SCN_Number", "SCN_Date",
+                        "OIO_Number", "OIO_Date", "Total_Demand", "Updated_At", "SCN_HTML_Path"])
+            w.writerow(["c1", "32AAAAA0001A1Z1", "Alpha", "73", "SCN_ISSUED", "1/2025", "15/03/2025",
+                        "", "", "1,20,000.00", "2025-03-15 10:00:00", "scn1.html"])
+            w.writerow(["c2", "32AAAAA0001A1Z1", "Alpha", "73", "DRC-01A_GENERATED", "", "",
+                        "", "", "", "2025-01-02 09:00:00", ""])
+            w.writerow(["c3", "32AAAAA0003A1Z1", "Gamma", "74", "ORDER_ISSUED", "2/2024", "01/12/2024",
+                        "7/2025", "02/02/2025", "5000", "2025-02-02 12:00:00", ""])
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def test_csv_is_imported_once_with_typed_columns(self):
+        self.assertEqual(self.db.import_case_files_csv(self.csv_path), 3)
+        case = self.db.get_case_file("c1")
+        self.assertEqual(case["SCN_Date"], "2025-03-15")
+        self.assertEqual(case["Total_Demand"], 120000.0)
+        self.assertEqual(case["SCN_HTML_Path"], "scn1.html")  # Non-register column kept
+
+        # Later edits of the retired CSV are not merged again
+        with open(self.csv_path, "a", newline="") as f:
+            csv.writer(f).writerow(["c4", "32AAAAA0004A1Z1", "Delta"])
+        self.assertEqual(self.db.import_case_files_csv(self.csv_path), 0)
+        self.assertEqual(len(self.db.get_all_case_files()), 3)
+
+    def test_registers_filter_and_sort_in_sql(self):
+        self.db.import_case_files_csv(self.csv_path)
+        self.assertEqual([r["CaseID"] for r in self.db.get_scn_register_cases()], ["c1", "c3"])
+        self.assertEqual([r["CaseID"] for r in self.db.get_oio_register_cases()], ["c3"])
+        self.assertEqual([r["CaseID"] for r in self.db.get_drc01a_register_cases()], ["c2"])
+        self.assertEqual(self.db.count_register_rows('scn', filters={'date_from': "2025-01-01"}), 1)
+
+        conn = sqlite3.connect(self.db_file)
+        plan = " ".join(row[3] for row in conn.execute(
+            "EXPLAIN QUERY PLAN SELECT * FROM case_file_register ORDER BY scn_date DESC"))
+        conn.close()
+        self.assertIn("idx_case_file_register_scn_date", plan)
+
+    def test_create_update_and_lookup(self):
+        case_id = self.db._legacy_create_case_file_csv({"GSTIN": "32AAAAA0009A1Z1", "Section": "73",
+                                                       "Status": "DRC-01A_GENERATED", "DRC01A_HTML_Path": "a.html"})
+        ok, _ = self.db.update_case_file(case_id, {"Status": "SCN_ISSUED", "SCN_Date": "05/06/2025",
+                                                   "CGST_Demand": "2,500", "SCN_HTML_Path": "b.html"})
+        self.assertTrue(ok)
+        case = self.db.find_active_case("32AAAAA0009A1Z1", "73")
+        self.assertEqual(case["CaseID"], case_id)
+        self.assertEqual((case["Status"], case["SCN_Date"], case["CGST_Demand"]), ("SCN_ISSUED", "2025-06-05", 2500.0))
+        self.assertEqual((case["DRC01A_HTML_Path"], case["SCN_HTML_Path"]), ("a.html", "b.html"))
+
+        self.assertEqual(self.db.update_case_file("missing", {"Status": "X"}), (False, "Case ID not found"))
+        self.assertTrue(self.db.delete_csv_case(case_id))
+        self.assertIsNone(self.db.get_case_file(case_id))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,103 @@
+import os
+import sys
+import shutil
+import sqlite3
+import tempfile
+import unittest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.database.schema import init_db
+from src.database.db_manager import DatabaseManager
+from src.database import case_stats
+
+
+class TestCaseStats(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.db_file = os.path.join(self.tmp_dir, "stats.db")
+        init_db(self.db_file)
+
+        self.db = DatabaseManager.__new__(DatabaseManager)
+        self.db.db_path = self.db_file
+        self.db.db_file = self.db_file
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def _summary(self):
+        conn = sqlite3.connect(self.db_file)
+        try:
+            return case_stats.summary(conn.cursor())
+        finally:
+            conn.close()
+
+    def assertMatchesRebuild(self):
+        """The trigger-maintained tables must equal a recount from scratch."""
+        live = self._summary()
+        conn = sqlite3.connect(self.db_file)
+        case_stats.rebuild(conn.cursor())
+        conn.commit()
+        conn.close()
+        self.assertEqual(live, self._summary())
+        return live
+
+    def _proceeding(self, fy="2023-24"):
+        return self.db.create_proceeding({"gstin": "32AAAAA0000A1Z5", "financial_year": fy, "form_type": "ASMT-10"})
+
+    def test_counts_follow_create_update_delete(self):
+        first, second = self._proceeding(), self._proceeding("2022-23")
+        stats = self.assertMatchesRebuild()
+        self.assertEqual(stats["cases"]["SCRUTINY"], 2)
+        self.assertEqual(stats["by_year"]["SCRUTINY"], {"2023-24": 1, "2022-23": 1})
+
+        self.db.update_proceeding(first, {"status": "Issued", "workflow_stage": 20})
+        stats = self.assertMatchesRebuild()
+        self.assertEqual(stats["by_status"]["SCRUTINY"], {"Issued": 1, "Draft": 1})
+        self.assertEqual(stats["by_stage"]["SCRUTINY"], {20: 1, 10: 1})
+
+        self.db.delete_proceeding(second)
+        stats = self.assertMatchesRebuild()
+        self.assertEqual(stats["cases"]["SCRUTINY"], 1)
+
+    def test_demand_totals_by_stage_and_year(self):
+        pid = self._proceeding()
+        self.db.save_case_issues(pid, [{"issue_id": "A", "data": {"amount": 1000}},
+                                       {"issue_id": "B", "data": {"total_shortfall": 250}}], stage="DRC-01A")
+        stats = self.assertMatchesRebuild()
+        self.assertEqual(stats["demand"]["ISSUES"], {"DRC-01A": 1250})
+        self.assertEqual(stats["demand_by_year"]["ISSUES"], {"2023-24": 1250})
+
+        # Re-saving replaces the stage's lines instead of adding to them
+        self.db.save_case_issues(pid, [{"issue_id": "A", "data": {"amount": 400}}], stage="DRC-01A")
+        self.assertEqual(self.assertMatchesRebuild()["demand"]["ISSUES"], {"DRC-01A": 400})
+
+        # Correcting the financial year moves the case's demand with it
+        self.db.update_proceeding(pid, {"financial_year": "2021-22"})
+        self.assertEqual(self.assertMatchesRebuild()["demand_by_year"]["ISSUES"], {"2021-22": 400})
+
+    def test_scn_demand_comes_from_demand_columns(self):
+        pid = self._proceeding()
+        breakdown = {"CGST": {"tax": 500, "interest": 50, "penalty": 50},
+                     "SGST": {"tax": 500, "interest": 25, "penalty": 25}}
+        self.db.save_scn_issue_snapshot(pid, [
+            {"issue_id": "A", "data": {"tax_breakdown": breakdown}},
+            {"issue_id": "B", "data": {"tax_breakdown": {"IGST": {"tax": 700}}, "is_included": False}},
+        ])
+        self.assertEqual(self.db.get_issue_demand_totals(pid, "SCN")["total"], 1150)
+        stats = self.assertMatchesRebuild()
+        self.assertEqual(self.db.get_case_statistics()["demand"]["ISSUES"], {"SCN": 1150})
+        self.assertEqual(stats["demand_items"]["ISSUES"], {"SCN": 1})  # Dropped cards are not demand lines
+
+    def test_case_file_register(self):
+        for section, status, demand in (("73", "Open", "1,00,000.50"), ("74", "Closed", "")):
+            self.db._legacy_create_case_file_csv({"Section": section, "Status": status,
+                                                  "Financial_Year": "2023-24", "Total_Demand": demand})
+        stats = self.assertMatchesRebuild()
+        self.assertEqual(stats["by_form_type"]["CASE_FILE"], {"73": 1, "74": 1})
+        self.assertEqual(stats["demand"]["CASE_FILE"], {"": 100000.5})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,120 @@
+import os
+import sys
+import shutil
+import tempfile
+import threading
+import unittest
+from multiprocessing import AuthenticationError
+from unittest.mock import patch
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.database.schema import init_db
+from src.database.db_manager import DatabaseManager
+from src.database import db_service
+from src.database.db_service import DatabaseService, DatabaseClient, configured_service, is_read
+
+KEY = b"test-office-key"
+
+
+class TestDatabaseService(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.db_file = os.path.join(self.tmp_dir, "shared.db")
+        init_db(self.db_file)
+        self.service = DatabaseService(self.db_file, ("127.0.0.1", 0), KEY, pool_size=2)
+        self.service.start()
+
+    def tearDown(self):
+        self.service.close()
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def _client(self):
+        client = DatabaseClient(self.service.address, KEY)
+        self.addCleanup(client.close)
+        return client
+
+    def test_oc_allocation_is_serialised_across_clients(self):
+        issued, lock = [], threading.Lock()
+
+        def desk():
+            client = self._client()
+            for _ in range(5):
+                numbers = client.allocate_oc_numbers("2025", 2)
+                with lock:
+                    issued.extend(numbers)
+
+        desks = [threading.Thread(target=desk) for _ in range(4)]
+        for t in desks:
+            t.start()
+        for t in desks:
+            t.join()
+
+        self.assertEqual(len(set(issued)), 40)
+        self.assertEqual(self._client().get_next_oc_number("2025"), 41)
+        self.assertLessEqual(self.service.pool._idle.qsize(), 2)
+
+    def test_batched_writes_and_errors(self):
+        client = self._client()
+        with client.batch() as results:
+            for n in range(1, 4):
+                self.assertIsNone(client.add_oc_entry(None, {'OC_Number': f'{n}/2025', 'OC_To': 'X'}, is_issuance=True))
+        self.assertEqual(results, ['1/2025', '2/2025', '3/2025'])
+        self.assertEqual(len(client.get_oc_register_entries()), 3)
+
+        # Validation errors raised on the server reach the caller
+        with self.assertRaisesRegex(ValueError, "Illegal OC Register Write"):
+            client.add_oc_entry(None, {'OC_Number': '9/2025'})
+        with self.assertRaises(AttributeError):
+            client._get_conn()
+
+    def test_wrong_key_is_rejected(self):
+        with self.assertRaises(AuthenticationError):
+            DatabaseClient(self.service.address, b"wrong").get_next_oc_number("2025")
+        self.assertEqual(self._client().get_next_oc_number("2025"), 1)
+
+    def test_only_listed_methods_skip_the_writer_lock(self):
+        for name in db_service.READ_ONLY_METHODS:
+            self.assertTrue(callable(getattr(DatabaseManager, name, None)), name)
+        # Getters that sync a CSV mirror or rebuild the handbook index write
+        for name in ("count_register_rows", "fetch_register_page", "iter_register_rows", "search_handbook",
+                     "get_scn_register_cases", "add_oc_entry"):
+            self.assertFalse(is_read(name), name)
+
+    def test_generators_are_streamed_in_chunks(self):
+        client = self._client()
+        with client.batch():
+            for n in range(1, 251):
+                client.add_oc_entry(None, {'OC_Number': f'{n}/2025', 'OC_Date': '2025-04-01'}, is_issuance=True)
+
+        sent = []
+        real_send = db_service._Stream.send_to
+
+        def send_to(stream, conn):
+            real_send(stream, type("Recorder", (), {"send": lambda _, msg: (sent.append(msg[0]), conn.send(msg))})())
+
+        with patch.object(db_service, "STREAM_CHUNK", 100), patch.object(db_service._Stream, "send_to", send_to):
+            rows = client.iter_register_rows("oc")
+            first = next(rows)
+            # The stream has its own connection: other calls go through meanwhile
+            self.assertEqual(client.get_next_oc_number("2025"), 251)
+            numbers = [first["OC_Number"]] + [r["OC_Number"] for r in rows]
+        self.assertEqual(sorted(numbers, key=lambda n: int(n.split("/")[0])), [f"{n}/2025" for n in range(1, 251)])
+        self.assertEqual(sent, ["chunk", "chunk", "chunk", "ok"])
+
+    def test_manager_returns_client_in_service_mode(self):
+        host, port = self.service.address
+        env = {"GST_DB_SERVICE": f"{host}:{port}", "GST_DB_SERVICE_KEY": KEY.decode()}
+        with patch.dict(os.environ, env):
+            self.assertEqual(configured_service(), ((host, port), KEY))
+            client = DatabaseManager()
+            self.addCleanup(client.close)
+            self.assertIsInstance(client, DatabaseClient)
+            self.assertEqual(client.allocate_oc_numbers("2026"), ["1/2026"])
+        with patch.dict(os.environ, {"GST_DB_SERVICE": ""}):
+            self.assertIsNone(configured_service())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,170 @@
+import os
+import sys
+import io
+import json
+import subprocess
+import unittest
+from contextlib import redirect_stdout
+from unittest import mock
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.services import document_service
+from src.services.document_service import DocumentService, aggregate_tax_rows
+
+GRID = {
+    "columns": [{"id": "col0", "label": "Description"}, {"id": "col1", "label": "CGST"}, {"id": "col2", "label": "SGST"}],
+    "rows": [{"col0": {"value": "Excess ITC"}, "col1": {"var": "row1_cgst"}, "col2": {"var": "row1_sgst"}}],
+}
+
+TEMPLATE = {
+    "issue_id": "SOP-3",
+    "issue_name": "Excess ITC",
+    "templates": {"brief_facts_scn": "<p>{{ taxpayer_name }} availed ITC in excess (see SOP-3).</p>"},
+    "grid_data": GRID,
+}
+
+
+class FakeDB:
+    """The handful of DatabaseManager reads the service uses."""
+
+    def __init__(self, proceeding, issues):
+        self.proceeding = proceeding
+        self.issues = issues
+
+    def get_proceeding(self, pid):
+        return dict(self.proceeding) if pid == self.proceeding["id"] else None
+
+    def get_case_issues(self, pid, stage="SCN"):
+        return [dict(r) for r in self.issues.get(stage, [])]
+
+    def get_issue(self, issue_id):
+        return None
+
+    def get_officer_by_id(self, officer_id):
+        return {"name": "Live Officer", "designation": "Superintendent", "jurisdiction": "Aluva Range"}
+
+
+def _proceeding(**extra):
+    proceeding = {
+        "id": "P1",
+        "case_id": "CASE/2025/ADJ/0001",
+        "gstin": "32AAAAA0000A1Z5",
+        "legal_name": "Alpha Traders",
+        "financial_year": "2023-24",
+        "adjudication_section": "Section 73",
+        "issuing_officer_id": 3,
+        "taxpayer_details": {"Address": "Kochi"},
+        "issuing_officer_snapshot": json.dumps({"DRC-01A": {"name": "A. Officer", "designation": "Inspector",
+                                                            "jurisdiction": "Paravur Range"}}),
+        "additional_details": {
+            "drc01a_metadata": {"oc_number": "12/2025", "oc_date": "2025-06-02",
+                                "reply_date": "2025-06-30", "payment_date": "2025-06-20"},
+            "scn_metadata": {"scn_number": "7", "scn_oc_number": "40/2025", "scn_date": "2025-09-01",
+                             "reliance_documents": "<p>GSTR-3B</p><p>GSTR-2A</p>"},
+        },
+    }
+    proceeding.update(extra)
+    return proceeding
+
+
+class TestDocumentService(unittest.TestCase):
+
+    def setUp(self):
+        drc_issue = {"issue_id": "SOP-3", "data": {
+            "content": "<html><body><p>Brief facts of the issue.</p></body></html>",
+            "facts": {"row1_cgst": 500, "row1_sgst": 500},
+            "tax_breakdown": {"CGST": {"tax": 500, "interest": 50, "penalty": 0},
+                              "SGST": {"tax": 500, "interest": 50, "penalty": 0}},
+            "table_data": GRID,
+            "is_included": True,
+        }}
+        excluded = {"issue_id": "SOP-9", "data": {"content": "<p>Dropped</p>", "is_included": False,
+                                                  "tax_breakdown": {"IGST": {"tax": 999}}}}
+        scn_issue = {"issue_id": "SOP-3", "data": {
+            "values": {"row1_cgst": 700, "row1_sgst": 700},
+            "table_data": GRID,
+            "template_snapshot": TEMPLATE,
+        }}
+        self.db = FakeDB(_proceeding(), {"DRC-01A": [drc_issue, excluded], "SCN": [scn_issue]})
+        self.service = DocumentService(self.db)
+
+    def test_tax_rows_follow_act_order(self):
+        rows, total = aggregate_tax_rows([{"SGST": {"tax": 5}, "IGST": {"tax": 1, "penalty": 2}},
+                                          {"SGST": {"tax": 5, "interest": 1}}], "2023-24")
+        self.assertEqual([r["act"] for r in rows], ["IGST", "SGST"])
+        self.assertEqual(rows[1], {"act": "SGST", "period": "2023-24", "tax": 10, "interest": 1,
+                                   "penalty": 0, "total": 11})
+        self.assertEqual(total, 14)
+
+    def test_drc01a_model_from_saved_draft(self):
+        model = self.service.drc01a_model("P1")
+        self.assertEqual(model["oc_no"], "12/2025")
+        self.assertEqual(model["oc_date"], "02/06/2025")
+        self.assertEqual(model["section_base"], "73")
+        self.assertEqual(model["grand_total_liability"], 1100)
+        self.assertEqual([r["act"] for r in model["tax_rows"]], ["CGST", "SGST"])
+        self.assertIn("Brief facts of the issue.", model["issues_html"])
+        self.assertNotIn("Dropped", model["issues_html"])
+        self.assertIn("Calculation Table", model["issues_html"])
+        self.assertEqual(model["officer_name"], "A. Officer")
+        self.assertIn("20/06/2025", model["advice_paragraph"])
+
+        html = self.service.render_html("DRC-01A", "P1")
+        self.assertIn("12/2025", html)
+        self.assertIn("Alpha Traders", html)
+
+    def test_drc01a_needs_a_section(self):
+        self.db.proceeding = _proceeding(adjudication_section="", initiating_section="")
+        with self.assertRaises(ValueError):
+            self.service.drc01a_model("P1")
+
+    def test_scn_model_rebuilt_from_case_issues(self):
+        model = self.service.scn_model("P1")
+        self.assertEqual(model["issue_date"], "01/09/2025")
+        self.assertEqual(model["current_financial_year"], "2025-26")
+        self.assertEqual(model["scn_no"], "7")
+        self.assertEqual(model["reliance_documents"], ["GSTR-3B", "GSTR-2A"])
+        # No SCN entry in the snapshot: the live officer record is used
+        self.assertEqual(model["officer_name"], "Live Officer")
+
+        issue = model["issues"][0]
+        self.assertEqual(issue["title"], "Excess ITC")
+        self.assertIn("Alpha Traders availed ITC", issue["paras"][0])
+        self.assertIn("issue 1", issue["paras"][0])
+        self.assertEqual(model["total_amount"], "1,400")
+        self.assertEqual(model["para_demand"], 4)
+
+        html = self.service.render_html("SCN", "P1")
+        self.assertIn("Issue No. 1: Excess ITC", html)
+
+    def test_saved_scn_snapshot_wins(self):
+        details = _proceeding()["additional_details"]
+        details["scn_metadata"]["scn_model_snapshot"] = {"issues": [], "scn_no": "SNAP"}
+        self.db.proceeding = _proceeding(additional_details=details)
+        self.assertEqual(self.service.scn_model("P1")["scn_no"], "SNAP")
+        self.assertEqual(self.service.scn_model("P1", use_snapshot=False)["scn_no"], "7")
+
+    def test_cli_all_with_no_cases(self):
+        self.db.get_document_case_ids = lambda doc_type: []
+
+        def init_worker(db_path):
+            document_service._service = self.service
+
+        out = io.StringIO()
+        with mock.patch.object(document_service, "_init_worker", init_worker), redirect_stdout(out):
+            self.assertEqual(document_service.main(["scn", "--all"]), 0)
+            self.assertEqual(document_service.main(["scn"]), 1)
+        self.assertEqual(out.getvalue().splitlines(), ["No cases have a SCN document.",
+                                                       "No cases given (pass case ids or --all)."])
+
+    def test_service_does_not_load_qt(self):
+        code = ("import sys; import src.services.document_service, src.services.asmt10_generator; "
+                "print(any(m.startswith('PyQt6') for m in sys.modules))")
+        root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+        out = subprocess.run([sys.executable, "-c", code], cwd=root, capture_output=True, text=True)
+        self.assertEqual(out.stdout.strip().splitlines()[-1], "False", out.stderr)
+
+
+if __name__ == '__main__':
+    unittest.main()
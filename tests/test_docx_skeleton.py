@@ -0,0 +1,117 @@
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+import zipfile
+from unittest import mock
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from docx import Document
+
+from src.utils import docx_skeleton, document_generator
+from src.utils.docx_skeleton import paragraph, run, table
+
+LETTERHEAD = os.path.join(os.path.dirname(__file__), '..', 'templates', 'letterheads', 'PARAVUR LETTER HEAD only.docx')
+
+
+class TestDocxSkeleton(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        docx_skeleton.clear_cache()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def test_fragments_are_spliced_before_section_properties(self):
+        path = os.path.join(self.tmp_dir, "out.docx")
+        docx_skeleton.blank().save(path, [
+            paragraph(run("Title <&>", bold=True, size=16), align="center"),
+            paragraph(run("1. ", bold=True), "first\nsecond\x0b", align="justify"),
+            table([["Act", "Tax"], ["CGST", 100], ["SGST"]]),
+        ], margins={"top": 0.8, "left": 1})
+
+        doc = Document(path)
+        self.assertEqual([p.text for p in doc.paragraphs], ["Title <&>", "1. first\nsecond"])
+        self.assertTrue(doc.paragraphs[0].runs[0].bold)
+        self.assertEqual(doc.paragraphs[0].runs[0].font.size.pt, 16)
+        self.assertEqual([[c.text for c in r.cells] for r in doc.tables[0].rows],
+                         [["Act", "Tax"], ["CGST", "100"], ["SGST", ""]])
+        self.assertEqual((doc.sections[0].top_margin.inches, doc.sections[0].left_margin.inches), (0.8, 1.0))
+
+    def test_plain_strings_are_always_text(self):
+        xml = paragraph("<w:r><w:t>injected</w:t></w:r>", run("ok"), style='x"y')
+        self.assertIn("&lt;w:r&gt;&lt;w:t&gt;injected", xml)
+        self.assertIn('w:val="x&quot;y"', xml)
+        self.assertEqual(xml.count("<w:r>"), 2)
+
+    def _package(self, body):
+        path = os.path.join(self.tmp_dir, "in.docx")
+        with zipfile.ZipFile(LETTERHEAD) as src, zipfile.ZipFile(path, "w") as out:
+            for name in src.namelist():
+                content = src.read(name)
+                if name == "word/document.xml":
+                    text = content.decode("utf-8")
+                    start = text.index("<w:body>") + len("<w:body>")
+                    content = (text[:start] + body + text[text.index("</w:body>"):]).encode("utf-8")
+                out.writestr(name, content)
+        return path
+
+    def test_body_section_properties_forms(self):
+        cases = [
+            ("<w:p/><w:sectPr/>", "<w:p/>"),
+            ('<w:p/><w:sectPr w:rsidR="1"/>\n', "<w:p/>"),
+            ('<w:p/><w:sectPr><w:pgSz w:w="11906"/><w:sectPrChange w:id="1"><w:sectPr/></w:sectPrChange></w:sectPr>',
+             "<w:p/>"),
+            ('<w:p><w:pPr><w:sectPr/></w:pPr></w:p><w:p/>', '<w:p><w:pPr><w:sectPr/></w:pPr></w:p><w:p/>'),
+        ]
+        for body, head in cases:
+            skeleton = docx_skeleton.DocxSkeleton(self._package(body))
+            self.assertTrue(skeleton._head.endswith("<w:body>" + head), body)
+            self.assertTrue(skeleton._tail.startswith(body[len(head):] + "</w:body>"), body)
+
+    def test_letterhead_parsed_once_and_kept_intact(self):
+        letterhead = os.path.join(self.tmp_dir, "letterhead.docx")
+        shutil.copy(LETTERHEAD, letterhead)
+        skeleton = docx_skeleton.load(letterhead)
+        self.assertIs(docx_skeleton.load(letterhead), skeleton)
+
+        path = skeleton.save(os.path.join(self.tmp_dir, "out.docx"), [paragraph("Body text")])
+        with zipfile.ZipFile(letterhead) as original, zipfile.ZipFile(path) as written:
+            self.assertEqual(original.namelist(), written.namelist())
+            for name in original.namelist():
+                if name != "word/document.xml":
+                    self.assertEqual(original.read(name), written.read(name), name)
+        doc = Document(path)
+        self.assertEqual(doc.paragraphs[-1].text, "Body text")
+        self.assertFalse(doc.sections[-1].footer.is_linked_to_previous)  # Footer reference kept
+
+        # A changed letterhead is parsed again
+        with zipfile.ZipFile(letterhead, "a") as z:
+            z.writestr("docProps/custom-note.txt", "x")
+        self.assertIsNot(docx_skeleton.load(letterhead), skeleton)
+
+    def test_generate_word_from_docx_uses_letterhead_skeleton(self):
+        data = {'form_type': 'DRC-07', 'date': '01/04/2025', 'gstin': '32AAAAA0000A1Z5',
+                'legal_name': 'Alpha & Sons', 'address': 'Paravur', 'proceeding_type': 'Section 73',
+                'facts': 'Short payment of tax.',
+                'tax_data': [{'Act': 'CGST', 'From': '04/2023', 'To': '03/2024', 'Tax': 1000,
+                              'Interest': 10, 'Penalty': 100, 'Total': 1110}]}
+        with mock.patch.object(document_generator, "OUTPUT_DIR", self.tmp_dir):
+            path = document_generator.DocumentGenerator().generate_word_from_docx(LETTERHEAD, data, "DRC07")
+
+        doc = Document(path)
+        texts = [p.text for p in doc.paragraphs]
+        start = texts.index("NOTICE: DRC-07")
+        self.assertEqual(texts[start + 1:start + 7], [
+            "Date: 01/04/2025", "GSTIN: 32AAAAA0000A1Z5", "Legal Name: Alpha & Sons",
+            "Address: Paravur", "Subject: Notice under Section 73", "Short payment of tax.",
+        ])
+        self.assertEqual([c.text for c in doc.tables[-1].rows[1].cells],
+                         ["CGST", "04/2023", "03/2024", "1000", "10", "100", "1110"])
+
+
+if __name__ == '__main__':
+    unittest.main()
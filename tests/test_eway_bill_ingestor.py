@@ -0,0 +1,143 @@
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import openpyxl
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.services.eway_bill_ingestor import aggregate_eway_bills, map_columns
+from src.services.scrutiny_parser import ScrutinyParser
+from src.utils.date_utils import fy_months, return_period_to_month
+
+HEADER = ["EWB No", "EWB Date", "Supply Type", "Doc Date", "From GSTIN", "To GSTIN",
+          "Assessable Value", "CGST", "SGST", "IGST", "CESS", "Status"]
+
+ROWS = [
+    ["1", "02/04/2023 10:00:00 AM", "Outward", "01/04/2023", "32AAAAA0000A1Z5", "32BBBBB1111B1Z5", "1,000", "90", "90", "0", "0", "Active"],
+    ["2", "03/04/2023 11:00:00 AM", "Outward", "2023-04-15", "32AAAAA0000A1Z5", "29CCCCC2222C1Z5", "2000", "0", "0", "360", "0", "Active"],
+    ["3", "05/05/2023 09:00:00 AM", "Outward", "04/05/2023", "32AAAAA0000A1Z5", "32BBBBB1111B1Z5", "500", "45", "45", "0", "0", "Active"],
+    ["4", "06/05/2023 09:00:00 AM", "Outward", "06/05/2023", "32AAAAA0000A1Z5", "32BBBBB1111B1Z5", "9999", "900", "900", "0", "0", "Cancelled"],
+    ["5", "07/05/2023 09:00:00 AM", "Inward", "07/05/2023", "33DDDDD3333D1Z5", "32AAAAA0000A1Z5", "7777", "0", "0", "1400", "0", "Active"],
+]
+
+
+class TestEwayBillIngestor(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def _csv(self):
+        path = os.path.join(self.tmp_dir, "ewb.csv")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("E-Way Bill Report\nGSTIN: 32AAAAA0000A1Z5\n")
+            for row in [HEADER] + ROWS:
+                f.write(",".join(f'"{v}"' for v in row) + "\n")
+        return path
+
+    def _xlsx(self):
+        path = os.path.join(self.tmp_dir, "ewb.xlsx")
+        wb = openpyxl.Workbook()
+        ws = wb.active
+        ws.append(["E-Way Bill Report"])
+        ws.append(HEADER)
+        for row in ROWS:
+            ws.append(row)
+        wb.save(path)
+        return path
+
+    def _assert_totals(self, res):
+        self.assertEqual(res["rows"], 5)
+        self.assertEqual(res["skipped"], {"cancelled": 1, "inward": 1, "undated": 0, "outside_fy": 0})
+        self.assertEqual(res["total_taxable"], 3500.0)
+        self.assertEqual(res["total_tax"], 630.0)
+        self.assertEqual(list(res["months"]), ["2023-04", "2023-05"])
+        self.assertEqual(res["months"]["2023-04"]["tax"], 540.0)
+        self.assertEqual(res["months"]["2023-05"]["taxable"], 500.0)
+        self.assertEqual(res["counterparties"]["32BBBBB1111B1Z5"]["bills"], 2)
+        self.assertEqual(res["counterparties"]["29CCCCC2222C1Z5"]["igst"], 360.0)
+
+    def test_csv_is_read_in_chunks(self):
+        # Chunks smaller than the file exercise the running merge
+        self._assert_totals(aggregate_eway_bills(self._csv(), chunk_rows=2))
+
+    def test_xlsx_is_read_in_chunks(self):
+        self._assert_totals(aggregate_eway_bills(self._xlsx(), chunk_rows=2))
+
+    def test_header_mapping(self):
+        cols = map_columns(HEADER)
+        self.assertEqual(cols["date"], 3)
+        self.assertEqual(cols["gstin"], 5)
+        self.assertEqual(cols["taxable"], 6)
+        self.assertIsNone(map_columns(["Sl No", "Remarks"]))
+
+    def test_return_period_to_month(self):
+        self.assertEqual(return_period_to_month("April 2023-24"), "2023-04")
+        self.assertEqual(return_period_to_month("February 2023-24"), "2024-02")
+        self.assertEqual(return_period_to_month("March-2024"), "2024-03")
+        self.assertIsNone(return_period_to_month("2023-24"))
+
+    def test_sop6_compares_months_against_3b(self):
+        path = self._csv()
+        pdfs = []
+        for name in ("apr.pdf", "may.pdf"):
+            pdfs.append(os.path.join(self.tmp_dir, name))
+            open(pdfs[-1], "w").close()
+        periods = {pdfs[0]: "April 2023-24", pdfs[1]: "May 2023-24"}
+        table_3_1_a = {
+            pdfs[0]: {"taxable_value": 3000.0, "igst": 360.0, "cgst": 90.0, "sgst": 90.0, "cess": 0.0},
+            pdfs[1]: {"taxable_value": 300.0, "igst": 0.0, "cgst": 20.0, "sgst": 20.0, "cess": 0.0},
+        }
+
+        parser = ScrutinyParser()
+        with patch("src.services.scrutiny_parser.parse_gstr3b_metadata", side_effect=lambda p: {"return_period": periods[p]}), \
+             patch("src.services.scrutiny_parser.parse_gstr3b_pdf_table_3_1_a", side_effect=lambda p: {"parsed": True, "data": table_3_1_a[p]}):
+            res = parser._parse_eway_bill_liability(path, pdfs)
+
+        # April matches; May e-way bills carry 90 tax against 40 in 3B
+        self.assertEqual(res["total_shortfall"], 50)
+        self.assertEqual(res["status"], "alert")
+        labels = [row["col0"]["value"] for row in res["summary_table"]["rows"]]
+        self.assertEqual(labels, ["Apr 2023", "May 2023", "Total"])
+        self.assertEqual(res["summary_table"]["rows"][1]["col5"]["value"], 50.0)
+        self.assertEqual(res["facts"]["top_counterparties"][0]["gstin"], "29CCCCC2222C1Z5")
+
+    def test_bills_outside_the_case_fy_are_left_out(self):
+        self.assertEqual(fy_months("2023-24")[::11], ["2023-04", "2024-03"])
+        res = aggregate_eway_bills(self._csv(), fy="2022-23")
+        self.assertEqual((res["months"], res["total_tax"]), ({}, 0.0))
+        self.assertEqual(res["skipped"]["outside_fy"], 3)
+        self.assertEqual(aggregate_eway_bills(self._csv(), fy="2023-24")["total_tax"], 630.0)
+
+    def test_sop6_months_without_3b_are_not_compared(self):
+        path = os.path.join(self.tmp_dir, "apr.pdf")
+        open(path, "w").close()
+        parser = ScrutinyParser()
+        with patch("src.services.scrutiny_parser.parse_gstr3b_metadata", return_value={"return_period": "April 2023-24"}), \
+             patch("src.services.scrutiny_parser.parse_gstr3b_pdf_table_3_1_a",
+                   return_value={"parsed": True, "data": {"taxable_value": 3000.0, "igst": 360.0, "cgst": 90.0, "sgst": 90.0}}):
+            res = parser._parse_eway_bill_liability(self._csv(), [path], fy="2023-24")
+
+        # May has e-way bills but no 3B: not a shortfall
+        self.assertEqual(res["total_shortfall"], 0)
+        self.assertEqual(res["status"], "pass")
+        rows = res["summary_table"]["rows"]
+        self.assertEqual([r["col0"]["value"] for r in rows], ["Apr 2023", "May 2023", "Total (compared months)"])
+        self.assertEqual(rows[1]["col5"]["value"], "Not compared")
+        self.assertEqual(rows[2]["col2"]["value"], 540.0)
+        self.assertIn("May 2023", res["analysis_meta"]["warnings"][0])
+
+    def test_sop6_without_3b_is_info(self):
+        res = ScrutinyParser()._parse_eway_bill_liability(self._csv(), [])
+        self.assertEqual(res["status"], "info")
+        self.assertEqual(res["facts"]["eway_bill"]["tax"], 630.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,93 @@
+import os
+import sys
+import shutil
+import tempfile
+import threading
+import unittest
+from unittest.mock import patch
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.services.export_jobs import ExportJobQueue, DONE, FAILED, QUEUED, RUNNING
+from src.utils.document_generator import DocumentGenerator
+
+
+class TestExportJobs(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.events = []
+        self.finished = threading.Semaphore(0)
+
+        def listener(job):
+            self.events.append((job.id, job.status))
+            if job.status in (DONE, FAILED):
+                self.finished.release()
+
+        self.queue = ExportJobQueue(max_workers=2, listener=listener)
+
+    def tearDown(self):
+        self.queue.shutdown(wait=True)
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def _wait(self, count=1):
+        for _ in range(count):
+            self.assertTrue(self.finished.acquire(timeout=10))
+
+    def test_failed_pdf_retries_from_the_same_snapshot(self):
+        rendered = []
+
+        def fake_render(generator, html, filename):
+            rendered.append((html, filename))
+            if len(rendered) == 1:
+                raise RuntimeError("TIMEOUT")
+            path = os.path.join(self.tmp_dir, filename + ".pdf")
+            with open(path, "w") as f:
+                f.write(html)
+            return path
+
+        target = os.path.join(self.tmp_dir, "out", "SCN_1.pdf")
+        with patch.object(DocumentGenerator, "generate_pdf_from_html", fake_render):
+            job = self.queue.submit_pdf("SCN PDF", "<p>snapshot</p>", target)
+            self._wait()
+            self.assertEqual(job.status, FAILED)
+            self.assertIn("20s limit", job.error)
+            self.assertFalse(os.path.exists(target))
+
+            self.assertIs(self.queue.retry(job.id), job)
+            self._wait()
+
+        self.assertEqual(job.status, DONE)
+        self.assertEqual(job.attempts, 2)
+        self.assertEqual([html for html, _ in rendered], ["<p>snapshot</p>"] * 2)
+        with open(target) as f:
+            self.assertEqual(f.read(), "<p>snapshot</p>")
+        self.assertEqual([s for _, s in self.events], [QUEUED, RUNNING, FAILED, QUEUED, RUNNING, DONE])
+        self.assertIsNone(self.queue.retry(job.id))
+
+    def test_jobs_run_concurrently_and_failed_builds_leave_no_file(self):
+        both_running = threading.Barrier(2, timeout=10)
+
+        def build(path):
+            both_running.wait()
+            with open(path, "w") as f:
+                f.write("docx")
+
+        def broken(path):
+            raise ValueError("bad model")
+
+        first = self.queue.submit_file("A", build, os.path.join(self.tmp_dir, "a.docx"))
+        second = self.queue.submit_file("B", build, os.path.join(self.tmp_dir, "b.docx"))
+        third = self.queue.submit_file("C", broken, os.path.join(self.tmp_dir, "c.docx"))
+        self._wait(3)
+
+        self.assertEqual((first.status, second.status, third.status), (DONE, DONE, FAILED))
+        self.assertEqual(third.error, "bad model")
+        self.assertEqual(sorted(os.listdir(self.tmp_dir)), ["a.docx", "b.docx"])
+        self.assertEqual(self.queue.active_count(), 0)
+        self.queue.clear_finished()
+        self.assertEqual([j.id for j in self.queue.jobs()], [third.id])
+
+
+if __name__ == '__main__':
+    unittest.main()
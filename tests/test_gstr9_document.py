@@ -0,0 +1,126 @@
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import fitz
+from src.services.gstr9_document import GSTR9Document, load_gstr9_document
+
+SAMPLE_PDF = os.path.join(os.path.dirname(__file__), '..', "GST_39_GSTR9_32AAALC0844J1ZJ_032023 filed on 31-12-2023.pdf")
+
+
+def _right(page, x1, y, text, size=9):
+    """Right-aligns an amount at x1 like the GST portal PDFs do."""
+    width = fitz.get_text_length(text, fontsize=size)
+    page.insert_text((x1 - width, y), text, fontsize=size)
+
+
+class TestGSTR9Document(unittest.TestCase):
+
+    def setUp(self):
+        fd, self.pdf_path = tempfile.mkstemp(suffix=".pdf")
+        os.close(fd)
+        doc = fitz.open()
+
+        # Page 1: metadata + Table 4 header
+        p1 = doc.new_page(width=842, height=595)
+        p1.insert_text((45, 140), "1. Financial Year", fontsize=9)
+        p1.insert_text((537, 140), "2022-23", fontsize=9)
+        p1.insert_text((45, 160), "2. GSTIN", fontsize=9)
+        p1.insert_text((537, 160), "32AAALC0844J1ZJ", fontsize=9)
+        p1.insert_text((45, 200), "Pt. III", fontsize=9)
+        p1.insert_text((45, 220), "Sr.No", fontsize=9)
+        p1.insert_text((266, 220), "Details", fontsize=9)
+        for x, cap in [(512, "Central Tax"), (590, "State Tax"), (680, "Integrated"), (756, "Cess")]:
+            p1.insert_text((x, 220), cap, fontsize=9)
+        for x, n in [(281, "1"), (528, "2"), (615, "3"), (704, "4"), (773, "5")]:
+            p1.insert_text((x, 240), n, fontsize=9)
+        p1.insert_text((56, 260), "8", fontsize=9)
+        p1.insert_text((362, 260), "Other ITC related information", fontsize=9)
+
+        p1.insert_text((56, 280), "A", fontsize=9)
+        p1.insert_text((83, 280), "ITC as per GSTR-2A (Table 3 & 5 thereof)", fontsize=9)
+        for x1, v in [(567, "2,23,34,755.57"), (660, "2,23,34,755.57"), (747, "2,86,29,565.32"), (797, "228.86")]:
+            _right(p1, x1, 280, v)
+
+        p1.insert_text((56, 300), "B", fontsize=9)
+        p1.insert_text((83, 300), "ITC as per sum total of 6(B) and 6(H) above", fontsize=9)
+        # CGST / SGST cells left blank on purpose
+        for x1, v in [(747, "3,13,67,529.53"), (797, "0.00")]:
+            _right(p1, x1, 300, v)
+
+        p1.insert_text((56, 320), "C", fontsize=9)
+        p1.insert_text((83, 320), "ITC on inward supplies received during", fontsize=9)
+        p1.insert_text((83, 334), "the financial year but availed in the next financial year", fontsize=9)
+        for x1, v in [(567, "10.00"), (660, "20.00"), (747, "30.00"), (797, "0.00")]:
+            _right(p1, x1, 320, v)
+
+        p1.insert_text((56, 354), "D", fontsize=9)
+        p1.insert_text((83, 354), "Difference [A-(B+C)]", fontsize=9)
+        for x1, v in [(567, "-41,29,422.68"), (660, "-41,29,422.68"), (747, "-27,37,964.21"), (797, "228.86")]:
+            _right(p1, x1, 354, v)
+
+        doc.save(self.pdf_path)
+        doc.close()
+
+    def tearDown(self):
+        try:
+            os.remove(self.pdf_path)
+        except OSError:
+            pass
+
+    def test_metadata(self):
+        doc = GSTR9Document(self.pdf_path)
+        self.assertEqual(doc.metadata["gstin"], "32AAALC0844J1ZJ")
+        self.assertEqual(doc.metadata["fy"], "2022-23")
+
+    def test_table_8_rows_by_column(self):
+        doc = GSTR9Document(self.pdf_path)
+        self.assertEqual(doc.table("8")["pages"], [1])
+
+        a = doc.values("8", "A")
+        self.assertAlmostEqual(a["cgst"], 22334755.57)
+        self.assertAlmostEqual(a["igst"], 28629565.32)
+        self.assertAlmostEqual(a["cess"], 228.86)
+
+        # Blank CGST/SGST cells must not shift IGST into the CGST column
+        b = doc.values("8", "B")
+        self.assertEqual(b["cgst"], 0.0)
+        self.assertEqual(b["sgst"], 0.0)
+        self.assertAlmostEqual(b["igst"], 31367529.53)
+
+        # Wrapped description stays with its row
+        c = doc.row("8", "C")
+        self.assertIn("next financial year", c["description"])
+        self.assertEqual(doc.values("8", "C")["sgst"], 20.0)
+
+        d = doc.values("8", "D")
+        self.assertAlmostEqual(d["cgst"], -4129422.68)
+
+    def test_missing_row_defaults_to_zero(self):
+        doc = GSTR9Document(self.pdf_path)
+        self.assertEqual(doc.values("8", "K"), {"cgst": 0.0, "sgst": 0.0, "igst": 0.0, "cess": 0.0})
+        self.assertIsNone(doc.table("6"))
+
+    def test_cache_reuses_document(self):
+        first = load_gstr9_document(self.pdf_path)
+        second = load_gstr9_document(self.pdf_path)
+        self.assertIs(first, second)
+
+    @unittest.skipUnless(os.path.exists(SAMPLE_PDF), "sample GSTR-9 PDF not available")
+    def test_sample_return(self):
+        doc = GSTR9Document(SAMPLE_PDF)
+        self.assertEqual(doc.metadata["gstin"], "32AAALC0844J1ZJ")
+        self.assertAlmostEqual(doc.values("8", "B")["igst"], 31367529.53)
+        # Table 6B is printed per Type; the row exposes the sum as well
+        self.assertAlmostEqual(doc.values("6", "B", row_type="Input Services")["cgst"], 76970.81)
+        self.assertAlmostEqual(doc.values("6", "B")["cgst"], 26464178.25)
+        # Table 4C has blank CGST/SGST cells
+        self.assertAlmostEqual(doc.values("4", "D", heads=("taxable_value", "igst"))["igst"], 40858.16)
+        self.assertNotIn("cgst", doc.row("4", "D")["values"])
+
+
+if __name__ == '__main__':
+    unittest.main()
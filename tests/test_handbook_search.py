@@ -0,0 +1,104 @@
+import os
+import sys
+import shutil
+import sqlite3
+import tempfile
+import unittest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.database.schema import init_db
+from src.database.db_manager import DatabaseManager
+from src.utils.legal_text import split_footnotes
+
+
+class TestHandbookSearch(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.db_file = os.path.join(self.tmp_dir, "handbook.db")
+        init_db(self.db_file)
+
+        # Skip CSV bootstrapping; only the SQLite handbook tables are exercised
+        self.db = DatabaseManager.__new__(DatabaseManager)
+        self.db.db_path = self.db_file
+        self.db.db_file = self.db_file
+
+        conn = sqlite3.connect(self.db_file)
+        conn.executemany("INSERT INTO gst_acts (act_id, title) VALUES (?, ?)", [
+            ("CGST", "Central Goods and Services Tax Act, 2017"),
+            ("IGST", "Integrated Goods and Services Tax Act, 2017"),
+        ])
+        conn.executemany("""
+            INSERT INTO gst_sections (act_id, chapter_id, chapter_name, section_number, title, content)
+            VALUES (?, ?, ?, ?, ?, ?)
+        """, [
+            ("CGST", "CHAPTER_V", "Input Tax Credit", "16", "Eligibility and conditions for taking input tax credit",
+             "(1) Every registered person shall be entitled to take credit of input tax.\n"
+             "1. Subs. by Act 31 of 2018, w.e.f. 1.2.2019"),
+            ("CGST", "CHAPTER_V", "Input Tax Credit", "17", "Apportionment of credit and blocked credits",
+             "(5) input tax credit shall not be available in respect of motor vehicles."),
+            ("CGST", "CHAPTER_XV", "Demands and Recovery", "73", "Determination of tax not paid",
+             "Where it appears to the proper officer that any tax has not been paid <or> short paid."),
+            ("IGST", None, None, "5", "Levy and collection",
+             "There shall be levied a tax called the integrated goods and services tax."),
+        ])
+        conn.commit()
+        conn.close()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def test_title_hits_rank_first(self):
+        results = self.db.search_handbook("input tax credit")
+        self.assertEqual([r['section_number'] for r in results[:2]], ["16", "17"])
+        self.assertIn("<b", results[0]['snippet'])
+        self.assertEqual(results[0]['act_title'], "Central Goods and Services Tax Act, 2017")
+
+    def test_prefix_and_act_filter(self):
+        results = self.db.search_handbook("integ")
+        self.assertEqual([r['section_number'] for r in results], ["5"])
+        self.assertEqual(self.db.search_handbook("integ", act_id="CGST"), [])
+
+    def test_snippet_is_escaped_and_odd_input_is_safe(self):
+        results = self.db.search_handbook("short paid")
+        self.assertEqual(results[0]['section_number'], "73")
+        self.assertIn("&lt;or&gt;", results[0]['snippet'])
+        # FTS operators and punctuation are treated as plain words
+        self.assertIsInstance(self.db.search_handbook('16(4) AND "'), list)
+        self.assertEqual(self.db.search_handbook("  "), [])
+
+    def test_footnotes_are_indexed_separately(self):
+        main, footnotes = split_footnotes(self.db.get_section(1)['content'])
+        self.assertNotIn("Subs.", main)
+        self.assertIn("Act 31 of 2018", footnotes)
+        # Footnote-only words still find the section, but rank below body hits
+        self.assertEqual(self.db.search_handbook("2018")[0]['section_number'], "16")
+
+    def test_index_rebuilds_after_section_changes(self):
+        self.assertEqual(self.db.search_handbook("anti-profiteering"), [])
+        conn = sqlite3.connect(self.db_file)
+        conn.execute("""
+            INSERT INTO gst_sections (act_id, chapter_id, chapter_name, section_number, title, content)
+            VALUES ('CGST', 'CHAPTER_XXI', 'Miscellaneous', '171', 'Antiprofiteering measure', 'anti profiteering')
+        """)
+        conn.commit()
+        conn.close()
+        self.assertEqual(self.db.search_handbook("antiprofiteering")[0]['section_number'], "171")
+
+    def test_outline_and_lazy_sections(self):
+        outline = self.db.get_handbook_outline()
+        cgst = next(a for a in outline if a['act_id'] == "CGST")
+        self.assertEqual([c['chapter_id'] for c in cgst['chapters']], ["CHAPTER_V", "CHAPTER_XV"])
+        self.assertEqual(cgst['chapters'][0]['section_count'], 2)
+        igst = next(a for a in outline if a['act_id'] == "IGST")
+        self.assertEqual((igst['chapters'], igst['loose_sections']), ([], 1))
+
+        headers = self.db.get_section_headers("CGST", "CHAPTER_V")
+        self.assertEqual([h['section_number'] for h in headers], ["16", "17"])
+        self.assertNotIn('content', headers[0])
+        self.assertEqual(len(self.db.get_section_headers("IGST")), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,103 @@
+import os
+import sys
+import time
+import unittest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.utils.html_sanitizer import sanitize, iter_sanitized
+
+WORD_PARAGRAPH = ('<p class=MsoNormal style="text-align:justify"><span style="font-size:12pt">'
+                  'The taxpayer &amp; <b>his</b> reply<o:p></o:p></span></p>\n')
+
+
+def _real_qt():
+    """False when an earlier test module has replaced PyQt6 with stand-ins."""
+    try:
+        from PyQt6 import QtWidgets
+    except ImportError:
+        return False
+    return getattr(QtWidgets, "__file__", None) is not None
+
+
+class TestHtmlSanitizer(unittest.TestCase):
+
+    def test_whitelist_and_word_markup(self):
+        html = ('<html><head><style>p{color:red}</style><title>T</title></head><body>'
+                '<!--[if gte mso 9]><xml><w:doc/></xml><![endif]-->'
+                '<p class=MsoNormal style="margin:0">Hello <strong>bold</strong> '
+                '<span style="font-weight:700;font-style:italic">bi</span><o:p></o:p></p>'
+                '<h2>Grounds</h2><script>alert("</p>")</script><div>a<br/>b</div> a < b</body></html>')
+        self.assertEqual(sanitize(html), '<p>Hello <b>bold</b> <b><i>bi</i></b></p><p><b>Grounds</b></p>'
+                                         '<p>a<br>b</p><p> a &lt; b</p>')
+
+    def test_tables_and_lists_are_kept_well_formed(self):
+        html = ('<table class=MsoTable style="width:100%"><tr><td colspan=2 width=300>Tax</td>'
+                '<tr><td><p>CGST</p><td>1,000</table><ul><li>one<li>two<ul><li>n</ul></ul>tail')
+        self.assertEqual(sanitize(html),
+                         '<table border="1" cellspacing="0" cellpadding="4"><tr><td colspan="2">Tax</td></tr>'
+                         '<tr><td><p>CGST</p></td><td>1,000</td></tr></table>'
+                         '<ul><li>one</li><li>two<ul><li>n</li></ul></li></ul><p>tail</p>')
+
+    def test_nested_tables(self):
+        table = '<table border="1" cellspacing="0" cellpadding="4">'
+        self.assertEqual(
+            sanitize("<table><tr><td>a<table><tr><td>x</td></tr></table></td><td>b</td></tr></table>"),
+            f"{table}<tr><td>a{table}<tr><td>x</td></tr></table></td><td>b</td></tr></table>")
+
+    def test_unterminated_tags_are_text_and_linear(self):
+        self.assertEqual(sanitize('<p>x <a href="open <b>y</b></p>'), '<p>x &lt;a href="open <b>y</b></p>')
+        self.assertEqual(sanitize("1 < 2 <!x"), "<p>1 &lt; 2 &lt;!x</p>")
+        started = time.monotonic()
+        for junk in ("<a " * 50000, '<a "' * 50000, "<!" * 50000):
+            sanitize(junk)
+        self.assertLess(time.monotonic() - started, 5)
+
+    def test_implicitly_closed_blocks_are_linear(self):
+        self.assertEqual(sanitize("<p>a<p>b<ul><li>x<li>y</ul><table><tr><td>1<td>2<tr><td>3</table>"),
+                         '<p>a</p><p>b</p><ul><li>x</li><li>y</li></ul>'
+                         '<table border="1" cellspacing="0" cellpadding="4"><tr><td>1</td><td>2</td></tr>'
+                         '<tr><td>3</td></tr></table>')
+        started = time.monotonic()
+        for html in ("<p>text" * 40000, "<table>" + "<tr><td>a<td>b" * 25000 + "</table>",
+                     "<ul>" + "<li>a" * 40000 + "</ul>", "<span>x</b>" * 40000):
+            sanitize(html)
+        self.assertLess(time.monotonic() - started, 5)
+
+    def test_runs_are_whole_blocks(self):
+        html = "<body>" + WORD_PARAGRAPH * 5000 + "</body>"
+        runs = list(iter_sanitized(html, chunk_chars=4096))
+        self.assertGreater(len(runs), 1)
+        self.assertEqual("".join(runs), sanitize(html))
+        for run in runs:
+            self.assertTrue(run.startswith("<p>") and run.endswith("</p>"))
+
+
+@unittest.skipUnless(_real_qt(), "needs the real PyQt6")
+class TestAsyncPaste(unittest.TestCase):
+
+    def test_large_paste_is_inserted_off_thread(self):
+        from PyQt6.QtCore import QMimeData
+        from PyQt6.QtWidgets import QApplication
+        from src.ui.rich_text_editor import SCNTextEdit
+
+        app = QApplication.instance() or QApplication(sys.argv)
+        editor = SCNTextEdit()
+        editor.ASYNC_PASTE_CHARS = 1000
+        mime = QMimeData()
+        mime.setHtml("<body>" + WORD_PARAGRAPH * 3000 + "<table><tr><td>A</td><td>B</td></tr></table></body>")
+        editor.insertFromMimeData(mime)
+
+        deadline = time.monotonic() + 10
+        while editor.is_pasting() and time.monotonic() < deadline:
+            app.processEvents()
+            time.sleep(0.01)
+        text = editor.toPlainText()
+        self.assertEqual(text.count("The taxpayer & his reply"), 3000)
+        self.assertTrue(editor.document().rootFrame().childFrames())  # The table survived
+        editor.undo()  # The whole paste is one undo step
+        self.assertEqual(editor.toPlainText(), "")
+
+
+if __name__ == '__main__':
+    unittest.main()
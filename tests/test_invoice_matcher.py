@@ -0,0 +1,142 @@
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+
+import openpyxl
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.services import invoice_matcher
+from src.services.scrutiny_parser import ScrutinyParser
+
+A = "32AAAAA0000A1Z5"
+B = "29BBBBB1111B1Z5"
+
+# Portal layout: title row, then parent / child header rows
+PARENT = ["GSTIN of supplier", "Trade/Legal name of the Supplier", "Invoice details", None, None,
+          "Place of supply", "Rate (%)", "Taxable Value (₹)", "Amount of tax", None, None, None,
+          "GSTR-3B Filing Status", "Supplier Registration Status"]
+CHILD = [None, None, "Invoice number", "Invoice Date", "Invoice Value (₹)", None, None, None,
+         "Integrated Tax (₹)", "Central Tax (₹)", "State/UT Tax (₹)", "Cess (₹)", None, None]
+
+GSTR2A = [
+    # Two rate lines of one invoice
+    [A, "Alpha", "INV/001", "05-04-2023", 1180, "Kerala", 9, 500, 0, 45, 45, 0, "Y", "Active"],
+    [A, "Alpha", "INV/001", "05-04-2023", 590, "Kerala", 18, 500, 0, 45, 45, 0, "Y", "Active"],
+    [A, "Alpha", "INV/002", "06-04-2023", 1180, "Kerala", 18, 1000, 0, 90, 90, 0, "Y", "Active"],
+    [A, "Alpha", "A-77", "10-05-2023", 2360, "Kerala", 18, 2000, 0, 180, 180, 0, "Y", "Active"],
+    [B, "Beta", "B/0012", "12-05-2023", 1180, "Karnataka", 18, 1000, 180, 0, 0, 0, "N", "Cancelled"],
+    [B, "Beta", "B/0013", "13-05-2023", 1180, "Karnataka", 18, 1000, 180, 0, 0, 0, "N", "Cancelled"],
+]
+
+GSTR2B = [
+    [A, "Alpha", "inv-001", "05-04-2023", 1180, "Kerala", 18, 1000, 0, 90, 90, 0, None, None],   # exact
+    [A, "Alpha", "INV/002", "06-04-2023", 1300, "Kerala", 18, 1100, 0, 99, 99, 0, None, None],   # value differs
+    [A, "Alpha", "77/2023", "10-05-2023", 2360, "Kerala", 18, 2000, 0, 180, 180, 0, None, None], # number differs
+    [B, "Beta", "12", "12-05-2023", 1180, "Karnataka", 18, 999, 180, 0, 0, 0, None, None],      # digits only
+    [B, "Beta", "B/0099", "20-05-2023", 590, "Karnataka", 18, 500, 90, 0, 0, 0, None, None],    # not in 2A
+]
+
+
+class TestInvoiceMatcher(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.gstr2a = self._portal_file("2a.xlsx", GSTR2A)
+        self.gstr2b = self._portal_file("2b.xlsx", GSTR2B)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def _portal_file(self, name, rows):
+        path = os.path.join(self.tmp_dir, name)
+        wb = openpyxl.Workbook()
+        wb.active.title = "Read me"
+        ws = wb.create_sheet("B2B")
+        ws.append(["Taxable inward supplies received from registered persons"])
+        ws.append(PARENT)
+        ws.append(CHILD)
+        for row in rows:
+            ws.append(row)
+        wb.save(path)
+        return path
+
+    def _purchase_register(self):
+        path = os.path.join(self.tmp_dir, "pr.csv")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("Supplier GSTIN,Bill No,Bill Date,Taxable Value,IGST,CGST,SGST\n")
+            f.write(f"{A},INV-002,06/04/2023,1000,0,90,90\n")
+            f.write(f"{A},INV-900,07/04/2023,400,0,36,36\n")
+        return path
+
+    def _statuses(self, matches):
+        return dict(zip(matches["invoice_no"], matches["status"]))
+
+    def test_reads_two_row_portal_header(self):
+        df = invoice_matcher.read_invoices(self.gstr2a)
+        self.assertEqual(len(df), 6)
+        self.assertEqual(df.loc[0, "inv_key"], "INV001")
+        self.assertEqual(df.loc[4, "num_key"], "12")
+        self.assertEqual(df["tax"].sum(), 1080.0)
+        self.assertEqual(df.loc[4, "filing_status"], "N")
+
+    def test_exact_fuzzy_missing_and_extra(self):
+        res = invoice_matcher.reconcile(self.gstr2a, [self.gstr2b])
+        matches = res["gstr2a_vs_2b"]
+        self.assertIsNone(res["pr_vs_2a"])
+        self.assertEqual(self._statuses(matches), {
+            "INV/001": "exact", "INV/002": "fuzzy", "A-77": "fuzzy",
+            "B/0012": "fuzzy", "B/0013": "missing", "B/0099": "extra",
+        })
+        totals = invoice_matcher.status_totals(matches)
+        self.assertEqual(totals["missing"]["igst"], 180.0)
+        by_supplier = invoice_matcher.summarise(matches, "gstin")
+        self.assertEqual(by_supplier[A]["fuzzy"]["count"], 2)
+        self.assertEqual(set(invoice_matcher.summarise(matches, "month")), {"2023-04", "2023-05"})
+
+    def test_purchase_register_against_2a(self):
+        matches = invoice_matcher.reconcile(self.gstr2a, [], self._purchase_register())["pr_vs_2a"]
+        statuses = self._statuses(matches)
+        self.assertEqual(statuses["INV-002"], "exact")
+        self.assertEqual(statuses["INV-900"], "missing")
+
+    def test_feeds_sop_tables(self):
+        parser = ScrutinyParser()
+        matching = invoice_matcher.reconcile(self.gstr2a, [self.gstr2b], self._purchase_register())
+
+        def sop4_result():
+            rows = [{"col0": {"value": label}, "col1": {"value": 10.0}} for label in ("ITC claimed in GSTR-3B", "Liability")]
+            return {"summary_table": {"columns": ["Description", "CGST", "SGST", "IGST", "Cess"], "rows": rows}}
+
+        sop4 = parser._add_invoice_matching(sop4_result(), matching)
+        rows = sop4["summary_table"]["rows"]
+        labels = [r["col0"]["value"] for r in rows]
+        self.assertEqual(labels[1], "GSTR-2A invoices not reflected in GSTR-2B (1 invoices)")
+        self.assertEqual(rows[1]["col3"]["value"], 180.0)
+        self.assertEqual(labels[-1], "Liability")  # The demand row stays last
+        self.assertIn("pr_vs_2a", sop4["facts"]["invoice_matching"])
+
+        # Statuses without invoices add no rows
+        clean = invoice_matcher.reconcile(self.gstr2a, [self.gstr2a], None)
+        sop4 = parser._add_invoice_matching(sop4_result(), clean)
+        self.assertEqual([r["col0"]["value"] for r in sop4["summary_table"]["rows"]],
+                         ["ITC claimed in GSTR-3B", "Liability"])
+
+        rows = [{"gstin": B, "invoice_no": "B/0012"}, {"gstin": B, "invoice_no": "B/0013"}]
+        table = {"columns": [{"id": "col0", "label": "GSTIN", "width": "50%"}, {"id": "col1", "label": "Invoice No.", "width": "50%"}],
+                 "rows": [{"col0": {"value": B}}, {"col0": {"value": B}}, {"col0": {"value": "TOTAL"}}]}
+        parser._add_2b_match_column(table, rows, matching)
+        self.assertEqual([r["col2"]["value"] for r in table["rows"]], ["Yes (values differ)", "No", ""])
+        self.assertEqual(table["columns"][0]["width"], "45%")
+
+    def test_parse_2a_invoices(self):
+        res = ScrutinyParser().parse_2a_invoices(self.gstr2a)
+        self.assertEqual(len(res["cancelled"]), 2)
+        self.assertEqual(res["cancelled"][0]["name"], "Beta")
+        self.assertEqual([r["itc_availed"] for r in res["non_filers"]], [180.0, 180.0])
+
+
+if __name__ == '__main__':
+    unittest.main()
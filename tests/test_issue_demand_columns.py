@@ -0,0 +1,101 @@
+import os
+import sys
+import json
+import pickle
+import shutil
+import sqlite3
+import tempfile
+import unittest
+from unittest import mock
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.database.schema import init_db
+from src.database.db_manager import DatabaseManager
+from src.database import case_issues
+
+
+def _issue(issue_id, cgst, sgst, igst=0, interest=0, penalty=0, included=True):
+    return {"issue_id": issue_id, "data": {
+        "is_included": included,
+        "tax_breakdown": {
+            "CGST": {"tax": cgst, "interest": interest, "penalty": penalty},
+            "SGST": {"tax": sgst, "interest": 0, "penalty": 0},
+            "IGST": {"tax": igst, "interest": 0, "penalty": 0},
+        },
+    }}
+
+
+class TestIssueDemandColumns(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.db_file = os.path.join(self.tmp_dir, "issues.db")
+        init_db(self.db_file)
+
+        self.db = DatabaseManager.__new__(DatabaseManager)
+        self.db.db_path = self.db_file
+        self.db.db_file = self.db_file
+        self.pid = self.db.create_proceeding({"gstin": "32AAAAA0000A1Z5", "financial_year": "2023-24"})
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def test_totals_come_from_columns(self):
+        self.db.save_case_issues(self.pid, [_issue("A", 1000, 1000, interest=50),
+                                            _issue("B", 0, 0, igst="2,500", penalty=100),
+                                            _issue("C", 7, 7, included=False)], stage="DRC-01A")
+        totals = self.db.get_issue_demand_totals(self.pid, "DRC-01A")
+        self.assertEqual(totals["issues"], 2)
+        self.assertEqual((totals["cgst_tax"], totals["igst_tax"], totals["interest"], totals["penalty"]),
+                         (1000, 2500, 50, 100))
+        self.assertEqual(totals["total"], 4650)
+        self.assertEqual(self.db.get_issue_demand_totals()["total"], 4650)  # Office-wide
+        self.assertEqual(self.db.get_issue_demand_totals(self.pid, "SCN")["issues"], 0)
+
+    def test_demand_text_without_decoding_json(self):
+        self.db.save_scn_issue_snapshot(self.pid, [_issue("A", 1000, 1000, igst=500)])
+        with mock.patch.object(case_issues.json, "loads", side_effect=AssertionError("decoded")):
+            text = self.db.generate_scn_demand_text(self.pid)
+        self.assertIn("Rs. 2,500.00/-", text)
+        self.assertIn("IGST Rs. 500.00/-", text)
+
+    def test_data_is_decoded_on_first_read(self):
+        issue = _issue("A", 10, 10)
+        issue["data"]["notes"] = "x" * 2000  # Large enough for the blob store
+        self.db.save_scn_issue_snapshot(self.pid, [issue])
+        with mock.patch.object(self.db, "_resolve_blob", wraps=self.db._resolve_blob) as resolve:
+            record = self.db.get_case_issues(self.pid, stage="SCN")[0]
+            self.assertFalse(resolve.called)
+            self.assertIn("data", record)
+            self.assertEqual(record["data"]["tax_breakdown"]["CGST"]["tax"], 10)
+            self.assertEqual(resolve.call_count, 1)
+        self.assertIs(record.get("data"), record["data"])
+
+        # Editing the payload keeps the columns in step
+        data = record["data"]
+        data["tax_breakdown"]["CGST"]["tax"] = 90
+        self.db.update_case_issue(record["id"], {"data_json": json.dumps(data)})
+        self.assertEqual(self.db.get_issue_demand_totals(self.pid, "SCN")["cgst_tax"], 90)
+
+    def test_copies_carry_the_lazy_keys(self):
+        self.db.save_scn_issue_snapshot(self.pid, [_issue("A", 10, 10)])
+        for copy_of in (dict, lambda r: r.copy(), lambda r: {**r}, lambda r: json.loads(json.dumps(r)),
+                        lambda r: pickle.loads(pickle.dumps(r))):
+            record = self.db.get_case_issues(self.pid, stage="SCN")[0]
+            copied = copy_of(record)
+            self.assertEqual(copied["data"]["tax_breakdown"]["SGST"]["tax"], 10)
+            self.assertEqual(json.loads(copied["data_json"]), copied["data"])
+
+    def test_existing_rows_are_backfilled(self):
+        conn = sqlite3.connect(self.db_file)
+        conn.execute("INSERT INTO case_issues (proceeding_id, issue_id, stage, data_json) VALUES (?, 'X', 'SCN', ?)",
+                     (self.pid, json.dumps(_issue("X", 300, 300)["data"])))
+        case_issues.backfill(conn.cursor())
+        conn.commit()
+        conn.close()
+        self.assertEqual(self.db.get_issue_demand_totals(self.pid)["total"], 600)
+
+
+if __name__ == '__main__':
+    unittest.main()
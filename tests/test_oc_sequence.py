@@ -0,0 +1,95 @@
+import os
+import sys
+import shutil
+import sqlite3
+import tempfile
+import threading
+import unittest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.database.schema import init_db
+from src.database.db_manager import DatabaseManager
+from src.database import oc_sequence
+
+
+class TestOCSequence(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.db_file = os.path.join(self.tmp_dir, "oc.db")
+        init_db(self.db_file)
+
+        self.db = DatabaseManager.__new__(DatabaseManager)
+        self.db.db_path = self.db_file
+        self.db.db_file = self.db_file
+
+        conn = sqlite3.connect(self.db_file)
+        conn.executemany("INSERT INTO oc_register (oc_number) VALUES (?)",
+                         [("7/2025",), ("12/2025",), ("x/2025",), ("40/2024",)])
+        conn.commit()
+        conn.close()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def test_seed_allocate_and_manual_numbers(self):
+        self.assertEqual(self.db.get_next_oc_number("2025"), 13)
+        self.assertEqual(self.db.get_next_oc_number("2026"), 1)
+
+        self.assertEqual(self.db.allocate_oc_numbers("2025", 3), ["13/2025", "14/2025", "15/2025"])
+        self.assertEqual(self.db.get_next_oc_number("2025"), 16)
+        self.assertEqual(self.db.allocate_oc_numbers("2024"), ["41/2024"])
+
+        # A number typed in by the officer moves the sequence past it
+        self.assertTrue(self.db.add_oc_entry(None, {'OC_Number': '30/2025'}, is_issuance=True))
+        self.assertEqual(self.db.get_next_oc_number("2025"), 31)
+        # ...but an older one does not move it back
+        self.assertTrue(self.db.add_oc_entry(None, {'OC_Number': '20/2025'}, is_issuance=True))
+        self.assertEqual(self.db.get_next_oc_number("2025"), 31)
+
+    def test_blank_number_is_allocated_on_issuance(self):
+        conn = sqlite3.connect(self.db_file)
+        number = self.db._insert_oc_entry(conn.cursor(), None, {'OC_Content': 'Notice'}, is_issuance=True)
+        conn.commit()
+        conn.close()
+        self.assertEqual(number, f"1/{oc_sequence.current_year()}")
+
+    def test_issued_number_is_never_overwritten(self):
+        self.assertEqual(self.db.add_oc_entry(None, {'OC_Number': '30/2025', 'OC_To': 'First'}, is_issuance=True), '30/2025')
+        with self.assertRaisesRegex(ValueError, "OC Number already issued"):
+            self.db.add_oc_entry(None, {'OC_Number': '30/2025', 'OC_To': 'Second'}, is_issuance=True)
+        entries = [e for e in self.db.get_oc_register_entries() if e['OC_Number'] == '30/2025']
+        self.assertEqual([e['OC_To'] for e in entries], ['First'])
+
+        # A blank number skips any already in the register
+        year = oc_sequence.current_year()
+        self.db.add_oc_entry(None, {'OC_Number': f'1/{year}'}, is_issuance=True)
+        conn = sqlite3.connect(self.db_file)
+        conn.execute("UPDATE oc_sequences SET last_seq = 0 WHERE year = ?", (year,))
+        conn.commit()
+        conn.close()
+        self.assertEqual(self.db.add_oc_entry(None, {'OC_Number': ''}, is_issuance=True), f'2/{year}')
+
+    def test_concurrent_allocation_never_collides(self):
+        issued, lock = [], threading.Lock()
+
+        def worker():
+            for _ in range(10):
+                numbers = self.db.allocate_oc_numbers("2025", 2)
+                with lock:
+                    issued.extend(numbers)
+
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        self.assertEqual(len(issued), 80)
+        self.assertEqual(len(set(issued)), 80)
+        self.assertEqual(self.db.get_next_oc_number("2025"), 93)
+
+
+if __name__ == '__main__':
+    unittest.main()
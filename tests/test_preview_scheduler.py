@@ -0,0 +1,102 @@
+import os
+import sys
+import time
+import threading
+import unittest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+def _real_qt():
+    """False when an earlier test module has replaced PyQt6 with stand-ins."""
+    try:
+        from PyQt6 import QtWidgets
+    except ImportError:
+        return False
+    return getattr(QtWidgets, "__file__", None) is not None
+
+
+if not _real_qt():
+    raise unittest.SkipTest("needs the real PyQt6")
+
+from PyQt6.QtWidgets import QApplication
+
+app = QApplication.instance() or QApplication(sys.argv)
+
+from src.ui.components.preview_scheduler import PreviewScheduler
+
+
+def _wait_for(condition, timeout=3.0):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        app.processEvents()
+        time.sleep(0.01)
+    app.processEvents()
+
+
+class TestPreviewScheduler(unittest.TestCase):
+
+    def setUp(self):
+        self.jobs = []
+        self.painted = []
+        self.progress = []
+        self.cancels = {}
+        self.release = threading.Event()
+
+    def _render(self, job, cancel, report):
+        self.cancels[job] = cancel
+        report(f"{job}:start")
+        if job == "slow":
+            self.release.wait(2.0)
+        report(f"{job}:end")
+        return f"<{job}>"
+
+    def _scheduler(self, delay_ms=0):
+        return PreviewScheduler(lambda: self.jobs.pop(0) if self.jobs else None, self._render,
+                                self.painted.append, delay_ms=delay_ms, progress=self.progress.append)
+
+    def test_newest_edit_wins(self):
+        scheduler = self._scheduler()
+        self.jobs = ["slow", "fast"]
+        scheduler.refresh_now()
+        _wait_for(lambda: "slow" in self.cancels)
+        scheduler.refresh_now()
+        _wait_for(lambda: self.painted)
+
+        self.assertTrue(self.cancels["slow"].is_set())
+        self.release.set()  # The stale render finishes late...
+        _wait_for(lambda: False, timeout=0.2)
+        self.assertEqual(self.painted, ["<fast>"])  # ...and is never painted
+        self.assertNotIn("slow:end", self.progress)
+        self.assertFalse(scheduler.is_busy())
+
+    def test_debounce_coalesces_bursts(self):
+        scheduler = self._scheduler(delay_ms=50)
+        self.jobs = ["first", "second"]
+        for _ in range(5):
+            scheduler.schedule()
+        _wait_for(lambda: self.painted)
+        _wait_for(lambda: False, timeout=0.15)
+        self.assertEqual(self.painted, ["<first>"])
+        self.assertEqual(self.jobs, ["second"])
+
+    def test_nothing_to_render(self):
+        scheduler = self._scheduler()
+        scheduler.refresh_now()
+        self.assertFalse(scheduler.is_busy())
+        self.assertEqual(self.painted, [])
+
+    def test_errors_go_to_failed(self):
+        errors = []
+
+        def render(job, cancel, report):
+            raise RuntimeError("MISSING_DEPENDENCY")
+
+        scheduler = PreviewScheduler(lambda: "job", render, self.painted.append, delay_ms=0, failed=errors.append)
+        scheduler.refresh_now()
+        _wait_for(lambda: errors)
+        self.assertEqual(str(errors[0]), "MISSING_DEPENDENCY")
+        self.assertEqual(self.painted, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
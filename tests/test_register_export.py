@@ -0,0 +1,76 @@
+import os
+import sys
+import csv
+import shutil
+import sqlite3
+import tempfile
+import unittest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from openpyxl import load_workbook
+from src.database.schema import init_db
+from src.database.db_manager import DatabaseManager
+from src.services.register_export import export_register, ExportCancelled
+
+
+class TestRegisterExport(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.db_file = os.path.join(self.tmp_dir, "export.db")
+        init_db(self.db_file)
+
+        self.db = DatabaseManager.__new__(DatabaseManager)
+        self.db.db_path = self.db_file
+        self.db.db_file = self.db_file
+
+        conn = sqlite3.connect(self.db_file)
+        conn.executemany(
+            "INSERT INTO asmt10_register (gstin, financial_year, issue_date, case_id, oc_number, created_at) VALUES (?, ?, ?, ?, ?, ?)",
+            [(f"32AAAAA{i:04d}A1Z{i % 2}", "2022-23", f"2025-{1 + i % 12:02d}-01", f"CASE-{i}", f"{i}/2025",
+              f"2025-01-01 00:{i // 60 % 60:02d}:{i % 60:02d}")
+             for i in range(1200)]
+        )
+        conn.commit()
+        conn.close()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def test_xlsx_streams_all_rows(self):
+        path = os.path.join(self.tmp_dir, "asmt10.xlsx")
+        seen = []
+        written = export_register(self.db, 'asmt10', path, batch_size=250,
+                                  progress=lambda done, total: seen.append((done, total)))
+        self.assertEqual(written, 1200)
+        self.assertEqual(seen[-1], (1200, 1200))
+        self.assertGreater(len(seen), 3)
+
+        ws = load_workbook(path, read_only=True).active
+        rows = list(ws.iter_rows(values_only=True))
+        self.assertEqual(rows[0][:3], ("Sl. No.", "GSTIN", "Financial Year"))
+        self.assertEqual(len(rows), 1201)
+        # Default register order: newest first
+        self.assertEqual(rows[1][0], 1)
+        self.assertEqual(rows[1][5], "CASE-1199")
+
+    def test_csv_with_sql_filters(self):
+        path = os.path.join(self.tmp_dir, "asmt10.csv")
+        written = export_register(self.db, 'asmt10', path,
+                                  filters={'gstin': "a1z1", 'date_from': "2025-06-01", 'date_to': "2025-06-30"})
+        with open(path, encoding="utf-8-sig", newline="") as f:
+            rows = list(csv.reader(f))
+        self.assertEqual(written, len(rows) - 1)
+        self.assertEqual(written, 100)
+        self.assertTrue(all(r[1].endswith("A1Z1") and r[3] == "2025-06-01" for r in rows[1:]))
+
+    def test_cancel_leaves_no_partial_file(self):
+        path = os.path.join(self.tmp_dir, "cancelled.xlsx")
+        with self.assertRaises(ExportCancelled):
+            export_register(self.db, 'asmt10', path, batch_size=100, is_cancelled=lambda: True)
+        self.assertEqual(os.listdir(self.tmp_dir), ["export.db"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,121 @@
+import os
+import sys
+import csv
+import shutil
+import sqlite3
+import tempfile
+import unittest
+from unittest.mock import patch
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.database.schema import init_db
+from src.database.db_manager import DatabaseManager
+from src.database.register_queries import CsvMirror, CSV_MIRRORS
+
+
+class TestRegisterPaging(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.db_file = os.path.join(self.tmp_dir, "registers.db")
+        init_db(self.db_file)
+
+        # Skip CSV bootstrapping of the real data directory
+        self.db = DatabaseManager.__new__(DatabaseManager)
+        self.db.db_path = self.db_file
+        self.db.db_file = self.db_file
+        DatabaseManager._mirror_signatures.clear()
+
+        self.taxpayers_csv = os.path.join(self.tmp_dir, "taxpayers.csv")
+        self._write_taxpayers(1000)
+
+        patcher = patch.dict(CSV_MIRRORS, {
+            'taxpayers': CsvMirror('taxpayers', self.taxpayers_csv, 'taxpayers',
+                                   CSV_MIRRORS['taxpayers'].columns, replace=True),
+        })
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        DatabaseManager._mirror_signatures.clear()
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def _write_taxpayers(self, n, extra=None):
+        with open(self.taxpayers_csv, "w", newline="") as f:
+            w = csv.writer(f)
+            w.writerow(["GSTIN", "Legal Name", "Trade Name", "Address", "State", "Email", "Mobile", "Status", "Constitution"])
+            for i in range(n):
+                w.writerow([f"32AAAAA{i:04d}A1Z1", f"Taxpayer {i:04d}", f"Trade {i:04d}", "", "Kerala", "", "",
+                            "Active" if i % 2 else "Cancelled", ""])
+            for row in extra or []:
+                w.writerow(row)
+
+    def test_pages_follow_csv_order(self):
+        self.assertEqual(self.db.count_register_rows('taxpayers'), 1000)
+        first = self.db.fetch_register_page('taxpayers', offset=0, limit=200)
+        second = self.db.fetch_register_page('taxpayers', offset=200, limit=200)
+        self.assertEqual(len(first), 200)
+        self.assertEqual(first[0]['GSTIN'], "32AAAAA0000A1Z1")
+        self.assertEqual(second[0]['Legal Name'], "Taxpayer 0200")
+
+    def test_search_filter_and_sort_in_sql(self):
+        self.assertEqual(self.db.count_register_rows('taxpayers', search="taxpayer 09"), 100)
+        self.assertEqual(self.db.count_register_rows('taxpayers', filters={'status': 'Active'}), 500)
+        page = self.db.fetch_register_page('taxpayers', limit=3, order_by="Legal Name", descending=True)
+        self.assertEqual([r['Legal Name'] for r in page], ["Taxpayer 0999", "Taxpayer 0998", "Taxpayer 0997"])
+        # Unknown sort keys are ignored rather than interpolated into SQL
+        page = self.db.fetch_register_page('taxpayers', limit=1, order_by="gstin; DROP TABLE taxpayers")
+        self.assertEqual(page[0]['GSTIN'], "32AAAAA0000A1Z1")
+
+    def test_mirror_resyncs_when_csv_changes(self):
+        self.assertEqual(self.db.count_register_rows('taxpayers'), 1000)
+        self._write_taxpayers(10, extra=[["32ZZZZZ9999Z1Z9", "New Entrant", "", "", "", "", "", "Active", ""]])
+        # Make sure the signature differs even on coarse mtime filesystems
+        st = os.stat(self.taxpayers_csv)
+        os.utime(self.taxpayers_csv, (st.st_atime, st.st_mtime + 5))
+        self.assertEqual(self.db.count_register_rows('taxpayers'), 11)
+        self.assertEqual(self.db.fetch_register_page('taxpayers', search="entrant")[0]['GSTIN'], "32ZZZZZ9999Z1Z9")
+
+    def test_case_file_registers(self):
+        for case in (
+            {"GSTIN": "32AAAAA0001A1Z1", "Legal Name": "Alpha", "Status": "SCN Issued", "SCN_Number": "1/2025",
+             "SCN_Date": "01/03/2025", "Total_Demand": "900", "Issue_Description": "ITC"},
+            {"GSTIN": "32AAAAA0002A1Z1", "Legal Name": "Beta", "Status": "DRC-01A Issued", "DRC01A_Path": "x.pdf",
+             "Total_Demand": "50", "Issue_Description": "Tax"},
+            {"GSTIN": "32AAAAA0003A1Z1", "Legal Name": "Gamma", "Status": "Draft", "SCN_Number": "2/2025",
+             "SCN_Date": "2025-04-01", "Total_Demand": "1,000", "Issue_Description": "RCM"},
+        ):
+            self.db._legacy_create_case_file_csv(case)
+
+        scn = self.db.fetch_register_page('scn')
+        self.assertEqual([r['Legal Name'] for r in scn], ["Gamma", "Alpha"])  # SCN_Date DESC
+        self.assertEqual(self.db.count_register_rows('drc01a'), 1)
+        by_demand = self.db.fetch_register_page('scn', order_by="Total_Demand")
+        self.assertEqual([r['Total_Demand'] for r in by_demand], [900, 1000])  # numeric, not text order
+        self.assertEqual(self.db.count_register_rows('scn', filters={'date_from': "2025-03-15"}), 1)
+
+    def test_export_pages_by_key_across_writes(self):
+        conn = sqlite3.connect(self.db_file)
+        conn.executemany("INSERT INTO oc_register (oc_number, oc_date, oc_to) VALUES (?, ?, ?)",
+                         [(f"{i}/2025", "2025-04-01" if i < 8 else None, f"Entry {i}") for i in range(10)])
+        conn.commit()
+
+        rows = self.db.iter_register_rows('oc', batch_size=3)
+        seen = [next(rows)['OC_Number'] for _ in range(3)]
+        # Writes between batches neither repeat nor drop the remaining rows
+        conn.execute("DELETE FROM oc_register WHERE oc_number = '0/2025'")
+        conn.execute("INSERT INTO oc_register (oc_number, oc_date, oc_to) VALUES ('99/2025', '2025-01-01', 'Late')")
+        conn.commit()
+        conn.close()
+        seen += [r['OC_Number'] for r in rows]
+
+        self.assertEqual(len(seen), len(set(seen)))
+        self.assertEqual(set(seen), {f"{i}/2025" for i in range(10)} | {"99/2025"})
+        self.assertEqual(seen[-3:], ["99/2025", "8/2025", "9/2025"])  # NULL dates sort last descending
+        self.assertEqual(list(self.db.iter_register_rows('oc', batch_size=4)),
+                         list(self.db.iter_register_rows('oc', batch_size=1000)))
+
+
+if __name__ == '__main__':
+    unittest.main()
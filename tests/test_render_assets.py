@@ -0,0 +1,76 @@
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.utils import render_assets
+
+
+class TestRenderAssets(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        render_assets.clear()
+
+    def tearDown(self):
+        render_assets.clear()
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def _write(self, name, content, bump=0):
+        path = os.path.join(self.tmp_dir, name)
+        with open(path, "wb") as f:
+            f.write(content)
+        st = os.stat(path)
+        os.utime(path, (st.st_atime, st.st_mtime + bump))
+        return path
+
+    def test_image_is_encoded_once_per_file_version(self):
+        path = self._write("lh.png", b"\x89PNG-v1")
+        with patch.object(render_assets, "_encode_image", wraps=render_assets._encode_image) as encode:
+            first = render_assets.letterhead_block(path, {"width": 623, "margin_bottom": 5})
+            self.assertEqual(render_assets.letterhead_block(path, {"width": 623, "margin_bottom": 5}), first)
+            self.assertEqual(encode.call_count, 1)
+            self.assertIn("width: 100%;", first)
+            self.assertIn('src="data:image/png;base64,', first)
+
+            self._write("lh.png", b"\x89PNG-v2", bump=5)
+            self.assertNotEqual(render_assets.letterhead_block(path), first)
+            self.assertEqual(encode.call_count, 2)
+
+    def test_referenced_image_and_html_letterheads(self):
+        png = self._write("lh.png", b"\x89PNG" * 1000)
+        referenced = render_assets.letterhead_block(png, inline=False)
+        self.assertNotIn("base64", referenced)
+        self.assertIn('src="file://', referenced)
+
+        html = self._write("lh.html", b'<html><body><div class="letterhead-x">HEAD</div><p>x</p></body></html>')
+        self.assertEqual(render_assets.letterhead_body(html), '<div class="letterhead-x">HEAD</div><p>x</p>')
+        self.assertEqual(render_assets.letterhead_div(html), '<div class="letterhead-x">HEAD</div>')
+        self.assertIn('HEAD</div><p>x</p></div>', render_assets.letterhead_block(html))
+        self.assertEqual(render_assets.letterhead_block(os.path.join(self.tmp_dir, "missing.png")), "")
+
+        embedded = self._write("lh_png.html", b'<body><img src="data:image/png;base64,iVBORw0KGgo="></body>')
+        with patch.object(render_assets, "EXTRACTED_DIR", os.path.join(self.tmp_dir, "extracted")):
+            body = render_assets.letterhead_body(embedded, inline=False)
+        self.assertNotIn("base64", body)
+        extracted = os.listdir(os.path.join(self.tmp_dir, "extracted"))
+        self.assertEqual(len(extracted), 1)
+        self.assertIn(extracted[0], body)
+
+    def test_styles_follow_css_edits(self):
+        self._write("doc_base.css", b"body { color: red; }")
+        self._write("doc_qt.css", b".page { margin: 0; }")
+        with patch.object(render_assets, "CSS_DIR", self.tmp_dir):
+            self.assertEqual(render_assets.document_styles_html(False), "<style>\nbody { color: red; }\n\n</style>")
+            self.assertIn(".page { margin: 0; }", render_assets.document_styles_html(True))
+            self._write("doc_base.css", b"body { color: blue; }", bump=5)
+            self.assertIn("blue", render_assets.document_styles_html(False))
+            self.assertEqual(render_assets.read_css("missing.css"), "")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,66 @@
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+
+import fitz
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.services.render_worker import rasterise_pdf_pages
+
+
+def _pdf(texts):
+    doc = fitz.open()
+    for text in texts:
+        page = doc.new_page(width=595, height=842)
+        page.insert_text((72, 72), text)
+    data = doc.tobytes()
+    doc.close()
+    return data
+
+
+class TestPageRasteriser(unittest.TestCase):
+
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+
+    def _render(self, pdf_bytes, first_pages=(0,), width=300):
+        lines = []
+        rasterise_pdf_pages(pdf_bytes, self.cache_dir, width=width, first_pages=first_pages, emit=lines.append)
+        pages = []
+        for line in lines[1:]:
+            _, index, w, h, path = line.split(" ", 4)
+            pages.append((int(index), int(w), int(h), path))
+        return lines[0], pages
+
+    def test_visible_pages_come_first(self):
+        header, pages = self._render(_pdf(["One", "Two", "Three", "Four"]), first_pages=(2, 3))
+        self.assertEqual(header, "PAGES 4")
+        self.assertEqual([p[0] for p in pages], [2, 3, 0, 1])
+        index, width, height, path = pages[0]
+        self.assertEqual(width, 300)
+        self.assertAlmostEqual(height, 300 * 842 / 595, delta=1)
+        self.assertTrue(os.path.exists(path))
+
+    def test_unchanged_pages_reuse_cache(self):
+        _, before = self._render(_pdf(["One", "Two", "Three"]))
+        _, after = self._render(_pdf(["One", "Edited", "Three"]))
+        before, after = {p[0]: p[3] for p in before}, {p[0]: p[3] for p in after}
+        self.assertEqual(before[0], after[0])
+        self.assertEqual(before[2], after[2])
+        self.assertNotEqual(before[1], after[1])
+
+    def test_width_is_part_of_the_key(self):
+        _, small = self._render(_pdf(["One"]), width=300)
+        _, large = self._render(_pdf(["One"]), width=600)
+        self.assertNotEqual(small[0][3], large[0][3])
+        self.assertEqual(large[0][1], 600)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,92 @@
+import os
+import sys
+import shutil
+import sqlite3
+import tempfile
+import unittest
+from unittest import mock
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.database import schema
+from src.database.schema import init_db, schema_version, SCHEMA_VERSION, MIGRATIONS
+
+
+def _columns(conn, table):
+    return {info[1] for info in conn.execute(f"PRAGMA table_info({table})")}
+
+
+class TestSchemaMigrations(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.db_file = os.path.join(self.tmp_dir, "schema.db")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def _version(self):
+        conn = sqlite3.connect(self.db_file)
+        try:
+            return schema_version(conn)
+        finally:
+            conn.close()
+
+    def test_fresh_database_is_stamped(self):
+        applied = init_db(self.db_file)
+        self.assertEqual(len(applied), len(MIGRATIONS))
+        self.assertEqual(self._version(), SCHEMA_VERSION)
+
+        conn = sqlite3.connect(self.db_file)
+        self.assertIn("issuing_officer_id", _columns(conn, "proceedings"))
+        self.assertIn("description", _columns(conn, "issues_master"))
+        conn.close()
+
+    def test_current_schema_runs_no_steps(self):
+        init_db(self.db_file)
+        with mock.patch.object(schema, "_v1_baseline") as baseline:
+            self.assertEqual(init_db(self.db_file), [])
+        baseline.assert_not_called()
+
+    def test_legacy_database_is_completed(self):
+        conn = sqlite3.connect(self.db_file)
+        conn.execute("CREATE TABLE case_registry (id TEXT PRIMARY KEY, source_type TEXT NOT NULL)")
+        conn.execute("CREATE TABLE proceedings (id TEXT PRIMARY KEY, gstin TEXT NOT NULL, financial_year TEXT, "
+                     "form_type TEXT, status TEXT DEFAULT 'Draft')")
+        conn.execute("CREATE TABLE case_issues (id INTEGER PRIMARY KEY, proceeding_id TEXT, issue_id TEXT, data_json TEXT)")
+        conn.execute("INSERT INTO proceedings (id, gstin) VALUES ('p1', 'G')")
+        conn.commit()
+        conn.close()
+
+        init_db(self.db_file)
+
+        conn = sqlite3.connect(self.db_file)
+        self.assertTrue({"case_id", "workflow_stage", "issuing_officer_snapshot"} <= _columns(conn, "proceedings"))
+        self.assertTrue({"stage", "origin", "added_by"} <= _columns(conn, "case_issues"))
+        # Existing rows are kept and picked up by the data migrations
+        self.assertEqual(conn.execute("SELECT workflow_stage FROM proceedings WHERE id = 'p1'").fetchone()[0], 10)
+        conn.close()
+
+    def test_failed_step_rolls_back_everything(self):
+        init_db(self.db_file)
+
+        def add_table(conn):
+            conn.execute("CREATE TABLE half_done (id INTEGER)")
+
+        def fail(conn):
+            raise sqlite3.OperationalError("boom")
+
+        steps = MIGRATIONS + [(SCHEMA_VERSION + 1, "add table", add_table), (SCHEMA_VERSION + 2, "fail", fail)]
+        with mock.patch.object(schema, "MIGRATIONS", steps), \
+                mock.patch.object(schema, "SCHEMA_VERSION", SCHEMA_VERSION + 2):
+            with self.assertRaises(sqlite3.OperationalError):
+                init_db(self.db_file)
+
+        conn = sqlite3.connect(self.db_file)
+        self.assertIsNone(conn.execute("SELECT name FROM sqlite_master WHERE name = 'half_done'").fetchone())
+        conn.close()
+        self.assertEqual(self._version(), SCHEMA_VERSION)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,114 @@
+import os
+import sys
+import shutil
+import sqlite3
+import tempfile
+import unittest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.database.schema import init_db
+from src.database.db_manager import DatabaseManager
+from src.utils import section_catalogue
+from src.utils.section_catalogue import SectionCatalogue, WHOLE_SECTION, parse_subsections
+
+
+SECTIONS = [
+    {"section_number": "16", "title": "Eligibility and conditions for taking input tax credit",
+     "content": "Intro text\n(1) Every registered person shall be entitled to take credit.\n"
+                "(2) No registered person shall be entitled to the credit unless he has a tax invoice."},
+    {"section_number": "73", "title": "Determination of tax not paid",
+     "content": "Where it appears to the proper officer that any tax has not been paid."},
+    {"section_number": "160", "title": "Assessment proceedings not to be invalid",
+     "content": "(1) No assessment shall be invalid by reason of any mistake."},
+]
+
+
+def _real_qt():
+    """False when an earlier test module has replaced PyQt6 with stand-ins."""
+    try:
+        from PyQt6 import QtWidgets
+    except ImportError:
+        return False
+    return getattr(QtWidgets, "__file__", None) is not None
+
+
+class TestSectionCatalogue(unittest.TestCase):
+
+    def setUp(self):
+        section_catalogue.clear_cache()
+
+    def test_subsections_are_split_once_per_section(self):
+        self.assertEqual([label for label, _ in parse_subsections(SECTIONS[0]["content"])], ["Intro", "(1)", "(2)"])
+        catalogue = SectionCatalogue(SECTIONS)
+        self.assertEqual(catalogue.entries[0].display_text, "Section 16 - " + SECTIONS[0]["title"])
+        self.assertEqual(len(catalogue.entries[0].subsections), 3)
+        self.assertEqual(catalogue.entries[1].subsections, [])  # No labels
+        self.assertEqual(catalogue.entries[2].subsections, [])  # A lone subsection is not split
+
+    def test_search_matches_words_and_last_word_prefix(self):
+        catalogue = SectionCatalogue(SECTIONS)
+        self.assertIsNone(catalogue.search("  "))
+        self.assertEqual(catalogue.search("tax invoice"), {(0, WHOLE_SECTION), (0, 2)})
+        self.assertEqual({s for s, _ in catalogue.search("16")}, {0, 2})  # '16' and '160'
+        self.assertEqual(catalogue.search("registered person shall be entit"),
+                         {(0, WHOLE_SECTION), (0, 1), (0, 2)})
+        self.assertEqual(catalogue.search("proper invoice"), set())
+
+    def test_catalogue_rebuilt_only_when_sections_change(self):
+        tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp_dir, ignore_errors=True)
+        db_file = os.path.join(tmp_dir, "sections.db")
+        init_db(db_file)
+        db = DatabaseManager.__new__(DatabaseManager)
+        db.db_path = db.db_file = db_file
+
+        conn = sqlite3.connect(db_file)
+        conn.execute("INSERT INTO gst_acts (act_id, title) VALUES ('CGST', 'Central Goods and Services Tax Act, 2017')")
+        conn.executemany("INSERT INTO gst_sections (act_id, section_number, title, content) VALUES ('CGST', ?, ?, ?)",
+                         [(s["section_number"], s["title"], s["content"]) for s in SECTIONS])
+        conn.commit()
+
+        first = db.get_cgst_section_catalogue()
+        self.assertEqual(len(first), 3)
+        self.assertIs(db.get_cgst_section_catalogue(), first)
+
+        conn.execute("UPDATE gst_sections SET title = 'Recovery of tax' WHERE section_number = '73'")
+        conn.commit()
+        conn.close()
+        second = db.get_cgst_section_catalogue()
+        self.assertIsNot(second, first)
+        self.assertEqual({s for s, _ in second.search("recovery")}, {1})
+
+
+@unittest.skipUnless(_real_qt(), "needs the real PyQt6")
+class TestSectionSelectorDialog(unittest.TestCase):
+
+    def test_dialog_filter_toggles_only_hits(self):
+        os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+        from unittest import mock
+        from PyQt6.QtWidgets import QApplication
+        from src.ui.components import section_selector
+
+        app = QApplication.instance() or QApplication([])
+        db = mock.Mock()
+        db.get_cgst_section_catalogue.return_value = SectionCatalogue(SECTIONS)
+        with mock.patch.object(section_selector, "DatabaseManager", return_value=db):
+            dialog = section_selector.SectionSelectorDialog()
+        root = dialog.tree_widget.invisibleRootItem()
+        self.assertEqual(root.childCount(), 3)
+
+        dialog.filter_tree("invoice")
+        self.assertEqual([root.child(i).isHidden() for i in range(3)], [False, True, True])
+        sec16 = root.child(0)
+        self.assertEqual([sec16.child(k).isHidden() for k in range(3)], [True, True, False])
+        self.assertTrue(sec16.isExpanded())
+
+        dialog.filter_tree("")
+        self.assertFalse(any(root.child(i).isHidden() for i in range(3)))
+        self.assertFalse(any(sec16.child(k).isHidden() for k in range(3)))
+        dialog.deleteLater()
+
+
+if __name__ == '__main__':
+    unittest.main()
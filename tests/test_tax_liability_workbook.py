@@ -0,0 +1,105 @@
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import openpyxl
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.services import tax_liability_workbook
+from src.services.tax_liability_workbook import TaxLiabilityWorkbook, load_tax_liability_workbook
+from src.services.scrutiny_parser import ScrutinyParser
+
+
+def _build_workbook(path):
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    ws.title = "Tax Liability Summary"
+    ws["A2"] = "GSTIN: 32AAAAA0000A1Z5"
+    ws["A3"] = "Legal name: Alpha Traders"
+    ws["A4"] = "GSTIN : 32AAAAA0000A1Z5"
+    ws["D5"] = "Financial Year : 2023-24"
+    ws["D6"] = "Financial Year: 2023-24"
+
+    itc = wb.create_sheet("ITC (Other than IMPG)")
+    itc["A4"] = "4. ITC availed in excess"
+    itc["A5"] = "Tax period"
+    itc["B5"] = "ITC available as per GSTR-2B"
+    itc["F5"] = "ITC claimed in GSTR-3B"
+    itc["J5"] = "Difference"
+    # Group captions are merged across their four tax heads
+    for start in ("B", "F", "J"):
+        itc.merge_cells(f"{start}5:{chr(ord(start) + 3)}5")
+    for offset, head in enumerate(["IGST", "CGST", "SGST", "Cess"]):
+        for start in ("B", "F", "J"):
+            itc[f"{chr(ord(start) + offset)}6"] = head
+    for r, (period, avail, claimed) in enumerate([("April", 100, 150), ("May", 200, 200.5), ("Total", 300, 350.5)], start=7):
+        itc[f"A{r}"] = period
+        itc[f"B{r}"], itc[f"F{r}"], itc[f"J{r}"] = avail, claimed, claimed - avail
+    wb.save(path)
+
+
+class TestTaxLiabilityWorkbook(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp_dir, "liability.xlsx")
+        _build_workbook(self.path)
+        tax_liability_workbook._WORKBOOK_CACHE.clear()
+
+    def tearDown(self):
+        tax_liability_workbook._WORKBOOK_CACHE.clear()
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def test_frames_match_read_excel(self):
+        model = TaxLiabilityWorkbook(self.path)
+        for sheet in model.sheet_names:
+            for header in (None, 0, [4, 5], [4, 5, 6]):
+                try:
+                    expected = pd.read_excel(self.path, sheet_name=sheet, header=header)
+                except ValueError:
+                    with self.assertRaises(ValueError):
+                        model.frame(sheet, header=header)
+                    continue
+                pd.testing.assert_frame_equal(model.frame(sheet, header=header), expected)
+
+    def test_header_block_cells_and_metadata(self):
+        model = TaxLiabilityWorkbook(self.path)
+        sheet = model.find_sheet("ITC (Other")
+        self.assertEqual(sheet, "ITC (Other than IMPG)")
+        self.assertEqual(model.cell(sheet, "F5"), "ITC claimed in GSTR-3B")
+        self.assertIsNone(model.cell(sheet, "Z99"))
+        # Row 7 holds periods, not tax heads, so the 2-row header block is used
+        self.assertEqual(model.itc_frame(sheet).columns.nlevels, 2)
+        self.assertEqual(model.issue_name(sheet), "ITC availed in excess")
+        meta = model.metadata
+        self.assertEqual((meta["gstin"], meta["financial_year"]), ("32AAAAA0000A1Z5", "2023-24"))
+
+    def test_workbook_is_loaded_once_per_file_version(self):
+        parser = ScrutinyParser()
+        real_load = openpyxl.load_workbook
+        with patch.object(tax_liability_workbook.openpyxl, "load_workbook", side_effect=real_load) as load:
+            self.assertTrue(parser.validate_metadata(self.path, "32AAAAA0000A1Z5", "2023-24")[0])
+            res = parser._parse_group_b_itc_summary(self.path, "ITC (Other", "All Other ITC", "summary_3x4",
+                                                    [5, 6, 7, 8], [1, 2, 3, 4], [9, 10, 11, 12],
+                                                    issue_id="ITC_3B_2B_OTHER")
+            parser._parse_isd_credit_phase1(self.path)
+            self.assertEqual(load.call_count, 1)
+
+            self.assertEqual(res["total_shortfall"], 50)
+            self.assertEqual(res["original_header"], "ITC availed in excess")
+
+            # Replacing the file on disk invalidates the cached model
+            _build_workbook(self.path)
+            st = os.stat(self.path)
+            os.utime(self.path, (st.st_atime, st.st_mtime + 5))
+            load_tax_liability_workbook(self.path)
+            self.assertEqual(load.call_count, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,116 @@
+import os
+import sys
+import unittest
+from unittest import mock
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.services import taxpayer_index
+from src.services.taxpayer_index import TaxpayerIndex
+
+
+TAXPAYERS = [
+    {"GSTIN": "32AABCA1234A1Z5", "Legal Name": "Alpha Traders", "Trade Name": "Alpha Mart", "Mobile": 9876543210.0},
+    {"GSTIN": "32AABCB1234A1Z5", "Legal Name": "Beta Alpha Stores", "Trade Name": ""},
+    {"GSTIN": "32aabcc1234a1z5", "Legal Name": "Gamma Agencies", "Trade Name": "Alphabet Toys"},
+    {"GSTIN": "32AABCA1234A1Z5", "Legal Name": "Duplicate row", "Trade Name": ""},
+]
+
+
+def _real_qt():
+    """False when an earlier test module has replaced PyQt6 with stand-ins."""
+    try:
+        from PyQt6 import QtWidgets
+    except ImportError:
+        return False
+    return getattr(QtWidgets, "__file__", None) is not None
+
+
+class TestTaxpayerIndex(unittest.TestCase):
+
+    def tearDown(self):
+        taxpayer_index.install([])
+
+    def test_suggestions_are_ranked_with_records_attached(self):
+        index = TaxpayerIndex(TAXPAYERS)
+        self.assertEqual(len(index), 3)  # First row per GSTIN wins
+
+        labels = [label for label, _ in index.suggest("alpha")]
+        self.assertEqual(labels, [
+            "32AABCA1234A1Z5 - Alpha Traders (Alpha Mart)",   # legal name
+            "32AABCC1234A1Z5 - Gamma Agencies (Alphabet Toys)",  # trade name
+            "32AABCB1234A1Z5 - Beta Alpha Stores",            # later word of a name
+        ])
+        _, record = index.suggest("32aabcb")[0]
+        self.assertEqual(record["Legal Name"], "Beta Alpha Stores")
+        self.assertEqual(len(index.suggest("32", k=2)), 2)
+        self.assertEqual(index.suggest("   "), [])
+        self.assertEqual(index.get("32aabcc1234a1z5 ")["Legal Name"], "Gamma Agencies")
+
+    def test_built_once_in_background_and_refreshed_on_import(self):
+        loader = mock.Mock(return_value=TAXPAYERS[:1])
+        with mock.patch.object(taxpayer_index, "_load_records", loader):
+            taxpayer_index.refresh()
+            self.assertTrue(taxpayer_index.wait_ready(5))
+            for _ in range(3):
+                self.assertEqual(taxpayer_index.lookup("32AABCA1234A1Z5")["Legal Name"], "Alpha Traders")
+                taxpayer_index.suggest("32")
+            self.assertEqual(loader.call_count, 1)
+
+            loader.return_value = TAXPAYERS
+            taxpayer_index.refresh()
+            self.assertTrue(taxpayer_index.wait_ready(5))
+            self.assertEqual(loader.call_count, 2)
+            self.assertIsNotNone(taxpayer_index.lookup("32AABCC1234A1Z5"))
+
+
+@unittest.skipUnless(_real_qt(), "needs the real PyQt6")
+class TestTaxpayerWidgets(unittest.TestCase):
+
+    def tearDown(self):
+        taxpayer_index.install([])
+
+    def test_completer_fills_gstin_and_emits_record(self):
+        os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+        from PyQt6.QtCore import QModelIndex
+        from PyQt6.QtWidgets import QApplication, QLineEdit
+        from src.ui.components.taxpayer_completer import TaxpayerCompleter, GSTIN_ROLE
+
+        app = QApplication.instance() or QApplication([])
+        taxpayer_index.install(TAXPAYERS)
+        line_edit = QLineEdit()
+        completer = TaxpayerCompleter(line_edit)
+        completer.attach(line_edit)
+        selected = []
+        completer.taxpayer_selected.connect(selected.append)
+
+        completer.update_suggestions("gamma")
+        model = completer.model()
+        self.assertEqual(model.rowCount(), 1)
+        self.assertEqual(model.index(0, 0).data(GSTIN_ROLE), "32AABCC1234A1Z5")
+        completer.activated[QModelIndex].emit(model.index(0, 0))
+        self.assertEqual(selected[0]["Trade Name"], "Alphabet Toys")
+        line_edit.deleteLater()
+
+    def test_combo_box_lists_every_gstin(self):
+        os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+        from PyQt6.QtWidgets import QApplication
+        from src.ui.components.taxpayer_completer import TaxpayerComboBox
+
+        app = QApplication.instance() or QApplication([])
+        taxpayer_index.install(TAXPAYERS)
+        combo = TaxpayerComboBox()
+        changes = []
+        combo.currentTextChanged.connect(changes.append)
+        combo.setEditText("32AAB")
+        combo.showPopup()
+        self.assertEqual([combo.itemText(i) for i in range(combo.count())],
+                         ["32AABCA1234A1Z5", "32AABCB1234A1Z5", "32AABCC1234A1Z5"])
+        self.assertEqual(combo.currentText(), "32AAB")  # Typed text kept
+        self.assertEqual(changes, ["32AAB"])
+        combo.hidePopup()
+        combo.deleteLater()
+
+
+if __name__ == '__main__':
+    unittest.main()